@@ -1,4 +1,9 @@
-from .refresh import execute_refresh_group, resolve_refresh_files
+from .refresh import execute_refresh_group, refresh_gold_mart, resolve_refresh_files
 from .reports import daily_report
 
-__all__ = ["daily_report", "execute_refresh_group", "resolve_refresh_files"]
+__all__ = [
+    "daily_report",
+    "execute_refresh_group",
+    "refresh_gold_mart",
+    "resolve_refresh_files",
+]
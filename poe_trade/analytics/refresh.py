@@ -1,11 +1,77 @@
 from __future__ import annotations
 
+import json
+import logging
+import re
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
+from uuid import uuid4
 
 from ..db import ClickHouseClient
+from ..db.clickhouse import query_rows
 
 
 SQL_ROOT = Path(__file__).resolve().parents[1] / "sql"
+WATERMARK_TABLE = "poe_trade.gold_refresh_watermarks"
+
+logger = logging.getLogger(__name__)
+
+# Silver sources a gold mart may be refreshed incrementally from, with the
+# column its hour buckets are derived from.
+_INCREMENTAL_SOURCE_TIME_COLUMNS = {
+    "poe_trade.v_ps_items_enriched": "observed_at",
+    "poe_trade.v_cx_markets_enriched": "hour_ts",
+}
+_INSERT_TARGET_PATTERN = re.compile(r"^\s*INSERT\s+INTO\s+([\w.]+)", re.IGNORECASE)
+_FROM_SOURCE_PATTERN = re.compile(r"\bFROM\s+(poe_trade\.\w+)\b", re.IGNORECASE)
+_STAGE_SUFFIX = "__refresh_stage"
+_HEADER_DIRECTIVE_PATTERN = re.compile(
+    r"^--\s*(depends_on|settings)\s*:\s*(.*)$", re.IGNORECASE
+)
+
+
+@dataclass(frozen=True)
+class RefreshStep:
+    """One refresh SQL file plus the directives in its leading comments.
+
+    ``-- depends_on: 110_listing_ref_hour`` names other files of the same
+    group (by stem) that must finish first; ``-- settings: max_threads=4``
+    adds ClickHouse settings to the statement. Both take comma-separated
+    lists and may repeat.
+    """
+
+    sql_file: Path
+    depends_on: tuple[str, ...] = ()
+    settings: Mapping[str, str] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return self.sql_file.stem
+
+
+@dataclass(frozen=True)
+class MartRefreshResult:
+    sql_file: Path
+    table: str
+    status: str
+    low_water: str | None = None
+    high_water: str | None = None
+    partitions_replaced: int = 0
+    read_rows: int | None = None
+    read_bytes: int | None = None
+    written_rows: int | None = None
+
+
+@dataclass(frozen=True)
+class _IncrementalMart:
+    table: str
+    source_table: str
+    time_column: str
+    select_sql: str
 
 
 def resolve_refresh_files(layer: str, group: str | None = None) -> list[Path]:
@@ -23,16 +89,333 @@ def resolve_refresh_files(layer: str, group: str | None = None) -> list[Path]:
     return sorted(path for path in search_root.glob("*.sql") if path.is_file())
 
 
+def load_refresh_steps(sql_files: Sequence[Path]) -> list[RefreshStep]:
+    """Parse step directives and return the steps in a stable topological order.
+
+    Raises ``ValueError`` for unknown dependencies and dependency cycles.
+    """
+    steps: dict[str, RefreshStep] = {}
+    for sql_file in sql_files:
+        depends_on: list[str] = []
+        settings: dict[str, str] = {}
+        for line in sql_file.read_text(encoding="utf-8").splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if not stripped.startswith("--"):
+                break
+            directive = _HEADER_DIRECTIVE_PATTERN.match(stripped)
+            if directive is None:
+                continue
+            values = [v.strip() for v in directive.group(2).split(",") if v.strip()]
+            if directive.group(1).lower() == "depends_on":
+                depends_on.extend(values)
+                continue
+            for value in values:
+                key, sep, setting = value.partition("=")
+                if not sep or not key.strip():
+                    raise ValueError(f"Invalid setting {value!r} in {sql_file.name}")
+                settings[key.strip()] = setting.strip()
+        steps[sql_file.stem] = RefreshStep(
+            sql_file=sql_file, depends_on=tuple(depends_on), settings=settings
+        )
+    for step in steps.values():
+        unknown = [name for name in step.depends_on if name not in steps]
+        if unknown:
+            raise ValueError(
+                f"{step.sql_file.name} depends on unknown refresh steps: "
+                + ", ".join(unknown)
+            )
+    ordered: list[RefreshStep] = []
+    done: set[str] = set()
+    remaining = dict(steps)
+    while remaining:
+        ready = sorted(
+            name
+            for name, step in remaining.items()
+            if all(dependency in done for dependency in step.depends_on)
+        )
+        if not ready:
+            raise ValueError(
+                "Refresh step dependency cycle: " + ", ".join(sorted(remaining))
+            )
+        for name in ready:
+            ordered.append(remaining.pop(name))
+            done.add(name)
+    return ordered
+
+
 def execute_refresh_group(
     client: ClickHouseClient,
     *,
     layer: str,
     group: str | None = None,
     dry_run: bool = False,
+    incremental: bool = False,
+    max_parallel: int = 1,
 ) -> list[Path]:
-    sql_files = resolve_refresh_files(layer, group)
+    steps = load_refresh_steps(resolve_refresh_files(layer, group))
+    sql_files = [step.sql_file for step in steps]
     if dry_run:
         return sql_files
-    for sql_file in sql_files:
-        client.execute(sql_file.read_text(encoding="utf-8"))
+    use_incremental = incremental and layer.strip().lower() == "gold"
+
+    def _run_step(step: RefreshStep) -> None:
+        if not use_incremental:
+            client.execute(
+                step.sql_file.read_text(encoding="utf-8"),
+                settings=dict(step.settings) or None,
+            )
+            return
+        result = refresh_gold_mart(client, step.sql_file, settings=step.settings)
+        logger.info(
+            "gold refresh mart=%s status=%s low_water=%s high_water=%s "
+            "partitions=%d read_rows=%s read_bytes=%s written_rows=%s",
+            result.table,
+            result.status,
+            result.low_water,
+            result.high_water,
+            result.partitions_replaced,
+            result.read_rows,
+            result.read_bytes,
+            result.written_rows,
+        )
+
+    started = time.perf_counter()
+    _run_refresh_dag(steps, _run_step, max_parallel=max_parallel)
+    logger.info(
+        "refresh layer=%s group=%s steps=%d max_parallel=%d wall_ms=%.1f",
+        layer,
+        group,
+        len(steps),
+        max_parallel,
+        (time.perf_counter() - started) * 1000.0,
+    )
     return sql_files
+
+
+def _run_refresh_dag(
+    steps: Sequence[RefreshStep],
+    run_step: Callable[[RefreshStep], None],
+    *,
+    max_parallel: int,
+) -> None:
+    """Run each step once all of its dependencies finished.
+
+    After a failure no new steps start; in-flight ones finish and the first
+    error is re-raised.
+    """
+    waiting = {step.name: set(step.depends_on) for step in steps}
+    by_name = {step.name: step for step in steps}
+
+    def _timed(step: RefreshStep) -> None:
+        step_started = time.perf_counter()
+        run_step(step)
+        logger.info(
+            "refresh step=%s elapsed_ms=%.1f",
+            step.name,
+            (time.perf_counter() - step_started) * 1000.0,
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, max_parallel), thread_name_prefix="sql-refresh"
+    ) as executor:
+        running: dict[Future[None], str] = {}
+        failure: BaseException | None = None
+        while waiting or running:
+            if failure is None:
+                for name in [n for n, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    running[executor.submit(_timed, by_name[name])] = name
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    logger.error("refresh step=%s failed: %s", name, error)
+                    failure = failure or error
+                    continue
+                for deps in waiting.values():
+                    deps.discard(name)
+        if failure is not None:
+            raise failure
+
+
+def refresh_gold_mart(
+    client: ClickHouseClient,
+    sql_file: Path,
+    *,
+    settings: Mapping[str, str] | None = None,
+) -> MartRefreshResult:
+    """Recompute only the day partitions touched since the mart's watermark.
+
+    New buckets are built into a staging copy of the mart and swapped in with
+    ``REPLACE PARTITION``, so readers never see a half-written or duplicated
+    day. The first run (no watermark yet) rebuilds every partition the same
+    way. Marts whose SQL does not read a known silver source run in full.
+    """
+    sql = sql_file.read_text(encoding="utf-8")
+    mart = _incremental_mart(sql)
+    if mart is None:
+        client.execute(sql, settings=dict(settings or {}) or None)
+        target = _INSERT_TARGET_PATTERN.match(_strip_comment_lines(sql))
+        return MartRefreshResult(
+            sql_file=sql_file,
+            table=target.group(1) if target else sql_file.stem,
+            status="full",
+        )
+
+    watermark = _latest_watermark(client, mart.table)
+    source_filter = (
+        f"{mart.time_column} > toDateTime64('{watermark}', 3, 'UTC')"
+        if watermark
+        else "1"
+    )
+    pending = query_rows(
+        client,
+        f"SELECT toString(max({mart.time_column})) AS high_water, "
+        f"count() AS pending_rows FROM {mart.source_table} "
+        f"WHERE {source_filter} FORMAT JSONEachRow",
+    )
+    pending_rows = int((pending[0] if pending else {}).get("pending_rows") or 0)
+    if pending_rows == 0:
+        return MartRefreshResult(
+            sql_file=sql_file,
+            table=mart.table,
+            status="unchanged",
+            high_water=watermark,
+        )
+    high_water = str(pending[0]["high_water"])
+    low_water = watermark[:10] + " 00:00:00.000" if watermark else None
+
+    clauses = [f"{mart.time_column} <= toDateTime64('{high_water}', 3, 'UTC')"]
+    if low_water:
+        clauses.insert(
+            0, f"{mart.time_column} >= toDateTime64('{low_water}', 3, 'UTC')"
+        )
+    windowed_source = (
+        f"FROM (SELECT * FROM {mart.source_table} WHERE {' AND '.join(clauses)})"
+    )
+    stage_table = mart.table + _STAGE_SUFFIX
+    client.execute(f"CREATE TABLE IF NOT EXISTS {stage_table} AS {mart.table}")
+    client.execute(f"TRUNCATE TABLE {stage_table}")
+    query_id = f"gold-refresh-{uuid4().hex}"
+    client.execute(
+        f"INSERT INTO {stage_table}\n"
+        + _FROM_SOURCE_PATTERN.sub(
+            lambda _match: windowed_source, mart.select_sql, count=1
+        ),
+        settings={**(settings or {}), "query_id": query_id},
+    )
+    database, _, stage_name = stage_table.partition(".")
+    partitions = [
+        str(row.get("partition_id") or "")
+        for row in query_rows(
+            client,
+            "SELECT DISTINCT partition_id FROM system.parts "
+            f"WHERE database = '{database}' AND table = '{stage_name}' "
+            "AND active ORDER BY partition_id FORMAT JSONEachRow",
+        )
+    ]
+    for partition_id in partitions:
+        client.execute(
+            f"ALTER TABLE {mart.table} "
+            f"REPLACE PARTITION ID '{partition_id}' FROM {stage_table}"
+        )
+    client.execute(f"TRUNCATE TABLE {stage_table}")
+    stats = _query_stats(client, query_id)
+    result = MartRefreshResult(
+        sql_file=sql_file,
+        table=mart.table,
+        status="refreshed",
+        low_water=low_water,
+        high_water=high_water,
+        partitions_replaced=len(partitions),
+        read_rows=stats.get("read_rows"),
+        read_bytes=stats.get("read_bytes"),
+        written_rows=stats.get("written_rows"),
+    )
+    _record_watermark(client, mart=mart, result=result)
+    return result
+
+
+def _strip_comment_lines(sql: str) -> str:
+    return "\n".join(
+        line for line in sql.splitlines() if not line.lstrip().startswith("--")
+    )
+
+
+def _incremental_mart(sql: str) -> _IncrementalMart | None:
+    statement = _strip_comment_lines(sql).strip().rstrip(";").strip()
+    target = _INSERT_TARGET_PATTERN.match(statement)
+    sources = _FROM_SOURCE_PATTERN.findall(statement)
+    if target is None or len(sources) != 1:
+        return None
+    time_column = _INCREMENTAL_SOURCE_TIME_COLUMNS.get(sources[0])
+    if time_column is None:
+        return None
+    return _IncrementalMart(
+        table=target.group(1),
+        source_table=sources[0],
+        time_column=time_column,
+        select_sql=statement[target.end() :].strip(),
+    )
+
+
+def _latest_watermark(client: ClickHouseClient, table: str) -> str | None:
+    rows = query_rows(
+        client,
+        "SELECT toString(argMax(source_watermark, refreshed_at)) AS watermark, "
+        f"count() AS refreshes FROM {WATERMARK_TABLE} "
+        f"WHERE mart_table = '{table}' FORMAT JSONEachRow",
+    )
+    if not rows or not int(rows[0].get("refreshes") or 0):
+        return None
+    return str(rows[0].get("watermark") or "") or None
+
+
+def _query_stats(client: ClickHouseClient, query_id: str) -> dict[str, int]:
+    try:
+        client.execute("SYSTEM FLUSH LOGS")
+        rows = query_rows(
+            client,
+            "SELECT read_rows, read_bytes, written_rows FROM system.query_log "
+            f"WHERE query_id = '{query_id}' AND type = 'QueryFinish' "
+            "ORDER BY event_time DESC LIMIT 1 FORMAT JSONEachRow",
+        )
+    except Exception:
+        logger.debug("gold refresh stats unavailable for %s", query_id, exc_info=True)
+        return {}
+    if not rows:
+        return {}
+    return {
+        key: int(rows[0][key])
+        for key in ("read_rows", "read_bytes", "written_rows")
+        if rows[0].get(key) is not None
+    }
+
+
+def _record_watermark(
+    client: ClickHouseClient,
+    *,
+    mart: _IncrementalMart,
+    result: MartRefreshResult,
+) -> None:
+    row = {
+        "mart_table": mart.table,
+        "source_table": mart.source_table,
+        "low_water": result.low_water,
+        "source_watermark": result.high_water,
+        "partitions_replaced": result.partitions_replaced,
+        "read_rows": result.read_rows,
+        "read_bytes": result.read_bytes,
+        "written_rows": result.written_rows,
+        "refreshed_at": datetime.now(timezone.utc).strftime(
+            "%Y-%m-%d %H:%M:%S.%f"
+        )[:-3],
+    }
+    client.execute(
+        f"INSERT INTO {WATERMARK_TABLE} FORMAT JSONEachRow\n" + json.dumps(row)
+    )
@@ -0,0 +1,256 @@
+"""Item-label suggestion index for the dashboard search box.
+
+``refresh_search_label_index`` keeps ``poe_trade.search_item_label_daily``
+(per-day label match counts) in sync with the listing episodes, recomputing
+only the days whose rows were inserted since the last refresh. The API loads
+the summed counts into a ``SuggestionIndex`` held in memory, so each keystroke
+is an n-gram lookup instead of a scan of the training table.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import ClickHouseClientError, query_rows
+from poe_trade.ml.v3.sql import TRAINING_SOURCE_TABLE
+
+LABEL_INDEX_TABLE = "poe_trade.search_item_label_daily"
+
+# Substring queries are answered from the posting list of their rarest n-gram.
+_MAX_GRAM = 3
+
+logger = logging.getLogger(__name__)
+
+
+def item_label_sql(alias: str = "") -> str:
+    prefix = f"{alias}." if alias else ""
+    return (
+        "if("
+        f"lowerUTF8(ifNull({prefix}rarity, '')) = 'unique' AND nullIf({prefix}item_name, '') IS NOT NULL, "
+        f"nullIf({prefix}item_name, ''), {prefix}base_type"
+        ")"
+    )
+
+
+def item_kind_sql(alias: str = "") -> str:
+    prefix = f"{alias}." if alias else ""
+    return (
+        "if("
+        f"lowerUTF8(ifNull({prefix}rarity, '')) = 'unique' AND nullIf({prefix}item_name, '') IS NOT NULL, "
+        "'unique_name', 'base_type'"
+        ")"
+    )
+
+
+@dataclass(frozen=True)
+class LabelIndexRefreshResult:
+    days_refreshed: int
+    source_watermark: str | None
+
+
+def refresh_search_label_index(client: ClickHouseClient) -> LabelIndexRefreshResult:
+    """Recompute the label counts of every day touched since the last refresh."""
+    watermark_rows = query_rows(
+        client,
+        "SELECT toString(max(source_inserted_at)) AS watermark, count() AS rows "
+        f"FROM {LABEL_INDEX_TABLE} FORMAT JSONEachRow",
+    )
+    watermark_row = watermark_rows[0] if watermark_rows else {}
+    watermark = (
+        str(watermark_row.get("watermark") or "") or None
+        if int(watermark_row.get("rows") or 0)
+        else None
+    )
+    touched_filter = (
+        f"WHERE inserted_at > toDateTime64('{watermark}', 3, 'UTC')"
+        if watermark
+        else ""
+    )
+    days = [
+        str(row.get("day") or "")
+        for row in query_rows(
+            client,
+            "SELECT DISTINCT toString(toDate(as_of_ts)) AS day "
+            f"FROM {TRAINING_SOURCE_TABLE} {touched_filter} "
+            "ORDER BY day FORMAT JSONEachRow",
+        )
+        if str(row.get("day") or "")
+    ]
+    if not days:
+        return LabelIndexRefreshResult(days_refreshed=0, source_watermark=watermark)
+    day_list = ", ".join(f"toDate('{day}')" for day in days)
+    client.execute(f"DELETE FROM {LABEL_INDEX_TABLE} WHERE day IN ({day_list})")
+    client.execute(
+        " ".join(
+            [
+                f"INSERT INTO {LABEL_INDEX_TABLE}",
+                "(day, item_name, item_kind, match_count, source_inserted_at)",
+                "SELECT",
+                "toDate(as_of_ts) AS day,",
+                f"{item_label_sql()} AS item_name,",
+                f"{item_kind_sql()} AS item_kind,",
+                "count() AS match_count,",
+                "max(inserted_at) AS source_inserted_at",
+                f"FROM {TRAINING_SOURCE_TABLE}",
+                f"WHERE toDate(as_of_ts) IN ({day_list})",
+                "AND target_price_chaos IS NOT NULL",
+                "AND target_price_chaos > 0",
+                "GROUP BY day, item_name, item_kind",
+                "HAVING item_name != ''",
+            ]
+        )
+    )
+    refreshed = query_rows(
+        client,
+        "SELECT toString(max(source_inserted_at)) AS watermark "
+        f"FROM {LABEL_INDEX_TABLE} FORMAT JSONEachRow",
+    )
+    refreshed_row = refreshed[0] if refreshed else {}
+    return LabelIndexRefreshResult(
+        days_refreshed=len(days),
+        source_watermark=str(refreshed_row.get("watermark") or "") or None,
+    )
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    item_name: str
+    item_kind: str
+    match_count: int
+
+
+class SuggestionIndex:
+    """Case-insensitive substring search over item labels, best matches first.
+
+    Every label's 1- to 3-grams map to posting lists of label ids. Ids follow
+    rank order (match count descending, then name), so walking the rarest
+    posting list of a query and keeping the labels that contain it yields the
+    top ``limit`` matches without sorting.
+    """
+
+    def __init__(self, suggestions: Sequence[Suggestion]) -> None:
+        self._suggestions = sorted(
+            suggestions, key=lambda item: (-item.match_count, item.item_name)
+        )
+        self._folded = [item.item_name.lower() for item in self._suggestions]
+        postings: dict[str, list[int]] = {}
+        for label_id, label in enumerate(self._folded):
+            grams = {
+                label[start : start + size]
+                for size in range(1, _MAX_GRAM + 1)
+                for start in range(len(label) - size + 1)
+            }
+            for gram in grams:
+                postings.setdefault(gram, []).append(label_id)
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self._suggestions)
+
+    def search(self, query: str, *, limit: int) -> list[Suggestion]:
+        needle = query.strip().lower()
+        if not needle or limit <= 0:
+            return []
+        size = min(len(needle), _MAX_GRAM)
+        candidates: list[int] | None = None
+        for start in range(len(needle) - size + 1):
+            posting = self._postings.get(needle[start : start + size])
+            if posting is None:
+                return []
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        matches: list[Suggestion] = []
+        for label_id in candidates or ():
+            if needle in self._folded[label_id]:
+                matches.append(self._suggestions[label_id])
+                if len(matches) >= limit:
+                    break
+        return matches
+
+
+def load_suggestion_index(client: ClickHouseClient) -> SuggestionIndex:
+    rows = query_rows(
+        client,
+        " ".join(
+            [
+                "SELECT item_name, item_kind, sum(match_count) AS match_count",
+                f"FROM {LABEL_INDEX_TABLE}",
+                "WHERE item_name != ''",
+                "GROUP BY item_name, item_kind",
+                "FORMAT JSONEachRow",
+            ]
+        ),
+    )
+    return SuggestionIndex(
+        [
+            Suggestion(
+                item_name=str(row.get("item_name") or ""),
+                item_kind=str(row.get("item_kind") or "base_type"),
+                match_count=int(row.get("match_count") or 0),
+            )
+            for row in rows
+        ]
+    )
+
+
+class SuggestionIndexCache:
+    """Keeps one ``SuggestionIndex`` in memory and reloads it periodically.
+
+    The first load happens inline; later reloads run on a background thread
+    while requests keep reading the previous index. A failed load keeps the
+    previous index and waits a full period before trying again.
+    """
+
+    def __init__(self, *, refresh_seconds: float) -> None:
+        self._refresh_seconds = max(0.0, float(refresh_seconds))
+        self._lock = threading.Lock()
+        self._index: SuggestionIndex | None = None
+        self._loaded_at: float | None = None
+        self._refreshing = False
+
+    def get(self, client: ClickHouseClient) -> SuggestionIndex | None:
+        with self._lock:
+            stale = (
+                self._loaded_at is None
+                or time.monotonic() - self._loaded_at >= self._refresh_seconds
+            )
+            if not stale or self._refreshing:
+                return self._index
+            self._refreshing = True
+            first_load = self._loaded_at is None
+        if first_load:
+            self._reload(client)
+        else:
+            threading.Thread(target=self._reload, args=(client,), daemon=True).start()
+        with self._lock:
+            return self._index
+
+    def _reload(self, client: ClickHouseClient) -> None:
+        index: SuggestionIndex | None = None
+        try:
+            index = load_suggestion_index(client)
+        except (ClickHouseClientError, OSError, ValueError) as exc:
+            logger.warning("search suggestion index load failed: %s", exc)
+        with self._lock:
+            if index is not None:
+                self._index = index
+            self._loaded_at = time.monotonic()
+            self._refreshing = False
+
+
+__all__ = [
+    "LABEL_INDEX_TABLE",
+    "LabelIndexRefreshResult",
+    "Suggestion",
+    "SuggestionIndex",
+    "SuggestionIndexCache",
+    "item_kind_sql",
+    "item_label_sql",
+    "load_suggestion_index",
+    "refresh_search_label_index",
+]
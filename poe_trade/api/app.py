@@ -15,6 +15,7 @@ import urllib.parse
 import urllib.request
 from urllib.parse import parse_qs, urlparse
 
+from poe_trade.analytics.search_index import SuggestionIndexCache
 from poe_trade.config import settings as config_settings
 from poe_trade.config.settings import Settings
 from poe_trade.db import ClickHouseClient
@@ -40,17 +41,20 @@ from .ml import (
     BackendUnavailable,
     contract_payload,
     ensure_allowed_league,
+    fetch_active_model_version,
     fetch_automation_history,
     fetch_automation_status,
     fetch_predict_one,
     fetch_status,
 )
 from poe_trade.ml import workflows
+from poe_trade.ml.v3 import serve as v3_serve
 from poe_trade.ingestion.account_stash_harvester import AccountStashHarvester
 from poe_trade.ingestion.account_stash_harvester import run_persisted_valuation_refresh
 from poe_trade.ingestion.poe_client import PoeClient
 from poe_trade.ingestion.rate_limit import RateLimitPolicy
 from poe_trade.ingestion.status import StatusReporter
+from poe_trade.stash_valuation_cache import StashValuationCache
 
 from .ops import (
     OpsBackendUnavailable,
@@ -71,6 +75,7 @@ from .ops import (
     scanner_summary_payload,
     messages_payload,
     price_check_payload,
+    price_items_json_payload,
     services_payload,
 )
 from .responses import ApiError, Response, json_error, json_response
@@ -90,7 +95,6 @@ from poe_trade.stash_scan import (
     fetch_active_scan,
     fetch_published_scan_id,
     fetch_valuation_refresh_status_payload,
-    serialize_stash_item_to_clipboard,
     valuation_refresh_status_payload,
 )
 from .service_control import (
@@ -367,6 +371,19 @@ def _load_private_stash_token_state(
     return token_state, access_token
 
 
+def _stash_valuation_cache(
+    clickhouse_client: ClickHouseClient, *, league: str
+) -> StashValuationCache | None:
+    try:
+        model_version = fetch_active_model_version(clickhouse_client, league=league)
+    except BackendUnavailable:
+        logger.warning("stash valuation cache disabled league=%s", league)
+        return None
+    return StashValuationCache(
+        clickhouse_client, league=league, model_version=model_version
+    )
+
+
 def _build_private_stash_harvester(
     settings: Settings,
     clickhouse_client: ClickHouseClient,
@@ -397,12 +414,11 @@ def _build_private_stash_harvester(
         poe_client.set_bearer_token(refreshed_access_token or None)
         return refreshed_access_token
 
-    def _price_item(raw_item: dict[str, object]) -> dict[str, object]:
-        item_text = serialize_stash_item_to_clipboard(raw_item)
-        return price_check_payload(
+    def _price_items(raw_items: list[dict[str, object]]) -> list[dict[str, object]]:
+        return price_items_json_payload(
             clickhouse_client,
             league=league,
-            item_text=item_text,
+            items=raw_items,
         )
 
     reporter = StatusReporter(clickhouse_client, "account_stash_harvester")
@@ -414,8 +430,10 @@ def _build_private_stash_harvester(
         account_name=account_name,
         access_token=access_token,
         refresh_access_token=_refresh_access_token,
+        valuation_cache=_stash_valuation_cache(clickhouse_client, league=league),
+        pricing_workers=settings.account_stash_pricing_workers,
     )
-    setattr(harvester, "_price_item", _price_item)
+    setattr(harvester, "_price_items", _price_items)
     return harvester
 
 
@@ -609,10 +627,13 @@ def start_stash_valuations_refresh(
                 published_scan_id=published_scan_id,
                 scan_id=active_scan_id,
                 started_at=started_at,
-                price_item=lambda raw_item: price_check_payload(
+                price_items=lambda raw_items: price_items_json_payload(
                     clickhouse_client,
                     league=league,
-                    item_text=serialize_stash_item_to_clipboard(raw_item),
+                    items=raw_items,
+                ),
+                valuation_cache=_stash_valuation_cache(
+                    clickhouse_client, league=league
                 ),
             )
             result_status = str(result.get("status") or "").strip().lower()
@@ -752,6 +773,12 @@ class ApiApp:
         self.settings = settings
         self.client = clickhouse_client
         self._ml_warmup_state: dict[str, dict[str, object]] = {}
+        v3_serve.configure_serving_context(
+            ttl_seconds=settings.ml_serving_context_ttl_seconds
+        )
+        self._search_suggestions = SuggestionIndexCache(
+            refresh_seconds=settings.api_search_suggestions_refresh_seconds
+        )
         self.router = Router()
         self._register_routes()
         if self.settings.ml_automation_enabled:
@@ -917,6 +944,14 @@ class ApiApp:
                     league,
                     exc,
                 )
+            try:
+                v3_serve.warmup_bundle_cache(league=league)
+            except Exception as exc:
+                logger.warning(
+                    "ml v3 bundle warmup failed for league=%s: %s",
+                    league,
+                    exc,
+                )
 
     def _ml_readiness_payload(self) -> dict[str, object]:
         if not self.settings.ml_automation_enabled:
@@ -1229,6 +1264,7 @@ class ApiApp:
             payload = analytics_search_suggestions(
                 self.client,
                 query=str((query_params.get("query") or [""])[0] or ""),
+                index=self._search_suggestions.get(self.client),
             )
         except OpsBackendUnavailable:
             raise ApiError(
@@ -1331,6 +1367,7 @@ class ApiApp:
                 payload = analytics_search_suggestions(
                     self.client,
                     query=str((query_params.get("query") or [""])[0] or ""),
+                    index=self._search_suggestions.get(self.client),
                 )
             elif kind == "search-history":
                 payload = analytics_search_history(
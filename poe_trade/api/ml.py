@@ -7,7 +7,7 @@ from typing import Any
 
 from poe_trade.config.settings import Settings
 from poe_trade.db import ClickHouseClient
-from poe_trade.db.clickhouse import ClickHouseClientError
+from poe_trade.db.clickhouse import ClickHouseClientError, query_rows
 from poe_trade.ml import workflows
 from poe_trade.ml.v3 import serve as v3_serve
 from poe_trade.ml.v3.sql import TRAINING_SOURCE_TABLE
@@ -89,6 +89,70 @@ def fetch_predict_one(
         raise BackendUnavailable("predict backend unavailable") from exc
 
 
+def fetch_predict_from_item_json(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    item: dict[str, Any],
+) -> dict[str, Any]:
+    try:
+        v3_payload = v3_serve.predict_from_item_json(
+            client,
+            league=league,
+            item=item,
+        )
+        return normalize_predict_one_payload(league=league, payload=v3_payload)
+    except ValueError:
+        raise
+    except ClickHouseClientError as exc:
+        raise BackendUnavailable("predict backend unavailable") from exc
+    except Exception as exc:
+        raise BackendUnavailable("predict backend unavailable") from exc
+
+
+def fetch_predict_many_from_item_json(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    items: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    try:
+        v3_payloads = v3_serve.predict_many_from_item_json(
+            client,
+            league=league,
+            items=items,
+        )
+        return [
+            normalize_predict_one_payload(league=league, payload=v3_payload)
+            for v3_payload in v3_payloads
+        ]
+    except ValueError:
+        raise
+    except ClickHouseClientError as exc:
+        raise BackendUnavailable("predict backend unavailable") from exc
+    except Exception as exc:
+        raise BackendUnavailable("predict backend unavailable") from exc
+
+
+def fetch_active_model_version(client: ClickHouseClient, *, league: str) -> str:
+    rows = _query_rows(
+        client,
+        " ".join(
+            [
+                "SELECT model_version",
+                f"FROM {_automation_tables()['model_registry']}",
+                f"WHERE league = {_quote(league)} AND promoted = 1",
+                "ORDER BY promoted_at DESC",
+                "LIMIT 1",
+                "FORMAT JSONEachRow",
+            ]
+        ),
+    )
+    if not rows:
+        return "none"
+    return str(rows[0].get("model_version") or "none")
+
+
 def fetch_automation_status(client: ClickHouseClient, *, league: str) -> dict[str, Any]:
     status_payload = fetch_status(client, league=league)
     tables = _automation_tables()
@@ -960,17 +1024,9 @@ def _as_list(value: Any) -> list[Any]:
 
 def _query_rows(client: ClickHouseClient, query: str) -> list[dict[str, Any]]:
     try:
-        payload = client.execute(query).strip()
+        return query_rows(client, query)
     except ClickHouseClientError as exc:
         raise BackendUnavailable("status backend unavailable") from exc
-    if not payload:
-        return []
-    rows: list[dict[str, Any]] = []
-    for line in payload.splitlines():
-        parsed = json.loads(line)
-        if isinstance(parsed, dict):
-            rows.append(parsed)
-    return rows
 
 
 def _quote(value: str) -> str:
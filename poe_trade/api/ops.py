@@ -4,23 +4,36 @@ import base64
 import json
 import re
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
 from poe_trade import __version__
 from poe_trade.analytics.reports import daily_report
+from poe_trade.analytics.search_index import (
+    SuggestionIndex,
+    item_kind_sql as _search_item_kind_sql,
+    item_label_sql as _search_item_label_sql,
+)
 from poe_trade.config import constants
 from poe_trade.config.settings import Settings
 from poe_trade.db import ClickHouseClient
 from poe_trade.db.clickhouse import ClickHouseClientError
-from poe_trade.ml.v3.sql import TRAINING_SOURCE_TABLE
+from poe_trade.ml.v3.sql import SEARCH_HISTORY_ROLLUP_TABLE, TRAINING_SOURCE_TABLE
 from poe_trade.strategy.alerts import ack_alert, list_alerts
 
-from .ml import fetch_predict_one, fetch_status
+from .ml import (
+    fetch_predict_from_item_json,
+    fetch_predict_many_from_item_json,
+    fetch_predict_one,
+    fetch_status,
+)
 from .service_control import ServiceSnapshot
 from .valuation import (
     ValuationBackendUnavailable,
+    item_json_comparables_key,
     price_check_comparables,
+    price_item_json_comparables,
     pricing_outlier_row_payload,
     pricing_outlier_weekly_payload,
     safe_json_rows,
@@ -908,6 +921,64 @@ def price_check_payload(
             "output_mode": "json",
         },
     )
+    return _price_check_response(
+        prediction,
+        comparables=_price_check_comparables(
+            client,
+            league=league,
+            item_text=item_text,
+        ),
+    )
+
+
+def price_item_json_payload(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    item: dict[str, Any],
+) -> dict[str, Any]:
+    """Price a GGG item dict without the clipboard text round trip."""
+    prediction = fetch_predict_from_item_json(client, league=league, item=item)
+    try:
+        comparables = price_item_json_comparables(client, league=league, item=item)
+    except ValuationBackendUnavailable as exc:
+        raise OpsBackendUnavailable("analytics backend unavailable") from exc
+    return _price_check_response(prediction, comparables=comparables)
+
+
+def price_items_json_payload(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    items: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Price a batch of GGG item dicts with one model call per serving bundle.
+
+    Items sharing a comparables identity share one comparables query.
+    """
+    predictions = fetch_predict_many_from_item_json(client, league=league, items=items)
+    comparables_by_identity: dict[tuple[str, str, str], list[dict[str, Any]]] = {}
+    payloads: list[dict[str, Any]] = []
+    for item, prediction in zip(items, predictions):
+        identity = item_json_comparables_key(item)
+        comparables = comparables_by_identity.get(identity)
+        if comparables is None:
+            try:
+                comparables = price_item_json_comparables(
+                    client, league=league, item=item
+                )
+            except ValuationBackendUnavailable as exc:
+                raise OpsBackendUnavailable("analytics backend unavailable") from exc
+            comparables_by_identity[identity] = comparables
+        payloads.append(_price_check_response(prediction, comparables=comparables))
+    return payloads
+
+
+def _price_check_response(
+    prediction: dict[str, Any],
+    *,
+    comparables: list[dict[str, Any]],
+) -> dict[str, Any]:
     interval = prediction.get("interval")
     if not isinstance(interval, dict):
         interval = {
@@ -926,11 +997,7 @@ def price_check_payload(
         "confidence": prediction.get("confidence")
         or prediction.get("confidence_percent")
         or 0.0,
-        "comparables": _price_check_comparables(
-            client,
-            league=league,
-            item_text=item_text,
-        ),
+        "comparables": comparables,
         "interval": interval,
         "saleProbabilityPercent": prediction.get("saleProbabilityPercent")
         or prediction.get("sale_probability_percent"),
@@ -967,11 +1034,29 @@ def analytics_search_suggestions(
     *,
     query: str,
     limit: int = 8,
+    index: SuggestionIndex | None = None,
 ) -> dict[str, Any]:
+    """Item labels containing ``query``, most listed first.
+
+    A loaded ``index`` answers from memory; without one (or while it is still
+    empty) the labels are aggregated from the training table.
+    """
     compact_query = query.strip()
     if not compact_query:
         return {"query": "", "suggestions": []}
     query_limit = max(1, min(limit, 20))
+    if index is not None and len(index):
+        return {
+            "query": compact_query,
+            "suggestions": [
+                {
+                    "itemName": item.item_name,
+                    "itemKind": item.item_kind,
+                    "matchCount": item.match_count,
+                }
+                for item in index.search(compact_query, limit=query_limit)
+            ],
+        }
     label_expr = _search_item_label_sql()
     kind_expr = _search_item_kind_sql()
     rows = _safe_json_rows_optional_compat(
@@ -1024,7 +1109,7 @@ def analytics_search_history(
         query_params, "limit", default=200, minimum=1, maximum=500
     )
 
-    league_where = _history_where_clause(
+    league_where = _history_rollup_where_clause(
         query=compact_query,
         league=None,
         price_min=None,
@@ -1032,7 +1117,7 @@ def analytics_search_history(
         time_from=None,
         time_to=None,
     )
-    ranges_where = _history_where_clause(
+    ranges_where = _history_rollup_where_clause(
         query=compact_query,
         league=league,
         price_min=None,
@@ -1040,7 +1125,7 @@ def analytics_search_history(
         time_from=None,
         time_to=None,
     )
-    price_hist_where = _history_where_clause(
+    price_hist_where = _history_rollup_where_clause(
         query=compact_query,
         league=league,
         price_min=None,
@@ -1048,7 +1133,7 @@ def analytics_search_history(
         time_from=time_from,
         time_to=time_to,
     )
-    time_hist_where = _history_where_clause(
+    time_hist_where = _history_rollup_where_clause(
         query=compact_query,
         league=league,
         price_min=price_min,
@@ -1065,77 +1150,65 @@ def analytics_search_history(
         time_to=time_to,
     )
 
-    league_rows = _safe_json_rows_optional_compat(
-        client,
-        " ".join(
+    label_expr = _search_item_label_sql()
+    queries = {
+        "leagues": " ".join(
             [
                 "SELECT league",
-                f"FROM {TRAINING_SOURCE_TABLE}",
+                f"FROM {SEARCH_HISTORY_ROLLUP_TABLE}",
                 league_where,
                 "GROUP BY league",
                 "ORDER BY league ASC FORMAT JSONEachRow",
             ]
         ),
-    )
-    range_rows = _safe_json_rows_optional_compat(
-        client,
-        " ".join(
+        "ranges": " ".join(
             [
                 "SELECT",
-                "min(target_price_chaos) AS min_price,",
-                "max(target_price_chaos) AS max_price,",
-                "min(as_of_ts) AS min_added_on,",
-                "max(as_of_ts) AS max_added_on",
-                f"FROM {TRAINING_SOURCE_TABLE}",
+                "min(min_price) AS min_price,",
+                "max(max_price) AS max_price,",
+                "min(min_as_of_ts) AS min_added_on,",
+                "max(max_as_of_ts) AS max_added_on",
+                f"FROM {SEARCH_HISTORY_ROLLUP_TABLE}",
                 ranges_where,
                 "FORMAT JSONEachRow",
             ]
         ),
-    )
-    ranges = range_rows[0] if range_rows else {}
-    min_price = _coerce_float(ranges.get("min_price"))
-    max_price = _coerce_float(ranges.get("max_price"))
-    min_added_on = _as_iso_utc(ranges.get("min_added_on"))
-    max_added_on = _as_iso_utc(ranges.get("max_added_on"))
-
-    price_bucket = _history_price_bucket_size(min_price, max_price)
-    price_rows = _safe_json_rows_optional_compat(
-        client,
-        " ".join(
+        "price": " ".join(
             [
+                "WITH (",
+                "SELECT greatest(ceil((max(max_price) - min(min_price)) / 20), 1)",
+                f"FROM {SEARCH_HISTORY_ROLLUP_TABLE}",
+                ranges_where,
+                ") AS bucket_width",
                 "SELECT",
-                f"floor(target_price_chaos / {price_bucket}) * {price_bucket} AS bucket_start,",
-                f"floor(target_price_chaos / {price_bucket}) * {price_bucket} + {price_bucket} AS bucket_end,",
-                "count() AS count",
-                f"FROM {TRAINING_SOURCE_TABLE}",
+                "floor(price_bucket / bucket_width) * bucket_width AS bucket_start,",
+                "bucket_start + bucket_width AS bucket_end,",
+                "sum(listings) AS count",
+                f"FROM {SEARCH_HISTORY_ROLLUP_TABLE}",
                 price_hist_where,
                 "GROUP BY bucket_start, bucket_end",
                 "ORDER BY bucket_start ASC FORMAT JSONEachRow",
             ]
         ),
-    )
-
-    time_bucket_seconds = _history_time_bucket_seconds(min_added_on, max_added_on)
-    time_rows = _safe_json_rows_optional_compat(
-        client,
-        " ".join(
+        "time": " ".join(
             [
+                "WITH (",
+                "SELECT dateDiff('second', min(min_as_of_ts), max(max_as_of_ts))",
+                f"FROM {SEARCH_HISTORY_ROLLUP_TABLE}",
+                ranges_where,
+                ") AS span_seconds,",
+                "if(span_seconds > 0, greatest(intDiv(span_seconds, 20 * 3600) * 3600, 3600), 86400) AS bucket_seconds",
                 "SELECT",
-                f"toDateTime(intDiv(toUInt32(toUnixTimestamp(as_of_ts)), {time_bucket_seconds}) * {time_bucket_seconds}, 'UTC') AS bucket_start,",
-                f"toDateTime(intDiv(toUInt32(toUnixTimestamp(as_of_ts)), {time_bucket_seconds}) * {time_bucket_seconds} + {time_bucket_seconds}, 'UTC') AS bucket_end,",
-                "count() AS count",
-                f"FROM {TRAINING_SOURCE_TABLE}",
+                "toDateTime(intDiv(toUInt32(hour), bucket_seconds) * bucket_seconds, 'UTC') AS bucket_start,",
+                "toDateTime(intDiv(toUInt32(hour), bucket_seconds) * bucket_seconds + bucket_seconds, 'UTC') AS bucket_end,",
+                "sum(listings) AS count",
+                f"FROM {SEARCH_HISTORY_ROLLUP_TABLE}",
                 time_hist_where,
                 "GROUP BY bucket_start, bucket_end",
                 "ORDER BY bucket_start ASC FORMAT JSONEachRow",
             ]
         ),
-    )
-
-    label_expr = _search_item_label_sql()
-    row_rows = _safe_json_rows_optional_compat(
-        client,
-        " ".join(
+        "rows": " ".join(
             [
                 "SELECT",
                 f"{label_expr} AS item_name,",
@@ -1148,7 +1221,28 @@ def analytics_search_history(
                 f"LIMIT {query_limit} FORMAT JSONEachRow",
             ]
         ),
-    )
+    }
+    # Histogram widths are derived in SQL from the same rollup range, so none
+    # of the five queries waits on another.
+    with ThreadPoolExecutor(
+        max_workers=len(queries), thread_name_prefix="search-history"
+    ) as pool:
+        futures = {
+            name: pool.submit(_safe_json_rows_optional_compat, client, query)
+            for name, query in queries.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    league_rows = results["leagues"]
+    range_rows = results["ranges"]
+    price_rows = results["price"]
+    time_rows = results["time"]
+    row_rows = results["rows"]
+
+    ranges = range_rows[0] if range_rows else {}
+    min_price = _coerce_float(ranges.get("min_price"))
+    max_price = _coerce_float(ranges.get("max_price"))
+    min_added_on = _as_iso_utc(ranges.get("min_added_on"))
+    max_added_on = _as_iso_utc(ranges.get("max_added_on"))
     return {
         "query": {
             "text": compact_query,
@@ -1532,26 +1626,6 @@ def _query_param_datetime(
     return parsed.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def _search_item_label_sql(alias: str = "") -> str:
-    prefix = f"{alias}." if alias else ""
-    return (
-        "if("
-        f"lowerUTF8(ifNull({prefix}rarity, '')) = 'unique' AND nullIf({prefix}item_name, '') IS NOT NULL, "
-        f"nullIf({prefix}item_name, ''), {prefix}base_type"
-        ")"
-    )
-
-
-def _search_item_kind_sql(alias: str = "") -> str:
-    prefix = f"{alias}." if alias else ""
-    return (
-        "if("
-        f"lowerUTF8(ifNull({prefix}rarity, '')) = 'unique' AND nullIf({prefix}item_name, '') IS NOT NULL, "
-        "'unique_name', 'base_type'"
-        ")"
-    )
-
-
 def _history_where_clause(
     *,
     query: str,
@@ -1582,6 +1656,40 @@ def _history_where_clause(
     return "WHERE " + " AND ".join(clauses)
 
 
+def _history_rollup_where_clause(
+    *,
+    query: str,
+    league: str | None,
+    price_min: float | None,
+    price_max: float | None,
+    time_from: str | None,
+    time_to: str | None,
+) -> str:
+    """Filters on the hourly rollup; bounds match whole hours and 1c buckets."""
+    clauses: list[str] = []
+    compact_query = query.strip()
+    if compact_query:
+        clauses.append(
+            f"positionCaseInsensitiveUTF8(item_name, {_quote_sql_string(compact_query)}) > 0"
+        )
+    compact_league = (league or "").strip()
+    if compact_league and compact_league.lower() != "all":
+        clauses.append(f"league = {_quote_sql_string(compact_league)}")
+    if price_min is not None:
+        clauses.append(f"price_bucket >= floor({price_min})")
+    if price_max is not None:
+        clauses.append(f"price_bucket <= {price_max}")
+    if time_from is not None:
+        clauses.append(
+            f"hour >= toStartOfHour(toDateTime({_quote_sql_string(time_from)}, 'UTC'))"
+        )
+    if time_to is not None:
+        clauses.append(f"hour <= toDateTime({_quote_sql_string(time_to)}, 'UTC')")
+    if not clauses:
+        return ""
+    return "WHERE " + " AND ".join(clauses)
+
+
 def _normalize_sort_order(value: str, *, default: str = "asc") -> str:
     normalized = value.lower().strip() if value else default
     if normalized not in {"asc", "desc"}:
@@ -1605,26 +1713,6 @@ def _history_order_sql(sort: str, order: str) -> str:
     return f"{column} {order.upper()}"
 
 
-def _history_price_bucket_size(min_price: float | None, max_price: float | None) -> str:
-    if min_price is None or max_price is None or max_price <= min_price:
-        return "1"
-    bucket = max((max_price - min_price) / 20.0, 1.0)
-    return _float_sql(bucket)
-
-
-def _history_time_bucket_seconds(
-    min_added_on: str | None, max_added_on: str | None
-) -> int:
-    if not min_added_on or not max_added_on:
-        return 86400
-    start = _parse_iso_utc(min_added_on)
-    end = _parse_iso_utc(max_added_on)
-    if start is None or end is None or end <= start:
-        return 86400
-    bucket = int((end - start).total_seconds() / 20.0)
-    return max(3600, bucket)
-
-
 def _normalize_outlier_sort(value: str) -> str:
     if value in {
         "item_name",
@@ -1666,11 +1754,6 @@ def _outlier_token_league_clause(alias: str, league: str | None) -> str:
     return f"{alias}.league = {_quote_sql_string(compact_league)}"
 
 
-def _float_sql(value: float) -> str:
-    text = f"{value:.6f}".rstrip("0").rstrip(".")
-    return text or "0"
-
-
 def _scanner_expected_hold_minutes_sql(
     *,
     evidence_snapshot_expr: str,
@@ -53,6 +53,37 @@ def price_check_comparables(
         parsed = ml_workflows._parse_clipboard_item(item_text)
     except ValueError:
         return []
+    return _comparables_for_parsed(client, league=league, parsed=parsed)
+
+
+def price_item_json_comparables(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    item: dict[str, Any],
+) -> list[dict[str, Any]]:
+    return _comparables_for_parsed(
+        client, league=league, parsed=ml_workflows._item_json_identity(item)
+    )
+
+
+def item_json_comparables_key(item: dict[str, Any]) -> tuple[str, str, str]:
+    """The fields ``price_item_json_comparables`` filters on, for reuse."""
+    parsed = ml_workflows._item_json_identity(item)
+    rarity = str(parsed.get("rarity") or "").strip()
+    return (
+        str(parsed.get("base_type") or "").strip(),
+        rarity,
+        str(parsed.get("item_name") or "").strip() if rarity == "Unique" else "",
+    )
+
+
+def _comparables_for_parsed(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    parsed: Mapping[str, Any],
+) -> list[dict[str, Any]]:
     base_type = str(parsed.get("base_type") or "").strip()
     if not base_type:
         return []
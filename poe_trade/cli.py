@@ -103,6 +103,17 @@ def main(argv: Sequence[str] | None = None) -> int:
     refresh_parser.add_argument(
         "--dry-run", action="store_true", help="List SQL files without executing them"
     )
+    refresh_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Refresh gold marts from their last watermark only",
+    )
+    refresh_parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=None,
+        help="Maximum concurrent refresh statements",
+    )
     rebuild_parser = subparsers.add_parser("rebuild", help="Run rebuild workflows")
     rebuild_parser.add_argument(
         "layer", choices=("silver", "gold"), help="SQL layer to rebuild"
@@ -300,6 +311,8 @@ def main(argv: Sequence[str] | None = None) -> int:
             layer=args.layer,
             group=args.group,
             dry_run=args.dry_run,
+            incremental=args.incremental,
+            max_parallel=args.parallelism or cfg.refresh_parallelism,
         )
         for sql_file in sql_files:
             print(sql_file)
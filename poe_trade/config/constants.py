@@ -49,10 +49,15 @@ DEFAULT_STASH_POLL_INTERVAL = 300.0
 DEFAULT_ENABLE_PSAPI = True
 DEFAULT_ENABLE_CXAPI = False
 DEFAULT_PSAPI_POLL_SECONDS = 30.0
+DEFAULT_PSAPI_PIPELINE_ENABLED = False
+DEFAULT_INGEST_BATCH_MAX_ROWS = 500
+DEFAULT_INGEST_BATCH_MAX_AGE_SECONDS = 2.0
 DEFAULT_CXAPI_BACKFILL_HOURS = 168
 DEFAULT_CXAPI_HOUR_OFFSET_SECONDS = 15
 DEFAULT_REFRESH_REFS_MINUTES = 5
+DEFAULT_REFRESH_PARALLELISM = 2
 DEFAULT_SCAN_MINUTES = 5
+DEFAULT_SCANNER_PACK_WORKERS = 4
 DEFAULT_RAW_PSAPI_TTL_DAYS = 21
 DEFAULT_RAW_CX_TTL_DAYS = 365
 DEFAULT_SILVER_TTL_DAYS = 90
@@ -69,10 +74,12 @@ DEFAULT_API_CORS_ORIGINS: tuple[str, ...] = ("https://poe.lama-lan.ch",)
 DEFAULT_API_TRUSTED_ORIGIN_BYPASS = False
 DEFAULT_API_MAX_BODY_BYTES = 32768
 DEFAULT_API_LEAGUE_ALLOWLIST = ("Mirage",)
+DEFAULT_API_SEARCH_SUGGESTIONS_REFRESH_SECONDS = 300.0
 DEFAULT_ENABLE_ACCOUNT_STASH = False
 DEFAULT_ACCOUNT_STASH_REALM = "pc"
 DEFAULT_ACCOUNT_STASH_LEAGUE = "Mirage"
 DEFAULT_ACCOUNT_STASH_SCAN_STALE_TIMEOUT_SECONDS = 120
+DEFAULT_ACCOUNT_STASH_PRICING_WORKERS = 4
 DEFAULT_AUTH_STATE_DIR = ".sisyphus/state/auth"
 DEFAULT_AUTH_COOKIE_NAME = "poe_session"
 DEFAULT_AUTH_COOKIE_SECURE = False
@@ -89,6 +96,11 @@ DEFAULT_ML_AUTOMATION_MAX_ITERATIONS = 1
 DEFAULT_ML_AUTOMATION_MAX_WALL_CLOCK_SECONDS = 900
 DEFAULT_ML_AUTOMATION_NO_IMPROVEMENT_PATIENCE = 2
 DEFAULT_ML_AUTOMATION_MIN_MDAPE_IMPROVEMENT = 0.005
+DEFAULT_ML_SERVING_CONTEXT_TTL_SECONDS = 300.0
+DEFAULT_ML_V3_MODEL_BACKEND = "gbr"
+DEFAULT_ML_V3_FULL_RETRAIN_HOURS = 24.0
+DEFAULT_ML_V3_WARM_START_MAX_DELTA = 0.2
+DEFAULT_ML_V3_BACKFILL_PARALLELISM = 2
 DEFAULT_POE_ENABLE_POENINJA_SNAPSHOT = True
 DEFAULT_POE_POENINJA_SNAPSHOT_LEAGUE = None
 DEFAULT_POE_ML_DATASET_REBUILD_INTERVAL_SECONDS = 3600
@@ -159,10 +159,15 @@ class Settings:
     market_poll_interval: float
     stash_poll_interval: float
     psapi_poll_seconds: float
+    psapi_pipeline_enabled: bool
+    ingest_batch_max_rows: int
+    ingest_batch_max_age_seconds: float
     cxapi_backfill_hours: int
     cxapi_hour_offset_seconds: int
     refresh_refs_minutes: int
+    refresh_parallelism: int
     scan_minutes: int
+    scanner_pack_workers: int
     raw_psapi_ttl_days: int
     raw_cx_ttl_days: int
     silver_ttl_days: int
@@ -181,11 +186,13 @@ class Settings:
     api_trusted_origin_bypass: bool
     api_max_body_bytes: int
     api_league_allowlist: tuple[str, ...]
+    api_search_suggestions_refresh_seconds: float
     enable_account_stash: bool
     account_stash_realm: str
     account_stash_league: str
     account_stash_request_timeout_seconds: float
     account_stash_scan_stale_timeout_seconds: int
+    account_stash_pricing_workers: int
     auth_state_dir: str
     auth_cookie_name: str
     auth_cookie_secure: bool
@@ -202,6 +209,11 @@ class Settings:
     ml_automation_max_wall_clock_seconds: int
     ml_automation_no_improvement_patience: int
     ml_automation_min_mdape_improvement: float
+    ml_serving_context_ttl_seconds: float
+    ml_v3_model_backend: str
+    ml_v3_full_retrain_hours: float
+    ml_v3_warm_start_max_delta: float
+    ml_v3_backfill_parallelism: int
     poe_enable_poeninja_snapshot: bool
     poe_poeninja_snapshot_league: str | None
     poe_ml_dataset_rebuild_interval_seconds: int
@@ -274,6 +286,18 @@ class Settings:
                     "POE_MARKET_POLL_INTERVAL", constants.DEFAULT_PSAPI_POLL_SECONDS
                 ),
             ),
+            psapi_pipeline_enabled=_parse_env_bool(
+                "POE_PSAPI_PIPELINE_ENABLED",
+                constants.DEFAULT_PSAPI_PIPELINE_ENABLED,
+            ),
+            ingest_batch_max_rows=_parse_env_int(
+                "POE_INGEST_BATCH_MAX_ROWS",
+                constants.DEFAULT_INGEST_BATCH_MAX_ROWS,
+            ),
+            ingest_batch_max_age_seconds=_parse_env_float(
+                "POE_INGEST_BATCH_MAX_AGE_SECONDS",
+                constants.DEFAULT_INGEST_BATCH_MAX_AGE_SECONDS,
+            ),
             cxapi_backfill_hours=_parse_env_int(
                 "POE_CXAPI_BACKFILL_HOURS",
                 constants.DEFAULT_CXAPI_BACKFILL_HOURS,
@@ -286,9 +310,16 @@ class Settings:
                 "POE_REFRESH_REFS_MINUTES",
                 constants.DEFAULT_REFRESH_REFS_MINUTES,
             ),
+            refresh_parallelism=_parse_env_int(
+                "POE_REFRESH_PARALLELISM",
+                constants.DEFAULT_REFRESH_PARALLELISM,
+            ),
             scan_minutes=_parse_env_int(
                 "POE_SCAN_MINUTES", constants.DEFAULT_SCAN_MINUTES
             ),
+            scanner_pack_workers=_parse_env_int(
+                "POE_SCANNER_PACK_WORKERS", constants.DEFAULT_SCANNER_PACK_WORKERS
+            ),
             raw_psapi_ttl_days=_parse_env_int(
                 "POE_RAW_PSAPI_TTL_DAYS", constants.DEFAULT_RAW_PSAPI_TTL_DAYS
             ),
@@ -342,6 +373,10 @@ class Settings:
             api_league_allowlist=_parse_env_list(
                 "POE_API_LEAGUE_ALLOWLIST", list(constants.DEFAULT_API_LEAGUE_ALLOWLIST)
             ),
+            api_search_suggestions_refresh_seconds=_parse_env_float(
+                "POE_API_SEARCH_SUGGESTIONS_REFRESH_SECONDS",
+                constants.DEFAULT_API_SEARCH_SUGGESTIONS_REFRESH_SECONDS,
+            ),
             enable_account_stash=_parse_env_bool(
                 "POE_ENABLE_ACCOUNT_STASH", constants.DEFAULT_ENABLE_ACCOUNT_STASH
             ),
@@ -359,6 +394,10 @@ class Settings:
                 "POE_ACCOUNT_STASH_SCAN_STALE_TIMEOUT_SECONDS",
                 constants.DEFAULT_ACCOUNT_STASH_SCAN_STALE_TIMEOUT_SECONDS,
             ),
+            account_stash_pricing_workers=_parse_env_int(
+                "POE_ACCOUNT_STASH_PRICING_WORKERS",
+                constants.DEFAULT_ACCOUNT_STASH_PRICING_WORKERS,
+            ),
             auth_state_dir=_get_env_str(
                 "POE_AUTH_STATE_DIR", constants.DEFAULT_AUTH_STATE_DIR
             ),
@@ -417,6 +456,25 @@ class Settings:
                 "POE_ML_AUTOMATION_MIN_MDAPE_IMPROVEMENT",
                 constants.DEFAULT_ML_AUTOMATION_MIN_MDAPE_IMPROVEMENT,
             ),
+            ml_serving_context_ttl_seconds=_parse_env_float(
+                "POE_ML_SERVING_CONTEXT_TTL_SECONDS",
+                constants.DEFAULT_ML_SERVING_CONTEXT_TTL_SECONDS,
+            ),
+            ml_v3_model_backend=_get_env_str(
+                "POE_ML_V3_MODEL_BACKEND", constants.DEFAULT_ML_V3_MODEL_BACKEND
+            ),
+            ml_v3_full_retrain_hours=_parse_env_float(
+                "POE_ML_V3_FULL_RETRAIN_HOURS",
+                constants.DEFAULT_ML_V3_FULL_RETRAIN_HOURS,
+            ),
+            ml_v3_warm_start_max_delta=_parse_env_float(
+                "POE_ML_V3_WARM_START_MAX_DELTA",
+                constants.DEFAULT_ML_V3_WARM_START_MAX_DELTA,
+            ),
+            ml_v3_backfill_parallelism=_parse_env_int(
+                "POE_ML_V3_BACKFILL_PARALLELISM",
+                constants.DEFAULT_ML_V3_BACKFILL_PARALLELISM,
+            ),
             poe_enable_poeninja_snapshot=_parse_env_bool(
                 "POE_ENABLE_POENINJA_SNAPSHOT",
                 constants.DEFAULT_POE_ENABLE_POENINJA_SNAPSHOT,
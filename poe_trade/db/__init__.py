@@ -1,6 +1,14 @@
 """ClickHouse helpers."""
 
+from .batched_insert import BatchedInserter
+from . import rowbinary
 from .clickhouse import ClickHouseClient, ClickHouseClientError
 from .migrations import MigrationRunner, main
 
-__all__ = ["ClickHouseClient", "ClickHouseClientError", "MigrationRunner", "main"]
+__all__ = [
+    "BatchedInserter",
+    "ClickHouseClient", "ClickHouseClientError",
+    "MigrationRunner",
+    "main",
+    "rowbinary",
+]
@@ -0,0 +1,250 @@
+"""Background, size/age-bounded JSONEachRow insert batching."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from .clickhouse import ClickHouseClient, ClickHouseClientError
+
+logger = logging.getLogger(__name__)
+
+_TableKey = tuple[str, tuple[str, ...]]
+
+_DEFAULT_CLOSE_TIMEOUT_SECONDS = 30.0
+_RETRY_BASE_DELAY_SECONDS = 1.0
+_MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+class BatchedInserter:
+    """Buffer small inserts per table and write them from one background thread.
+
+    Rows are flushed once a table buffer reaches ``max_rows`` or its oldest row
+    is ``max_age_seconds`` old. Producers block once ``max_pending_rows`` rows are
+    buffered or in flight. Retryable ClickHouse failures keep the rows buffered
+    and are retried with exponential backoff, also while ``close`` drains the
+    buffers; rows are dropped only on non-retryable errors or once the close
+    timeout runs out.
+    """
+
+    def __init__(
+        self,
+        client: ClickHouseClient,
+        *,
+        max_rows: int = 500,
+        max_age_seconds: float = 2.0,
+        max_pending_rows: int = 20_000,
+        name: str = "clickhouse-batched-insert",
+    ) -> None:
+        self._client = client
+        self._max_rows = max(1, int(max_rows))
+        self._max_age_seconds = max(0.0, float(max_age_seconds))
+        self._max_pending_rows = max(self._max_rows, int(max_pending_rows))
+        self._buffers: dict[_TableKey, list[str]] = {}
+        self._first_buffered_at: dict[_TableKey, float] = {}
+        self._retry_after: dict[_TableKey, float] = {}
+        self._failures: dict[_TableKey, int] = {}
+        self._close_deadline: float | None = None
+        self._pending_rows = 0
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def insert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Mapping[str, Any]],
+    ) -> None:
+        lines = [json.dumps(row, ensure_ascii=False) for row in rows]
+        if not lines:
+            return
+        key = (table, tuple(columns))
+        with self._cond:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                while (
+                    self._pending_rows >= self._max_pending_rows and not self._closed
+                ):
+                    self._cond.wait()
+                buffer = self._buffers.setdefault(key, [])
+                wake = not buffer or len(buffer) + len(lines) >= self._max_rows
+                if not buffer:
+                    # The writer may be sleeping without a deadline; it has to
+                    # learn about the new age deadline.
+                    self._first_buffered_at[key] = time.monotonic()
+                buffer.extend(lines)
+                self._pending_rows += len(lines)
+                if wake:
+                    self._cond.notify_all()
+        if closed:
+            self._write(key, lines)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending_rows > 0 and self._thread.is_alive():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return self._pending_rows == 0
+
+    def close(self, timeout: float | None = _DEFAULT_CLOSE_TIMEOUT_SECONDS) -> None:
+        """Flush the buffers, retrying retryable failures for up to ``timeout``.
+
+        ``None`` retries without a deadline.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            if timeout is not None:
+                self._close_deadline = time.monotonic() + max(0.0, timeout)
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "BatchedInserter":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                due = self._take_due()
+                while not due and not self._closed:
+                    self._cond.wait(self._next_wakeup())
+                    due = self._take_due()
+                if self._closed:
+                    due.extend(self._take_closing())
+                    if not due and not self._buffers:
+                        return
+            for key, lines in due:
+                if self._write(key, lines, requeue=True):
+                    self._done(len(lines))
+
+    def _take_closing(self) -> list[tuple[_TableKey, list[str]]]:
+        """Buffers to write while closing; waits out retry backoff if needed."""
+        while self._buffers:
+            now = time.monotonic()
+            if self._close_deadline is not None and now >= self._close_deadline:
+                for key, lines in self._take_all():
+                    logger.error(
+                        "Dropping %d rows for %s: close timed out", len(lines), key[0]
+                    )
+                    self._pending_rows -= len(lines)
+                self._cond.notify_all()
+                return []
+            ready = [
+                key
+                for key in self._buffers
+                if self._retry_after.get(key, 0.0) <= now
+            ]
+            if ready:
+                return [(key, self._pop(key)) for key in ready]
+            wakeup = min(self._retry_after.values()) - now
+            if self._close_deadline is not None:
+                wakeup = min(wakeup, self._close_deadline - now)
+            self._cond.wait(max(0.0, wakeup))
+        return []
+
+    def _take_due(self) -> list[tuple[_TableKey, list[str]]]:
+        now = time.monotonic()
+        force = self._flush_requested
+        self._flush_requested = False
+        due: list[tuple[_TableKey, list[str]]] = []
+        for key in list(self._buffers):
+            buffer = self._buffers[key]
+            if not buffer or self._retry_after.get(key, 0.0) > now:
+                continue
+            age = now - self._first_buffered_at.get(key, now)
+            if force or len(buffer) >= self._max_rows or age >= self._max_age_seconds:
+                due.append((key, self._pop(key)))
+        return due
+
+    def _take_all(self) -> list[tuple[_TableKey, list[str]]]:
+        return [(key, self._pop(key)) for key in list(self._buffers)]
+
+    def _pop(self, key: _TableKey) -> list[str]:
+        self._first_buffered_at.pop(key, None)
+        self._retry_after.pop(key, None)
+        return self._buffers.pop(key, [])
+
+    def _next_wakeup(self) -> float | None:
+        if not self._buffers:
+            return None
+        now = time.monotonic()
+        deadlines = [
+            max(
+                self._first_buffered_at.get(key, now) + self._max_age_seconds,
+                self._retry_after.get(key, 0.0),
+            )
+            for key, buffer in self._buffers.items()
+            if buffer
+        ]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
+
+    def _done(self, row_count: int) -> None:
+        with self._cond:
+            self._pending_rows -= row_count
+            self._cond.notify_all()
+
+    def _write(
+        self, key: _TableKey, lines: list[str], *, requeue: bool = False
+    ) -> bool:
+        table, columns = key
+        query = (
+            f"INSERT INTO {table} ({', '.join(columns)})\n"
+            "FORMAT JSONEachRow\n"
+            + "\n".join(lines)
+        )
+        try:
+            self._client.execute(query)
+        except ClickHouseClientError as exc:
+            if requeue and exc.retryable:
+                logger.warning(
+                    "Transient failure flushing %d rows to %s: %s",
+                    len(lines),
+                    table,
+                    exc,
+                )
+                self._requeue(key, lines)
+                return False
+            logger.error("Dropping %d rows for %s: %s", len(lines), table, exc)
+            if requeue:
+                self._done(len(lines))
+            return False
+        except Exception as exc:
+            logger.exception("Unexpected failure flushing rows to %s: %s", table, exc)
+            if requeue:
+                self._done(len(lines))
+            return False
+        with self._cond:
+            self._failures.pop(key, None)
+        return True
+
+    def _requeue(self, key: _TableKey, lines: list[str]) -> None:
+        with self._cond:
+            now = time.monotonic()
+            self._buffers[key] = lines + self._buffers.get(key, [])
+            self._first_buffered_at[key] = min(
+                self._first_buffered_at.get(key, now), now
+            )
+            failures = self._failures.get(key, 0)
+            self._failures[key] = failures + 1
+            delay = _RETRY_BASE_DELAY_SECONDS * 2 ** min(failures, 8)
+            self._retry_after[key] = now + min(delay, _MAX_RETRY_DELAY_SECONDS)
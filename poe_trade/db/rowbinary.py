@@ -0,0 +1,43 @@
+"""Encoders for ClickHouse's RowBinary input format."""
+
+from __future__ import annotations
+
+import struct
+from datetime import datetime, timezone
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def string(value: str | bytes) -> bytes:
+    data = value.encode("utf-8") if isinstance(value, str) else value
+    return varint(len(data)) + data
+
+
+def nullable_string(value: str | bytes | None) -> bytes:
+    if value is None:
+        return b"\x01"
+    return b"\x00" + string(value)
+
+
+def datetime64(value: datetime, precision: int = 3) -> bytes:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    ticks = (
+        delta.days * 86_400 * 10**precision
+        + delta.seconds * 10**precision
+        + delta.microseconds * 10**precision // 1_000_000
+    )
+    return struct.pack("<q", ticks)
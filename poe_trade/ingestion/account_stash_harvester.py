@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
 import re
+import threading
 import time
 import uuid
-from collections.abc import Callable, Mapping
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
@@ -26,6 +31,10 @@ from poe_trade.stash_scan import (
     price_evaluation_for_band,
     StashPrediction,
 )
+from poe_trade.stash_valuation_cache import (
+    StashValuationCache,
+    valuation_key_for_item,
+)
 
 from .poe_client import PoeClient
 from .status import StatusReporter
@@ -38,6 +47,23 @@ _PRICE_NOTE_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+_ITEM_WRITE_CHUNK_ROWS = 500
+_PROGRESS_INTERVAL_SECONDS = 5.0
+_TAB_PREFETCH_DEPTH = 2
+_FETCH_DONE = object()
+
+PriceItems = Callable[[list[dict[str, Any]]], list[dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class _PendingTab:
+    tab_number: int
+    tab_meta: dict[str, Any]
+    tab_index: int
+    item_count: int
+    items: list[dict[str, Any]]
+    tab_row: dict[str, Any]
+
 _PRIVATE_STASH_ITEMS_URL = (
     "https://www.pathofexile.com/character-window/get-stash-items"
 )
@@ -66,7 +92,10 @@ class AccountStashHarvester:
         access_token: str | None = None,
         refresh_access_token: Callable[[], str | None] | None = None,
         price_item: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+        price_items: PriceItems | None = None,
         request_headers: Mapping[str, str] | None = None,
+        valuation_cache: StashValuationCache | None = None,
+        pricing_workers: int = constants.DEFAULT_ACCOUNT_STASH_PRICING_WORKERS,
     ) -> None:
         self._client = client
         self._clickhouse = clickhouse
@@ -76,7 +105,10 @@ class AccountStashHarvester:
         self._access_token = access_token.strip() if access_token else ""
         self._refresh_access_token = refresh_access_token
         self._price_item = price_item
+        self._price_items = price_items
         self._request_headers = dict(request_headers or {})
+        self._valuation_cache = valuation_cache
+        self._pricing_workers = max(1, int(pricing_workers))
 
     def run(
         self,
@@ -99,9 +131,15 @@ class AccountStashHarvester:
         realm: str,
         league: str,
         price_item: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+        price_items: PriceItems | None = None,
         scan_id: str | None = None,
         started_at: str | None = None,
     ) -> dict[str, Any]:
+        """Fetch, price and publish every tab of the account's stash.
+
+        ``price_items`` prices a whole tab in one call, so the model runs a
+        few matrix predicts per tab; ``price_item`` is the per-item fallback.
+        """
         account_name = self._account_name.strip()
         if not account_name:
             raise ValueError("account_name is required for private stash scans")
@@ -139,14 +177,32 @@ class AccountStashHarvester:
         tabs_processed = 0
         items_processed = 0
         items_total = 0
-        effective_price_item = (
-            price_item if price_item is not None else self._price_item
-        )
-        pending_scan_item_rows: list[dict[str, Any]] = []
-        pending_normalized_item_rows: list[dict[str, Any]] = []
+        if price_item is None and price_items is None:
+            price_item, price_items = self._price_item, self._price_items
+        effective_price_items = price_items
+        effective_price_item = price_item if price_items is None else None
+        valuation_cache = self._valuation_cache
+        if valuation_cache is not None and effective_price_items is not None:
+            effective_price_items = valuation_cache.wrap_batch(effective_price_items)
+        if valuation_cache is not None and effective_price_item is not None:
+            effective_price_item = valuation_cache.wrap(effective_price_item)
+        # v2 scan rows stream out in chunks; readers only see them through the
+        # published scan id. Item history is read across scans, so its rows are
+        # held and written in one insert right before the publish marker, and
+        # legacy valuation rows wait for the marker itself.
+        pending_item_rows: list[dict[str, Any]] = []
+        pending_history_rows: list[dict[str, Any]] = []
         pending_legacy_item_rows: list[dict[str, Any]] = []
         terminal_state: tuple[str, str, str] | None = None
         terminal_written = False
+        price_pool: ThreadPoolExecutor | None = None
+
+        def _flush_item_rows() -> None:
+            if not pending_item_rows:
+                return
+            self._write_scan_item_rows(pending_item_rows)
+            pending_history_rows.extend(pending_item_rows)
+            pending_item_rows.clear()
 
         def _finalize_scan_state(
             *,
@@ -218,8 +274,41 @@ class AccountStashHarvester:
                     )
             return ok
 
+        def _log_pricing_failure() -> None:
+            logger.exception(
+                "Valuation lookup failed account=%s realm=%s league=%s",
+                account_name,
+                realm,
+                league,
+            )
+
+        def _price_one(raw_item: dict[str, Any]) -> Any:
+            if effective_price_item is None:
+                return None
+            try:
+                return effective_price_item(raw_item)
+            except Exception:
+                _log_pricing_failure()
+                return None
+
+        def _price_tab_items(tab_items: list[dict[str, Any]]) -> list[Any]:
+            if effective_price_items is not None:
+                try:
+                    return _batch_price_payloads(effective_price_items, tab_items)
+                except Exception:
+                    _log_pricing_failure()
+                    return [None] * len(tab_items)
+            if effective_price_item is None:
+                return [None] * len(tab_items)
+            if price_pool is not None:
+                return list(price_pool.map(_price_one, tab_items))
+            return [_price_one(raw_item) for raw_item in tab_items]
+
         def _build_item_row(
-            tab: dict[str, Any], tab_index: int, raw_item: dict[str, Any]
+            tab: dict[str, Any],
+            tab_index: int,
+            raw_item: dict[str, Any],
+            price_payload: Any,
         ) -> tuple[dict[str, Any], dict[str, Any]]:
             listed = parse_listed_price(str(raw_item.get("note") or "")) or parse_listed_price(
                 str(tab.get("name") or "")
@@ -227,30 +316,10 @@ class AccountStashHarvester:
             listed_price = listed[0] if listed else None
             listed_currency = str(listed[1] if listed else "chaos")
             prediction = _fallback_prediction(currency=listed_currency)
-            if effective_price_item is not None:
-                try:
-                    price_payload = effective_price_item(raw_item)
-                    if _has_concrete_prediction(price_payload):
-                        prediction = normalize_stash_prediction(price_payload)
-                    elif isinstance(price_payload, dict):
-                        prediction = StashPrediction(
-                            predicted_price=prediction.predicted_price,
-                            currency=str(price_payload.get("currency") or prediction.currency),
-                            confidence=prediction.confidence,
-                            price_p10=prediction.price_p10,
-                            price_p90=prediction.price_p90,
-                            price_recommendation_eligible=prediction.price_recommendation_eligible,
-                            estimate_trust=prediction.estimate_trust,
-                            estimate_warning=prediction.estimate_warning,
-                            fallback_reason=prediction.fallback_reason,
-                        )
-                except Exception:
-                    logger.exception(
-                        "Valuation lookup failed account=%s realm=%s league=%s",
-                        account_name,
-                        realm,
-                        league,
-                    )
+            try:
+                prediction = _prediction_from_payload(price_payload, prediction)
+            except Exception:
+                _log_pricing_failure()
             estimated_currency = str(prediction.currency or listed_currency or "chaos")
             listed_price_chaos = normalize_chaos_price(
                 listed_price,
@@ -380,6 +449,45 @@ class AccountStashHarvester:
             }
             return normalized_row, legacy_row
 
+        last_progress_at: float | None = None
+
+        def _finish_tab(pending_tab: _PendingTab, price_payloads: list[Any]) -> None:
+            nonlocal items_processed, tabs_processed, last_progress_at
+            for raw_item, price_payload in zip(pending_tab.items, price_payloads):
+                normalized_row, legacy_row = _build_item_row(
+                    pending_tab.tab_meta, pending_tab.tab_index, raw_item, price_payload
+                )
+                pending_item_rows.append(normalized_row)
+                pending_legacy_item_rows.append(legacy_row)
+            self._write_scan_tabs([pending_tab.tab_row])
+            if len(pending_item_rows) >= _ITEM_WRITE_CHUNK_ROWS:
+                _flush_item_rows()
+            items_processed += pending_tab.item_count
+            tabs_processed = pending_tab.tab_number
+            now = time.monotonic()
+            if (
+                last_progress_at is None
+                or now - last_progress_at >= _PROGRESS_INTERVAL_SECONDS
+            ):
+                last_progress_at = now
+                self._write_scan_run(
+                    scan_id=effective_scan_id,
+                    status="running",
+                    account_name=account_name,
+                    league=league,
+                    realm=realm,
+                    started_at=effective_started_at,
+                    updated_at=_timestamp_utc(),
+                    completed_at=None,
+                    published_at=None,
+                    failed_at=None,
+                    tabs_total=tabs_total,
+                    tabs_processed=pending_tab.tab_number,
+                    items_total=items_total,
+                    items_processed=items_processed,
+                    error_message="",
+                )
+
         try:
             self._set_bearer_token()
             tabs_payload = self._request_account_stash(
@@ -394,19 +502,21 @@ class AccountStashHarvester:
             )
             tabs = _ordered_private_tabs_from_payload(tabs_payload)
             tabs_total = len(tabs)
-
-            for tab_number, tab in enumerate(tabs, start=1):
-                tab_index = int(tab.get("tab_index") or 0)
-                payload = self._request_account_stash(
-                    stash_endpoint(realm, league, tab_id=str(tab.get("id") or "")),
-                    params=_private_stash_params(
-                        account_name=account_name,
-                        realm=realm,
-                        league=league,
-                        tabs="0",
-                        tab_index=str(tab_index),
-                    ),
+            if self._pricing_workers > 1 and (
+                effective_price_items is not None or effective_price_item is not None
+            ):
+                price_pool = ThreadPoolExecutor(
+                    max_workers=self._pricing_workers,
+                    thread_name_prefix="stash-pricing",
                 )
+            # A batch pricer scores a whole tab per pool task, so the next tabs
+            # are fetched and earlier ones written while it runs; tabs finish
+            # in order. Per-item pricers fan a tab's items out over the pool.
+            pricing_tabs: deque[tuple[Future[list[Any]], _PendingTab]] = deque()
+
+            for tab_number, tab, tab_index, payload in self._prefetch_private_tabs(
+                account_name=account_name, realm=realm, league=league, tabs=tabs
+            ):
                 current_tab_row = {
                     "scan_id": effective_scan_id,
                     "account_name": account_name,
@@ -425,38 +535,34 @@ class AccountStashHarvester:
                 raw_items = stash_body.get("items")
                 items = raw_items if isinstance(raw_items, list) else []
                 items_total += len(items)
-                for raw_item in items:
-                    if not isinstance(raw_item, dict):
-                        continue
-                    normalized_row, legacy_row = _build_item_row(
-                        dict(tab), tab_index, raw_item
+                tab_items = [item for item in items if isinstance(item, dict)]
+                if valuation_cache is not None:
+                    valuation_cache.prefetch(
+                        valuation_key_for_item(raw_item) for raw_item in tab_items
                     )
-                    pending_scan_item_rows.append(normalized_row)
-                    pending_normalized_item_rows.append(normalized_row)
-                    pending_legacy_item_rows.append(legacy_row)
-                self._write_scan_tabs([current_tab_row])
-                items_processed += len(items)
-                self._write_scan_run(
-                    scan_id=effective_scan_id,
-                    status="running",
-                    account_name=account_name,
-                    league=league,
-                    realm=realm,
-                    started_at=effective_started_at,
-                    updated_at=_timestamp_utc(),
-                    completed_at=None,
-                    published_at=None,
-                    failed_at=None,
-                    tabs_total=tabs_total,
-                    tabs_processed=tab_number,
-                    items_total=items_total,
-                    items_processed=items_processed,
-                    error_message="",
+                pending_tab = _PendingTab(
+                    tab_number=tab_number,
+                    tab_meta=dict(tab),
+                    tab_index=tab_index,
+                    item_count=len(items),
+                    items=tab_items,
+                    tab_row=current_tab_row,
                 )
-                tabs_processed = tab_number
-
-            self._write_scan_item_rows(pending_scan_item_rows)
-            self._write_scan_item_history_v2(pending_normalized_item_rows)
+                if price_pool is not None and effective_price_items is not None:
+                    pricing_tabs.append(
+                        (price_pool.submit(_price_tab_items, tab_items), pending_tab)
+                    )
+                    while len(pricing_tabs) > self._pricing_workers:
+                        future, priced_tab = pricing_tabs.popleft()
+                        _finish_tab(priced_tab, future.result())
+                else:
+                    _finish_tab(pending_tab, _price_tab_items(tab_items))
+            while pricing_tabs:
+                future, priced_tab = pricing_tabs.popleft()
+                _finish_tab(priced_tab, future.result())
+
+            _flush_item_rows()
+            self._write_scan_item_history_v2(pending_history_rows)
             published_at = _timestamp_utc()
             published_finalized = _finalize_scan_state(
                 status="published",
@@ -520,6 +626,10 @@ class AccountStashHarvester:
                 "error": error_message,
             }
         finally:
+            if price_pool is not None:
+                price_pool.shutdown(wait=True)
+            if valuation_cache is not None:
+                valuation_cache.flush()
             if terminal_state is not None and not terminal_written:
                 status, terminal_at, error_message = terminal_state
                 _finalize_scan_state(
@@ -528,6 +638,70 @@ class AccountStashHarvester:
                     error_message=error_message,
                 )
 
+    def _prefetch_private_tabs(
+        self,
+        *,
+        account_name: str,
+        realm: str,
+        league: str,
+        tabs: list[dict[str, Any]],
+    ) -> Iterator[tuple[int, dict[str, Any], int, Any]]:
+        """Yield tab payloads in order while the next tabs are fetched ahead.
+
+        A single fetch thread keeps requests sequential, so the client's
+        rate-limit pacing still applies; the bounded queue caps read-ahead.
+        """
+        fetched: queue.Queue[Any] = queue.Queue(maxsize=_TAB_PREFETCH_DEPTH)
+        stop = threading.Event()
+
+        def _offer(entry: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    fetched.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _fetch() -> None:
+            try:
+                for tab_number, tab in enumerate(tabs, start=1):
+                    if stop.is_set():
+                        return
+                    tab_index = int(tab.get("tab_index") or 0)
+                    payload = self._request_account_stash(
+                        stash_endpoint(realm, league, tab_id=str(tab.get("id") or "")),
+                        params=_private_stash_params(
+                            account_name=account_name,
+                            realm=realm,
+                            league=league,
+                            tabs="0",
+                            tab_index=str(tab_index),
+                        ),
+                    )
+                    if not _offer((tab_number, tab, tab_index, payload)):
+                        return
+            except Exception as exc:
+                _offer(exc)
+                return
+            _offer(_FETCH_DONE)
+
+        fetcher = threading.Thread(
+            target=_fetch, name="stash-tab-fetch", daemon=True
+        )
+        fetcher.start()
+        try:
+            while True:
+                entry = fetched.get()
+                if entry is _FETCH_DONE:
+                    return
+                if isinstance(entry, Exception):
+                    raise entry
+                yield entry
+        finally:
+            stop.set()
+            fetcher.join()
+
     def _harvest(self, *, realm: str, league: str, dry_run: bool) -> None:
         key = queue_key(FEED_KIND_ACCOUNT_STASH, realm)
         started = time.monotonic()
@@ -897,6 +1071,8 @@ def run_persisted_valuation_refresh(
     scan_id: str | None = None,
     started_at: str | None = None,
     price_item: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    price_items: PriceItems | None = None,
+    valuation_cache: StashValuationCache | None = None,
 ) -> dict[str, Any]:
     policy = RateLimitPolicy(0, 0.0, 0.0, 0.0)
     poe_client = PoeClient("http://poe.invalid", policy, "ua", 1.0)
@@ -931,7 +1107,12 @@ def run_persisted_valuation_refresh(
 
     effective_scan_id = scan_id or uuid.uuid4().hex
     effective_started_at = started_at or _timestamp_utc()
-    effective_price_item = price_item
+    effective_price_items = price_items
+    effective_price_item = price_item if price_items is None else None
+    if valuation_cache is not None and effective_price_items is not None:
+        effective_price_items = valuation_cache.wrap_batch(effective_price_items)
+    if valuation_cache is not None and effective_price_item is not None:
+        effective_price_item = valuation_cache.wrap(effective_price_item)
 
     def _load_rows(query: str) -> list[dict[str, Any]]:
         try:
@@ -1170,11 +1351,38 @@ def run_persisted_valuation_refresh(
                 "tab_type": row.get("tab_type") or "normal",
             }
 
+        def _log_pricing_failure() -> None:
+            logger.exception(
+                "Persisted valuation lookup failed account=%s realm=%s league=%s",
+                account_name,
+                realm,
+                league,
+            )
+
+        def _price_chunk(chunk: list[dict[str, Any]]) -> list[Any]:
+            if effective_price_items is not None:
+                try:
+                    return _batch_price_payloads(effective_price_items, chunk)
+                except Exception:
+                    _log_pricing_failure()
+                    return [None] * len(chunk)
+            payloads: list[Any] = []
+            for raw_item in chunk:
+                payload = None
+                if effective_price_item is not None:
+                    try:
+                        payload = effective_price_item(raw_item)
+                    except Exception:
+                        _log_pricing_failure()
+                payloads.append(payload)
+            return payloads
+
         def _build_item_rows(
             tab: dict[str, Any],
             tab_index: int,
             raw_item: dict[str, Any],
             source_row: dict[str, Any],
+            price_payload: Any,
         ) -> tuple[dict[str, Any], dict[str, Any]]:
             listed = parse_listed_price(str(raw_item.get("note") or "")) or parse_listed_price(
                 str(tab.get("tab_name") or tab.get("name") or "")
@@ -1191,30 +1399,10 @@ def run_persisted_valuation_refresh(
             ).strip().lower()
 
             prediction = _fallback_prediction(currency=listed_currency)
-            if effective_price_item is not None:
-                try:
-                    price_payload = effective_price_item(raw_item)
-                    if _has_concrete_prediction(price_payload):
-                        prediction = normalize_stash_prediction(price_payload)
-                    elif isinstance(price_payload, dict):
-                        prediction = StashPrediction(
-                            predicted_price=prediction.predicted_price,
-                            currency=str(price_payload.get("currency") or prediction.currency),
-                            confidence=prediction.confidence,
-                            price_p10=prediction.price_p10,
-                            price_p90=prediction.price_p90,
-                            price_recommendation_eligible=prediction.price_recommendation_eligible,
-                            estimate_trust=prediction.estimate_trust,
-                            estimate_warning=prediction.estimate_warning,
-                            fallback_reason=prediction.fallback_reason,
-                        )
-                except Exception:
-                    logger.exception(
-                        "Persisted valuation lookup failed account=%s realm=%s league=%s",
-                        account_name,
-                        realm,
-                        league,
-                    )
+            try:
+                prediction = _prediction_from_payload(price_payload, prediction)
+            except Exception:
+                _log_pricing_failure()
 
             predicted_currency = str(
                 prediction.currency
@@ -1370,13 +1558,29 @@ def run_persisted_valuation_refresh(
             }
             return normalized_row, legacy_row
 
+        raw_items: list[dict[str, Any]] = []
         for source_row in item_rows:
             raw_item = _load_payload_json(source_row.get("payload_json"))
-            if not isinstance(raw_item, dict):
-                raw_item = {}
+            raw_items.append(raw_item if isinstance(raw_item, dict) else {})
+        if valuation_cache is not None:
+            valuation_cache.prefetch(
+                valuation_key_for_item(raw_item) for raw_item in raw_items
+            )
+
+        price_payloads: list[Any] = []
+        for start in range(0, len(raw_items), _ITEM_WRITE_CHUNK_ROWS):
+            price_payloads.extend(
+                _price_chunk(raw_items[start : start + _ITEM_WRITE_CHUNK_ROWS])
+            )
+
+        for source_row, raw_item, price_payload in zip(
+            item_rows, raw_items, price_payloads
+        ):
             tab = _item_row_tab(source_row)
             tab_index = int(source_row.get("tab_index") or tab.get("tab_index") or 0)
-            normalized_row, legacy_row = _build_item_rows(tab, tab_index, raw_item, source_row)
+            normalized_row, legacy_row = _build_item_rows(
+                tab, tab_index, raw_item, source_row, price_payload
+            )
             pending_scan_item_rows.append(normalized_row)
             pending_normalized_item_rows.append(normalized_row)
             pending_legacy_item_rows.append(legacy_row)
@@ -1448,6 +1652,8 @@ def run_persisted_valuation_refresh(
             "error": error_message,
         }
     finally:
+        if valuation_cache is not None:
+            valuation_cache.flush()
         if terminal_state is not None and not terminal_written:
             status, terminal_at, error_message = terminal_state
             _finalize_refresh_state(
@@ -1532,6 +1738,39 @@ def _has_concrete_prediction(payload: Mapping[str, Any]) -> bool:
     return isinstance(price_p50, (int, float))
 
 
+def _batch_price_payloads(
+    price_items: PriceItems, raw_items: list[dict[str, Any]]
+) -> list[Any]:
+    if not raw_items:
+        return []
+    payloads = list(price_items(raw_items))
+    if len(payloads) != len(raw_items):
+        raise ValueError(
+            f"price_items returned {len(payloads)} payloads for {len(raw_items)} items"
+        )
+    return payloads
+
+
+def _prediction_from_payload(
+    price_payload: Any, fallback: StashPrediction
+) -> StashPrediction:
+    if not isinstance(price_payload, dict):
+        return fallback
+    if _has_concrete_prediction(price_payload):
+        return normalize_stash_prediction(price_payload)
+    return StashPrediction(
+        predicted_price=fallback.predicted_price,
+        currency=str(price_payload.get("currency") or fallback.currency),
+        confidence=fallback.confidence,
+        price_p10=fallback.price_p10,
+        price_p90=fallback.price_p90,
+        price_recommendation_eligible=fallback.price_recommendation_eligible,
+        estimate_trust=fallback.estimate_trust,
+        estimate_warning=fallback.estimate_warning,
+        fallback_reason=fallback.fallback_reason,
+    )
+
+
 def _fallback_prediction(*, currency: str) -> StashPrediction:
     return StashPrediction(
         predicted_price=0.0,
@@ -6,17 +6,21 @@ import hashlib
 import json
 import logging
 import os
+import queue
 import re
 import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Callable, Iterable, Mapping
 
 from ..config import constants
-from ..db import ClickHouseClient, ClickHouseClientError
+from ..db import BatchedInserter, ClickHouseClient, ClickHouseClientError, rowbinary
+from ..db.clickhouse import supports_native_io
 from .poe_client import PoeClient
 from .rate_limit import RateLimitPolicy, glean_rate_limit, parse_retry_after
+from .stash_page import parse_stash_page
 from .status import StatusReporter
 from .sync_contract import queue_key
 from .sync_state import SyncStateStore
@@ -29,6 +33,56 @@ _CHECKPOINT_LAG_THRESHOLD_SECONDS = 300  # 5 minutes
 _DIVINES_ESTIMATE_BASE = 5.0
 _DIVINES_PENALTY_PER_SECOND = 0.01
 _PSAPI_CURSOR_PATTERN = re.compile(r"^\d+(?:-\d+)*$")
+_RAW_PAGES_TABLE = "poe_trade.raw_public_stash_pages"
+_RAW_PAGES_COLUMNS = (
+    "ingested_at",
+    "realm",
+    "league",
+    "stash_id",
+    "checkpoint",
+    "next_change_id",
+    "payload_json",
+)
+_CHECKPOINT_TABLE = "poe_trade.bronze_ingest_checkpoints"
+_CHECKPOINT_COLUMNS = (
+    "service",
+    "queue_key",
+    "feed_kind",
+    "contract_version",
+    "realm",
+    "league",
+    "endpoint",
+    "last_cursor_id",
+    "next_cursor_id",
+    "cursor_hash",
+    "retrieved_at",
+    "retry_count",
+    "status",
+    "error",
+    "http_status",
+    "response_ms",
+)
+_PIPELINE_QUEUE_SIZE = 4
+_PIPELINE_IDLE_WAIT_SECONDS = 1.0
+_REQUEST_TABLE = "poe_trade.bronze_requests"
+_REQUEST_COLUMNS = (
+    "requested_at",
+    "service",
+    "queue_key",
+    "feed_kind",
+    "contract_version",
+    "realm",
+    "league",
+    "endpoint",
+    "http_method",
+    "status",
+    "attempts",
+    "response_ms",
+    "rate_limit_raw",
+    "rate_limit_parsed",
+    "retry_after_seconds",
+    "error",
+)
 
 
 class OAuthToken:
@@ -119,6 +173,29 @@ def oauth_client_factory(settings: Any) -> OAuthClient:
     )
 
 
+@dataclass(frozen=True)
+class _FetchedPage:
+    cursor: str | None
+    next_change_id: str
+    payload: dict[str, Any]
+    fetched_at: datetime
+    http_status: int
+    response_ms: float
+    attempts: int
+
+
+@dataclass(frozen=True)
+class _FetchFailure:
+    cursor: str | None
+    fetched_at: datetime
+    status: str
+    error: str
+    http_status: int
+    response_ms: float
+    attempts: int
+    headers: Mapping[str, str]
+
+
 class MarketHarvester:
     def __init__(
         self,
@@ -131,6 +208,7 @@ class MarketHarvester:
         bootstrap_until_league: str | None = None,
         bootstrap_from_beginning: bool = False,
         cursor_file_path: str | None = None,
+        inserter: BatchedInserter | None = None,
     ) -> None:
         self._client = client
         self._auth_client = auth_client
@@ -141,6 +219,9 @@ class MarketHarvester:
         self._error_counts: dict[str, int] = {}
         self._stalled_since: dict[str, datetime] = {}
         self._paused_until: dict[str, datetime] = {}
+        self._inserter = inserter
+        # Cursors whose checkpoint rows are still buffered in the inserter.
+        self._queued_cursors: dict[str, str] = {}
         self._lock = threading.Lock()
         self._service_name = service_name
         self._bootstrap_until_league = bootstrap_until_league
@@ -154,6 +235,9 @@ class MarketHarvester:
         self._cursor_file: Path | None = (
             Path(resolved_cursor_file).expanduser() if resolved_cursor_file else None
         )
+        register_parser = getattr(client, "register_payload_parser", None)
+        if callable(register_parser):
+            register_parser(constants.DEFAULT_POE_STASH_API_PATH, parse_stash_page)
 
     def _ensure_token(self) -> None:
         if self._token is None or self._token.is_expired():
@@ -219,7 +303,9 @@ class MarketHarvester:
         return _PSAPI_CURSOR_PATTERN.fullmatch(cursor) is not None
 
     def _resolve_start_cursor(self, key: str) -> str | None:
-        checkpoint_cursor = self._sync_state.latest_cursor(key)
+        with self._lock:
+            queued_cursor = self._queued_cursors.get(key)
+        checkpoint_cursor = queued_cursor or self._sync_state.latest_cursor(key)
         file_cursor = self._cursor_from_file()
         if file_cursor and file_cursor != checkpoint_cursor:
             logger.info(
@@ -245,6 +331,24 @@ class MarketHarvester:
             return [entry for entry in entries if isinstance(entry, Mapping)]
         return []
 
+    def _payload_entries_with_raw(
+        self, payload: Mapping[str, Any]
+    ) -> list[tuple[Mapping[str, Any], str | None]]:
+        raw_stashes = getattr(payload, "raw_stashes", None)
+        stashes = payload.get("stashes")
+        if (
+            not payload.get("tabs")
+            and isinstance(stashes, list)
+            and raw_stashes is not None
+            and len(raw_stashes) == len(stashes)
+        ):
+            return [
+                (entry, raw_entry)
+                for entry, raw_entry in zip(stashes, raw_stashes)
+                if isinstance(entry, Mapping)
+            ]
+        return [(entry, None) for entry in self._payload_entries(payload)]
+
     @staticmethod
     def _entry_league(entry: Mapping[str, Any]) -> str | None:
         league = entry.get("league")
@@ -266,7 +370,7 @@ class MarketHarvester:
 
         seen_stash_ids: set[str] = set()  # Add this back for deduplication
 
-        for entry in self._payload_entries(payload):
+        for entry, raw_entry in self._payload_entries_with_raw(payload):
             # De-duplication check: if a stash_id is encountered multiple times in the same page, only process it once.
             stash_id_value = (
                 entry.get("id") or entry.get("stash_id") or entry.get("tab_id")
@@ -306,7 +410,9 @@ class MarketHarvester:
                     "league": entry_league,
                     "tab_id": tab_id,
                     "next_change_id": next_change_id or "",
-                    "payload_json": json.dumps(entry, ensure_ascii=False),
+                    "payload_json": raw_entry
+                    if raw_entry is not None
+                    else json.dumps(entry, ensure_ascii=False),
                 }
             )
         return rows
@@ -714,6 +820,283 @@ class MarketHarvester:
                 self._persist_cursor_file(next_change_id or cursor)
                 self._maybe_log_checkpoint_lag(key, checkpoint_lag_seconds)
 
+    def harvest_pipelined(
+        self,
+        realm: str,
+        *,
+        dry_run: bool,
+        stop_event: threading.Event,
+        queue_size: int = _PIPELINE_QUEUE_SIZE,
+        idle_wait: float = _PIPELINE_IDLE_WAIT_SECONDS,
+    ) -> None:
+        """Fetch pages on a background thread and commit them in order here.
+
+        A cursor is only checkpointed after its page has been written, so
+        pages still queued when the pipeline stops are simply re-fetched.
+        """
+        if self._bootstrap_until_league:
+            self._harvest(realm, self._bootstrap_until_league, dry_run)
+            return
+        key = self._queue_key(realm)
+        endpoint = self._public_stash_endpoint(realm)
+        halt = threading.Event()
+        pages: queue.Queue[_FetchedPage | _FetchFailure | None] = queue.Queue(
+            maxsize=max(1, queue_size)
+        )
+        fetcher = threading.Thread(
+            target=self._fetch_pages,
+            kwargs={
+                "key": key,
+                "endpoint": endpoint,
+                "pages": pages,
+                "should_stop": lambda: stop_event.is_set() or halt.is_set(),
+                "idle_wait": idle_wait,
+            },
+            name=f"psapi-fetch-{realm}",
+            daemon=True,
+        )
+        fetcher.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is None:
+                    break
+                if isinstance(item, _FetchFailure):
+                    self._record_fetch_failure(
+                        item, realm=realm, key=key, endpoint=endpoint, dry_run=dry_run
+                    )
+                    continue
+                try:
+                    self._commit_page(
+                        item, realm=realm, key=key, endpoint=endpoint, dry_run=dry_run
+                    )
+                except Exception:
+                    logger.exception("MarketHarvester commit failed for %s", key)
+                    break
+        finally:
+            halt.set()
+            while fetcher.is_alive():
+                try:
+                    pages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            fetcher.join()
+
+    def _fetch_pages(
+        self,
+        *,
+        key: str,
+        endpoint: str,
+        pages: "queue.Queue[_FetchedPage | _FetchFailure | None]",
+        should_stop: Callable[[], bool],
+        idle_wait: float,
+    ) -> None:
+        def _put(item: _FetchedPage | _FetchFailure | None) -> bool:
+            while True:
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    if item is not None and should_stop():
+                        return False
+
+        def _wait(seconds: float) -> None:
+            deadline = time.monotonic() + max(0.0, seconds)
+            while not should_stop() and time.monotonic() < deadline:
+                time.sleep(min(0.1, deadline - time.monotonic()))
+
+        try:
+            cursor = self._resolve_start_cursor(key)
+            while not should_stop():
+                now = datetime.now(timezone.utc)
+                paused_until = self._active_pause_until(key, now)
+                if paused_until is not None:
+                    _wait((paused_until - now).total_seconds())
+                    continue
+                response_status = 0
+                response_ms = 0.0
+                attempts = 0
+                try:
+                    self._ensure_token()
+                    response = self._client.request_with_metadata(
+                        "GET", endpoint, params=self._build_request_params(cursor)
+                    )
+                    response_status = response.status_code
+                    response_ms = response.duration_ms
+                    attempts = response.attempts
+                    if response_status == 429:
+                        retry_after = self._pause_after_rate_limit(
+                            key, response.headers, now
+                        )
+                        _put(
+                            _FetchFailure(
+                                cursor=cursor,
+                                fetched_at=now,
+                                status="rate_limited",
+                                error=f"rate_limited: retry_after_seconds={retry_after:.1f}",
+                                http_status=429,
+                                response_ms=response_ms,
+                                attempts=attempts,
+                                headers=response.headers,
+                            )
+                        )
+                        continue
+                    payload = response.payload
+                    if not isinstance(payload, dict):
+                        raise ValueError(f"Unexpected stash payload: {payload}")
+                    next_change_id, _ = self._validate_payload(payload, key)
+                except Exception as exc:
+                    status_code = self._extract_http_status(exc)
+                    status_text = "error"
+                    if status_code == 429:
+                        response_status = 429
+                        retry_after = self._pause_after_rate_limit(key, {}, now)
+                        status_text = "rate_limited"
+                    logger.warning("MarketHarvester fetch failed for %s: %s", key, exc)
+                    _put(
+                        _FetchFailure(
+                            cursor=cursor,
+                            fetched_at=now,
+                            status=status_text,
+                            error=str(exc),
+                            http_status=response_status,
+                            response_ms=response_ms,
+                            attempts=attempts or self._client.last_attempts,
+                            headers={},
+                        )
+                    )
+                    if status_code != 429:
+                        _wait(idle_wait)
+                    continue
+                if not _put(
+                    _FetchedPage(
+                        cursor=cursor,
+                        next_change_id=next_change_id,
+                        payload=payload,
+                        fetched_at=now,
+                        http_status=response_status,
+                        response_ms=response_ms,
+                        attempts=attempts,
+                    )
+                ):
+                    break
+                if next_change_id == cursor:
+                    _wait(idle_wait)
+                cursor = next_change_id
+        finally:
+            _put(None)
+
+    def _commit_page(
+        self,
+        page: _FetchedPage,
+        *,
+        realm: str,
+        key: str,
+        endpoint: str,
+        dry_run: bool,
+    ) -> None:
+        status_text = "success"
+        if page.cursor and page.next_change_id == page.cursor:
+            status_text = "idle" if not page.payload.get("stashes") else "stale cursor"
+        else:
+            rows = self._rows(page.payload, page.fetched_at, realm=realm)
+            if rows and not dry_run:
+                self._write(rows, checkpoint=page.cursor or "")
+        with self._lock:
+            self._error_counts[key] = 0
+            self._stalled_since.pop(key, None)
+        self._status.report(
+            queue_key=key,
+            feed_kind=constants.FEED_KIND_PSAPI,
+            contract_version=self._contract_version(),
+            league=None,
+            realm=realm,
+            cursor=page.cursor,
+            next_change_id=page.next_change_id,
+            last_ingest_at=page.fetched_at,
+            request_rate=1000.0 / max(page.response_ms, 1.0),
+            status=status_text,
+            error=None,
+            error_count=0,
+            stalled_since=None,
+        )
+        if not dry_run:
+            self._write_checkpoint_entry(
+                queue_key_value=key,
+                feed_kind=constants.FEED_KIND_PSAPI,
+                realm=realm,
+                league=None,
+                endpoint=endpoint,
+                last_cursor=page.cursor,
+                next_cursor=page.next_change_id,
+                retrieved_at=page.fetched_at,
+                status=status_text,
+                error=None,
+                http_status=page.http_status,
+                response_ms=page.response_ms,
+                attempts=page.attempts,
+            )
+            self._persist_cursor_file(page.next_change_id)
+
+    def _record_fetch_failure(
+        self,
+        failure: _FetchFailure,
+        *,
+        realm: str,
+        key: str,
+        endpoint: str,
+        dry_run: bool,
+    ) -> None:
+        with self._lock:
+            self._error_counts[key] = self._error_counts.get(key, 0) + 1
+            self._stalled_since.setdefault(key, failure.fetched_at)
+        if failure.http_status == 429 and not dry_run:
+            self._write_request_entry(
+                queue_key_value=key,
+                feed_kind=constants.FEED_KIND_PSAPI,
+                realm=realm,
+                league=None,
+                endpoint=endpoint,
+                http_method="GET",
+                requested_at=failure.fetched_at,
+                status=429,
+                attempts=failure.attempts,
+                response_ms=failure.response_ms,
+                headers=failure.headers,
+                error=failure.error,
+            )
+        self._status.report(
+            queue_key=key,
+            feed_kind=constants.FEED_KIND_PSAPI,
+            contract_version=self._contract_version(),
+            league=None,
+            realm=realm,
+            cursor=failure.cursor,
+            next_change_id=None,
+            last_ingest_at=failure.fetched_at,
+            request_rate=0.0,
+            status=failure.status,
+            error=failure.error,
+            error_count=self._error_counts.get(key, 0),
+            stalled_since=self._stalled_since.get(key),
+        )
+        if not dry_run:
+            self._write_checkpoint_entry(
+                queue_key_value=key,
+                feed_kind=constants.FEED_KIND_PSAPI,
+                realm=realm,
+                league=None,
+                endpoint=endpoint,
+                last_cursor=failure.cursor,
+                next_cursor=None,
+                retrieved_at=failure.fetched_at,
+                status=failure.status,
+                error=failure.error,
+                http_status=failure.http_status,
+                response_ms=failure.response_ms,
+                attempts=failure.attempts,
+            )
+
     def _validate_payload(
         self, payload: dict[str, Any], key: str
     ) -> tuple[str, list[dict[str, Any]]]:
@@ -744,18 +1127,51 @@ class MarketHarvester:
                     "payload_json": row.get("payload_json") or "",
                 }
             )
+        if supports_native_io(self._clickhouse):
+            data = self._encode_raw_page_rows(normalized_rows)
+            if data is not None:
+                self._clickhouse.insert_binary(
+                    _RAW_PAGES_TABLE, _RAW_PAGES_COLUMNS, data
+                )
+                return
         payload = "\n".join(
             json.dumps(normalized_row, ensure_ascii=False)
             for normalized_row in normalized_rows
         )
         query = (
-            "INSERT INTO poe_trade.raw_public_stash_pages "
-            "(ingested_at, realm, league, stash_id, checkpoint, next_change_id, payload_json)\n"
+            f"INSERT INTO {_RAW_PAGES_TABLE} "
+            f"({', '.join(_RAW_PAGES_COLUMNS)})\n"
             "FORMAT JSONEachRow\n"
             f"{payload}"
         )
         self._clickhouse.execute(query)
 
+    @staticmethod
+    def _encode_raw_page_rows(rows: list[dict[str, Any]]) -> bytes | None:
+        timestamps: dict[str, bytes] = {}
+        chunks: list[bytes] = []
+        for row in rows:
+            ingested_at = str(row["ingested_at"])
+            encoded_ts = timestamps.get(ingested_at)
+            if encoded_ts is None:
+                try:
+                    parsed = datetime.strptime(ingested_at, "%Y-%m-%d %H:%M:%S.%f")
+                except ValueError:
+                    return None
+                encoded_ts = rowbinary.datetime64(parsed.replace(tzinfo=timezone.utc))
+                timestamps[ingested_at] = encoded_ts
+            league = row["league"]
+            chunks.append(encoded_ts)
+            chunks.append(rowbinary.string(str(row["realm"])))
+            chunks.append(
+                rowbinary.nullable_string(None if league is None else str(league))
+            )
+            chunks.append(rowbinary.string(str(row["stash_id"])))
+            chunks.append(rowbinary.string(str(row["checkpoint"])))
+            chunks.append(rowbinary.string(str(row["next_change_id"])))
+            chunks.append(rowbinary.string(str(row["payload_json"])))
+        return b"".join(chunks)
+
     def _write_checkpoint_entry(
         self,
         queue_key_value: str,
@@ -794,10 +1210,16 @@ class MarketHarvester:
             "http_status": int(http_status or 0),
             "response_ms": int(response_ms),
         }
+        if self._inserter is not None:
+            self._inserter.insert(_CHECKPOINT_TABLE, _CHECKPOINT_COLUMNS, [row])
+            if next_cursor and status in {"success", "idle"}:
+                with self._lock:
+                    self._queued_cursors[queue_key_value] = next_cursor
+            return
         payload = json.dumps(row, ensure_ascii=False)
         query = (
-            "INSERT INTO poe_trade.bronze_ingest_checkpoints "
-            "(service, queue_key, feed_kind, contract_version, realm, league, endpoint, last_cursor_id, next_cursor_id, cursor_hash, retrieved_at, retry_count, status, error, http_status, response_ms)\n"
+            f"INSERT INTO {_CHECKPOINT_TABLE} "
+            f"({', '.join(_CHECKPOINT_COLUMNS)})\n"
             "FORMAT JSONEachRow\n"
             f"{payload}"
         )
@@ -841,10 +1263,13 @@ class MarketHarvester:
             "retry_after_seconds": retry_after_seconds,
             "error": error or "",
         }
+        if self._inserter is not None:
+            self._inserter.insert(_REQUEST_TABLE, _REQUEST_COLUMNS, [row])
+            return
         payload = json.dumps(row, ensure_ascii=False)
         query = (
-            "INSERT INTO poe_trade.bronze_requests "
-            "(requested_at, service, queue_key, feed_kind, contract_version, realm, league, endpoint, http_method, status, attempts, response_ms, rate_limit_raw, rate_limit_parsed, retry_after_seconds, error)\n"
+            f"INSERT INTO {_REQUEST_TABLE} "
+            f"({', '.join(_REQUEST_COLUMNS)})\n"
             "FORMAT JSONEachRow\n"
             f"{payload}"
         )
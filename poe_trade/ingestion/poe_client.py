@@ -8,7 +8,7 @@ import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -59,10 +59,18 @@ class PoeClient:
     _bearer_token: str | None = field(default=None, init=False)
     _state: RateLimitState = field(default_factory=RateLimitState, init=False)
     _last_attempts: int = field(default=0, init=False)
+    _payload_parsers: dict[str, Callable[[str], Any]] = field(
+        default_factory=dict, init=False
+    )
 
     def set_bearer_token(self, token: str | None) -> None:
         self._bearer_token = token
 
+    def register_payload_parser(
+        self, path_prefix: str, parser: Callable[[str], Any]
+    ) -> None:
+        self._payload_parsers[path_prefix] = parser
+
     @property
     def rate_state(self) -> RateLimitState:
         return self._state
@@ -132,7 +140,7 @@ class PoeClient:
                     self._state.update(response_headers)
                     duration_ms = (time.monotonic() - start) * 1000.0
                     return PoeResponse(
-                        payload=self._parse_body(raw),
+                        payload=self._parse_body(raw, path),
                         headers=response_headers,
                         status_code=resp.getcode(),
                         attempts=self._last_attempts,
@@ -208,8 +216,16 @@ class PoeClient:
             return urllib.parse.urlencode(data).encode("utf-8")
         raise ValueError("Unsupported request body type")
 
-    def _parse_body(self, body: str) -> Any:
+    def _parse_body(self, body: str, path: str = "") -> Any:
+        parser = next(
+            (
+                parser
+                for prefix, parser in self._payload_parsers.items()
+                if path.startswith(prefix)
+            ),
+            json.loads,
+        )
         try:
-            return json.loads(body)
+            return parser(body)
         except json.JSONDecodeError:
             return body
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+import threading
 import time
 from datetime import datetime, timedelta, timezone
 from typing import Protocol, cast
@@ -8,11 +10,19 @@ from ..analytics import execute_refresh_group
 from ..db import ClickHouseClient
 from .cxapi_sync import last_completed_hour
 
+logger = logging.getLogger(__name__)
+
 
 class PsapiHarvester(Protocol):
     def _harvest(self, realm: str, league: str, dry_run: bool) -> None: ...
 
 
+class PipelinedPsapiHarvester(PsapiHarvester, Protocol):
+    def harvest_pipelined(
+        self, realm: str, *, dry_run: bool, stop_event: threading.Event
+    ) -> None: ...
+
+
 class CxapiHourSync(Protocol):
     def sync_hour(
         self,
@@ -35,8 +45,79 @@ def run_market_sync(
     cxapi_hour_offset_seconds: int,
     refresh_client: object | None = None,
     refresh_refs_minutes: int = 0,
+    refresh_parallelism: int = 1,
+    psapi_pipelined: bool = False,
 ) -> None:
     active_league = leagues[0] if leagues else ""
+    stop_event = threading.Event()
+    pipelines: list[threading.Thread] = []
+    if harvester is not None and psapi_pipelined and not once:
+        pipelines = [
+            threading.Thread(
+                target=_run_pipelined_harvest,
+                args=(
+                    cast(PipelinedPsapiHarvester, harvester),
+                    realm,
+                    dry_run,
+                    poll_interval,
+                    stop_event,
+                ),
+                name=f"psapi-pipeline-{realm}",
+                daemon=True,
+            )
+            for realm in realms
+        ]
+        for pipeline in pipelines:
+            pipeline.start()
+    try:
+        _run_sync_loop(
+            harvester=None if pipelines else harvester,
+            cx_sync=cx_sync,
+            realms=realms,
+            active_league=active_league,
+            poll_interval=poll_interval,
+            dry_run=dry_run,
+            once=once,
+            cxapi_hour_offset_seconds=cxapi_hour_offset_seconds,
+            refresh_client=refresh_client,
+            refresh_refs_minutes=refresh_refs_minutes,
+            refresh_parallelism=refresh_parallelism,
+        )
+    finally:
+        stop_event.set()
+        for pipeline in pipelines:
+            pipeline.join()
+
+
+def _run_pipelined_harvest(
+    harvester: PipelinedPsapiHarvester,
+    realm: str,
+    dry_run: bool,
+    poll_interval: float,
+    stop_event: threading.Event,
+) -> None:
+    while not stop_event.is_set():
+        try:
+            harvester.harvest_pipelined(realm, dry_run=dry_run, stop_event=stop_event)
+        except Exception as exc:  # pragma: no cover - best effort
+            logger.exception("Pipelined harvest failed for %s: %s", realm, exc)
+        stop_event.wait(poll_interval)
+
+
+def _run_sync_loop(
+    *,
+    harvester: PsapiHarvester | None,
+    cx_sync: CxapiHourSync | None,
+    realms: tuple[str, ...],
+    active_league: str,
+    poll_interval: float,
+    dry_run: bool,
+    once: bool,
+    cxapi_hour_offset_seconds: int,
+    refresh_client: object | None,
+    refresh_refs_minutes: int,
+    refresh_parallelism: int = 1,
+) -> None:
     last_cx_hours: dict[str, datetime] = {}
     last_refs_refresh_at: datetime | None = None
 
@@ -61,6 +142,8 @@ def run_market_sync(
                 layer="gold",
                 group="refs",
                 dry_run=dry_run,
+                incremental=True,
+                max_parallel=refresh_parallelism,
             )
             last_refs_refresh_at = now
 
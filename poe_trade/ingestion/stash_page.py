@@ -0,0 +1,88 @@
+"""Single-pass PSAPI page decoding that keeps each stash's raw JSON text."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class StashPagePayload(dict[str, Any]):
+    """Decoded page whose ``raw_stashes[i]`` is the source text of ``stashes[i]``."""
+
+    raw_stashes: list[str] | None = None
+
+
+def parse_stash_page(body: str) -> Any:
+    """Decode a public stash page, slicing raw stash text instead of re-encoding it.
+
+    Falls back to ``json.loads`` for anything that is not a JSON object.
+    """
+    try:
+        return _scan_page(body)
+    except (ValueError, IndexError):
+        return json.loads(body)
+
+
+def _skip(body: str, index: int) -> int:
+    return _WHITESPACE.match(body, index).end()  # type: ignore[union-attr]
+
+
+def _scan_page(body: str) -> StashPagePayload:
+    index = _skip(body, 0)
+    if body[index] != "{":
+        raise ValueError("page is not a JSON object")
+    page = StashPagePayload()
+    index = _skip(body, index + 1)
+    if body[index] == "}":
+        index += 1
+    else:
+        while True:
+            key, index = _DECODER.raw_decode(body, index)
+            if not isinstance(key, str):
+                raise ValueError("object key must be a string")
+            index = _skip(body, index)
+            if body[index] != ":":
+                raise ValueError("expected ':'")
+            index = _skip(body, index + 1)
+            if key == "stashes" and body[index] == "[":
+                stashes, raw_stashes, index = _scan_array(body, index)
+                page[key] = stashes
+                page.raw_stashes = raw_stashes
+            else:
+                page[key], index = _DECODER.raw_decode(body, index)
+                if key == "stashes":
+                    page.raw_stashes = None
+            index = _skip(body, index)
+            if body[index] == ",":
+                index = _skip(body, index + 1)
+                continue
+            if body[index] != "}":
+                raise ValueError("expected ',' or '}'")
+            index += 1
+            break
+    if _skip(body, index) != len(body):
+        raise ValueError("trailing data after page object")
+    return page
+
+
+def _scan_array(body: str, index: int) -> tuple[list[Any], list[str], int]:
+    values: list[Any] = []
+    raw_values: list[str] = []
+    index = _skip(body, index + 1)
+    if body[index] == "]":
+        return values, raw_values, index + 1
+    while True:
+        value, end = _DECODER.raw_decode(body, index)
+        values.append(value)
+        raw_values.append(body[index:end])
+        index = _skip(body, end)
+        if body[index] == ",":
+            index = _skip(body, index + 1)
+            continue
+        if body[index] != "]":
+            raise ValueError("expected ',' or ']'")
+        return values, raw_values, index + 1
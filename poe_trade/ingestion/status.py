@@ -6,10 +6,28 @@ import json
 import logging
 from datetime import datetime, timezone
 
-from ..db import ClickHouseClient, ClickHouseClientError
+from ..db import BatchedInserter, ClickHouseClient, ClickHouseClientError
 
 logger = logging.getLogger(__name__)
 
+_STATUS_TABLE = "poe_trade.poe_ingest_status"
+_STATUS_COLUMNS = (
+    "queue_key",
+    "feed_kind",
+    "contract_version",
+    "league",
+    "realm",
+    "source",
+    "last_cursor",
+    "next_change_id",
+    "last_ingest_at",
+    "request_rate",
+    "error_count",
+    "stalled_since",
+    "last_error",
+    "status",
+)
+
 
 def _format_ts(value: datetime | None) -> str | None:
     if value is None:
@@ -19,9 +37,16 @@ def _format_ts(value: datetime | None) -> str | None:
 
 
 class StatusReporter:
-    def __init__(self, client: ClickHouseClient, source: str) -> None:
+    def __init__(
+        self,
+        client: ClickHouseClient,
+        source: str,
+        *,
+        inserter: BatchedInserter | None = None,
+    ) -> None:
         self._client: ClickHouseClient = client
         self._source: str = source
+        self._inserter: BatchedInserter | None = inserter
 
     def report(
         self,
@@ -55,6 +80,9 @@ class StatusReporter:
             "last_error": error or "",
             "status": status,
         }
+        if self._inserter is not None:
+            self._inserter.insert(_STATUS_TABLE, _STATUS_COLUMNS, [row])
+            return
         query = (
             "INSERT INTO poe_trade.poe_ingest_status "
             "(queue_key, feed_kind, contract_version, league, realm, source, last_cursor, next_change_id, last_ingest_at, request_rate, error_count, stalled_since, last_error, status)\n"
@@ -13,6 +13,7 @@ from poe_trade.db import ClickHouseClient
 
 from . import workflows
 from .v3 import benchmark as v3_benchmark
+from .v3 import backends as v3_backends
 from .v3 import backfill as v3_backfill
 from .v3 import eval as v3_eval
 from .v3 import serve as v3_serve
@@ -37,11 +38,14 @@ class _Args(argparse.Namespace):
     clipboard: bool = False
     day: str = ""
     max_bytes: int = 13_500_000_000
+    parallelism: int | None = None
+    resume: bool = False
     start_day: str = ""
     end_day: str = ""
     run_id: str = ""
-    max_rows: int = 60000
-    max_rows_per_route: int = 60000
+    max_rows: int | None = None
+    max_rows_per_route: int | None = None
+    model_backend: str | None = None
     route: str = ""
     input: str = ""
 
@@ -79,6 +83,8 @@ def main(argv: Sequence[str] | None = None) -> int:
     _ = v3_backfill_parser.add_argument("--start-day", required=True)
     _ = v3_backfill_parser.add_argument("--end-day", required=True)
     _ = v3_backfill_parser.add_argument("--max-bytes", type=int, default=13_500_000_000)
+    _ = v3_backfill_parser.add_argument("--parallelism", type=int, default=None)
+    _ = v3_backfill_parser.add_argument("--resume", action="store_true")
 
     v3_replay_day_parser = subparsers.add_parser("v3-replay-day")
     _ = v3_replay_day_parser.add_argument("--league", required=True)
@@ -93,13 +99,19 @@ def main(argv: Sequence[str] | None = None) -> int:
     v3_train_parser = subparsers.add_parser("v3-train")
     _ = v3_train_parser.add_argument("--league", required=True)
     _ = v3_train_parser.add_argument("--model-dir", required=True)
-    _ = v3_train_parser.add_argument("--max-rows-per-route", type=int, default=60000)
+    _ = v3_train_parser.add_argument("--max-rows-per-route", type=int, default=None)
+    _ = v3_train_parser.add_argument(
+        "--model-backend", choices=v3_backends.MODEL_BACKENDS, default=None
+    )
 
     v3_train_route_parser = subparsers.add_parser("v3-train-route")
     _ = v3_train_route_parser.add_argument("--league", required=True)
     _ = v3_train_route_parser.add_argument("--route", required=True)
     _ = v3_train_route_parser.add_argument("--model-dir", required=True)
-    _ = v3_train_route_parser.add_argument("--max-rows", type=int, default=60000)
+    _ = v3_train_route_parser.add_argument("--max-rows", type=int, default=None)
+    _ = v3_train_route_parser.add_argument(
+        "--model-backend", choices=v3_backends.MODEL_BACKENDS, default=None
+    )
 
     v3_eval_parser = subparsers.add_parser("v3-evaluate")
     _ = v3_eval_parser.add_argument("--league", required=True)
@@ -167,6 +179,8 @@ def main(argv: Sequence[str] | None = None) -> int:
                 start_day=str(args.start_day),
                 end_day=str(args.end_day),
                 max_bytes=int(args.max_bytes),
+                parallelism=args.parallelism or cfg.ml_v3_backfill_parallelism,
+                resume=bool(args.resume),
             )
             print(json.dumps(result, indent=2, sort_keys=True))
             return 0
@@ -193,7 +207,8 @@ def main(argv: Sequence[str] | None = None) -> int:
                 client,
                 league=league,
                 model_dir=str(args.model_dir),
-                max_rows_per_route=int(args.max_rows_per_route),
+                max_rows_per_route=args.max_rows_per_route,
+                model_backend=args.model_backend or cfg.ml_v3_model_backend,
             )
             print(json.dumps(result, indent=2, sort_keys=True))
             return 0
@@ -203,7 +218,8 @@ def main(argv: Sequence[str] | None = None) -> int:
                 league=league,
                 route=str(args.route),
                 model_dir=str(args.model_dir),
-                max_rows=int(args.max_rows),
+                max_rows=args.max_rows,
+                model_backend=args.model_backend or cfg.ml_v3_model_backend,
             )
             print(json.dumps(result, indent=2, sort_keys=True))
             return 0
@@ -226,7 +242,9 @@ def main(argv: Sequence[str] | None = None) -> int:
                     for line in payload_text.splitlines()
                     if line.strip()
                 ]
-            result = v3_benchmark.save_benchmark_artifacts(rows, str(args.output))
+            result = v3_benchmark.save_benchmark_artifacts(
+                rows, str(args.output), workers=runtime_profile.default_workers
+            )
             print(json.dumps(result, indent=2, sort_keys=True))
             return 0
         if command == "v3-predict-one":
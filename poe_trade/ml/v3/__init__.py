@@ -12,7 +12,7 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from .backfill import backfill_range, replay_day
     from .eval import evaluate_run, promotion_gate
-    from .serve import predict_one_v3
+    from .serve import predict_many_v3, predict_one_v3
     from .train import train_all_routes_v3, train_route_v3
 
 
@@ -21,6 +21,7 @@ _EXPORT_TO_MODULE = {
     "replay_day": ".backfill",
     "evaluate_run": ".eval",
     "promotion_gate": ".eval",
+    "predict_many_v3": ".serve",
     "predict_one_v3": ".serve",
     "train_all_routes_v3": ".train",
     "train_route_v3": ".train",
@@ -46,6 +47,7 @@ __all__ = [
     "replay_day",
     "evaluate_run",
     "promotion_gate",
+    "predict_many_v3",
     "predict_one_v3",
     "train_all_routes_v3",
     "train_route_v3",
@@ -0,0 +1,185 @@
+"""Model backends for v3 bundle training.
+
+``gbr`` is the original exact-split ``GradientBoostingRegressor`` on a sparse
+one-hot ``DictVectorizer`` matrix. ``hist`` uses ``HistGradientBoostingRegressor``
+with native quantile losses and native categorical splits, which bins every
+feature once and scales to a much longer route history.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.feature_extraction import DictVectorizer
+
+GBR_BACKEND = "gbr"
+HIST_BACKEND = "hist"
+MODEL_BACKENDS = (GBR_BACKEND, HIST_BACKEND)
+
+# Row caps applied when the caller does not pass one. ``hist`` scales to far
+# more rows than ``gbr``, but every row is still decoded from JSON and held in
+# a dense matrix, so its cap bounds the memory of a single route.
+MAX_ROWS_PER_ROUTE_BY_BACKEND: dict[str, int | None] = {
+    GBR_BACKEND: 60_000,
+    HIST_BACKEND: 250_000,
+}
+
+# ``HistGradientBoostingRegressor`` refits its bin mapper on every ``fit``, so
+# a warm start on delta rows re-bins categories for the existing trees and
+# sends categories missing from the delta down the missing-value branch.
+WARM_START_BACKENDS = (GBR_BACKEND,)
+
+_TARGET_LOSSES: dict[str, dict[str, Any]] = {
+    "p10": {"loss": "quantile", "alpha": 0.1},
+    "p50": {"loss": "absolute_error"},
+    "p90": {"loss": "quantile", "alpha": 0.9},
+    "sale_probability": {"loss": "absolute_error"},
+    "fast_sale_24h": {"loss": "absolute_error"},
+}
+
+# HistGradientBoosting bins categories into at most 255 codes, one of which
+# is reserved for missing values.
+_MAX_CATEGORIES = 254
+
+
+class CategoricalDictVectorizer:
+    """Dense ``DictVectorizer`` stand-in that keeps strings as one ordinal column.
+
+    Numeric features behave like ``DictVectorizer`` (missing means 0). String
+    features are coded by frequency rank; rare, unseen and missing values map
+    to NaN, which the hist backend treats as the missing category.
+    """
+
+    def __init__(self, max_categories: int = _MAX_CATEGORIES) -> None:
+        self.max_categories = max_categories
+        self.feature_names_: list[str] = []
+        self.vocabulary_: dict[str, int] = {}
+        self.categories_: dict[str, dict[str, int]] = {}
+        self.categorical_mask_ = np.zeros(0, dtype=bool)
+
+    def fit(self, rows: Iterable[Mapping[str, Any]]) -> CategoricalDictVectorizer:
+        numeric: set[str] = set()
+        counts: dict[str, Counter[str]] = {}
+        for row in rows:
+            for name, value in row.items():
+                if value is None:
+                    continue
+                if _is_numeric(value):
+                    numeric.add(name)
+                else:
+                    counts.setdefault(name, Counter())[str(value)] += 1
+        self.feature_names_ = sorted(numeric | set(counts))
+        self.vocabulary_ = {name: i for i, name in enumerate(self.feature_names_)}
+        self.categories_ = {}
+        for name, counter in counts.items():
+            ranked = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+            self.categories_[name] = {
+                value: code
+                for code, (value, _count) in enumerate(ranked[: self.max_categories])
+            }
+        self.categorical_mask_ = np.array(
+            [name in self.categories_ for name in self.feature_names_], dtype=bool
+        )
+        return self
+
+    def transform(self, rows: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        rows = list(rows)
+        X = np.zeros((len(rows), len(self.feature_names_)), dtype=np.float32)
+        X[:, self.categorical_mask_] = np.nan
+        for row_index, row in enumerate(rows):
+            for name, value in row.items():
+                column = self.vocabulary_.get(name)
+                if column is None or value is None:
+                    continue
+                codes = self.categories_.get(name)
+                if codes is None:
+                    if _is_numeric(value):
+                        X[row_index, column] = float(value)
+                    continue
+                code = codes.get(str(value))
+                if code is not None:
+                    X[row_index, column] = code
+        return X
+
+    def fit_transform(self, rows: Iterable[Mapping[str, Any]]) -> np.ndarray:
+        rows = list(rows)
+        return self.fit(rows).transform(rows)
+
+
+def _is_numeric(value: Any) -> bool:
+    return isinstance(value, (bool, int, float, np.integer, np.floating))
+
+
+def validate_model_backend(backend: str) -> str:
+    normalized = backend.strip().lower()
+    if normalized not in MODEL_BACKENDS:
+        raise ValueError(
+            f"unknown v3 model backend {backend!r}; expected one of "
+            + ", ".join(MODEL_BACKENDS)
+        )
+    return normalized
+
+
+def new_vectorizer(backend: str) -> DictVectorizer | CategoricalDictVectorizer:
+    if backend == HIST_BACKEND:
+        return CategoricalDictVectorizer()
+    return DictVectorizer(sparse=True)
+
+
+def new_target_model(
+    backend: str, target: str, *, categorical_mask: np.ndarray | None = None
+) -> Any:
+    loss = dict(_TARGET_LOSSES[target])
+    if backend == HIST_BACKEND:
+        if "alpha" in loss:
+            loss["quantile"] = loss.pop("alpha")
+        has_categories = categorical_mask is not None and bool(categorical_mask.any())
+        return HistGradientBoostingRegressor(
+            **loss,
+            max_iter=300,
+            learning_rate=0.05,
+            max_leaf_nodes=31,
+            min_samples_leaf=20,
+            early_stopping=False,
+            categorical_features=categorical_mask if has_categories else None,
+            random_state=42,
+        )
+    return GradientBoostingRegressor(
+        **loss,
+        n_estimators=120,
+        learning_rate=0.05,
+        max_depth=3,
+        random_state=42,
+    )
+
+
+def grow_target_model(backend: str, model: Any, extra_estimators: int) -> Any:
+    """Switch a fitted model to warm start with ``extra_estimators`` more trees.
+
+    The next ``fit`` keeps the existing ensemble and boosts the added trees on
+    the rows it is given.
+    """
+    if backend not in WARM_START_BACKENDS:
+        raise ValueError(f"v3 model backend {backend!r} does not support warm start")
+    model.set_params(
+        warm_start=True, n_estimators=model.n_estimators + extra_estimators
+    )
+    return model
+
+
+__all__ = [
+    "CategoricalDictVectorizer",
+    "GBR_BACKEND",
+    "HIST_BACKEND",
+    "MAX_ROWS_PER_ROUTE_BY_BACKEND",
+    "MODEL_BACKENDS",
+    "WARM_START_BACKENDS",
+    "grow_target_model",
+    "new_target_model",
+    "new_vectorizer",
+    "validate_model_backend",
+]
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
 from poe_trade.db import ClickHouseClient
-from poe_trade.db.clickhouse import ClickHouseClientError
+from poe_trade.db.clickhouse import ClickHouseClientError, query_rows
 
 from . import sql
 
@@ -24,6 +27,17 @@ class BackfillDayResult:
     training_examples_inserted: bool
 
 
+# Per-day replay stages in dependency order; each reads what the previous
+# stages wrote for the same day.
+_REPLAY_STAGES: tuple[tuple[str, Callable[..., str]], ...] = (
+    ("listing_episodes", sql.build_listing_episodes_insert_query),
+    ("events", sql.build_events_insert_query),
+    ("disappearance_events", sql.build_disappearance_events_insert_query),
+    ("sale_proxy_labels", sql.build_sale_proxy_labels_insert_query),
+    ("training_examples", sql.build_training_examples_insert_query),
+)
+
+
 @dataclass(frozen=True)
 class _ChunkReplayError(Exception):
     completed: list[BackfillDayResult]
@@ -31,15 +45,7 @@ class _ChunkReplayError(Exception):
 
 
 def _query_rows(client: ClickHouseClient, query: str) -> list[dict[str, Any]]:
-    payload = client.execute(query).strip()
-    if not payload:
-        return []
-    rows: list[dict[str, Any]] = []
-    for line in payload.splitlines():
-        if not line.strip():
-            continue
-        rows.append(json.loads(line))
-    return rows
+    return query_rows(client, query)
 
 
 def _quote(value: str) -> str:
@@ -72,6 +78,30 @@ def guard_disk_budget(client: ClickHouseClient, *, max_bytes: int) -> int:
     return current
 
 
+class _SharedDiskBudget:
+    """Disk guard shared by every in-flight replay day.
+
+    Checks are serialized, and once the budget is exceeded every later check
+    fails, so no worker starts another stage.
+    """
+
+    def __init__(self, client: ClickHouseClient, *, max_bytes: int) -> None:
+        self._client = client
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._error: ValueError | None = None
+
+    def check(self) -> None:
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            try:
+                guard_disk_budget(self._client, max_bytes=self._max_bytes)
+            except ValueError as exc:
+                self._error = exc
+                raise
+
+
 def _clear_replay_day_slice(
     client: ClickHouseClient,
     *,
@@ -117,6 +147,17 @@ def _clear_replay_day_slice(
             ]
         )
     )
+    # The rollup is fed by a materialized view, so replayed days are cleared
+    # here or their listings would be counted twice.
+    client.execute(
+        " ".join(
+            [
+                f"DELETE FROM {sql.SEARCH_HISTORY_ROLLUP_TABLE}",
+                f"WHERE league = {league_sql}",
+                f"AND toDate(hour) = toDate({day_sql})",
+            ]
+        )
+    )
 
 
 def replay_day(
@@ -127,12 +168,27 @@ def replay_day(
     max_bytes: int = 13_500_000_000,
 ) -> BackfillDayResult:
     guard_disk_budget(client, max_bytes=max_bytes)
+    return _replay_day_stages(client, league=league, day=day)
+
+
+def _replay_day_stages(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    day: date,
+    before_stage: Callable[[], None] | None = None,
+) -> BackfillDayResult:
     _clear_replay_day_slice(client, league=league, day=day)
-    client.execute(sql.build_listing_episodes_insert_query(league=league, day=day))
-    client.execute(sql.build_events_insert_query(league=league, day=day))
-    client.execute(sql.build_disappearance_events_insert_query(league=league, day=day))
-    client.execute(sql.build_sale_proxy_labels_insert_query(league=league, day=day))
-    client.execute(sql.build_training_examples_insert_query(league=league, day=day))
+    for stage, build_query in _REPLAY_STAGES:
+        if before_stage is not None:
+            before_stage()
+        client.execute(build_query(league=league, day=day))
+        logger.debug(
+            "ml-v3 replay stage complete league=%s day=%s stage=%s",
+            league,
+            day.isoformat(),
+            stage,
+        )
     logger.info("ml-v3 replay day complete league=%s day=%s", league, day.isoformat())
     return BackfillDayResult(
         league=league,
@@ -151,20 +207,22 @@ def _replay_chunk_with_retry(
     days: list[date],
     max_bytes: int,
     max_retries: int,
+    on_day_complete: Callable[[BackfillDayResult], None] | None = None,
 ) -> list[BackfillDayResult]:
     completed: list[BackfillDayResult] = []
     for day in days:
         attempt = 0
         while True:
             try:
-                completed.append(
-                    replay_day(
-                        client,
-                        league=league,
-                        day=day,
-                        max_bytes=max_bytes,
-                    )
+                result = replay_day(
+                    client,
+                    league=league,
+                    day=day,
+                    max_bytes=max_bytes,
                 )
+                if on_day_complete is not None:
+                    on_day_complete(result)
+                completed.append(result)
                 break
             except ClickHouseClientError as exc:
                 if attempt >= max_retries:
@@ -184,42 +242,19 @@ def _replay_chunk_with_retry(
     return completed
 
 
-def _parse_day(value: str) -> date:
-    parsed = datetime.strptime(value, "%Y-%m-%d")
-    return parsed.date()
-
-
-def backfill_range(
+def _replay_days_in_chunks(
     client: ClickHouseClient,
     *,
     league: str,
-    start_day: str,
-    end_day: str,
-    max_bytes: int = 13_500_000_000,
-    chunk_days: int = 1,
-    max_retries: int = 1,
-) -> dict[str, Any]:
-    start = _parse_day(start_day)
-    end = _parse_day(end_day)
-    if end < start:
-        raise ValueError("end_day must be >= start_day")
-    if chunk_days < 1:
-        raise ValueError("chunk_days must be >= 1")
-    if max_retries < 0:
-        raise ValueError("max_retries must be >= 0")
-
-    days = (end - start).days + 1
-    cursor = start
-    results: list[dict[str, Any]] = []
-    while cursor <= end:
-        chunk: list[date] = []
-        for _ in range(chunk_days):
-            if cursor > end:
-                break
-            chunk.append(cursor)
-            cursor += timedelta(days=1)
-        if not chunk:
-            break
+    days: list[date],
+    max_bytes: int,
+    chunk_days: int,
+    max_retries: int,
+    on_day_complete: Callable[[BackfillDayResult], None],
+) -> list[BackfillDayResult]:
+    replayed: list[BackfillDayResult] = []
+    for offset in range(0, len(days), chunk_days):
+        chunk = days[offset : offset + chunk_days]
         try:
             chunk_results = _replay_chunk_with_retry(
                 client,
@@ -227,6 +262,7 @@ def backfill_range(
                 days=chunk,
                 max_bytes=max_bytes,
                 max_retries=max_retries,
+                on_day_complete=on_day_complete,
             )
         except _ChunkReplayError as exc:
             if len(chunk) == 1:
@@ -245,26 +281,227 @@ def backfill_range(
                         days=[day],
                         max_bytes=max_bytes,
                         max_retries=max_retries,
+                        on_day_complete=on_day_complete,
                     )
                 )
-        for result in chunk_results:
-            results.append(
-                {
-                    "league": result.league,
-                    "day": result.day,
-                    "events_inserted": result.events_inserted,
-                    "disappearance_events_inserted": result.disappearance_events_inserted,
-                    "labels_inserted": result.labels_inserted,
-                    "training_examples_inserted": result.training_examples_inserted,
-                }
+        replayed.extend(chunk_results)
+    return replayed
+
+
+def _replay_day_with_retry(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    day: date,
+    budget: _SharedDiskBudget,
+    max_retries: int,
+) -> BackfillDayResult:
+    attempt = 0
+    while True:
+        try:
+            budget.check()
+            return _replay_day_stages(
+                client, league=league, day=day, before_stage=budget.check
+            )
+        except ClickHouseClientError as exc:
+            if attempt >= max_retries:
+                raise
+            attempt += 1
+            logger.warning(
+                "ml-v3 replay day retry league=%s day=%s attempt=%s error=%s",
+                league,
+                day.isoformat(),
+                attempt,
+                exc,
             )
 
+
+def _replay_days_parallel(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    days: list[date],
+    max_bytes: int,
+    max_retries: int,
+    parallelism: int,
+    on_day_complete: Callable[[BackfillDayResult], None],
+) -> list[BackfillDayResult]:
+    """Replay up to ``parallelism`` days at once, oldest first.
+
+    After a failure no new days start; in-flight days finish (and are
+    checkpointed) and the first error is re-raised.
+    """
+    budget = _SharedDiskBudget(client, max_bytes=max_bytes)
+    pending = list(reversed(days))
+    completed: list[BackfillDayResult] = []
+    with ThreadPoolExecutor(
+        max_workers=parallelism, thread_name_prefix="v3-backfill-day"
+    ) as executor:
+        running: dict[Future[BackfillDayResult], date] = {}
+        failure: BaseException | None = None
+        while pending or running:
+            while failure is None and pending and len(running) < parallelism:
+                day = pending.pop()
+                future = executor.submit(
+                    _replay_day_with_retry,
+                    client,
+                    league=league,
+                    day=day,
+                    budget=budget,
+                    max_retries=max_retries,
+                )
+                running[future] = day
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                day = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    logger.error(
+                        "ml-v3 replay day failed league=%s day=%s: %s",
+                        league,
+                        day.isoformat(),
+                        error,
+                    )
+                    failure = failure or error
+                    continue
+                result = future.result()
+                on_day_complete(result)
+                completed.append(result)
+        if failure is not None:
+            raise failure
+    return sorted(completed, key=lambda result: result.day)
+
+
+def _checkpointed_days(
+    client: ClickHouseClient, *, league: str, start: date, end: date
+) -> set[str]:
+    rows = _query_rows(
+        client,
+        " ".join(
+            [
+                "SELECT DISTINCT toString(day) AS day",
+                f"FROM {sql.BACKFILL_CHECKPOINTS_TABLE}",
+                f"WHERE league = {_quote(league)}",
+                f"AND day BETWEEN toDate({_quote(start.isoformat())})",
+                f"AND toDate({_quote(end.isoformat())})",
+                "FORMAT JSONEachRow",
+            ]
+        ),
+    )
+    return {str(row.get("day") or "") for row in rows}
+
+
+def _record_checkpoint(client: ClickHouseClient, result: BackfillDayResult) -> None:
+    row = {
+        "league": result.league,
+        "day": result.day,
+        "completed_at": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+    }
+    try:
+        client.execute(
+            f"INSERT INTO {sql.BACKFILL_CHECKPOINTS_TABLE} FORMAT JSONEachRow\n"
+            + json.dumps(row, separators=(",", ":"))
+        )
+    except ClickHouseClientError as exc:
+        logger.warning(
+            "ml-v3 replay checkpoint failed league=%s day=%s error=%s",
+            result.league,
+            result.day,
+            exc,
+        )
+
+
+def _parse_day(value: str) -> date:
+    parsed = datetime.strptime(value, "%Y-%m-%d")
+    return parsed.date()
+
+
+def backfill_range(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    start_day: str,
+    end_day: str,
+    max_bytes: int = 13_500_000_000,
+    chunk_days: int = 1,
+    max_retries: int = 1,
+    parallelism: int = 1,
+    resume: bool = False,
+) -> dict[str, Any]:
+    """Replay every day in ``[start_day, end_day]``.
+
+    Each finished day is checkpointed; ``resume=True`` skips days that already
+    have a checkpoint. With ``parallelism > 1`` up to that many days replay at
+    once under one shared disk guard, and ``chunk_days`` is ignored.
+    """
+    start = _parse_day(start_day)
+    end = _parse_day(end_day)
+    if end < start:
+        raise ValueError("end_day must be >= start_day")
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be >= 1")
+    if max_retries < 0:
+        raise ValueError("max_retries must be >= 0")
+    if parallelism < 1:
+        raise ValueError("parallelism must be >= 1")
+
+    days = (end - start).days + 1
+    pending_days = [start + timedelta(days=offset) for offset in range(days)]
+    resumed_days: list[str] = []
+    if resume:
+        checkpointed = _checkpointed_days(client, league=league, start=start, end=end)
+        resumed_days = [
+            day.isoformat() for day in pending_days if day.isoformat() in checkpointed
+        ]
+        pending_days = [
+            day for day in pending_days if day.isoformat() not in checkpointed
+        ]
+
+    def _checkpoint(result: BackfillDayResult) -> None:
+        _record_checkpoint(client, result)
+
+    if parallelism > 1:
+        replayed = _replay_days_parallel(
+            client,
+            league=league,
+            days=pending_days,
+            max_bytes=max_bytes,
+            max_retries=max_retries,
+            parallelism=parallelism,
+            on_day_complete=_checkpoint,
+        )
+    else:
+        replayed = _replay_days_in_chunks(
+            client,
+            league=league,
+            days=pending_days,
+            max_bytes=max_bytes,
+            chunk_days=chunk_days,
+            max_retries=max_retries,
+            on_day_complete=_checkpoint,
+        )
+
+    results = [
+        {
+            "league": result.league,
+            "day": result.day,
+            "events_inserted": result.events_inserted,
+            "disappearance_events_inserted": result.disappearance_events_inserted,
+            "labels_inserted": result.labels_inserted,
+            "training_examples_inserted": result.training_examples_inserted,
+        }
+        for result in replayed
+    ]
     return {
         "league": league,
         "start_day": start_day,
         "end_day": end_day,
         "days_requested": days,
         "days_processed": len(results),
+        "days_resumed": resumed_days,
+        "parallelism": parallelism,
         "results": results,
         "disk_bytes_after": disk_usage_bytes(client, fail_open=True),
     }
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import json
 import math
+import pickle
 import re
+import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Mapping, Sequence, cast
@@ -20,6 +23,11 @@ from sklearn.dummy import DummyRegressor
 from sklearn.linear_model import ElasticNet, HuberRegressor, QuantileRegressor
 from sklearn.neighbors import KNeighborsRegressor
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = cast(Any, None)
+
 try:
     from catboost import CatBoostRegressor
 except ImportError:
@@ -48,6 +56,7 @@ from .features import (
     build_item_state_key,
     validate_ring_parser_row,
 )
+from .parallel import TrainingPool, load_shared_array
 from .routes import assign_cohort
 from .sql import (
     BENCHMARK_EXTRACT_COLUMNS,
@@ -994,52 +1003,53 @@ def _knn_model() -> KNeighborsRegressor:
     return KNeighborsRegressor(n_neighbors=5, weights="distance")
 
 
-def _stacked_ensemble_model() -> Any:
-    class _SafeStackingRegressor:
-        def __init__(self) -> None:
-            self._model: Any | None = None
-            self._fallback = ElasticNet(
-                alpha=0.0005, l1_ratio=0.5, max_iter=6000, random_state=42
-            )
+class _SafeStackingRegressor:
+    def __init__(self) -> None:
+        self._model: Any | None = None
+        self._fallback = ElasticNet(
+            alpha=0.0005, l1_ratio=0.5, max_iter=6000, random_state=42
+        )
 
-        def fit(
-            self,
-            X: np.ndarray,
-            y: np.ndarray,
-            sample_weight: np.ndarray | None = None,
-        ) -> "_SafeStackingRegressor":
-            if len(X) < 3:
-                self._model = self._fallback
-                _fit_model(self._fallback, X, y, sample_weight=sample_weight)
-                return self
-
-            estimators = [
-                ("elasticnet", _elasticnet_model()),
-                ("huber", _huber_model()),
-                ("catboost", _catboost_model()),
-                ("lightgbm", _lightgbm_model()),
-                ("xgboost", _xgboost_model()),
-            ]
-            stacked = StackingRegressor(
-                estimators=estimators,
-                final_estimator=ElasticNet(
-                    alpha=0.0005, l1_ratio=0.5, max_iter=6000, random_state=42
-                ),
-                passthrough=True,
-                cv=min(3, len(X)),
-                n_jobs=1,
-            )
-            fitted = _fit_model(stacked, X, y, sample_weight=sample_weight)
-            if not hasattr(fitted, "estimators_"):
-                fitted = _fit_model(self._fallback, X, y, sample_weight=sample_weight)
-            self._model = fitted
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        sample_weight: np.ndarray | None = None,
+    ) -> "_SafeStackingRegressor":
+        if len(X) < 3:
+            self._model = self._fallback
+            _fit_model(self._fallback, X, y, sample_weight=sample_weight)
             return self
 
-        def predict(self, X: np.ndarray) -> np.ndarray:
-            if self._model is None:
-                raise RuntimeError("stacked ensemble has not been fitted yet")
-            return np.asarray(self._model.predict(X), dtype=float)
+        estimators = [
+            ("elasticnet", _elasticnet_model()),
+            ("huber", _huber_model()),
+            ("catboost", _catboost_model()),
+            ("lightgbm", _lightgbm_model()),
+            ("xgboost", _xgboost_model()),
+        ]
+        stacked = StackingRegressor(
+            estimators=estimators,
+            final_estimator=ElasticNet(
+                alpha=0.0005, l1_ratio=0.5, max_iter=6000, random_state=42
+            ),
+            passthrough=True,
+            cv=min(3, len(X)),
+            n_jobs=1,
+        )
+        fitted = _fit_model(stacked, X, y, sample_weight=sample_weight)
+        if not hasattr(fitted, "estimators_"):
+            fitted = _fit_model(self._fallback, X, y, sample_weight=sample_weight)
+        self._model = fitted
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self._model is None:
+            raise RuntimeError("stacked ensemble has not been fitted yet")
+        return np.asarray(self._model.predict(X), dtype=float)
 
+
+def _stacked_ensemble_model() -> Any:
     return _SafeStackingRegressor()
 
 
@@ -1115,48 +1125,77 @@ def _candidate_metadata(spec: CandidateSpec) -> dict[str, Any]:
     }
 
 
-def _train_candidate(
-    spec: CandidateSpec,
+@dataclass(frozen=True)
+class _SplitMatrices:
+    """Feature matrices for one split, vectorized once and shared by candidates."""
+
+    vectorizer: DictVectorizer
+    train: np.ndarray
+    validation: np.ndarray
+    test: np.ndarray
+
+
+def _build_split_matrices(
     split: Mapping[str, Sequence[Mapping[str, Any]]],
     *,
-    tail_quantile: float | None = None,
     feature_builder: Callable[[Mapping[str, Any]], dict[str, Any]] = _feature_dict,
-) -> dict[str, Any]:
-    train_rows = split["train"]
-    validation_rows = split["validation"]
-    test_rows = split["test"]
-
+) -> _SplitMatrices:
     vectorizer, train_matrix = _dense_feature_matrix(
-        train_rows, feature_builder=feature_builder
-    )
-    validation_matrix = _transform_rows(
-        validation_rows, vectorizer=vectorizer, feature_builder=feature_builder
+        split["train"], feature_builder=feature_builder
     )
-    test_matrix = _transform_rows(
-        test_rows, vectorizer=vectorizer, feature_builder=feature_builder
+    return _SplitMatrices(
+        vectorizer=vectorizer,
+        train=train_matrix,
+        validation=_transform_rows(
+            split["validation"], vectorizer=vectorizer, feature_builder=feature_builder
+        ),
+        test=_transform_rows(
+            split["test"], vectorizer=vectorizer, feature_builder=feature_builder
+        ),
     )
 
+
+def _candidate_training_targets(
+    spec: CandidateSpec, train_rows: Sequence[Mapping[str, Any]]
+) -> tuple[np.ndarray, np.ndarray | None]:
     y_train = np.asarray(spec.target_builder(train_rows), dtype=float)
     sample_weight = (
         np.asarray([_row_weight(row) for row in train_rows], dtype=float)
         if spec.uses_sample_weight
         else None
     )
+    return y_train, sample_weight
+
+
+def _fit_candidate(
+    spec: CandidateSpec,
+    train_matrix: np.ndarray,
+    validation_matrix: np.ndarray,
+    test_matrix: np.ndarray,
+    y_train: np.ndarray,
+    sample_weight: np.ndarray | None,
+) -> dict[str, Any]:
+    """Fit one candidate and predict validation/test, measuring the cost.
 
+    ``peak_rss_mb`` is the high-water mark of the process that ran the fit; pooled
+    candidates each get a fresh worker, in-process fits report the parent's.
+    """
+    fit_started = time.perf_counter()
     model = spec.model_factory()
     if isinstance(model, KNeighborsRegressor):
         neighbor_count = _to_int(
-            getattr(model, "n_neighbors", len(train_rows)), len(train_rows)
+            getattr(model, "n_neighbors", len(train_matrix)), len(train_matrix)
         )
-        model.n_neighbors = max(1, min(neighbor_count, len(train_rows)))
+        model.n_neighbors = max(1, min(neighbor_count, len(train_matrix)))
     model = _fit_model(model, train_matrix, y_train, sample_weight=sample_weight)
+    fit_seconds = time.perf_counter() - fit_started
 
+    predict_started = time.perf_counter()
     train_pred_log = np.asarray(model.predict(train_matrix), dtype=float)
     residuals = y_train - train_pred_log
     residual_low, residual_high = np.quantile(residuals, [0.10, 0.90])
     if residual_low > residual_high:
         residual_low, residual_high = residual_high, residual_low
-
     validation_predictions = _predict_price(
         model,
         validation_matrix,
@@ -1169,6 +1208,54 @@ def _train_candidate(
         residual_low=float(residual_low),
         residual_high=float(residual_high),
     )
+    predict_seconds = time.perf_counter() - predict_started
+    return {
+        "model": model,
+        "residual_low": float(residual_low),
+        "residual_high": float(residual_high),
+        "validation_predictions": validation_predictions,
+        "test_predictions": test_predictions,
+        "resources": {
+            "fit_seconds": round(fit_seconds, 4),
+            "predict_seconds": round(predict_seconds, 4),
+            "peak_rss_mb": round(_peak_rss_mb(), 2),
+        },
+    }
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _fit_candidate_from_shared(
+    spec: CandidateSpec, directory: str, target_key: str, weighted: bool
+) -> dict[str, Any]:
+    return _fit_candidate(
+        spec,
+        load_shared_array(directory, "train"),
+        load_shared_array(directory, "validation"),
+        load_shared_array(directory, "test"),
+        load_shared_array(directory, f"y_{target_key}"),
+        load_shared_array(directory, "sample_weight") if weighted else None,
+    )
+
+
+def _score_candidate(
+    spec: CandidateSpec,
+    split: Mapping[str, Sequence[Mapping[str, Any]]],
+    vectorizer: DictVectorizer,
+    fitted: Mapping[str, Any],
+    *,
+    tail_quantile: float | None = None,
+) -> dict[str, Any]:
+    validation_rows = split["validation"]
+    test_rows = split["test"]
+    validation_predictions = fitted["validation_predictions"]
+    test_predictions = fitted["test_predictions"]
 
     validation_metrics = _metrics_from_predictions(
         validation_rows, validation_predictions
@@ -1194,11 +1281,12 @@ def _train_candidate(
         "candidate": spec.name,
         "metadata": _candidate_metadata(spec),
         "vectorizer": vectorizer,
-        "model": model,
+        "model": fitted["model"],
         "residual_interval": {
-            "low": float(residual_low),
-            "high": float(residual_high),
+            "low": fitted["residual_low"],
+            "high": fitted["residual_high"],
         },
+        "resources": fitted["resources"],
         "validation": {
             **validation_metrics,
             "slice_metrics": validation_slice_metrics,
@@ -1210,11 +1298,128 @@ def _train_candidate(
     }
 
 
+def _train_candidate(
+    spec: CandidateSpec,
+    split: Mapping[str, Sequence[Mapping[str, Any]]],
+    *,
+    tail_quantile: float | None = None,
+    feature_builder: Callable[[Mapping[str, Any]], dict[str, Any]] = _feature_dict,
+    matrices: _SplitMatrices | None = None,
+) -> dict[str, Any]:
+    if matrices is None:
+        matrices = _build_split_matrices(split, feature_builder=feature_builder)
+    y_train, sample_weight = _candidate_training_targets(spec, split["train"])
+    fitted = _fit_candidate(
+        spec,
+        matrices.train,
+        matrices.validation,
+        matrices.test,
+        y_train,
+        sample_weight,
+    )
+    return _score_candidate(
+        spec, split, matrices.vectorizer, fitted, tail_quantile=tail_quantile
+    )
+
+
+def _is_picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _train_candidates(
+    specs: Sequence[CandidateSpec],
+    split: Mapping[str, Sequence[Mapping[str, Any]]],
+    *,
+    tail_quantile: float | None = None,
+    feature_builder: Callable[[Mapping[str, Any]], dict[str, Any]] = _feature_dict,
+    workers: int = 1,
+) -> list[dict[str, Any]]:
+    """Vectorize the split once and fit every candidate, in spec order.
+
+    With ``workers > 1`` the matrices and targets are memory-mapped into a
+    process pool and independent candidates fit concurrently. Candidates that
+    cannot be pickled (e.g. specs built from local lambdas) fit in-process.
+    """
+    matrices = _build_split_matrices(split, feature_builder=feature_builder)
+    pooled = [spec for spec in specs if _is_picklable(spec)] if workers > 1 else []
+    if len(pooled) < 2:
+        return [
+            _train_candidate(
+                spec,
+                split,
+                tail_quantile=tail_quantile,
+                feature_builder=feature_builder,
+                matrices=matrices,
+            )
+            for spec in specs
+        ]
+
+    train_rows = split["train"]
+    targets: dict[str, np.ndarray] = {}
+    for spec in pooled:
+        if spec.target_name not in targets:
+            targets[spec.target_name] = np.asarray(
+                spec.target_builder(train_rows), dtype=float
+            )
+    with TrainingPool(
+        workers=min(workers, len(pooled)), max_tasks_per_child=1
+    ) as pool:
+        directory = pool.share(
+            {
+                "train": matrices.train,
+                "validation": matrices.validation,
+                "test": matrices.test,
+                "sample_weight": np.asarray(
+                    [_row_weight(row) for row in train_rows], dtype=float
+                ),
+                **{f"y_{name}": values for name, values in targets.items()},
+            }
+        )
+        futures = {
+            spec.name: pool.submit(
+                _fit_candidate_from_shared,
+                spec,
+                directory,
+                spec.target_name,
+                spec.uses_sample_weight,
+            )
+            for spec in pooled
+        }
+        results = []
+        for spec in specs:
+            future = futures.get(spec.name)
+            if future is None:
+                results.append(
+                    _train_candidate(
+                        spec,
+                        split,
+                        tail_quantile=tail_quantile,
+                        matrices=matrices,
+                    )
+                )
+                continue
+            results.append(
+                _score_candidate(
+                    spec,
+                    split,
+                    matrices.vectorizer,
+                    future.result(),
+                    tail_quantile=tail_quantile,
+                )
+            )
+    return results
+
+
 def _candidate_summary(result: Mapping[str, Any]) -> dict[str, Any]:
     return {
         "candidate": str(result.get("candidate") or ""),
         "metadata": result.get("metadata") or {},
         "residual_interval": result.get("residual_interval") or {},
+        "resources": result.get("resources") or {},
         "validation": result.get("validation") or {},
         "test": result.get("test") or {},
     }
@@ -1342,6 +1547,7 @@ def run_fast_sale_benchmark(
     *,
     split_kind: str = "grouped_forward",
     candidate_specs: Sequence[CandidateSpec] = FAST_SALE_BENCHMARK_CANDIDATE_SPECS,
+    workers: int = 1,
 ) -> dict[str, Any]:
     if split_kind != "grouped_forward":
         raise ValueError(
@@ -1352,15 +1558,15 @@ def run_fast_sale_benchmark(
     filtered_rows = _sold_only_rows(rows)
     validate_benchmark_rows(filtered_rows)
     split = split_grouped_forward_benchmark_rows(filtered_rows)
-    trained_candidates = [
-        _train_candidate(
-            spec,
-            split,
-            tail_quantile=0.9,
-            feature_builder=_fast_sale_feature_dict,
-        )
-        for spec in candidate_specs
-    ]
+    started = time.perf_counter()
+    trained_candidates = _train_candidates(
+        candidate_specs,
+        split,
+        tail_quantile=0.9,
+        feature_builder=_fast_sale_feature_dict,
+        workers=workers,
+    )
+    wall_seconds = time.perf_counter() - started
     candidate_results = [_candidate_summary(result) for result in trained_candidates]
     ranking = _fast_sale_ranking_rows(candidate_results)
     best_candidate = ranking[0] if ranking else {}
@@ -1394,6 +1600,7 @@ def run_fast_sale_benchmark(
             ),
         },
         "row_count": len(filtered_rows),
+        "training": {"workers": workers, "wall_seconds": round(wall_seconds, 4)},
         "candidate_results": candidate_results,
         "ranking": ranking,
         "best_candidate": best_candidate,
@@ -1405,6 +1612,7 @@ def run_pricing_benchmark(
     *,
     split_kind: str = "forward",
     candidate_specs: Sequence[CandidateSpec] = BENCHMARK_CANDIDATE_SPECS,
+    workers: int = 1,
 ) -> dict[str, Any]:
     if split_kind != "forward":
         raise ValueError(
@@ -1412,7 +1620,9 @@ def run_pricing_benchmark(
         )
     validate_benchmark_rows(rows)
     split = split_benchmark_rows(rows)
-    trained_candidates = [_train_candidate(spec, split) for spec in candidate_specs]
+    started = time.perf_counter()
+    trained_candidates = _train_candidates(candidate_specs, split, workers=workers)
+    wall_seconds = time.perf_counter() - started
     candidate_results = [_candidate_summary(result) for result in trained_candidates]
     ranking = sorted(
         (
@@ -1445,6 +1655,7 @@ def run_pricing_benchmark(
             ),
             "test_start_as_of_ts": str(split["test"][0].get("as_of_ts") or ""),
         },
+        "training": {"workers": workers, "wall_seconds": round(wall_seconds, 4)},
         "candidate_results": candidate_results,
         "ranking": ranking,
         "best_candidate": best_candidate,
@@ -1491,9 +1702,31 @@ def format_benchmark_report(report: Mapping[str, Any]) -> str:
         lines.append(
             f"Top single-model: {top_single['candidate']} (val MDAPE={top_single['validation_mdape']:.4f}, test MDAPE={top_single['test_mdape']:.4f})"
         )
+    lines.extend(_format_resource_lines(report))
     return "\n".join(lines) + "\n"
 
 
+def _format_resource_lines(report: Mapping[str, Any]) -> list[str]:
+    results = [
+        result
+        for result in report.get("candidate_results", [])
+        if result.get("resources")
+    ]
+    if not results:
+        return []
+    training = report.get("training") or {}
+    lines = [
+        "",
+        f"Training: workers={training.get('workers', 1)} wall={training.get('wall_seconds', 0.0):.2f}s",
+    ]
+    for result in results:
+        resources = result["resources"]
+        lines.append(
+            f"- {result['candidate']}: fit={resources['fit_seconds']:.2f}s predict={resources['predict_seconds']:.2f}s peak_rss={resources['peak_rss_mb']:.1f}MB"
+        )
+    return lines
+
+
 def _write_report_bundle(
     report: Mapping[str, Any],
     output_path: str | Path,
@@ -1566,6 +1799,7 @@ def format_fast_sale_benchmark_report(report: Mapping[str, Any]) -> str:
                 f"Best candidate: {best.get('candidate', 'unknown')} (val tail MDAPE={best.get('validation_tail_mdape', 0.0):.4f}, test tail MDAPE={best.get('test_tail_mdape', 0.0):.4f})",
             ]
         )
+    lines.extend(_format_resource_lines(report))
     return "\n".join(lines) + "\n"
 
 
@@ -1751,9 +1985,9 @@ def save_item_family_benchmark_artifacts(
 
 
 def save_benchmark_artifacts(
-    rows: Sequence[Mapping[str, Any]], output_path: str | Path
+    rows: Sequence[Mapping[str, Any]], output_path: str | Path, *, workers: int = 1
 ) -> dict[str, Any]:
-    report = run_pricing_benchmark(rows)
+    report = run_pricing_benchmark(rows, workers=workers)
     text_output = Path(output_path).suffix.lower() in {".txt", ".md"}
     artifacts = write_benchmark_report(report, output_path, text_output=text_output)
     bundle_path = Path(output_path).parent / f"{Path(output_path).name}.joblib"
@@ -1771,15 +2005,18 @@ def run_mirage_iron_ring_branch_benchmark(
     rows: Sequence[Mapping[str, Any]],
     *,
     candidate_specs: Sequence[CandidateSpec] = BENCHMARK_CANDIDATE_SPECS,
+    workers: int = 1,
 ) -> dict[str, Any]:
     validate_benchmark_rows(rows)
     split = split_grouped_forward_benchmark_rows_by_field(
         rows, group_field="normalized_affix_hash"
     )
-    trained_candidates = [
-        _train_candidate(spec, split, feature_builder=_mirage_feature_dict)
-        for spec in candidate_specs
-    ]
+    trained_candidates = _train_candidates(
+        candidate_specs,
+        split,
+        feature_builder=_mirage_feature_dict,
+        workers=workers,
+    )
     candidate_results = [_candidate_summary(result) for result in trained_candidates]
     ranking = sorted(
         (
@@ -7,6 +7,7 @@ from importlib import import_module
 from typing import Any, cast
 
 from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import query_rows
 
 from .sql import TRAINING_SOURCE_TABLE
 
@@ -22,10 +23,7 @@ def _quote(value: str) -> str:
 
 
 def _query_rows(client: ClickHouseClient, query: str) -> list[dict[str, Any]]:
-    payload = client.execute(query).strip()
-    if not payload:
-        return []
-    return [json.loads(line) for line in payload.splitlines() if line.strip()]
+    return query_rows(client, query)
 
 
 def _insert_json_rows(
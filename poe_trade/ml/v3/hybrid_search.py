@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import UTC, datetime, timedelta
 from time import monotonic
 from typing import Any
@@ -9,6 +10,8 @@ from typing import Any
 import json
 import math
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class SearchResult:
@@ -20,6 +23,33 @@ class SearchResult:
     degradation_reason: str | None
 
 
+class CandidatePool:
+    def __init__(self) -> None:
+        self._rows: dict[tuple[str, str], list[Mapping[str, Any]]] = {}
+
+    def add_rows(
+        self,
+        *,
+        route: str,
+        item_state_keys: Sequence[str],
+        rows: Sequence[Mapping[str, Any]],
+    ) -> None:
+        for item_state_key in item_state_keys:
+            self._rows.setdefault((route, str(item_state_key)), [])
+        for row in rows:
+            key = (route, str(_row_field(row, "item_state_key") or ""))
+            if key in self._rows:
+                self._rows[key].append(row)
+
+    def rows_for(
+        self, *, route: str, item_state_key: str
+    ) -> list[Mapping[str, Any]] | None:
+        return self._rows.get((route, item_state_key))
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._rows.values())
+
+
 _DEFAULT_STAGE_SUPPORT_TARGETS = {1: 8, 2: 12, 3: 18, 4: 24}
 _MAX_CANDIDATES = 64
 _DEFAULT_LATENCY_BUDGET_MS = 150
@@ -40,6 +70,9 @@ _MISSING_AFFIX_PENALTY = {
     1: -0.20,
 }
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
 
 def _to_float(value: Any) -> float:
     try:
@@ -162,6 +195,19 @@ def _coerce_mod_payload(raw: Any) -> dict[str, float]:
     return coalesced
 
 
+@lru_cache(maxsize=16384)
+def _cached_mod_payload(raw: str) -> Mapping[str, float]:
+    # Shared across searches over the same pooled rows; callers must not mutate.
+    return _coerce_mod_payload(raw)
+
+
+def _row_mod_payload(row: Mapping[str, Any]) -> Mapping[str, float]:
+    raw = _row_field(row, "mod_features_json", "mods", "mod_features")
+    if isinstance(raw, str):
+        return _cached_mod_payload(raw)
+    return _coerce_mod_payload(raw)
+
+
 def _row_field(row: Mapping[str, Any], *keys: str) -> Any:
     for key in keys:
         if key in row:
@@ -186,6 +232,23 @@ def _parse_row_datetime(raw: Any) -> datetime | None:
     return parsed
 
 
+@lru_cache(maxsize=16384)
+def _cached_epoch_us(raw: str) -> int | None:
+    parsed = _parse_row_datetime(raw)
+    if parsed is None:
+        return None
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def _row_epoch_us(raw: Any) -> int | None:
+    if isinstance(raw, str):
+        return _cached_epoch_us(raw)
+    parsed = _parse_row_datetime(raw)
+    if parsed is None:
+        return None
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
 def _recency_score(raw_ts: Any, *, now_utc: datetime | None = None) -> float:
     parsed = _parse_row_datetime(raw_ts)
     if parsed is None:
@@ -607,6 +670,276 @@ def _search_stage(
     ]
 
 
+@dataclass(frozen=True)
+class _CandidateMatrix:
+    """Per-search columnar view of the cohort rows.
+
+    ``values``/``present`` are ``rows x important_affixes``; ``values`` holds
+    ``_to_float`` of the candidate roll (0.0 when absent) and ``present`` the
+    key presence used for overlap scoring.
+    """
+
+    rows: list[Mapping[str, Any]]
+    core_state: np.ndarray
+    values: np.ndarray
+    present: np.ndarray
+    target_values: np.ndarray
+    target_present: np.ndarray
+    recency: np.ndarray
+    quality: np.ndarray
+    identity_rank: np.ndarray
+    identities: list[str]
+
+
+def _build_candidate_matrix(
+    *,
+    rows: list[Mapping[str, Any]],
+    parsed_item: Mapping[str, Any],
+    important_affixes: list[tuple[str, float, int]],
+    now_utc: datetime,
+) -> _CandidateMatrix | None:
+    affixes = [affix for affix, _importance, _support in important_affixes]
+    if len(set(affixes)) != len(affixes):
+        # Duplicate affix names change the matched/missing list semantics.
+        return None
+    target_payload = _coerce_mod_payload(parsed_item.get("mod_features_json"))
+    target_values = np.array(
+        [_to_float(target_payload.get(affix)) for affix in affixes], dtype=np.float64
+    )
+    target_present = np.array(
+        [affix in target_payload for affix in affixes], dtype=bool
+    )
+    if not np.isfinite(target_values).all():
+        return None
+
+    row_count = len(rows)
+    affix_count = len(affixes)
+    values = np.zeros((row_count, affix_count), dtype=np.float64)
+    present = np.zeros((row_count, affix_count), dtype=bool)
+    core_state = np.zeros(row_count, dtype=bool)
+    observed_us = np.zeros(row_count, dtype=np.int64)
+    observed_valid = np.zeros(row_count, dtype=bool)
+    quality = np.zeros(row_count, dtype=np.float64)
+    identities: list[str] = []
+    for index, row in enumerate(rows):
+        core_state[index] = _row_matches_core_state(row, parsed_item)
+        if affix_count:
+            payload = _row_mod_payload(row)
+            for column, affix in enumerate(affixes):
+                if affix in payload:
+                    present[index, column] = True
+                    values[index, column] = payload[affix]
+        observed = _row_epoch_us(
+            _row_field(row, "as_of_ts", "candidate_as_of_ts")
+        )
+        if observed is not None:
+            observed_us[index] = observed
+            observed_valid[index] = True
+        quality[index] = _extract_support(row)
+        identities.append(
+            str(_row_field(row, "identity_key", "candidate_identity_key") or "")
+        )
+    if not np.isfinite(values).all():
+        return None
+
+    age_us = ((now_utc - _EPOCH) // _MICROSECOND) - observed_us
+    age_days = (age_us / 1_000_000) / (24.0 * 3600.0)
+    recency = np.where(
+        age_us <= 0,
+        1.0,
+        np.maximum(0.0, 1.0 - age_days / float(_RECENCY_WINDOW_DAYS)),
+    )
+    recency = np.where(observed_valid, recency, 0.0)
+
+    # Equal identities share a rank so the stable sort keeps row order.
+    identity_rank = np.zeros(row_count, dtype=np.int64)
+    previous: str | None = None
+    rank = -1
+    for index in sorted(range(row_count), key=identities.__getitem__):
+        if identities[index] != previous:
+            rank += 1
+            previous = identities[index]
+        identity_rank[index] = rank
+
+    return _CandidateMatrix(
+        rows=rows,
+        core_state=core_state,
+        values=values,
+        present=present,
+        target_values=target_values,
+        target_present=target_present,
+        recency=recency,
+        quality=quality,
+        identity_rank=identity_rank,
+        identities=identities,
+    )
+
+
+def _stage_mask(matrix: _CandidateMatrix, stage: int) -> np.ndarray:
+    mask = matrix.core_state.copy()
+    if not matrix.values.shape[1]:
+        return mask
+    values = matrix.values
+    targets = matrix.target_values
+    if stage in {1, 2}:
+        mask &= (values != 0.0).all(axis=1)
+    if stage == 1:
+        mask &= ((targets == 0.0) | (values == targets)).all(axis=1)
+    if stage == 2:
+        mask &= ((targets == 0.0) | (np.abs(targets - values) <= 1.0)).all(axis=1)
+    if stage == 3:
+        mask &= (values[:, :2] != 0.0).all(axis=1)
+    return mask
+
+
+def _score_stage_matrix(
+    matrix: _CandidateMatrix,
+    *,
+    indices: np.ndarray,
+    important_affixes: list[tuple[str, float, int]],
+    stage: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized ``_score_candidate``; returns ``(scores, missing)``.
+
+    Additions run in the same order as the scalar path so scores are
+    bit-identical to it.
+    """
+    row_count = len(indices)
+    affix_count = len(important_affixes)
+    missing = np.zeros((row_count, affix_count), dtype=bool)
+    if not affix_count:
+        overlap_score: Any = _SEARCH_WEIGHTS["important_affix_overlap"]
+        tier_score: Any = _SEARCH_WEIGHTS["tier_proximity"]
+        roll_score: Any = _SEARCH_WEIGHTS["roll_closeness"]
+        rare_bonus: Any = 0.0
+        penalty: Any = 0.0
+    else:
+        values = matrix.values[indices]
+        present = matrix.present[indices]
+        missing = ~present
+        tier_sum = np.zeros(row_count, dtype=np.float64)
+        roll_sum = np.zeros(row_count, dtype=np.float64)
+        scored_count = np.zeros(row_count, dtype=np.int64)
+        for rank in range(affix_count):
+            present_column = present[:, rank]
+            if matrix.target_present[rank]:
+                delta = np.abs(matrix.target_values[rank] - values[:, rank])
+                if stage == 1:
+                    rejected = present_column & (delta > 0)
+                    missing[:, rank] |= rejected
+                    scored = present_column & ~rejected
+                    tier = np.ones(row_count, dtype=np.float64)
+                elif stage == 2:
+                    scored = present_column
+                    tier = np.maximum(0.0, 1.0 - 0.08 * np.minimum(delta, 2.0))
+                else:
+                    scored = present_column
+                    tier = np.ones(row_count, dtype=np.float64)
+                roll = np.maximum(0.0, 1.0 - np.minimum(delta, 1.0))
+                tier_sum = tier_sum + np.where(scored, tier, 0.0)
+                roll_sum = roll_sum + np.where(scored, roll, 0.0)
+                scored_count += scored
+            elif rank < 2:
+                scored_count += present_column
+
+        divisor = np.maximum(scored_count, 1)
+        tier_score = np.where(
+            scored_count > 0,
+            (tier_sum / divisor) * _SEARCH_WEIGHTS["tier_proximity"],
+            0.0,
+        )
+        roll_score = np.where(
+            scored_count > 0,
+            (roll_sum / divisor) * _SEARCH_WEIGHTS["roll_closeness"],
+            0.0,
+        )
+        overlap_score = (present.sum(axis=1) / affix_count) * _SEARCH_WEIGHTS[
+            "important_affix_overlap"
+        ]
+        rare_bonus = (
+            present[:, 0].astype(np.float64)
+            if important_affixes[0][1] >= 7.0
+            else 0.0
+        )
+        penalty = np.zeros(row_count, dtype=np.float64)
+        for index in range(affix_count):
+            penalty = penalty + np.where(
+                missing[:, index], _MISSING_AFFIX_PENALTY.get(index, -0.10), 0.0
+            )
+
+    score = (
+        _SEARCH_WEIGHTS["base_item_state"]
+        + overlap_score
+        + tier_score
+        + roll_score
+        + (_SEARCH_WEIGHTS["rare_affix_bonus"] * rare_bonus)
+        + (_SEARCH_WEIGHTS["recency"] * matrix.recency[indices])
+        + (_SEARCH_WEIGHTS["listing_quality"] * matrix.quality[indices])
+        + penalty
+    )
+    return np.clip(score, 0.0, 1.0), missing
+
+
+def _candidate_from_matrix(
+    matrix: _CandidateMatrix,
+    *,
+    row_index: int,
+    score: float,
+    missing: np.ndarray,
+    important_affixes: list[tuple[str, float, int]],
+) -> dict[str, Any]:
+    row = matrix.rows[row_index]
+    present = matrix.present[row_index]
+    return {
+        "identity_key": matrix.identities[row_index],
+        "price": _to_float(
+            _row_field(row, "target_price_chaos", "candidate_price_chaos")
+        ),
+        "score": score,
+        "matched_affixes": [
+            affix
+            for rank, (affix, _importance, _support) in enumerate(important_affixes)
+            if present[rank] and not missing[rank]
+        ],
+        "missing_affixes": [
+            affix
+            for rank, (affix, _importance, _support) in enumerate(important_affixes)
+            if missing[rank]
+        ],
+        "observed_at": _row_field(row, "as_of_ts", "candidate_as_of_ts"),
+        "support": _to_float(
+            _row_field(row, "support_count_recent", "target_support_count", "support")
+        ),
+    }
+
+
+def _search_stage_matrix(
+    matrix: _CandidateMatrix,
+    *,
+    stage: int,
+    important_affixes: list[tuple[str, float, int]],
+    max_candidates: int,
+) -> tuple[list[dict[str, Any]], int, int]:
+    indices = np.flatnonzero(_stage_mask(matrix, stage))
+    scores, missing = _score_stage_matrix(
+        matrix, indices=indices, important_affixes=important_affixes, stage=stage
+    )
+    # Same order as ``_sort_identity``: scored items carry no as_of_ts, so the
+    # tie-break after score is the identity key, then row order.
+    order = np.lexsort((matrix.identity_rank[indices], -scores))
+    candidates = [
+        _candidate_from_matrix(
+            matrix,
+            row_index=int(indices[position]),
+            score=float(scores[position]),
+            missing=missing[position],
+            important_affixes=important_affixes,
+        )
+        for position in order[:max_candidates]
+    ]
+    return candidates, len(indices), int((scores > 0.0).sum())
+
+
 def score_confidence(
     *,
     stage: int,
@@ -657,6 +990,7 @@ def run_search(
     max_candidates: int = _MAX_CANDIDATES,
     latency_budget_ms: int = _DEFAULT_LATENCY_BUDGET_MS,
     now_utc: datetime | None = None,
+    vectorized: bool = True,
 ) -> SearchResult:
     important_affixes = _normalize_important_affixes(ranked_affixes)
     stage_support_targets = {
@@ -688,44 +1022,64 @@ def run_search(
             rows=rows, max_candidates=safe_max_candidates
         )
 
+    matrix = (
+        _build_candidate_matrix(
+            rows=rows,
+            parsed_item=parsed_item,
+            important_affixes=important_affixes,
+            now_utc=effective_now_utc,
+        )
+        if vectorized
+        else None
+    )
+
     for stage in (1, 2, 3, 4):
         if _budget_exceeded():
             return _deterministic_latency_fallback(
                 rows=rows,
                 max_candidates=safe_max_candidates,
             )
-        matching_rows = _search_stage(
-            stage=stage,
-            parsed_item=parsed_item,
-            rows=rows,
-            important_affixes=important_affixes,
-        )
-        scored: list[dict[str, Any]] = []
-        for row in matching_rows:
-            if _budget_exceeded():
-                return _deterministic_latency_fallback(
-                    rows=rows,
-                    max_candidates=safe_max_candidates,
-                )
-            scored.append(
-                _score_candidate(
-                    row=row,
-                    parsed_item=parsed_item,
-                    important_affixes=important_affixes,
-                    stage=stage,
-                    now_utc=effective_now_utc,
+        if matrix is not None:
+            candidates, candidate_count, effective_support = _search_stage_matrix(
+                matrix,
+                stage=stage,
+                important_affixes=important_affixes,
+                max_candidates=safe_max_candidates,
+            )
+        else:
+            matching_rows = _search_stage(
+                stage=stage,
+                parsed_item=parsed_item,
+                rows=rows,
+                important_affixes=important_affixes,
+            )
+            scored: list[dict[str, Any]] = []
+            for row in matching_rows:
+                if _budget_exceeded():
+                    return _deterministic_latency_fallback(
+                        rows=rows,
+                        max_candidates=safe_max_candidates,
+                    )
+                scored.append(
+                    _score_candidate(
+                        row=row,
+                        parsed_item=parsed_item,
+                        important_affixes=important_affixes,
+                        stage=stage,
+                        now_utc=effective_now_utc,
+                    )
                 )
+            scored.sort(key=_sort_identity)
+            candidates = scored[:safe_max_candidates]
+            candidate_count = len(scored)
+            effective_support = sum(
+                1 for item in scored if (item.get("score") or 0.0) > 0.0
             )
         if _budget_exceeded():
             return _deterministic_latency_fallback(
                 rows=rows,
                 max_candidates=safe_max_candidates,
             )
-        scored.sort(key=_sort_identity)
-        candidate_count = len(scored)
-        effective_support = sum(
-            1 for item in scored if (item.get("score") or 0.0) > 0.0
-        )
         threshold = int(stage_support_targets.get(stage, 1))
 
         if stage == 3:
@@ -738,7 +1092,7 @@ def run_search(
             if effective_support > 0:
                 return SearchResult(
                     stage=4,
-                    candidates=scored[:safe_max_candidates],
+                    candidates=candidates,
                     dropped_affixes=dropped_affixes,
                     effective_support=effective_support,
                     candidate_count=candidate_count,
@@ -751,7 +1105,7 @@ def run_search(
         if effective_support >= threshold:
             return SearchResult(
                 stage=stage,
-                candidates=scored[:safe_max_candidates],
+                candidates=candidates,
                 dropped_affixes=dropped_affixes,
                 effective_support=effective_support,
                 candidate_count=candidate_count,
@@ -0,0 +1,229 @@
+"""Change detection for incremental v3 training cycles.
+
+Each route's training slice is fingerprinted by row count, latest ``as_of_ts``
+and an order-independent content digest (XOR of per-row hashes). Because the
+digest is an XOR, the digest of the rows a bundle was trained on can be
+recomputed over the prefix of the current slice, which tells an append-only
+delta apart from rewritten history.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import query_rows
+
+from . import sql
+from .backends import WARM_START_BACKENDS
+
+STATE_FILENAME = "training_state.json"
+
+# Columns that change what a bundle learns from a row.
+_DIGEST_COLUMNS = (
+    "identity_key",
+    "as_of_ts",
+    "target_price_chaos",
+    "target_fast_sale_24h_price",
+    "target_sale_probability_24h",
+    "label_weight",
+    "feature_vector_json",
+    "mod_features_json",
+)
+
+FULL_RETRAIN = "full"
+WARM_START = "warm_start"
+SKIP = "skip"
+
+
+@dataclass(frozen=True)
+class IncrementalPolicy:
+    full_retrain_hours: float = 24.0
+    warm_start_max_delta: float = 0.2
+    min_change_fraction: float = 0.01
+    warm_start_estimators: int = 20
+    max_warm_starts: int = 8
+
+
+@dataclass(frozen=True)
+class RouteFingerprint:
+    row_count: int
+    max_as_of_ts: str
+    digest: str
+
+
+@dataclass(frozen=True)
+class SliceFingerprint:
+    current: RouteFingerprint
+    prefix_row_count: int
+    prefix_digest: str
+
+
+@dataclass(frozen=True)
+class RouteTrainingState:
+    fingerprint: RouteFingerprint
+    model_backend: str
+    full_trained_at: str
+    warm_starts: int = 0
+
+
+@dataclass(frozen=True)
+class RoutePlan:
+    action: str
+    reason: str
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def load_slice_fingerprint(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    route: str,
+    train_limit: int,
+    since: str | None = None,
+) -> SliceFingerprint:
+    """Fingerprint the first ``train_limit`` rows of the route's training slice.
+
+    ``since`` is the ``max_as_of_ts`` of a previous fingerprint; rows up to it
+    are counted and digested separately so the caller can confirm the old
+    slice is still an untouched prefix.
+    """
+    prefix_condition = (
+        f"as_of_ts <= toDateTime64({_quote(since)}, 3, 'UTC')" if since else "0"
+    )
+    rows = query_rows(
+        client,
+        " ".join(
+            [
+                "SELECT",
+                "count() AS rows,",
+                "toString(max(as_of_ts)) AS max_as_of_ts,",
+                "toString(groupBitXor(row_hash)) AS digest,",
+                f"countIf({prefix_condition}) AS prefix_rows,",
+                f"toString(groupBitXorIf(row_hash, {prefix_condition}))",
+                "AS prefix_digest",
+                "FROM (",
+                "SELECT as_of_ts,",
+                f"cityHash64({', '.join(_DIGEST_COLUMNS)}) AS row_hash",
+                f"FROM {sql.TRAINING_SOURCE_TABLE}",
+                f"WHERE league = {_quote(league)} AND route = {_quote(route)}",
+                "AND target_price_chaos > 0",
+                "ORDER BY as_of_ts ASC, identity_key ASC",
+                f"LIMIT {max(int(train_limit), 0)}",
+                ")",
+                "FORMAT JSONEachRow",
+            ]
+        ),
+    )
+    row = rows[0] if rows else {}
+    row_count = int(row.get("rows") or 0)
+    return SliceFingerprint(
+        current=RouteFingerprint(
+            row_count=row_count,
+            max_as_of_ts=str(row.get("max_as_of_ts") or "") if row_count else "",
+            digest=str(row.get("digest") or "0"),
+        ),
+        prefix_row_count=int(row.get("prefix_rows") or 0),
+        prefix_digest=str(row.get("prefix_digest") or "0"),
+    )
+
+
+def plan_route_update(
+    state: RouteTrainingState | None,
+    fingerprint: SliceFingerprint,
+    *,
+    policy: IncrementalPolicy,
+    model_backend: str,
+    now: datetime | None = None,
+) -> RoutePlan:
+    if state is None:
+        return RoutePlan(FULL_RETRAIN, "no_previous_state")
+    if state.model_backend != model_backend:
+        return RoutePlan(FULL_RETRAIN, "backend_changed")
+    current = fingerprint.current
+    previous = state.fingerprint
+    if state.warm_starts > 0 and _full_retrain_due(state, policy=policy, now=now):
+        return RoutePlan(FULL_RETRAIN, "scheduled")
+    if current == previous:
+        return RoutePlan(SKIP, "unchanged")
+    if (
+        fingerprint.prefix_row_count != previous.row_count
+        or fingerprint.prefix_digest != previous.digest
+        or current.row_count <= previous.row_count
+    ):
+        return RoutePlan(FULL_RETRAIN, "history_changed")
+    delta_fraction = (current.row_count - previous.row_count) / max(
+        previous.row_count, 1
+    )
+    if delta_fraction < policy.min_change_fraction:
+        return RoutePlan(SKIP, "below_change_threshold")
+    if delta_fraction > policy.warm_start_max_delta:
+        return RoutePlan(FULL_RETRAIN, "large_delta")
+    if state.warm_starts >= policy.max_warm_starts:
+        return RoutePlan(FULL_RETRAIN, "warm_start_limit")
+    if model_backend not in WARM_START_BACKENDS:
+        return RoutePlan(FULL_RETRAIN, "warm_start_unsupported")
+    return RoutePlan(WARM_START, "appended_rows")
+
+
+def _full_retrain_due(
+    state: RouteTrainingState, *, policy: IncrementalPolicy, now: datetime | None
+) -> bool:
+    try:
+        trained_at = datetime.fromisoformat(state.full_trained_at)
+    except ValueError:
+        return True
+    if trained_at.tzinfo is None:
+        trained_at = trained_at.replace(tzinfo=UTC)
+    elapsed = (now or datetime.now(UTC)) - trained_at
+    return elapsed >= timedelta(hours=policy.full_retrain_hours)
+
+
+def read_training_state(route_dir: Path) -> RouteTrainingState | None:
+    path = route_dir / STATE_FILENAME
+    try:
+        payload: Any = json.loads(path.read_text(encoding="utf-8"))
+        return RouteTrainingState(
+            fingerprint=RouteFingerprint(**payload["fingerprint"]),
+            model_backend=str(payload["model_backend"]),
+            full_trained_at=str(payload["full_trained_at"]),
+            warm_starts=int(payload.get("warm_starts") or 0),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_training_state(route_dir: Path, state: RouteTrainingState) -> None:
+    route_dir.mkdir(parents=True, exist_ok=True)
+    _ = (route_dir / STATE_FILENAME).write_text(
+        json.dumps(asdict(state), indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+
+
+def clear_training_state(route_dir: Path) -> None:
+    (route_dir / STATE_FILENAME).unlink(missing_ok=True)
+
+
+__all__ = [
+    "FULL_RETRAIN",
+    "IncrementalPolicy",
+    "RouteFingerprint",
+    "RoutePlan",
+    "RouteTrainingState",
+    "SKIP",
+    "STATE_FILENAME",
+    "SliceFingerprint",
+    "WARM_START",
+    "clear_training_state",
+    "load_slice_fingerprint",
+    "plan_route_update",
+    "read_training_state",
+    "write_training_state",
+]
@@ -0,0 +1,117 @@
+"""Process pool used to fan v3 model fits out across CPU cores.
+
+Row batches are not pickled into the workers: the parent writes each feature
+matrix and target vector once as ``.npy`` files in a scratch directory and the
+workers open them with ``mmap_mode="r"``, so every fit of the same bundle reads
+the same page-cache backed arrays.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import shutil
+import tempfile
+import uuid
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from poe_trade.ml.runtime import detect_runtime_profile
+
+# Rough footprint of one route in flight besides its rows (fitted models,
+# vectorizer, pool bookkeeping).
+ROUTE_MEMORY_ESTIMATE_GB = 1.0
+# Rough peak cost of one training row: the decoded JSON row, its feature dict
+# and a dense float32 matrix row across the mod features.
+ROUTE_BYTES_PER_ROW = 16_384
+
+
+@dataclass(frozen=True)
+class TrainingCapacity:
+    workers: int
+    route_slots: int
+
+
+def estimate_route_memory_gb(rows: int) -> float:
+    return ROUTE_MEMORY_ESTIMATE_GB + max(0, int(rows)) * ROUTE_BYTES_PER_ROW / 2**30
+
+
+def resolve_training_capacity(
+    workers: int | None = None, *, route_rows: int = 0
+) -> TrainingCapacity:
+    """Size the process pool and how many routes may train at once.
+
+    ``route_rows`` is the row count of the largest route that will train; route
+    concurrency is limited so that many such routes fit the memory budget.
+    """
+    profile = detect_runtime_profile()
+    resolved_workers = profile.default_workers if workers is None else workers
+    resolved_workers = max(1, int(resolved_workers))
+    route_slots = int(profile.memory_budget_gb // estimate_route_memory_gb(route_rows))
+    return TrainingCapacity(
+        workers=resolved_workers,
+        route_slots=max(1, min(resolved_workers, route_slots)),
+    )
+
+
+def load_shared_array(directory: str, name: str) -> np.ndarray:
+    return np.load(Path(directory) / f"{name}.npy", mmap_mode="r")
+
+
+class TrainingPool:
+    """Spawn-based process pool plus the scratch space for shared arrays."""
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        scratch_root: str | None = None,
+        max_tasks_per_child: int | None = None,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self._scratch = tempfile.TemporaryDirectory(
+            prefix="poe-v3-train-", dir=scratch_root
+        )
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=max_tasks_per_child,
+        )
+
+    def __enter__(self) -> TrainingPool:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def share(self, arrays: Mapping[str, np.ndarray]) -> str:
+        directory = Path(self._scratch.name) / uuid.uuid4().hex
+        directory.mkdir()
+        for name, array in arrays.items():
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(array))
+        return str(directory)
+
+    def release(self, directory: str) -> None:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+        return self._executor.submit(fn, *args)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._scratch.cleanup()
+
+
+__all__ = [
+    "ROUTE_BYTES_PER_ROW",
+    "ROUTE_MEMORY_ESTIMATE_GB",
+    "TrainingCapacity",
+    "TrainingPool",
+    "estimate_route_memory_gb",
+    "load_shared_array",
+    "resolve_training_capacity",
+]
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import json
+import time
 import uuid
+from collections import OrderedDict
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from threading import Lock
+from typing import Any, Mapping, Sequence
 
 import joblib
 
+from poe_trade.config import constants
 from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import query_rows
 from poe_trade.ml import workflows
 
 from .features import build_feature_row
@@ -19,33 +24,92 @@ from .hybrid_anchor import build_anchor
 from .train import apply_residual_cap, _prediction_space_to_price
 from .sql import ROLLOUT_STATE_TABLE, TRAINING_SOURCE_TABLE
 
+DEFAULT_MODEL_DIR = "artifacts/ml"
+
+_BUNDLE_CACHE_MAX_ENTRIES = 16
+_BUNDLE_CACHE: OrderedDict[
+    tuple[str, str, str], tuple[tuple[int, int, int], dict[str, Any]]
+] = OrderedDict()
+_BUNDLE_CACHE_LOCK = Lock()
+
 
 def _quote(value: str) -> str:
     return "'" + value.replace("'", "''") + "'"
 
 
 def _query_rows(client: ClickHouseClient, query: str) -> list[dict[str, Any]]:
-    payload = client.execute(query).strip()
-    if not payload:
-        return []
-    return [json.loads(line) for line in payload.splitlines() if line.strip()]
+    return query_rows(client, query)
+
+
+def _bundle_path(*, model_dir: str, league: str, route: str) -> Path:
+    return Path(model_dir) / "v3" / league / route / "bundle.joblib"
+
+
+def _bundle_file_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
 
 
 def _load_bundle_if_present(
     *, model_dir: str, league: str, route: str
 ) -> dict[str, Any] | None:
-    path = Path(model_dir) / "v3" / league / route / "bundle.joblib"
+    path = _bundle_path(model_dir=model_dir, league=league, route=route)
     if not path.exists():
         return None
+    cache_key = (str(model_dir), league, route)
+    signature = _bundle_file_signature(path)
+    if signature is not None:
+        with _BUNDLE_CACHE_LOCK:
+            cached = _BUNDLE_CACHE.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                _BUNDLE_CACHE.move_to_end(cache_key)
+                return cached[1]
     try:
         payload = joblib.load(path)
     except Exception:
         return None
     if not isinstance(payload, dict):
         return None
+    if signature is not None:
+        with _BUNDLE_CACHE_LOCK:
+            _BUNDLE_CACHE[cache_key] = (signature, payload)
+            _BUNDLE_CACHE.move_to_end(cache_key)
+            while len(_BUNDLE_CACHE) > _BUNDLE_CACHE_MAX_ENTRIES:
+                _BUNDLE_CACHE.popitem(last=False)
     return payload
 
 
+def reset_bundle_cache(*, league: str | None = None) -> None:
+    with _BUNDLE_CACHE_LOCK:
+        if league is None:
+            _BUNDLE_CACHE.clear()
+            return
+        stale_keys = [key for key in _BUNDLE_CACHE if key[1] == league]
+        for key in stale_keys:
+            _BUNDLE_CACHE.pop(key, None)
+
+
+def warmup_bundle_cache(
+    *, league: str, model_dir: str = DEFAULT_MODEL_DIR
+) -> dict[str, str]:
+    league_dir = Path(model_dir) / "v3" / league
+    if not league_dir.is_dir():
+        return {}
+    route_states: dict[str, str] = {}
+    for path in sorted(league_dir.glob("*/bundle.joblib")):
+        route = path.parent.name
+        bundle = _load_bundle_if_present(
+            model_dir=model_dir, league=league, route=route
+        )
+        route_states[route] = (
+            "warm" if _is_valid_bundle_schema(bundle) else "bundle_invalid"
+        )
+    return route_states
+
+
 def _is_valid_bundle_schema(bundle: dict[str, Any] | None) -> bool:
     if not isinstance(bundle, dict):
         return False
@@ -112,7 +176,7 @@ def _safe_multiplier(raw: Any) -> float:
         return 0.9
 
 
-def _latest_fx_rate(client: ClickHouseClient, *, league: str) -> float:
+def _query_latest_fx_rate(client: ClickHouseClient, *, league: str) -> float | None:
     query = " ".join(
         [
             "SELECT chaos_equivalent AS rate",
@@ -124,16 +188,17 @@ def _latest_fx_rate(client: ClickHouseClient, *, league: str) -> float:
             "FORMAT JSONEachRow",
         ]
     )
-    try:
-        rows = _query_rows(client, query)
-    except Exception:
-        return 1.0
+    rows = _query_rows(client, query)
     if not rows:
-        return 1.0
+        return None
     try:
         return max(0.1, float(rows[0].get("rate") or 1.0))
     except (TypeError, ValueError):
-        return 1.0
+        return None
+
+
+def _latest_fx_rate(client: ClickHouseClient, *, league: str) -> float:
+    return _SERVING_CONTEXT.fx_rate(client, league=league)
 
 
 def _coerce_mod_payload(raw: Any) -> dict[str, float]:
@@ -330,7 +395,7 @@ def _resolve_rollout_bundle_key(
     return None
 
 
-def _load_promoted_rollout_rows(
+def _query_promoted_rollout_rows(
     client: ClickHouseClient, *, league: str
 ) -> list[dict[str, Any]]:
     query = " ".join(
@@ -342,10 +407,99 @@ def _load_promoted_rollout_rows(
             "FORMAT JSONEachRow",
         ]
     )
-    try:
-        return _query_rows(client, query)
-    except Exception:
-        return []
+    return _query_rows(client, query)
+
+
+def _load_promoted_rollout_rows(
+    client: ClickHouseClient, *, league: str
+) -> list[dict[str, Any]]:
+    return _SERVING_CONTEXT.promoted_rollout_rows(client, league=league)
+
+
+class ServingContext:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = constants.DEFAULT_ML_SERVING_CONTEXT_TTL_SECONDS,
+    ) -> None:
+        self._ttl_seconds = max(0.0, float(ttl_seconds))
+        self._lock = Lock()
+        self._entries: dict[tuple[str, str], tuple[float, Any]] = {}
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds
+
+    def configure(self, *, ttl_seconds: float) -> None:
+        with self._lock:
+            self._ttl_seconds = max(0.0, float(ttl_seconds))
+            self._entries.clear()
+
+    def fx_rate(self, client: ClickHouseClient, *, league: str) -> float:
+        cached = self._get("fx_rate", league)
+        if cached is not None:
+            return float(cached)
+        try:
+            rate = _query_latest_fx_rate(client, league=league)
+        except Exception:
+            return 1.0
+        if rate is None:
+            return 1.0
+        self._put("fx_rate", league, rate)
+        return rate
+
+    def promoted_rollout_rows(
+        self, client: ClickHouseClient, *, league: str
+    ) -> list[dict[str, Any]]:
+        cached = self._get("promoted_rollout_rows", league)
+        if cached is not None:
+            return [dict(row) for row in cached]
+        try:
+            rows = _query_promoted_rollout_rows(client, league=league)
+        except Exception:
+            return []
+        self._put("promoted_rollout_rows", league, [dict(row) for row in rows])
+        return rows
+
+    def invalidate(self, *, league: str | None = None) -> None:
+        with self._lock:
+            if league is None:
+                self._entries.clear()
+                return
+            stale_keys = [key for key in self._entries if key[1] == league]
+            for key in stale_keys:
+                self._entries.pop(key, None)
+
+    def _get(self, name: str, league: str) -> Any:
+        with self._lock:
+            entry = self._entries.get((name, league))
+            if entry is None:
+                return None
+            cached_at, value = entry
+            if time.monotonic() - cached_at > self._ttl_seconds:
+                self._entries.pop((name, league), None)
+                return None
+            return value
+
+    def _put(self, name: str, league: str, value: Any) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[(name, league)] = (time.monotonic(), value)
+
+
+_SERVING_CONTEXT = ServingContext()
+
+
+def configure_serving_context(*, ttl_seconds: float) -> None:
+    _SERVING_CONTEXT.configure(ttl_seconds=ttl_seconds)
+
+
+def invalidate_serving_context(*, league: str | None = None) -> None:
+    _SERVING_CONTEXT.invalidate(league=league)
+
+
+workflows.register_serving_cache_invalidator(invalidate_serving_context)
 
 
 def _select_serving_bundle(
@@ -379,14 +533,7 @@ def _select_serving_bundle(
     return selected_bundle
 
 
-def predict_one_v3(
-    client: ClickHouseClient,
-    *,
-    league: str,
-    clipboard_text: str,
-    model_dir: str = "artifacts/ml",
-) -> dict[str, Any]:
-    parsed = workflows._parse_clipboard_item(clipboard_text)
+def _prediction_identity(parsed: dict[str, Any]) -> dict[str, Any]:
     route = routes.select_route(parsed)
     cohort_identity = routes.assign_cohort(parsed)
     strategy_family = str(cohort_identity.get("strategy_family") or route)
@@ -400,156 +547,255 @@ def predict_one_v3(
     )
     feature_input = {**parsed, **cohort_identity}
     features = build_feature_row(feature_input)
-    parsed = {**feature_input, **features}
-    base_type = str(parsed.get("base_type") or "")
-    rarity = str(parsed.get("rarity") or "")
+    return {
+        "route": route,
+        "strategy_family": strategy_family,
+        "cohort_key": cohort_key,
+        "parent_cohort_key": parent_cohort_key,
+        "parsed": {**feature_input, **features},
+        "features": features,
+    }
 
-    retrieval_rows: list[dict[str, Any]] = []
-    try:
-        retrieval_query = sql.build_retrieval_candidate_query(
-            league=league,
-            route=route,
-            item_state_key=str(parsed.get("item_state_key") or ""),
-            limit=2000,
+
+def _item_state_key(prepared: dict[str, Any]) -> str:
+    return str(prepared["parsed"].get("item_state_key") or "")
+
+
+def prefetch_candidate_pool(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    prepared_items: Sequence[dict[str, Any]],
+) -> hybrid_search.CandidatePool:
+    keys_by_route: dict[str, set[str]] = {}
+    for prepared in prepared_items:
+        keys_by_route.setdefault(prepared["route"], set()).add(
+            _item_state_key(prepared)
         )
-        retrieval_rows = _query_rows(client, retrieval_query)
-    except Exception:
-        retrieval_rows = []
+    pool = hybrid_search.CandidatePool()
+    for route, item_state_keys in sorted(keys_by_route.items()):
+        ordered_keys = sorted(item_state_keys)
+        try:
+            rows = _query_rows(
+                client,
+                sql.build_retrieval_candidate_pool_query(
+                    league=league,
+                    route=route,
+                    item_state_keys=ordered_keys,
+                    limit=2000,
+                ),
+            )
+        except Exception:
+            continue
+        pool.add_rows(route=route, item_state_keys=ordered_keys, rows=rows)
+    return pool
+
+
+def _attach_search(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    prepared: dict[str, Any],
+    candidate_pool: hybrid_search.CandidatePool | None = None,
+) -> dict[str, Any]:
+    route = prepared["route"]
+    parsed = prepared["parsed"]
+    item_state_key = _item_state_key(prepared)
+    pooled_rows = (
+        candidate_pool.rows_for(route=route, item_state_key=item_state_key)
+        if candidate_pool is not None
+        else None
+    )
+    retrieval_rows: list[dict[str, Any]] = []
+    if pooled_rows is not None:
+        retrieval_rows = list(pooled_rows)
+    else:
+        try:
+            retrieval_query = sql.build_retrieval_candidate_query(
+                league=league,
+                route=route,
+                item_state_key=item_state_key,
+                limit=2000,
+            )
+            retrieval_rows = _query_rows(client, retrieval_query)
+        except Exception:
+            retrieval_rows = []
     search = hybrid_search.run_search(
         parsed_item=parsed,
         candidate_rows=retrieval_rows,
         ranked_affixes=_ranked_affixes_for_item(parsed),
         max_candidates=64,
     )
-    anchor = build_anchor(list(search.candidates))
-
-    bundle = _load_bundle_if_present(model_dir=model_dir, league=league, route=route)
-    if not _is_valid_bundle_schema(bundle):
-        bundle = None
-    elif isinstance(bundle, dict):
-        promoted_rows = _load_promoted_rollout_rows(client, league=league)
-        bundle = _select_serving_bundle(
-            bundle=bundle,
-            strategy_family=strategy_family,
-            cohort_key=cohort_key,
-            parent_cohort_key=parent_cohort_key,
-            promoted_rows=promoted_rows,
-        )
-        if not _is_valid_bundle_schema(bundle):
-            bundle = None
-    p10 = 0.1
-    p50 = 0.1
-    p90 = 0.1
-    sale_prob = 0.5
-    support = 0
-    confidence = 0.25
-    source = "v3_median_fallback"
-    fast_sale = 0.1
-
-    if bundle is not None:
+    return {
+        **prepared,
+        "search": search,
+        "anchor": build_anchor(list(search.candidates)),
+    }
+
+
+def _predict_bundle_outputs(
+    bundle: dict[str, Any], feature_rows: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    metadata = bundle.get("metadata") or {}
+    prediction_space = str(metadata.get("prediction_space") or "price")
+    support = int(metadata.get("row_count") or 0)
+    rows = [{**features, "support_count_recent": support} for features in feature_rows]
+    X = bundle["vectorizer"].transform(rows)
+    models = bundle["models"]
+    raw_p10 = models["p10"].predict(X)
+    raw_p50 = models["p50"].predict(X)
+    raw_p90 = models["p90"].predict(X)
+    outputs = [
+        {
+            "p10": _prediction_space_to_price(
+                float(raw_p10[index]), prediction_space=prediction_space
+            ),
+            "p50": _prediction_space_to_price(
+                float(raw_p50[index]), prediction_space=prediction_space
+            ),
+            "p90": _prediction_space_to_price(
+                float(raw_p90[index]), prediction_space=prediction_space
+            ),
+            "sale_probability": 0.5,
+            "fast_sale": None,
+            "support": support,
+        }
+        for index in range(len(rows))
+    ]
+
+    sale_model = models.get("sale_probability")
+    sale_predict_proba = getattr(sale_model, "predict_proba", None)
+    sale_predict = getattr(sale_model, "predict", None)
+    sale_result: Any = None
+    try:
+        if callable(sale_predict_proba):
+            sale_result = [row[1] for row in sale_predict_proba(X)]
+        elif callable(sale_predict):
+            sale_result = sale_predict(X)
+    except Exception:
+        sale_result = None
+    if sale_result is not None:
+        for index, output in enumerate(outputs):
+            try:
+                output["sale_probability"] = float(sale_result[index])
+            except Exception:
+                output["sale_probability"] = 0.5
+
+    fast_sale_model = models.get("fast_sale_24h")
+    fast_sale_predict = getattr(fast_sale_model, "predict", None)
+    if callable(fast_sale_predict):
         try:
-            metadata = bundle.get("metadata") or {}
-            prediction_space = str(metadata.get("prediction_space") or "price")
-            price_unit = str(metadata.get("price_unit") or "chaos")
-            features = dict(features)
-            features["support_count_recent"] = int(metadata.get("row_count") or 0)
-            vectorizer = bundle["vectorizer"]
-            X = vectorizer.transform([features])
-            models = bundle["models"]
-            raw_p10 = float(models["p10"].predict(X)[0])
-            raw_p50 = float(models["p50"].predict(X)[0])
-            raw_p90 = float(models["p90"].predict(X)[0])
-            p10 = _prediction_space_to_price(raw_p10, prediction_space=prediction_space)
-            p50 = _prediction_space_to_price(raw_p50, prediction_space=prediction_space)
-            p90 = _prediction_space_to_price(raw_p90, prediction_space=prediction_space)
-            p10 = max(0.1, p10)
-            p50 = max(p10, p50)
-            p90 = max(p50, p90)
-            fx_rate = (
-                _latest_fx_rate(client, league=league)
-                if price_unit == "divine"
-                else 1.0
-            )
-            if price_unit == "divine":
-                p10 *= fx_rate
-                p50 *= fx_rate
-                p90 *= fx_rate
-            sale_model = models.get("sale_probability")
-            sale_predict_proba = getattr(sale_model, "predict_proba", None)
-            sale_predict = getattr(sale_model, "predict", None)
-            if callable(sale_predict_proba):
-                try:
-                    sale_result: Any = sale_predict_proba(X)
-                    sale_prob = float(sale_result[0][1])
-                except Exception:
-                    sale_prob = 0.5
-            elif callable(sale_predict):
-                try:
-                    sale_result = sale_predict(X)
-                    sale_prob = float(sale_result[0])
-                except Exception:
-                    sale_prob = 0.5
-            else:
-                sale_prob = 0.5
-            sale_prob = max(0.0, min(1.0, sale_prob))
-            support = int(features.get("support_count_recent") or 0)
-            confidence = _confidence_from_support_and_interval(
-                support=support,
-                p10=p10,
-                p50=p50,
-                p90=p90,
-            )
-            multiplier = _safe_multiplier(
-                bundle.get("fallback_fast_sale_multiplier") or 0.9
-            )
-            fast_sale_model = models.get("fast_sale_24h")
-            fast_sale_predict = getattr(fast_sale_model, "predict", None)
-            if not callable(fast_sale_predict):
-                fast_sale = max(0.1, p50 * multiplier)
-            else:
+            fast_sale_result: Any = fast_sale_predict(X)
+        except Exception:
+            fast_sale_result = None
+        if fast_sale_result is not None:
+            for index, output in enumerate(outputs):
                 try:
-                    fast_sale_result: Any = fast_sale_predict(X)
-                    fast_sale = _prediction_space_to_price(
-                        float(fast_sale_result[0]), prediction_space=prediction_space
+                    output["fast_sale"] = _prediction_space_to_price(
+                        float(fast_sale_result[index]),
+                        prediction_space=prediction_space,
                     )
                 except Exception:
-                    fast_sale = max(0.1, p50 * multiplier)
-            if price_unit == "divine":
-                fast_sale *= fx_rate
-            fast_sale = max(0.1, fast_sale * 0.95)
-            source = "v3_model"
-
-            if search.stage > 0 and anchor.anchor_price is not None:
-                fair_residual = p50 - float(anchor.anchor_price)
-                fast_residual = fast_sale - float(anchor.anchor_price)
-                capped = apply_residual_cap(
-                    anchor_price=anchor.anchor_price,
-                    confidence=confidence,
-                    fair_residual=fair_residual,
-                    fast_residual=fast_residual,
-                )
-                p50 = max(0.1, float(capped["fair_value"]))
-                p10 = max(0.1, p50 * 0.85)
-                p90 = max(p50, p50 * 1.15)
-                fast_sale = max(0.1, float(capped["fast_sale"]))
-                source = "v3_hybrid"
-        except Exception:
-            bundle = None
+                    output["fast_sale"] = None
+    return outputs
 
-    if bundle is None:
-        p50, support = _median_fallback(
-            client,
-            league=league,
-            route=route,
-            base_type=base_type,
-            rarity=rarity,
+
+def _model_prediction(
+    *,
+    bundle: dict[str, Any],
+    output: dict[str, Any],
+    prepared: dict[str, Any],
+    fx_rate: float,
+) -> dict[str, Any]:
+    metadata = bundle.get("metadata") or {}
+    price_unit = str(metadata.get("price_unit") or "chaos")
+    p10 = max(0.1, float(output["p10"]))
+    p50 = max(p10, float(output["p50"]))
+    p90 = max(p50, float(output["p90"]))
+    if price_unit == "divine":
+        p10 *= fx_rate
+        p50 *= fx_rate
+        p90 *= fx_rate
+    sale_prob = max(0.0, min(1.0, float(output["sale_probability"])))
+    support = int(output["support"])
+    confidence = _confidence_from_support_and_interval(
+        support=support,
+        p10=p10,
+        p50=p50,
+        p90=p90,
+    )
+    multiplier = _safe_multiplier(bundle.get("fallback_fast_sale_multiplier") or 0.9)
+    if output["fast_sale"] is None:
+        fast_sale = max(0.1, p50 * multiplier)
+    else:
+        fast_sale = float(output["fast_sale"])
+    if price_unit == "divine":
+        fast_sale *= fx_rate
+    fast_sale = max(0.1, fast_sale * 0.95)
+    source = "v3_model"
+
+    search = prepared["search"]
+    anchor = prepared["anchor"]
+    if search.stage > 0 and anchor.anchor_price is not None:
+        fair_residual = p50 - float(anchor.anchor_price)
+        fast_residual = fast_sale - float(anchor.anchor_price)
+        capped = apply_residual_cap(
+            anchor_price=anchor.anchor_price,
+            confidence=confidence,
+            fair_residual=fair_residual,
+            fast_residual=fast_residual,
         )
+        p50 = max(0.1, float(capped["fair_value"]))
         p10 = max(0.1, p50 * 0.85)
         p90 = max(p50, p50 * 1.15)
-        confidence = 0.25 if support < 20 else 0.45
-        sale_prob = 0.35 if support < 20 else 0.55
-        source = "v3_median_fallback"
-        fast_sale = max(0.1, p50 * 0.9 * 0.95)
+        fast_sale = max(0.1, float(capped["fast_sale"]))
+        source = "v3_hybrid"
+    return {
+        "p10": p10,
+        "p50": p50,
+        "p90": p90,
+        "sale_probability": sale_prob,
+        "support": support,
+        "confidence": confidence,
+        "fast_sale": fast_sale,
+        "source": source,
+    }
+
+
+def _median_fallback_prediction(
+    client: ClickHouseClient, *, league: str, prepared: dict[str, Any]
+) -> dict[str, Any]:
+    parsed = prepared["parsed"]
+    p50, support = _median_fallback(
+        client,
+        league=league,
+        route=prepared["route"],
+        base_type=str(parsed.get("base_type") or ""),
+        rarity=str(parsed.get("rarity") or ""),
+    )
+    return {
+        "p10": max(0.1, p50 * 0.85),
+        "p50": p50,
+        "p90": max(p50, p50 * 1.15),
+        "sale_probability": 0.35 if support < 20 else 0.55,
+        "support": support,
+        "confidence": 0.25 if support < 20 else 0.45,
+        "fast_sale": max(0.1, p50 * 0.9 * 0.95),
+        "source": "v3_median_fallback",
+    }
+
+
+def _prediction_payload(
+    *, prepared: dict[str, Any], prediction: dict[str, Any]
+) -> dict[str, Any]:
+    search = prepared["search"]
+    anchor = prepared["anchor"]
+    p10 = prediction["p10"]
+    p50 = prediction["p50"]
+    p90 = prediction["p90"]
+    sale_prob = prediction["sale_probability"]
+    confidence = prediction["confidence"]
+    source = prediction["source"]
 
     now = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
     prediction_id = str(uuid.uuid4())
@@ -573,22 +819,22 @@ def predict_one_v3(
     return {
         "prediction_id": prediction_id,
         "prediction_as_of_ts": now,
-        "route": route,
-        "strategy_family": strategy_family,
-        "cohort_key": cohort_key,
-        "parent_cohort_key": parent_cohort_key,
+        "route": prepared["route"],
+        "strategy_family": prepared["strategy_family"],
+        "cohort_key": prepared["cohort_key"],
+        "parent_cohort_key": prepared["parent_cohort_key"],
         "price_p10": p10,
         "price_p50": p50,
         "price_p90": p90,
         "fair_value_p10": p10,
         "fair_value_p50": p50,
         "fair_value_p90": p90,
-        "fast_sale_24h_price": fast_sale,
+        "fast_sale_24h_price": prediction["fast_sale"],
         "sale_probability_24h": sale_prob,
         "sale_probability_percent": round(sale_prob * 100, 2),
         "confidence": confidence,
         "confidence_percent": round(confidence * 100, 2),
-        "support_count_recent": support,
+        "support_count_recent": prediction["support"],
         "prediction_source": source,
         "engine_version": "ml_v3",
         "uncertainty_tier": uncertainty_tier,
@@ -622,3 +868,190 @@ def predict_one_v3(
             "anchorHigh": anchor_high,
         },
     }
+
+
+def _predict_prepared_v3(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    prepared_items: list[dict[str, Any]],
+    model_dir: str,
+) -> list[dict[str, Any]]:
+    route_bundles: dict[str, dict[str, Any] | None] = {}
+    lookups: dict[str, Any] = {}
+
+    def _promoted_rows() -> list[dict[str, Any]]:
+        if "promoted_rows" not in lookups:
+            lookups["promoted_rows"] = _load_promoted_rollout_rows(
+                client, league=league
+            )
+        return lookups["promoted_rows"]
+
+    def _fx_rate() -> float:
+        if "fx_rate" not in lookups:
+            lookups["fx_rate"] = _latest_fx_rate(client, league=league)
+        return lookups["fx_rate"]
+
+    groups: dict[int, tuple[dict[str, Any], list[int]]] = {}
+    for index, prepared in enumerate(prepared_items):
+        route = prepared["route"]
+        if route not in route_bundles:
+            bundle = _load_bundle_if_present(
+                model_dir=model_dir, league=league, route=route
+            )
+            route_bundles[route] = bundle if _is_valid_bundle_schema(bundle) else None
+        route_bundle = route_bundles[route]
+        if route_bundle is None:
+            continue
+        serving_bundle = _select_serving_bundle(
+            bundle=route_bundle,
+            strategy_family=prepared["strategy_family"],
+            cohort_key=prepared["cohort_key"],
+            parent_cohort_key=prepared["parent_cohort_key"],
+            promoted_rows=_promoted_rows(),
+        )
+        if serving_bundle is None or not _is_valid_bundle_schema(serving_bundle):
+            continue
+        groups.setdefault(id(serving_bundle), (serving_bundle, []))[1].append(index)
+
+    predictions: list[dict[str, Any] | None] = [None] * len(prepared_items)
+    for serving_bundle, indexes in groups.values():
+        try:
+            outputs = _predict_bundle_outputs(
+                serving_bundle,
+                [prepared_items[index]["features"] for index in indexes],
+            )
+        except Exception:
+            continue
+        metadata = serving_bundle.get("metadata") or {}
+        price_unit = str(metadata.get("price_unit") or "chaos")
+        fx_rate = _fx_rate() if price_unit == "divine" else 1.0
+        for index, output in zip(indexes, outputs):
+            try:
+                predictions[index] = _model_prediction(
+                    bundle=serving_bundle,
+                    output=output,
+                    prepared=prepared_items[index],
+                    fx_rate=fx_rate,
+                )
+            except Exception:
+                predictions[index] = None
+
+    payloads: list[dict[str, Any]] = []
+    for prepared, prediction in zip(prepared_items, predictions):
+        if prediction is None:
+            prediction = _median_fallback_prediction(
+                client, league=league, prepared=prepared
+            )
+        payloads.append(_prediction_payload(prepared=prepared, prediction=prediction))
+    return payloads
+
+
+def predict_one_v3(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    clipboard_text: str,
+    model_dir: str = DEFAULT_MODEL_DIR,
+) -> dict[str, Any]:
+    return _predict_parsed_v3(
+        client,
+        league=league,
+        parsed=workflows._parse_clipboard_item(clipboard_text),
+        model_dir=model_dir,
+    )
+
+
+def predict_from_item_json(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    item: dict[str, Any],
+    model_dir: str = DEFAULT_MODEL_DIR,
+) -> dict[str, Any]:
+    return _predict_parsed_v3(
+        client,
+        league=league,
+        parsed=workflows._parse_item_json(item),
+        model_dir=model_dir,
+    )
+
+
+def _predict_parsed_v3(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    parsed: dict[str, Any],
+    model_dir: str,
+) -> dict[str, Any]:
+    prepared = _attach_search(
+        client, league=league, prepared=_prediction_identity(parsed)
+    )
+    return _predict_prepared_v3(
+        client,
+        league=league,
+        prepared_items=[prepared],
+        model_dir=model_dir,
+    )[0]
+
+
+def predict_many_v3(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    items: Sequence[str],
+    model_dir: str = DEFAULT_MODEL_DIR,
+) -> list[dict[str, Any]]:
+    return _predict_many_parsed_v3(
+        client,
+        league=league,
+        parsed_items=[
+            workflows._parse_clipboard_item(clipboard_text) for clipboard_text in items
+        ],
+        model_dir=model_dir,
+    )
+
+
+def predict_many_from_item_json(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    items: Sequence[Mapping[str, Any]],
+    model_dir: str = DEFAULT_MODEL_DIR,
+) -> list[dict[str, Any]]:
+    return _predict_many_parsed_v3(
+        client,
+        league=league,
+        parsed_items=[workflows._parse_item_json(dict(item)) for item in items],
+        model_dir=model_dir,
+    )
+
+
+def _predict_many_parsed_v3(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    parsed_items: Sequence[dict[str, Any]],
+    model_dir: str,
+) -> list[dict[str, Any]]:
+    if not parsed_items:
+        return []
+    identities = [_prediction_identity(parsed) for parsed in parsed_items]
+    candidate_pool = prefetch_candidate_pool(
+        client, league=league, prepared_items=identities
+    )
+    prepared_items = [
+        _attach_search(
+            client,
+            league=league,
+            prepared=prepared,
+            candidate_pool=candidate_pool,
+        )
+        for prepared in identities
+    ]
+    return _predict_prepared_v3(
+        client,
+        league=league,
+        prepared_items=prepared_items,
+        model_dir=model_dir,
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, Mapping
+from typing import Any, Mapping, Sequence
 
 from poe_trade.ml.contract import PRICING_BENCHMARK_CONTRACT
 
@@ -15,6 +15,8 @@ LISTING_EPISODES_TABLE = "poe_trade.ml_v3_listing_episodes"
 TRAINING_SOURCE_TABLE = LISTING_EPISODES_TABLE
 TRAINING_TABLE = "poe_trade.ml_v3_training_examples"
 ROLLOUT_STATE_TABLE = "poe_trade.ml_v3_cohort_rollout_state"
+BACKFILL_CHECKPOINTS_TABLE = "poe_trade.ml_v3_backfill_checkpoints"
+SEARCH_HISTORY_ROLLUP_TABLE = "poe_trade.search_history_rollup_hourly"
 
 BENCHMARK_EXTRACT_TABLE = "poe_trade.ml_v3_pricing_benchmark_v1"
 MIRAGE_IRON_RING_BENCHMARK_TABLE = "poe_trade.v_ml_v3_mirage_iron_ring_item_features_v1"
@@ -1096,10 +1098,43 @@ def build_retrieval_candidate_query(
     route: str,
     item_state_key: str,
     limit: int = 2000,
+) -> str:
+    return _retrieval_candidate_query(
+        league=league,
+        route=route,
+        item_state_predicate=f"item_state_key = {_quote(item_state_key)}",
+        limit=limit,
+    )
+
+
+def build_retrieval_candidate_pool_query(
+    *,
+    league: str,
+    route: str,
+    item_state_keys: Sequence[str],
+    limit: int = 2000,
+) -> str:
+    unique_keys = sorted({str(key) for key in item_state_keys})
+    if not unique_keys:
+        raise ValueError("item_state_keys must not be empty")
+    keys_sql = ", ".join(_quote(key) for key in unique_keys)
+    return _retrieval_candidate_query(
+        league=league,
+        route=route,
+        item_state_predicate=f"item_state_key IN ({keys_sql})",
+        limit=limit,
+    )
+
+
+def _retrieval_candidate_query(
+    *,
+    league: str,
+    route: str,
+    item_state_predicate: str,
+    limit: int,
 ) -> str:
     league_sql = _quote(league)
     route_sql = _quote(route)
-    item_state_key_sql = _quote(item_state_key)
     safe_limit = max(1, int(limit))
     return " ".join(
         [
@@ -1147,7 +1182,7 @@ def build_retrieval_candidate_query(
             f"FROM {TRAINING_SOURCE_TABLE}",
             f"WHERE league = {league_sql}",
             f"AND route = {route_sql}",
-            f"AND item_state_key = {item_state_key_sql}",
+            f"AND {item_state_predicate}",
             ")",
             f"WHERE candidate_rank <= {safe_limit}",
             "FORMAT JSONEachRow",
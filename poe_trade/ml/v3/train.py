@@ -5,25 +5,52 @@ import hashlib
 from importlib import import_module
 from datetime import UTC, datetime
 from dataclasses import asdict, dataclass
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, TypedDict, cast
 import uuid
 
 import joblib
 import numpy as np
-from sklearn.ensemble import GradientBoostingRegressor
+from scipy.sparse import csr_matrix
 from sklearn.feature_extraction import DictVectorizer
 
 from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import iter_row_batches, query_records, query_rows
 from poe_trade.ml import workflows
 
+from .backends import (
+    GBR_BACKEND,
+    HIST_BACKEND,
+    MAX_ROWS_PER_ROUTE_BY_BACKEND,
+    CategoricalDictVectorizer,
+    grow_target_model,
+    new_target_model,
+    new_vectorizer,
+    validate_model_backend,
+)
 from .features import build_feature_row
+from .incremental import (
+    SKIP,
+    WARM_START,
+    IncrementalPolicy,
+    RouteTrainingState,
+    SliceFingerprint,
+    clear_training_state,
+    load_slice_fingerprint,
+    plan_route_update,
+    read_training_state,
+    write_training_state,
+)
+from .parallel import TrainingPool, load_shared_array, resolve_training_capacity
 from .routes import assign_cohort
 from . import sql
 
 MAX_ROWS_PER_ROUTE_DEFAULT = 60_000
 EVAL_ROWS_PER_ROUTE_DEFAULT = 2_000
+# Eval rows are scored and inserted as they stream in, this many at a time.
+EVAL_ROW_BATCH_SIZE = 1_000
 
 
 class _PredictionBundleCache(TypedDict):
@@ -47,6 +74,7 @@ class TrainRouteResult:
     row_count: int
     model_bundle_path: str
     status: str
+    reason: str = ""
 
 
 def _quote(value: str) -> str:
@@ -54,10 +82,7 @@ def _quote(value: str) -> str:
 
 
 def _query_rows(client: ClickHouseClient, query: str) -> list[dict[str, Any]]:
-    payload = client.execute(query).strip()
-    if not payload:
-        return []
-    return [json.loads(line) for line in payload.splitlines() if line.strip()]
+    return query_rows(client, query)
 
 
 def _forward_split_row_limits(total_rows: int, max_rows: int) -> tuple[int, int]:
@@ -70,13 +95,13 @@ def _forward_split_row_limits(total_rows: int, max_rows: int) -> tuple[int, int]
     return train_limit, eval_limit
 
 
-def _load_training_rows(
+def _training_row_limit(
     client: ClickHouseClient,
     *,
     league: str,
     route: str,
-    max_rows: int,
-) -> list[dict[str, Any]]:
+    max_rows: int | None,
+) -> int:
     count_rows = _query_rows(
         client,
         " ".join(
@@ -89,8 +114,36 @@ def _load_training_rows(
         ),
     )
     total_rows = int((count_rows[0].get("rows") if count_rows else 0) or 0)
-    train_limit, _ = _forward_split_row_limits(total_rows, max_rows)
+    train_limit, _ = _forward_split_row_limits(
+        total_rows, total_rows if max_rows is None else max_rows
+    )
+    return train_limit
+
+
+def _load_training_rows(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    route: str,
+    max_rows: int | None,
+) -> list[dict[str, Any]]:
+    train_limit = _training_row_limit(
+        client, league=league, route=route, max_rows=max_rows
+    )
+    return _query_training_slice(client, league=league, route=route, limit=train_limit)
 
+
+def _query_training_slice(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    route: str,
+    limit: int,
+    since: str | None = None,
+) -> list[dict[str, Any]]:
+    since_clauses = (
+        [f"AND as_of_ts > toDateTime64({_quote(since)}, 3, 'UTC')"] if since else []
+    )
     query = " ".join(
         [
             "SELECT",
@@ -126,12 +179,12 @@ def _load_training_rows(
             f"FROM {sql.TRAINING_SOURCE_TABLE}",
             f"WHERE league = {_quote(league)} AND route = {_quote(route)}",
             "AND target_price_chaos > 0",
+            *since_clauses,
             f"ORDER BY as_of_ts ASC, identity_key ASC",
-            f"LIMIT {train_limit}",
-            "FORMAT JSONEachRow",
+            f"LIMIT {limit}",
         ]
     )
-    return _query_rows(client, query)
+    return query_records(client, query)
 
 
 def _feature_dict(row: dict[str, Any]) -> dict[str, Any]:
@@ -213,23 +266,106 @@ def _derive_cohort_metadata(
     }
 
 
-def _train_bundle_for_rows(
-    *,
-    league: str,
-    route: str,
-    strategy_family: str,
-    cohort_key: str,
+_WEIGHTED_TARGETS = frozenset({"sale_probability", "fast_sale_24h"})
+
+
+@dataclass(frozen=True)
+class _PreparedBundle:
+    backend: str
+    vectorizer: DictVectorizer | CategoricalDictVectorizer
+    matrix: Any
+    targets: dict[str, np.ndarray]
+    sample_weight: np.ndarray
+    use_divine_targets: bool
+    fallback_multiplier: float
+    has_fast_sale_target: bool
+    row_count: int
+
+
+    @property
+    def categorical_mask(self) -> np.ndarray | None:
+        return getattr(self.vectorizer, "categorical_mask_", None)
+
+
+def _fit_target_model(
+    backend: str,
+    target: str,
+    X: Any,
+    y: np.ndarray,
+    sample_weight: np.ndarray,
+    categorical_mask: np.ndarray | None = None,
+) -> Any:
+    model = new_target_model(backend, target, categorical_mask=categorical_mask)
+    if target in _WEIGHTED_TARGETS:
+        model.fit(X, y, sample_weight=sample_weight)
+    else:
+        model.fit(X, y)
+    return model
+
+
+def _shared_matrix_arrays(matrix: Any) -> dict[str, np.ndarray]:
+    if isinstance(matrix, np.ndarray):
+        return {"matrix": matrix}
+    return {
+        "data": matrix.data,
+        "indices": matrix.indices,
+        "indptr": matrix.indptr,
+        "shape": np.array(matrix.shape, dtype=np.int64),
+    }
+
+
+def _fit_shared_target_model(directory: str, backend: str, target: str) -> Any:
+    if backend == HIST_BACKEND:
+        X = load_shared_array(directory, "matrix")
+        categorical_mask = np.asarray(load_shared_array(directory, "categorical_mask"))
+    else:
+        shape = tuple(int(value) for value in load_shared_array(directory, "shape"))
+        X = csr_matrix(
+            (
+                load_shared_array(directory, "data"),
+                load_shared_array(directory, "indices"),
+                load_shared_array(directory, "indptr"),
+            ),
+            shape=shape,
+        )
+        categorical_mask = None
+    return _fit_target_model(
+        backend,
+        target,
+        X,
+        load_shared_array(directory, f"y_{target}"),
+        load_shared_array(directory, "sample_weight"),
+        categorical_mask,
+    )
+
+
+def _prepare_bundle_inputs(
     rows: list[dict[str, Any]],
-    model_scope: str = "cohort",
-) -> dict[str, Any]:
+    *,
+    backend: str = GBR_BACKEND,
+    reference: Mapping[str, Any] | None = None,
+) -> _PreparedBundle:
+    """Vectorize ``rows`` and build every target vector.
+
+    ``reference`` is an already trained bundle; its vectorizer, price unit and
+    fast-sale fallback are reused so the inputs line up with its models.
+    """
     feature_rows = [_feature_dict(row) for row in rows]
-    vectorizer = DictVectorizer(sparse=True)
-    X = vectorizer.fit_transform(feature_rows)
-    use_divine_targets = all(
-        _row_float(row, "target_price_divine") > 0
-        and _row_float(row, "target_fast_sale_24h_price_divine") > 0
-        for row in rows
-    )
+    if reference is None:
+        vectorizer = new_vectorizer(backend)
+        X = vectorizer.fit_transform(feature_rows)
+        use_divine_targets = all(
+            _row_float(row, "target_price_divine") > 0
+            and _row_float(row, "target_fast_sale_24h_price_divine") > 0
+            for row in rows
+        )
+    else:
+        vectorizer = reference["vectorizer"]
+        X = vectorizer.transform(feature_rows)
+        reference_metadata = reference.get("metadata") or {}
+        use_divine_targets = reference_metadata.get("price_unit") == "divine"
+    if backend != HIST_BACKEND:
+        X = csr_matrix(X)
     y_p50 = np.array(
         [
             _row_float(
@@ -245,45 +381,9 @@ def _train_bundle_for_rows(
     sample_weights = np.array(
         [max(0.1, float(row.get("label_weight") or 0.25)) for row in rows]
     )
-
-    model_p10 = GradientBoostingRegressor(
-        loss="quantile",
-        alpha=0.1,
-        n_estimators=120,
-        learning_rate=0.05,
-        max_depth=3,
-        random_state=42,
-    )
-    model_p50 = GradientBoostingRegressor(
-        loss="absolute_error",
-        n_estimators=120,
-        learning_rate=0.05,
-        max_depth=3,
-        random_state=42,
-    )
-    model_p90 = GradientBoostingRegressor(
-        loss="quantile",
-        alpha=0.9,
-        n_estimators=120,
-        learning_rate=0.05,
-        max_depth=3,
-        random_state=42,
-    )
-    model_p10.fit(X, y_p50_log)
-    model_p50.fit(X, y_p50_log)
-    model_p90.fit(X, y_p50_log)
-
     sale_targets = np.array(
         [float(row.get("target_sale_probability_24h") or 0.0) for row in rows]
     )
-    sale_model = GradientBoostingRegressor(
-        loss="absolute_error",
-        n_estimators=120,
-        learning_rate=0.05,
-        max_depth=3,
-        random_state=42,
-    )
-    sale_model.fit(X, np.clip(sale_targets, 0.0, 1.0), sample_weight=sample_weights)
 
     fast_sale_targets = np.array(
         [
@@ -299,7 +399,11 @@ def _train_bundle_for_rows(
     )
     fallback_multiplier = 0.9
     positive_mask = (y_p50 > 0) & (fast_sale_targets > 0)
-    if positive_mask.any():
+    if reference is not None:
+        fallback_multiplier = float(
+            reference.get("fallback_fast_sale_multiplier") or fallback_multiplier
+        )
+    elif positive_mask.any():
         fallback_multiplier = float(
             np.clip(
                 np.median(fast_sale_targets[positive_mask] / y_p50[positive_mask]),
@@ -313,15 +417,36 @@ def _train_bundle_for_rows(
         np.maximum(0.1, y_p50 * fallback_multiplier),
     )
     effective_fast_sale_log = np.log1p(np.maximum(effective_fast_sale, 0.0))
-    model_fast_sale = GradientBoostingRegressor(
-        loss="absolute_error",
-        n_estimators=120,
-        learning_rate=0.05,
-        max_depth=3,
-        random_state=42,
+    return _PreparedBundle(
+        backend=backend,
+        vectorizer=vectorizer,
+        matrix=X,
+        targets={
+            "p10": y_p50_log,
+            "p50": y_p50_log,
+            "p90": y_p50_log,
+            "sale_probability": np.clip(sale_targets, 0.0, 1.0),
+            "fast_sale_24h": effective_fast_sale_log,
+        },
+        sample_weight=sample_weights,
+        use_divine_targets=use_divine_targets,
+        fallback_multiplier=fallback_multiplier,
+        has_fast_sale_target=bool((fast_sale_targets > 0).any()),
+        row_count=len(rows),
     )
-    model_fast_sale.fit(X, effective_fast_sale_log, sample_weight=sample_weights)
 
+
+def _assemble_bundle(
+    prepared: _PreparedBundle,
+    models: Mapping[str, Any],
+    *,
+    league: str,
+    route: str,
+    strategy_family: str,
+    cohort_key: str,
+    model_scope: str,
+) -> dict[str, Any]:
+    vectorizer = prepared.vectorizer
     identity_metadata = _derive_cohort_metadata(
         strategy_family=strategy_family,
         cohort_key=cohort_key,
@@ -330,29 +455,30 @@ def _train_bundle_for_rows(
     return {
         "vectorizer": vectorizer,
         "models": {
-            "p10": model_p10,
-            "p50": model_p50,
-            "p90": model_p90,
-            "fast_sale_24h": model_fast_sale,
-            "sale_probability": sale_model,
+            "p10": models["p10"],
+            "p50": models["p50"],
+            "p90": models["p90"],
+            "fast_sale_24h": models["fast_sale_24h"],
+            "sale_probability": models["sale_probability"],
         },
         "search_config": {
             "max_candidates": 64,
             "stage_support_targets": {"1": 8, "2": 12, "3": 18, "4": 24},
         },
         "route_family_priors": {},
-        "fair_value_residual_model": model_p50,
-        "fast_sale_residual_model": model_fast_sale,
-        "fallback_fast_sale_multiplier": fallback_multiplier,
+        "fair_value_residual_model": models["p50"],
+        "fast_sale_residual_model": models["fast_sale_24h"],
+        "fallback_fast_sale_multiplier": prepared.fallback_multiplier,
         "metadata": {
             "league": league,
             "route": route,
             **identity_metadata,
             "model_scope": model_scope,
-            "row_count": len(rows),
-            "has_fast_sale_target": bool((fast_sale_targets > 0).any()),
+            "row_count": prepared.row_count,
+            "has_fast_sale_target": prepared.has_fast_sale_target,
             "prediction_space": "log1p_price",
-            "price_unit": "divine" if use_divine_targets else "chaos",
+            "price_unit": "divine" if prepared.use_divine_targets else "chaos",
+            "model_backend": prepared.backend,
             "feature_schema": {
                 "fields": sorted(vectorizer.feature_names_),
                 "field_count": len(vectorizer.feature_names_),
@@ -366,6 +492,160 @@ def _train_bundle_for_rows(
     }
 
 
+def _train_bundle_for_rows(
+    *,
+    league: str,
+    route: str,
+    strategy_family: str,
+    cohort_key: str,
+    rows: list[dict[str, Any]],
+    model_scope: str = "cohort",
+    model_backend: str = GBR_BACKEND,
+) -> dict[str, Any]:
+    prepared = _prepare_bundle_inputs(rows, backend=model_backend)
+    models = {
+        target: _fit_target_model(
+            model_backend,
+            target,
+            prepared.matrix,
+            y,
+            prepared.sample_weight,
+            prepared.categorical_mask,
+        )
+        for target, y in prepared.targets.items()
+    }
+    return _assemble_bundle(
+        prepared,
+        models,
+        league=league,
+        route=route,
+        strategy_family=strategy_family,
+        cohort_key=cohort_key,
+        model_scope=model_scope,
+    )
+
+
+def _train_bundles_in_pool(
+    pool: TrainingPool,
+    specs: list[dict[str, Any]],
+    *,
+    league: str,
+    route: str,
+    model_backend: str = GBR_BACKEND,
+) -> list[dict[str, Any]]:
+    """Fit every target model of every bundle on the pool, keeping spec order."""
+    pending: list[tuple[_PreparedBundle, str, dict[str, Future[Any]]]] = []
+    for spec in specs:
+        prepared = _prepare_bundle_inputs(spec["rows"], backend=model_backend)
+        shared = {
+            **_shared_matrix_arrays(prepared.matrix),
+            "sample_weight": prepared.sample_weight,
+            **{f"y_{name}": y for name, y in prepared.targets.items()},
+        }
+        if prepared.categorical_mask is not None:
+            shared["categorical_mask"] = prepared.categorical_mask
+        directory = pool.share(shared)
+        futures = {
+            target: pool.submit(
+                _fit_shared_target_model, directory, model_backend, target
+            )
+            for target in prepared.targets
+        }
+        pending.append((prepared, directory, futures))
+    bundles: list[dict[str, Any]] = []
+    try:
+        for spec, (prepared, _directory, futures) in zip(specs, pending):
+            models = {target: future.result() for target, future in futures.items()}
+            bundles.append(
+                _assemble_bundle(
+                    prepared,
+                    models,
+                    league=league,
+                    route=route,
+                    strategy_family=spec["strategy_family"],
+                    cohort_key=spec["cohort_key"],
+                    model_scope=spec["model_scope"],
+                )
+            )
+    finally:
+        for _prepared, directory, futures in pending:
+            for future in futures.values():
+                future.cancel()
+            pool.release(directory)
+    return bundles
+
+
+def _warm_start_target_model(
+    backend: str,
+    target: str,
+    model: Any,
+    X: Any,
+    y: np.ndarray,
+    sample_weight: np.ndarray,
+    extra_estimators: int,
+) -> Any:
+    grow_target_model(backend, model, extra_estimators)
+    if target in _WEIGHTED_TARGETS:
+        model.fit(X, y, sample_weight=sample_weight)
+    else:
+        model.fit(X, y)
+    return model
+
+
+def _warm_start_route_bundle(
+    bundle: dict[str, Any],
+    rows: list[dict[str, Any]],
+    *,
+    route: str,
+    model_backend: str,
+    extra_estimators: int,
+) -> bool:
+    """Boost extra trees onto a loaded route bundle from newly appended rows.
+
+    Returns ``False`` without touching the bundle when a row belongs to a
+    cohort the bundle has no model for.
+    """
+    cohort_bundles = bundle.get("cohort_bundles") or {}
+    grouped_rows: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        strategy_family, cohort_key = _cohort_identity_from_row(row=row, route=route)
+        grouped_rows.setdefault(f"{strategy_family}::{cohort_key}", []).append(row)
+    if any(key not in cohort_bundles for key in grouped_rows):
+        return False
+    updates: list[tuple[dict[str, Any], list[dict[str, Any]]]] = [(bundle, rows)]
+    updates.extend(
+        (cohort_bundles[key], cohort_rows) for key, cohort_rows in grouped_rows.items()
+    )
+    # A single-cohort route shares its model objects with the route-wide bundle.
+    extended: set[int] = set()
+    for target_bundle, target_rows in updates:
+        models = target_bundle["models"]
+        if any(id(model) not in extended for model in models.values()):
+            prepared = _prepare_bundle_inputs(
+                target_rows, backend=model_backend, reference=target_bundle
+            )
+            for target, y in prepared.targets.items():
+                model = models[target]
+                if id(model) in extended:
+                    continue
+                extended.add(id(model))
+                _warm_start_target_model(
+                    model_backend,
+                    target,
+                    model,
+                    prepared.matrix,
+                    y,
+                    prepared.sample_weight,
+                    extra_estimators,
+                )
+        metadata = target_bundle.get("metadata")
+        if isinstance(metadata, dict):
+            metadata["row_count"] = int(metadata.get("row_count") or 0) + len(
+                target_rows
+            )
+    return True
+
+
 def apply_residual_cap(
     *,
     anchor_price: float,
@@ -438,13 +718,13 @@ def _load_bundle_for_route(
     return payload
 
 
-def _load_eval_rows(
+def _iter_eval_row_batches(
     client: ClickHouseClient,
     *,
     league: str,
     route: str,
     max_rows: int,
-) -> list[dict[str, Any]]:
+) -> Iterator[list[dict[str, Any]]]:
     count_rows = _query_rows(
         client,
         " ".join(
@@ -471,7 +751,7 @@ def _load_eval_rows(
             "FORMAT JSONEachRow",
         ]
     )
-    return _query_rows(client, query)
+    return iter_row_batches(client, query, batch_size=EVAL_ROW_BATCH_SIZE)
 
 
 def _insert_eval_predictions(
@@ -681,21 +961,21 @@ def record_eval_predictions_for_run(
         model_version = str(
             (metadata or {}).get("model_version") or f"v3-{league.lower()}-{route}"
         )
-        rows = _load_eval_rows(
+        for rows in _iter_eval_row_batches(
             client,
             league=league,
             route=route,
             max_rows=max_rows_per_route,
-        )
-        total += _insert_eval_predictions(
-            client,
-            league=league,
-            route=route,
-            model_version=model_version,
-            run_id=run_id,
-            rows=rows,
-            bundle=bundle,
-        )
+        ):
+            total += _insert_eval_predictions(
+                client,
+                league=league,
+                route=route,
+                model_version=model_version,
+                run_id=run_id,
+                rows=rows,
+                bundle=bundle,
+            )
     return total
 
 
@@ -705,8 +985,70 @@ def train_route_v3(
     league: str,
     route: str,
     model_dir: str,
-    max_rows: int = MAX_ROWS_PER_ROUTE_DEFAULT,
+    max_rows: int | None = None,
+    pool: TrainingPool | None = None,
+    model_backend: str = GBR_BACKEND,
+    incremental: IncrementalPolicy | None = None,
 ) -> dict[str, Any]:
+    """Train the route-wide and per-cohort bundles for one route.
+
+    ``max_rows=None`` applies the backend's row cap: the exact-split ``gbr``
+    backend keeps ``MAX_ROWS_PER_ROUTE_DEFAULT``, the ``hist`` backend a much
+    larger cap (see ``MAX_ROWS_PER_ROUTE_BY_BACKEND``).
+
+    With an ``incremental`` policy the training slice is fingerprinted first:
+    an unchanged slice keeps the saved bundle, a small append-only delta is
+    warm-started onto it, and anything else retrains from scratch.
+    """
+    model_backend = validate_model_backend(model_backend)
+    if max_rows is None:
+        max_rows = MAX_ROWS_PER_ROUTE_BY_BACKEND[model_backend]
+    route_dir = Path(model_dir) / "v3" / league / route
+    bundle_path = route_dir / "bundle.joblib"
+    fingerprint: SliceFingerprint | None = None
+    reason = ""
+    if incremental is None:
+        clear_training_state(route_dir)
+    else:
+        state = read_training_state(route_dir) if bundle_path.exists() else None
+        fingerprint = load_slice_fingerprint(
+            client,
+            league=league,
+            route=route,
+            train_limit=_training_row_limit(
+                client, league=league, route=route, max_rows=max_rows
+            ),
+            since=state.fingerprint.max_as_of_ts if state is not None else None,
+        )
+        plan = plan_route_update(
+            state, fingerprint, policy=incremental, model_backend=model_backend
+        )
+        reason = plan.reason
+        if state is not None and plan.action == SKIP:
+            return asdict(
+                TrainRouteResult(
+                    league=league,
+                    route=route,
+                    row_count=state.fingerprint.row_count,
+                    model_bundle_path=str(bundle_path),
+                    status="unchanged",
+                    reason=plan.reason,
+                )
+            )
+        if state is not None and plan.action == WARM_START:
+            warm_result = _warm_start_route(
+                client,
+                league=league,
+                route=route,
+                model_dir=model_dir,
+                state=state,
+                fingerprint=fingerprint,
+                policy=incremental,
+                model_backend=model_backend,
+            )
+            if warm_result is not None:
+                return warm_result
+            reason = "warm_start_unavailable"
     rows = _load_training_rows(
         client,
         league=league,
@@ -745,14 +1087,40 @@ def train_route_v3(
         entry["rows"].append(row)
 
     ordered_group_keys = list(grouped_rows)
-    bundle = _train_bundle_for_rows(
-        league=league,
-        route=route,
-        strategy_family="__route_wide__",
-        cohort_key="__route_wide__",
-        rows=rows,
-        model_scope="route_wide",
-    )
+    bundle_specs: list[dict[str, Any]] = [
+        {
+            "strategy_family": "__route_wide__",
+            "cohort_key": "__route_wide__",
+            "rows": rows,
+            "model_scope": "route_wide",
+        }
+    ]
+    if len(grouped_rows) > 1:
+        bundle_specs.extend(
+            {
+                "strategy_family": str(group["strategy_family"]),
+                "cohort_key": str(group["cohort_key"]),
+                "rows": list(group["rows"]),
+                "model_scope": "cohort",
+            }
+            for group in grouped_rows.values()
+        )
+    if pool is None:
+        trained_bundles = [
+            _train_bundle_for_rows(
+                league=league, route=route, model_backend=model_backend, **spec
+            )
+            for spec in bundle_specs
+        ]
+    else:
+        trained_bundles = _train_bundles_in_pool(
+            pool,
+            bundle_specs,
+            league=league,
+            route=route,
+            model_backend=model_backend,
+        )
+    bundle = trained_bundles[0]
     if len(grouped_rows) == 1:
         only_key = ordered_group_keys[0]
         only_group = grouped_rows[only_key]
@@ -768,17 +1136,7 @@ def train_route_v3(
         cohort_bundle["metadata"] = cohort_bundle_metadata
         bundle["cohort_bundles"] = {only_key: cohort_bundle}
     else:
-        bundle["cohort_bundles"] = {
-            cohort_bundle_key: _train_bundle_for_rows(
-                league=league,
-                route=route,
-                strategy_family=str(group["strategy_family"]),
-                cohort_key=str(group["cohort_key"]),
-                rows=list(group["rows"]),
-                model_scope="cohort",
-            )
-            for cohort_bundle_key, group in grouped_rows.items()
-        }
+        bundle["cohort_bundles"] = dict(zip(ordered_group_keys, trained_bundles[1:]))
     metadata = bundle.get("metadata")
     if isinstance(metadata, dict):
         metadata["cohort_count"] = len(grouped_rows)
@@ -794,9 +1152,7 @@ def train_route_v3(
             if isinstance(child_metadata, dict):
                 child_metadata["model_version"] = f"v3-{league.lower()}"
 
-    target_dir = Path(model_dir) / "v3" / league / route
-    target_dir.mkdir(parents=True, exist_ok=True)
-    bundle_path = target_dir / "bundle.joblib"
+    route_dir.mkdir(parents=True, exist_ok=True)
     joblib.dump(bundle, bundle_path)
     model_version = f"v3-{league.lower()}-{route}"
     _register_route_model(
@@ -807,6 +1163,15 @@ def train_route_v3(
         model_dir=model_dir,
         row_count=len(rows),
     )
+    if fingerprint is not None:
+        write_training_state(
+            route_dir,
+            RouteTrainingState(
+                fingerprint=fingerprint.current,
+                model_backend=model_backend,
+                full_trained_at=datetime.now(UTC).isoformat(),
+            ),
+        )
 
     return asdict(
         TrainRouteResult(
@@ -815,6 +1180,68 @@ def train_route_v3(
             row_count=len(rows),
             model_bundle_path=str(bundle_path),
             status="trained",
+            reason=reason,
+        )
+    )
+
+
+def _warm_start_route(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    route: str,
+    model_dir: str,
+    state: RouteTrainingState,
+    fingerprint: SliceFingerprint,
+    policy: IncrementalPolicy,
+    model_backend: str,
+) -> dict[str, Any] | None:
+    bundle = _load_bundle_for_route(model_dir=model_dir, league=league, route=route)
+    if bundle is None:
+        return None
+    rows = _query_training_slice(
+        client,
+        league=league,
+        route=route,
+        limit=fingerprint.current.row_count - state.fingerprint.row_count,
+        since=state.fingerprint.max_as_of_ts,
+    )
+    if not rows or not _warm_start_route_bundle(
+        bundle,
+        rows,
+        route=route,
+        model_backend=model_backend,
+        extra_estimators=policy.warm_start_estimators,
+    ):
+        return None
+    route_dir = Path(model_dir) / "v3" / league / route
+    bundle_path = route_dir / "bundle.joblib"
+    joblib.dump(bundle, bundle_path)
+    _register_route_model(
+        client,
+        league=league,
+        route=route,
+        model_version=f"v3-{league.lower()}-{route}",
+        model_dir=model_dir,
+        row_count=fingerprint.current.row_count,
+    )
+    write_training_state(
+        route_dir,
+        RouteTrainingState(
+            fingerprint=fingerprint.current,
+            model_backend=model_backend,
+            full_trained_at=state.full_trained_at,
+            warm_starts=state.warm_starts + 1,
+        ),
+    )
+    return asdict(
+        TrainRouteResult(
+            league=league,
+            route=route,
+            row_count=fingerprint.current.row_count,
+            model_bundle_path=str(bundle_path),
+            status="warm_started",
+            reason="appended_rows",
         )
     )
 
@@ -824,8 +1251,18 @@ def train_all_routes_v3(
     *,
     league: str,
     model_dir: str,
-    max_rows_per_route: int = MAX_ROWS_PER_ROUTE_DEFAULT,
+    max_rows_per_route: int | None = None,
+    workers: int | None = None,
+    model_backend: str = GBR_BACKEND,
+    incremental: IncrementalPolicy | None = None,
 ) -> dict[str, Any]:
+    """Train every route with rows for ``league``.
+
+    With more than one worker (sized from the runtime profile by default),
+    routes run concurrently up to the memory budget and all their cohort and
+    target fits share one process pool. Results keep the route order.
+    ``incremental`` is forwarded to ``train_route_v3``.
+    """
     workflows.audit_ring_parser_invariants(client, league=league)
     rows = _query_rows(
         client,
@@ -844,20 +1281,61 @@ def train_all_routes_v3(
         str(row.get("route") or "") for row in rows if str(row.get("route") or "")
     ]
     run_id = f"v3-train-{league.lower()}-{int(datetime.now(UTC).timestamp())}"
-    results = [
-        train_route_v3(
-            client,
-            league=league,
-            route=route,
-            model_dir=model_dir,
-            max_rows=max_rows_per_route,
-        )
-        for route in routes
-    ]
+    row_cap = (
+        max_rows_per_route
+        if max_rows_per_route is not None
+        else MAX_ROWS_PER_ROUTE_BY_BACKEND[validate_model_backend(model_backend)]
+    )
+    largest_route_rows = max((int(row.get("rows") or 0) for row in rows), default=0)
+    capacity = resolve_training_capacity(
+        workers,
+        route_rows=(
+            largest_route_rows
+            if row_cap is None
+            else min(largest_route_rows, row_cap)
+        ),
+    )
+    if capacity.workers <= 1 or not routes:
+        results = [
+            train_route_v3(
+                client,
+                league=league,
+                route=route,
+                model_dir=model_dir,
+                max_rows=max_rows_per_route,
+                model_backend=model_backend,
+                incremental=incremental,
+            )
+            for route in routes
+        ]
+    else:
+        with (
+            TrainingPool(workers=capacity.workers) as pool,
+            ThreadPoolExecutor(
+                max_workers=min(capacity.route_slots, len(routes)),
+                thread_name_prefix="v3-train-route",
+            ) as route_executor,
+        ):
+            results = list(
+                route_executor.map(
+                    lambda route: train_route_v3(
+                        client,
+                        league=league,
+                        route=route,
+                        model_dir=model_dir,
+                        max_rows=max_rows_per_route,
+                        pool=pool,
+                        model_backend=model_backend,
+                        incremental=incremental,
+                    ),
+                    routes,
+                )
+            )
     trained_routes = [
         str(row.get("route") or "")
         for row in results
-        if str(row.get("status") or "") == "trained" and str(row.get("route") or "")
+        if str(row.get("status") or "") in {"trained", "warm_started"}
+        and str(row.get("route") or "")
     ]
     eval_prediction_rows = record_eval_predictions_for_run(
         client,
@@ -872,6 +1350,12 @@ def train_all_routes_v3(
         "routes": routes,
         "results": results,
         "trained_count": sum(1 for row in results if row.get("status") == "trained"),
+        "warm_started_count": sum(
+            1 for row in results if row.get("status") == "warm_started"
+        ),
+        "unchanged_count": sum(
+            1 for row in results if row.get("status") == "unchanged"
+        ),
         "eval_prediction_rows": eval_prediction_rows,
     }
 
@@ -8,18 +8,23 @@ import os
 import re
 import time
 import uuid
+from collections.abc import Iterator
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from threading import Lock
-from typing import Any
+from typing import Any, Callable
 
 import joblib
 from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.feature_extraction import DictVectorizer
 
 from poe_trade.db import ClickHouseClient
-from poe_trade.db.clickhouse import ClickHouseClientError
+from poe_trade.db.clickhouse import (
+    ClickHouseClientError,
+    iter_row_batches,
+    query_rows,
+)
 from poe_trade.db.migrations import MigrationRunner
 from poe_trade.ingestion.poeninja_snapshot import PoeNinjaClient
 
@@ -128,6 +133,7 @@ _ACTIVE_MODEL_CACHE_LOCK = Lock()
 _SERVING_PROFILE_CACHE_LOCK = Lock()
 _ROLLOUT_CONTROL_LOCK = Lock()
 _ROLLOUT_CONTROLS: dict[str, dict[str, Any]] = {}
+_SERVING_CACHE_INVALIDATORS: list[Callable[..., None]] = []
 
 _ACTIVE_MODEL_CACHE_MAX_AGE_SECONDS = 30.0
 _SERVING_PROFILE_CACHE_MAX_AGE_SECONDS = 30.0
@@ -152,6 +158,7 @@ _LEGACY_LABELS_TABLE = "poe_trade.ml_price_labels_v1"
 _MOD_FEATURES_CACHE_PATH = Path("/tmp/mod_features_cache.json")
 
 _MOD_FEATURE_BATCH_SIZE = 5000
+_MOD_FEATURE_STREAM_BATCH_SIZE = 1000
 
 
 def _ensure_non_legacy_dataset_table(dataset_table: str) -> None:
@@ -1810,20 +1817,19 @@ def _populate_item_mod_features_from_tokens(
         )
 
     def _query_legacy_with_backoff(
-        *, cursor: str, fallback_mode: bool
+        read: Callable[[str], list[dict[str, Any]]], *, fallback_mode: bool
     ) -> list[dict[str, Any]]:
         limit_value = max(1, page_size)
         if fallback_mode:
             limit_value = min(limit_value, fallback_page_size_cap)
         while True:
             try:
-                return _query_rows(
-                    client,
+                return read(
                     _legacy_query(
-                        cursor,
+                        next_item_id,
                         fallback_mode=fallback_mode,
                         limit_value=limit_value,
-                    ),
+                    )
                 )
             except ClickHouseClientError as exc:
                 if not fallback_mode or not _is_memory_limit_error(exc):
@@ -1840,7 +1846,7 @@ def _populate_item_mod_features_from_tokens(
                     "ml mod features legacy query hit memory limit; reducing page size",
                     extra={
                         "league": league,
-                        "cursor": cursor,
+                        "cursor": next_item_id,
                         "previous_page_size": limit_value,
                         "next_page_size": next_limit,
                     },
@@ -1909,27 +1915,77 @@ def _populate_item_mod_features_from_tokens(
             }
         )
 
+    page_rows = 0
+
+    def _write_token_rows(token_rows: list[dict[str, Any]]) -> None:
+        nonlocal next_item_id, non_empty_rows, rows_written
+        batch: list[dict[str, Any]] = []
+        for row in token_rows:
+            item_id = str(row.get("item_id") or "")
+            if not item_id:
+                continue
+            token_values = row.get("mod_tokens")
+            mod_tokens = (
+                [str(token) for token in token_values]
+                if isinstance(token_values, list)
+                else []
+            )
+            mod_features = _mod_features_from_tokens(mod_tokens)
+            mod_features_json = json.dumps(mod_features, separators=(",", ":"))
+            if mod_features:
+                non_empty_rows += 1
+            batch.append(
+                {
+                    "league": league,
+                    "item_id": item_id,
+                    "mod_features_json": mod_features_json,
+                    "mod_count": len(mod_tokens),
+                    "as_of_ts": str(row.get("max_as_of_ts") or now),
+                    "updated_at": now,
+                }
+            )
+            next_item_id = item_id
+
+        _insert_json_rows(client, "poe_trade.ml_item_mod_features_v1", batch)
+        rows_written += len(batch)
+
+    def _read_page(query: str) -> list[dict[str, Any]]:
+        nonlocal page_rows
+        token_rows = _query_rows(client, query)
+        page_rows += len(token_rows)
+        return token_rows
+
+    def _stream_page(query: str) -> list[dict[str, Any]]:
+        # Rows are written as they arrive, so a retry after a mid-page error
+        # resumes from the advanced cursor.
+        nonlocal page_rows
+        for token_rows in _iter_row_batches(
+            client, query, batch_size=_MOD_FEATURE_STREAM_BATCH_SIZE
+        ):
+            page_rows += len(token_rows)
+            _write_token_rows(token_rows)
+        return []
+
+    # Shadow reads compare whole pages, so only they materialize a page.
+    read = _read_page if shadow_enabled else _stream_page
     page_index = 0
 
     while True:
         use_fallback_now = force_legacy_fallback or not rollup_primary_enabled
+        page_rows = 0
         if rollup_primary_enabled and not force_legacy_fallback:
             try:
-                token_rows = _query_rows(client, _rollup_query(next_item_id))
+                token_rows = read(_rollup_query(next_item_id))
             except ClickHouseClientError:
                 fallback_summary["triggered"] = True
                 fallback_summary["reason"] = "rollup_query_error"
                 use_fallback_now = True
-                token_rows = _query_legacy_with_backoff(
-                    cursor=next_item_id,
-                    fallback_mode=True,
-                )
+                token_rows = _query_legacy_with_backoff(read, fallback_mode=True)
         else:
             token_rows = _query_legacy_with_backoff(
-                cursor=next_item_id,
-                fallback_mode=use_fallback_now,
+                read, fallback_mode=use_fallback_now
             )
-        if not token_rows:
+        if not page_rows:
             break
         page_index += 1
 
@@ -1968,35 +2024,8 @@ def _populate_item_mod_features_from_tokens(
                     },
                 )
 
-        batch: list[dict[str, Any]] = []
-        for row in token_rows:
-            item_id = str(row.get("item_id") or "")
-            if not item_id:
-                continue
-            token_values = row.get("mod_tokens")
-            mod_tokens = (
-                [str(token) for token in token_values]
-                if isinstance(token_values, list)
-                else []
-            )
-            mod_features = _mod_features_from_tokens(mod_tokens)
-            mod_features_json = json.dumps(mod_features, separators=(",", ":"))
-            if mod_features:
-                non_empty_rows += 1
-            batch.append(
-                {
-                    "league": league,
-                    "item_id": item_id,
-                    "mod_features_json": mod_features_json,
-                    "mod_count": len(mod_tokens),
-                    "as_of_ts": str(row.get("max_as_of_ts") or now),
-                    "updated_at": now,
-                }
-            )
-            next_item_id = item_id
-
-        _insert_json_rows(client, "poe_trade.ml_item_mod_features_v1", batch)
-        rows_written += len(batch)
+        if token_rows:
+            _write_token_rows(token_rows)
 
     if shadow_enabled:
         report = {
@@ -6481,16 +6510,13 @@ def _quote(value: str) -> str:
 
 
 def _query_rows(client: ClickHouseClient, query: str) -> list[dict[str, Any]]:
-    payload = client.execute(query)
-    rows: list[dict[str, Any]] = []
-    for line in payload.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        row = json.loads(line)
-        if isinstance(row, dict):
-            rows.append(row)
-    return rows
+    return query_rows(client, query)
+
+
+def _iter_row_batches(
+    client: ClickHouseClient, query: str, *, batch_size: int
+) -> Iterator[list[dict[str, Any]]]:
+    return iter_row_batches(client, query, batch_size=batch_size)
 
 
 def _scalar_count(client: ClickHouseClient, query: str) -> int:
@@ -8190,6 +8216,82 @@ def _parse_clipboard_item(text: str) -> dict[str, Any]:
     }
 
 
+_ITEM_JSON_RARITY_BY_FRAME_TYPE = {0: "Normal", 1: "Magic", 2: "Rare", 3: "Unique"}
+_ITEM_JSON_MOD_SECTIONS = (
+    "implicitMods",
+    "explicitMods",
+    "craftedMods",
+    "fracturedMods",
+    "enchantMods",
+)
+
+
+def _item_json_identity(item: dict[str, Any]) -> dict[str, str]:
+    rarity = str(item.get("rarity") or "").strip()
+    if not rarity:
+        frame_type = item.get("frameType")
+        rarity = (
+            _ITEM_JSON_RARITY_BY_FRAME_TYPE.get(frame_type, "Normal")
+            if isinstance(frame_type, int)
+            else "Normal"
+        )
+    name = str(item.get("name") or "").strip()
+    type_line = str(item.get("typeLine") or "").strip()
+    base_type = str(item.get("baseType") or type_line or name).strip()
+    return {
+        "rarity": rarity,
+        "item_class": str(item.get("itemClass") or "").strip(),
+        "item_name": name if rarity in {"Rare", "Unique"} else "",
+        "item_type_line": type_line or base_type,
+        "base_type": base_type,
+    }
+
+
+def _parse_item_json(item: dict[str, Any]) -> dict[str, Any]:
+    """Build the ``_parse_clipboard_item`` shape straight from GGG item JSON.
+
+    Mod tokens come from the same sections the training token tables read,
+    and the flags from the JSON fields the silver views extract.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("invalid item json: expected an object")
+    identity = _item_json_identity(item)
+    if not identity["base_type"]:
+        raise ValueError("invalid item json: missing typeLine/baseType")
+    mod_tokens: list[str] = []
+    for section in _ITEM_JSON_MOD_SECTIONS:
+        values = item.get(section)
+        if not isinstance(values, list):
+            continue
+        for value in values:
+            text = str(value).strip()
+            if text:
+                mod_tokens.append(text)
+    ilvl = _to_int(item.get("ilvl"), 0)
+    stack_size = max(1, _to_int(item.get("stackSize"), 1))
+    category = _derive_category(
+        "other",
+        item_class=identity["item_class"],
+        base_type=identity["base_type"],
+        item_type_line=identity["item_type_line"],
+    )
+    return {
+        **identity,
+        "category": category,
+        "mod_count": len(mod_tokens),
+        "mod_token_count": len(mod_tokens),
+        "mod_features_json": json.dumps(
+            _mod_features_from_tokens(mod_tokens),
+            separators=(",", ":"),
+        ),
+        "ilvl": ilvl,
+        "stack_size": stack_size,
+        "corrupted": 1 if item.get("corrupted") else 0,
+        "fractured": 1 if item.get("fractured") else 0,
+        "synthesised": 1 if item.get("synthesised") else 0,
+    }
+
+
 def _resolve_route_decision(
     *,
     category: str,
@@ -9043,6 +9145,20 @@ def _invalidate_active_model_cache(*, league: str | None = None) -> None:
                 _ACTIVE_ROUTE_MODEL_DIRS.pop(key, None)
                 _ACTIVE_ROUTE_MODEL_META.pop(key, None)
         _MODEL_BUNDLE_CACHE.clear()
+    for invalidator in list(_SERVING_CACHE_INVALIDATORS):
+        try:
+            invalidator(league=league)
+        except Exception as exc:
+            logger.warning(
+                "serving cache invalidation hook failed for league=%s: %s",
+                league,
+                exc,
+            )
+
+
+def register_serving_cache_invalidator(callback: Callable[..., None]) -> None:
+    if callback not in _SERVING_CACHE_INVALIDATORS:
+        _SERVING_CACHE_INVALIDATORS.append(callback)
 
 
 def _invalidate_serving_profile_cache(
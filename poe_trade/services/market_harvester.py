@@ -9,7 +9,7 @@ import os
 from typing import Sequence
 
 from ..config import settings as config_settings
-from ..db import ClickHouseClient
+from ..db import BatchedInserter, ClickHouseClient
 from ..ingestion import (
     CxapiSync,
     MarketHarvester,
@@ -118,7 +118,12 @@ def main(argv: Sequence[str] | None = None) -> int:
         cfg.poe_api_base_url, policy, cfg.poe_user_agent, cfg.poe_request_timeout
     )
     ck_client = ClickHouseClient.from_env(cfg.clickhouse_url)
-    status = StatusReporter(ck_client, SERVICE_NAME)
+    inserter = BatchedInserter(
+        ck_client,
+        max_rows=cfg.ingest_batch_max_rows,
+        max_age_seconds=cfg.ingest_batch_max_age_seconds,
+    )
+    status = StatusReporter(ck_client, SERVICE_NAME, inserter=inserter)
     sync_state = SyncStateStore(ck_client)
 
     harvester = None
@@ -133,6 +138,7 @@ def main(argv: Sequence[str] | None = None) -> int:
             bootstrap_until_league=bootstrap_until_league,
             bootstrap_from_beginning=bootstrap_from_beginning,
             cursor_file_path=os.getenv("POE_CURSOR_FILE", ".state/cursor"),
+            inserter=inserter,
         )
 
     cx_sync = None
@@ -147,18 +153,23 @@ def main(argv: Sequence[str] | None = None) -> int:
         )
 
     scheduler = importlib.import_module("poe_trade.ingestion.scheduler")
-    scheduler.run_market_sync(
-        harvester=harvester,
-        cx_sync=cx_sync,
-        realms=tuple(realms),
-        leagues=tuple(leagues),
-        poll_interval=poll_interval,
-        dry_run=args.dry_run,
-        once=args.once,
-        cxapi_hour_offset_seconds=cfg.cxapi_hour_offset_seconds,
-        refresh_client=ck_client,
-        refresh_refs_minutes=cfg.refresh_refs_minutes,
-    )
+    try:
+        scheduler.run_market_sync(
+            harvester=harvester,
+            cx_sync=cx_sync,
+            realms=tuple(realms),
+            leagues=tuple(leagues),
+            poll_interval=poll_interval,
+            dry_run=args.dry_run,
+            once=args.once,
+            cxapi_hour_offset_seconds=cfg.cxapi_hour_offset_seconds,
+            refresh_client=ck_client,
+            refresh_refs_minutes=cfg.refresh_refs_minutes,
+            refresh_parallelism=cfg.refresh_parallelism,
+            psapi_pipelined=cfg.psapi_pipeline_enabled,
+        )
+    finally:
+        inserter.close()
     return 0
 
 
@@ -5,14 +5,18 @@ import json
 import logging
 import time
 from collections.abc import Sequence
+from dataclasses import asdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from poe_trade.analytics import search_index
 from poe_trade.config import settings as config_settings
 from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import query_rows
 from poe_trade.ml import workflows
 from poe_trade.ml.v3 import backfill as v3_backfill
 from poe_trade.ml.v3 import eval as v3_eval
+from poe_trade.ml.v3 import incremental as v3_incremental
 from poe_trade.ml.v3 import train as v3_train
 
 SERVICE_NAME = "ml_trainer"
@@ -53,10 +57,7 @@ def _write_stage(
 
 
 def _query_rows(client: ClickHouseClient, query: str) -> list[dict[str, object]]:
-    payload = client.execute(query).strip()
-    if not payload:
-        return []
-    return [json.loads(line) for line in payload.splitlines() if line.strip()]
+    return query_rows(client, query)
 
 
 def _assert_stage_completed(*, stage: str, payload: dict[str, object]) -> None:
@@ -85,7 +86,7 @@ def _assert_stage_completed(*, stage: str, payload: dict[str, object]) -> None:
 
 
 def _refresh_v3_training_examples(
-    client: ClickHouseClient, *, league: str
+    client: ClickHouseClient, *, league: str, parallelism: int = 1
 ) -> dict[str, object]:
     source_rows = _query_rows(
         client,
@@ -156,6 +157,7 @@ def _refresh_v3_training_examples(
                 league=league,
                 start_day=start_day,
                 end_day=source_day,
+                parallelism=parallelism,
             )
             requested_days = int(v3_backfill_result.get("days_requested") or 0)
             processed_days = int(v3_backfill_result.get("days_processed") or 0)
@@ -178,6 +180,28 @@ def _refresh_v3_training_examples(
     }
 
 
+def _refresh_search_index(client: ClickHouseClient) -> dict[str, object]:
+    try:
+        result = search_index.refresh_search_label_index(client)
+    except Exception as exc:
+        logging.getLogger(__name__).warning(
+            "search label index refresh failed: %s", exc
+        )
+        return {"status": "failed", "error": str(exc)}
+    return {"status": "completed", **asdict(result)}
+
+
+def _incremental_policy(
+    cfg: config_settings.Settings,
+) -> v3_incremental.IncrementalPolicy | None:
+    if cfg.ml_v3_full_retrain_hours <= 0:
+        return None
+    return v3_incremental.IncrementalPolicy(
+        full_retrain_hours=cfg.ml_v3_full_retrain_hours,
+        warm_start_max_delta=cfg.ml_v3_warm_start_max_delta,
+    )
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         prog=SERVICE_NAME, description="Run autonomous ML trainer service"
@@ -210,7 +234,9 @@ def main(argv: Sequence[str] | None = None) -> int:
             _write_stage(
                 league=league, stage="refresh_training_examples", status="running"
             )
-            data_refresh = _refresh_v3_training_examples(client, league=league)
+            data_refresh = _refresh_v3_training_examples(
+                client, league=league, parallelism=cfg.ml_v3_backfill_parallelism
+            )
             _assert_stage_completed(
                 stage="refresh_training_examples", payload=data_refresh
             )
@@ -220,12 +246,15 @@ def main(argv: Sequence[str] | None = None) -> int:
                 status="completed",
                 details={"replayed_days": data_refresh.get("replayed_days")},
             )
+            search_index_refresh = _refresh_search_index(client)
 
             _write_stage(league=league, stage="train_models", status="running")
             v3_result = v3_train.train_all_routes_v3(
                 client,
                 league=league,
                 model_dir=str(args.model_dir),
+                model_backend=cfg.ml_v3_model_backend,
+                incremental=_incremental_policy(cfg),
             )
             _assert_stage_completed(stage="train_models", payload=v3_result)
             _write_stage(
@@ -235,6 +264,8 @@ def main(argv: Sequence[str] | None = None) -> int:
                 details={
                     "run_id": v3_result.get("run_id"),
                     "trained_count": v3_result.get("trained_count"),
+                    "warm_started_count": v3_result.get("warm_started_count"),
+                    "unchanged_count": v3_result.get("unchanged_count"),
                 },
             )
 
@@ -266,6 +297,7 @@ def main(argv: Sequence[str] | None = None) -> int:
                 "active_model_version": "v3",
                 "v3": v3_result,
                 "data_refresh": data_refresh,
+                "search_index": search_index_refresh,
                 "evaluation": eval_result,
             }
             _write_status(
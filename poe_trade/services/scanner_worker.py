@@ -48,10 +48,17 @@ def main(argv: Sequence[str] | None = None) -> int:
     client = ClickHouseClient.from_env(cfg.clickhouse_url)
     status = StatusReporter(client, SERVICE_NAME)
     logger = logging.getLogger(__name__)
+    watch_state = None if once_mode else scanner.ScanWatchState()
 
     while True:
         try:
-            run_id = scanner.run_scan_once(client, league=league, dry_run=dry_run)
+            run_id = scanner.run_scan_once(
+                client,
+                league=league,
+                dry_run=dry_run,
+                max_workers=cfg.scanner_pack_workers,
+                watch_state=watch_state,
+            )
         except ClickHouseClientError as exc:
             if getattr(exc, "retryable", False):
                 logger.warning("Transient scanner cycle failure: %s", exc)
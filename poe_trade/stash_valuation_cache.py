@@ -0,0 +1,255 @@
+"""Content keyed cache for private stash item valuations."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any
+
+from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import query_rows
+from poe_trade.stash_scan import _escape_sql_literal, content_signature_for_item
+
+logger = logging.getLogger(__name__)
+
+VALUATION_CACHE_TABLE = "poe_trade.account_stash_valuation_cache"
+_VALUATION_CACHE_COLUMNS = (
+    "league",
+    "model_version",
+    "fx_hour",
+    "content_signature",
+    "payload_json",
+    "cached_at",
+)
+_PREFETCH_CHUNK_SIZE = 500
+
+_MEMORY_MAX_ENTRIES = 100_000
+_MEMORY: OrderedDict[tuple[str, str, str, str], dict[str, Any]] = OrderedDict()
+_MEMORY_LOCK = Lock()
+
+
+def fx_hour_bucket(now: datetime | None = None) -> str:
+    effective_now = now or datetime.now(timezone.utc)
+    if effective_now.tzinfo is None:
+        effective_now = effective_now.replace(tzinfo=timezone.utc)
+    return effective_now.astimezone(timezone.utc).strftime("%Y-%m-%d %H:00:00")
+
+
+def valuation_key_for_item(item: dict[str, Any]) -> str:
+    """Content signature plus the item JSON fields pricing reads beyond it.
+
+    The scan signature ignores item level, stack size and the corrupted,
+    fractured and synthesised flags, but the model prices on them.
+    """
+    priced = {
+        "signature": content_signature_for_item(item),
+        "baseType": str(item.get("baseType") or "").strip(),
+        "rarity": str(item.get("rarity") or "").strip(),
+        "ilvl": item.get("ilvl"),
+        "stackSize": item.get("stackSize"),
+        "corrupted": bool(item.get("corrupted")),
+        "fractured": bool(item.get("fractured")),
+        "synthesised": bool(item.get("synthesised")),
+    }
+    encoded = json.dumps(
+        priced, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def reset_memory_cache() -> None:
+    with _MEMORY_LOCK:
+        _MEMORY.clear()
+
+
+class StashValuationCache:
+    """Reuse ``price_item`` payloads for items whose content did not change.
+
+    Entries are keyed by (league, valuation key, model version, FX hour):
+    a promotion or the next FX hour naturally invalidates them. The table's
+    ``content_signature`` column holds the valuation key, not the bare scan
+    signature, because pricing reads fields the signature ignores. Lookups go
+    through a process-wide LRU first, then one batched ClickHouse read per
+    ``prefetch`` call; new payloads are written back on ``flush``.
+    """
+
+    def __init__(
+        self,
+        clickhouse: ClickHouseClient,
+        *,
+        league: str,
+        model_version: str,
+        fx_hour: str | None = None,
+    ) -> None:
+        self._clickhouse = clickhouse
+        self._league = league
+        self._model_version = model_version
+        self._fx_hour = fx_hour or fx_hour_bucket()
+        self._pending: dict[str, str] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, signature: str) -> tuple[str, str, str, str]:
+        return (self._league, self._model_version, self._fx_hour, signature)
+
+    def get(self, signature: str) -> dict[str, Any] | None:
+        key = self._key(signature)
+        with _MEMORY_LOCK:
+            payload = _MEMORY.get(key)
+            if payload is None:
+                return None
+            _MEMORY.move_to_end(key)
+        return dict(payload)
+
+    def put(self, signature: str, payload: dict[str, Any]) -> None:
+        self._remember(signature, dict(payload))
+        with self._lock:
+            self._pending[signature] = json.dumps(
+                payload, ensure_ascii=False, default=str
+            )
+
+    def _remember(self, signature: str, payload: dict[str, Any]) -> None:
+        key = self._key(signature)
+        with _MEMORY_LOCK:
+            _MEMORY[key] = payload
+            _MEMORY.move_to_end(key)
+            while len(_MEMORY) > _MEMORY_MAX_ENTRIES:
+                _MEMORY.popitem(last=False)
+
+    def prefetch(self, signatures: Iterable[str]) -> None:
+        missing = sorted(
+            {
+                signature
+                for signature in signatures
+                if signature and self.get(signature) is None
+            }
+        )
+        for start in range(0, len(missing), _PREFETCH_CHUNK_SIZE):
+            chunk = missing[start : start + _PREFETCH_CHUNK_SIZE]
+            signature_list = ", ".join(
+                f"'{_escape_sql_literal(signature)}'" for signature in chunk
+            )
+            query = (
+                "SELECT content_signature, "
+                "argMax(payload_json, cached_at) AS payload_json "
+                f"FROM {VALUATION_CACHE_TABLE} "
+                f"WHERE league = '{_escape_sql_literal(self._league)}' "
+                f"AND model_version = '{_escape_sql_literal(self._model_version)}' "
+                f"AND fx_hour = toDateTime('{self._fx_hour}', 'UTC') "
+                f"AND content_signature IN ({signature_list}) "
+                "GROUP BY content_signature FORMAT JSONEachRow"
+            )
+            try:
+                rows = query_rows(self._clickhouse, query)
+            except Exception:
+                logger.warning(
+                    "Valuation cache prefetch failed league=%s",
+                    self._league,
+                    exc_info=True,
+                )
+                return
+            for row in rows:
+                try:
+                    payload = json.loads(str(row.get("payload_json") or ""))
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(payload, dict):
+                    self._remember(str(row.get("content_signature") or ""), payload)
+
+    def wrap(
+        self, price_item: Callable[[dict[str, Any]], dict[str, Any]]
+    ) -> Callable[[dict[str, Any]], dict[str, Any]]:
+        def _cached_price_item(raw_item: dict[str, Any]) -> dict[str, Any]:
+            signature = valuation_key_for_item(raw_item)
+            cached = self.get(signature)
+            with self._lock:
+                if cached is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if cached is not None:
+                return cached
+            payload = price_item(raw_item)
+            if isinstance(payload, dict):
+                self.put(signature, payload)
+            return payload
+
+        return _cached_price_item
+
+    def wrap_batch(
+        self, price_items: Callable[[list[dict[str, Any]]], list[dict[str, Any]]]
+    ) -> Callable[[list[dict[str, Any]]], list[dict[str, Any]]]:
+        """Like ``wrap``, but prices only the batch's cache misses, in one call."""
+
+        def _cached_price_items(
+            raw_items: list[dict[str, Any]],
+        ) -> list[dict[str, Any]]:
+            signatures = [valuation_key_for_item(raw_item) for raw_item in raw_items]
+            payloads: list[dict[str, Any] | None] = [
+                self.get(signature) for signature in signatures
+            ]
+            missing = [
+                index for index, payload in enumerate(payloads) if payload is None
+            ]
+            with self._lock:
+                self.hits += len(raw_items) - len(missing)
+                self.misses += len(missing)
+            if missing:
+                priced = price_items([raw_items[index] for index in missing])
+                for index, payload in zip(missing, priced):
+                    payloads[index] = payload
+                    if isinstance(payload, dict):
+                        self.put(signatures[index], payload)
+            return [payload if payload is not None else {} for payload in payloads]
+
+        return _cached_price_items
+
+    def flush(self) -> None:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            hits, misses = self.hits, self.misses
+        logger.info(
+            "Valuation cache league=%s model=%s hits=%d misses=%d",
+            self._league,
+            self._model_version,
+            hits,
+            misses,
+        )
+        if not pending:
+            return
+        cached_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        rows = [
+            json.dumps(
+                {
+                    "league": self._league,
+                    "model_version": self._model_version,
+                    "fx_hour": self._fx_hour,
+                    "content_signature": signature,
+                    "payload_json": payload_json,
+                    "cached_at": cached_at,
+                },
+                ensure_ascii=False,
+            )
+            for signature, payload_json in pending.items()
+        ]
+        columns = ", ".join(_VALUATION_CACHE_COLUMNS)
+        query = (
+            f"INSERT INTO {VALUATION_CACHE_TABLE} ({columns})\n"
+            "FORMAT JSONEachRow\n" + "\n".join(rows)
+        )
+        try:
+            self._clickhouse.execute(query)
+        except Exception:
+            logger.warning(
+                "Valuation cache write failed league=%s rows=%d",
+                self._league,
+                len(rows),
+                exc_info=True,
+            )
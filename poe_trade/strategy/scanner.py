@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
-from datetime import datetime, timezone
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 import json
 import logging
 import re
@@ -21,7 +23,7 @@ from .policy import (
     evaluate_candidates,
     policy_from_pack,
 )
-from .registry import list_strategy_packs, load_candidate_sql
+from .registry import StrategyPack, list_strategy_packs, load_candidate_sql
 
 
 _LEGACY_COMPAT_HASH_EXPRESSION = "toString(cityHash64(concat(ifNull(source.semantic_key, ''), '|', ifNull(source.item_or_market_key, ''))))"
@@ -31,6 +33,10 @@ _HISTORICAL_LEGACY_COMPAT_HASH_EXPRESSION = (
 
 logger = logging.getLogger(__name__)
 
+_WATCH_FULL_REFRESH_SECONDS = 900.0
+_ALERT_WATERMARK_SLACK = timedelta(minutes=1)
+_GOLD_SOURCE_TABLE_PATTERN = re.compile(r"\bpoe_trade\.(gold_[a-z0-9_]+)\b")
+
 _SCHEMA_FALLBACK_COLUMNS = frozenset(
     {
         "recommendation_source",
@@ -182,11 +188,58 @@ _MISSING_TABLE_ERROR_PATTERNS = (
 )
 
 
+@dataclass(frozen=True)
+class _PackScanResult:
+    strategy_id: str
+    decision_rows: list[dict[str, object]]
+    recommendation_rows: list[dict[str, object]]
+    elapsed_seconds: float
+    last_alerted_at_by_key: dict[str, datetime]
+    journal_active_keys: set[str] | None
+
+
+class ScanWatchState:
+    """Memory that ``run_scan_watch`` carries from one cycle to the next.
+
+    A pack is skipped while the ``max(updated_at)`` watermarks of the gold
+    tables its candidate SQL reads (and, for journal packs, the journal
+    watermark) stay put, up to ``full_refresh_seconds`` since it last ran.
+    Cooldown state is loaded once per pack and then topped up from
+    ``scanner_alert_log`` rows recorded since the previous cycle.
+    """
+
+    def __init__(
+        self, *, full_refresh_seconds: float = _WATCH_FULL_REFRESH_SECONDS
+    ) -> None:
+        self.full_refresh_seconds = full_refresh_seconds
+        self.last_alerted_at: dict[str, dict[str, datetime]] = {}
+        self.journal_active_keys: dict[str, set[str]] = {}
+        self.journal_watermark: str | None = None
+        self.alert_watermark: datetime | None = None
+        self.pack_signatures: dict[str, tuple[object, ...]] = {}
+        self.evaluated_at: dict[str, float] = {}
+        self.source_tables: dict[str, tuple[str, ...]] = {}
+
+    def record(
+        self, result: _PackScanResult, *, signature: tuple[object, ...] | None
+    ) -> None:
+        self.last_alerted_at[result.strategy_id] = result.last_alerted_at_by_key
+        if result.journal_active_keys is not None:
+            self.journal_active_keys[result.strategy_id] = result.journal_active_keys
+        if signature is None:
+            self.pack_signatures.pop(result.strategy_id, None)
+        else:
+            self.pack_signatures[result.strategy_id] = signature
+        self.evaluated_at[result.strategy_id] = time.monotonic()
+
+
 def run_scan_once(
     client: ClickHouseClient,
     *,
     league: str,
     dry_run: bool = False,
+    max_workers: int = 1,
+    watch_state: ScanWatchState | None = None,
 ) -> str:
     scanner_run_id = uuid4().hex
     enabled_packs = [pack for pack in list_strategy_packs() if pack.enabled]
@@ -194,114 +247,280 @@ def run_scan_once(
     if dry_run:
         return scanner_run_id
 
-    for pack in enabled_packs:
-        try:
-            source_rows = _fetch_candidate_source_rows(
-                client, sql=load_candidate_sql(pack)
+    started = time.perf_counter()
+    signatures: dict[str, tuple[object, ...]] = {}
+    skipped: list[str] = []
+    packs_to_scan = enabled_packs
+    if watch_state is not None:
+        signatures = _plan_watch_cycle(
+            client, league=league, packs=enabled_packs, state=watch_state
+        )
+        packs_to_scan = []
+        for pack in enabled_packs:
+            if _watch_pack_is_unchanged(
+                watch_state, pack=pack, signature=signatures.get(pack.strategy_id)
+            ):
+                skipped.append(pack.strategy_id)
+            else:
+                packs_to_scan.append(pack)
+        if skipped:
+            logger.info(
+                "scanner watch skipped unchanged packs: %s",
+                ",".join(skipped),
+                extra={"league": league},
             )
-            journal_active_keys: set[str] | None = None
-            if pack.requires_journal:
-                journal_active_keys = _fetch_journal_active_keys(
-                    client,
-                    strategy_id=pack.strategy_id,
-                    league=league,
-                )
-            candidates: list[CandidateRow] = []
-            invalid_decisions: list[CandidateDecision] = []
-            source_by_candidate: dict[int, Mapping[str, object]] = {}
-            for source_row in source_rows:
-                try:
-                    candidate = candidate_from_source_row(
-                        pack.strategy_id,
-                        source_row,
-                        default_league=league,
-                        default_estimated_operations=getattr(
-                            pack, "max_estimated_operations", None
-                        ),
-                        default_estimated_whispers=getattr(
-                            pack, "max_estimated_whispers", None
-                        ),
-                        default_profit_per_operation_chaos=getattr(
-                            pack,
-                            "advanced_override_profit_per_operation_chaos",
-                            None,
-                        ),
-                    )
-                except ValueError as exc:
-                    invalid_decisions.append(
-                        CandidateDecision(
-                            candidate=_invalid_candidate_row(
-                                strategy_id=pack.strategy_id,
-                                source_row=source_row,
-                                default_league=league,
-                                error=str(exc),
-                            ),
-                            accepted=False,
-                            reason=REJECTED_INVALID_SOURCE_ROW,
-                        )
-                    )
-                    continue
-                candidates.append(candidate)
-                source_by_candidate[id(candidate)] = source_row
-            evaluation = evaluate_candidates(
-                candidates,
-                policy=policy_from_pack(pack),
-                requested_league=league,
-                journal_active_keys=journal_active_keys,
-                last_alerted_at_by_key=_fetch_last_alerted_at_by_key(
-                    client,
-                    strategy_id=pack.strategy_id,
-                    league=league,
-                ),
+
+    def _scan(pack: StrategyPack) -> _PackScanResult | None:
+        state = watch_state or ScanWatchState()
+        try:
+            return _scan_pack(
+                client,
+                pack=pack,
+                league=league,
+                scanner_run_id=scanner_run_id,
+                last_alerted_at_by_key=state.last_alerted_at.get(pack.strategy_id),
+                journal_active_keys=state.journal_active_keys.get(pack.strategy_id),
             )
-            recommendation_rows = [
-                _recommendation_payload(
-                    scanner_run_id=scanner_run_id,
-                    pack=pack,
-                    candidate=candidate,
-                    source_row=source_by_candidate[id(candidate)],
-                )
-                for candidate in evaluation.eligible
-            ]
-            decision_rows = [
-                _decision_payload(
-                    scanner_run_id=scanner_run_id,
-                    decision=decision,
-                    source_row=source_by_candidate.get(id(decision.candidate)),
-                )
-                for decision in (*invalid_decisions, *evaluation.decisions)
-            ]
-            if decision_rows:
-                _insert_candidate_decision_rows(
-                    client,
-                    rows=decision_rows,
-                )
-            if recommendation_rows:
-                _insert_json_rows(
-                    client,
-                    table="poe_trade.scanner_recommendations",
-                    rows=recommendation_rows,
-                    columns=_RECOMMENDATION_INSERT_COLUMNS,
-                    fallback_columns=_LEGACY_RECOMMENDATION_INSERT_COLUMNS,
-                )
-                _insert_json_rows(
-                    client,
-                    table="poe_trade.scanner_alert_log",
-                    rows=[_alert_payload(row) for row in recommendation_rows],
-                    columns=_ALERT_INSERT_COLUMNS,
-                    fallback_columns=_LEGACY_ALERT_INSERT_COLUMNS,
-                )
         except Exception:
             logger.exception(
                 "scanner strategy pack failed: %s",
                 pack.strategy_id,
                 extra={"strategy_id": pack.strategy_id, "league": league},
             )
-            continue
+            return None
 
+    workers = max(1, min(max_workers, len(packs_to_scan)))
+    if workers == 1:
+        outcomes = [_scan(pack) for pack in packs_to_scan]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="scanner-pack"
+        ) as executor:
+            outcomes = list(executor.map(_scan, packs_to_scan))
+    results = [result for result in outcomes if result is not None]
+    for result in results:
+        logger.info(
+            "scanner pack completed strategy_id=%s decisions=%d "
+            "recommendations=%d elapsed_ms=%.1f",
+            result.strategy_id,
+            len(result.decision_rows),
+            len(result.recommendation_rows),
+            result.elapsed_seconds * 1000.0,
+            extra={"strategy_id": result.strategy_id, "league": league},
+        )
+    written: list[_PackScanResult] = []
+    try:
+        written = _write_scan_results(client, results=results)
+    except Exception:
+        logger.exception(
+            "scanner cycle write failed for packs: %s",
+            ",".join(result.strategy_id for result in results),
+            extra={"league": league},
+        )
+    if watch_state is not None:
+        # A pack whose rows were lost must not look unchanged next cycle.
+        for result in written:
+            watch_state.record(result, signature=signatures.get(result.strategy_id))
+    logger.info(
+        "scanner cycle finished run_id=%s packs=%d skipped=%d failed=%d "
+        "workers=%d elapsed_ms=%.1f",
+        scanner_run_id,
+        len(enabled_packs),
+        len(skipped),
+        len(packs_to_scan) - len(results),
+        workers,
+        (time.perf_counter() - started) * 1000.0,
+        extra={"league": league},
+    )
     return scanner_run_id
 
 
+def _scan_pack(
+    client: ClickHouseClient,
+    *,
+    pack: StrategyPack,
+    league: str,
+    scanner_run_id: str,
+    last_alerted_at_by_key: dict[str, datetime] | None = None,
+    journal_active_keys: set[str] | None = None,
+) -> _PackScanResult:
+    started = time.perf_counter()
+    source_rows = _fetch_candidate_source_rows(client, sql=load_candidate_sql(pack))
+    if not pack.requires_journal:
+        journal_active_keys = None
+    elif journal_active_keys is None:
+        journal_active_keys = _fetch_journal_active_keys(
+            client,
+            strategy_id=pack.strategy_id,
+            league=league,
+        )
+    candidates: list[CandidateRow] = []
+    invalid_decisions: list[CandidateDecision] = []
+    source_by_candidate: dict[int, Mapping[str, object]] = {}
+    for source_row in source_rows:
+        try:
+            candidate = candidate_from_source_row(
+                pack.strategy_id,
+                source_row,
+                default_league=league,
+                default_estimated_operations=getattr(
+                    pack, "max_estimated_operations", None
+                ),
+                default_estimated_whispers=getattr(
+                    pack, "max_estimated_whispers", None
+                ),
+                default_profit_per_operation_chaos=getattr(
+                    pack,
+                    "advanced_override_profit_per_operation_chaos",
+                    None,
+                ),
+            )
+        except ValueError as exc:
+            invalid_decisions.append(
+                CandidateDecision(
+                    candidate=_invalid_candidate_row(
+                        strategy_id=pack.strategy_id,
+                        source_row=source_row,
+                        default_league=league,
+                        error=str(exc),
+                    ),
+                    accepted=False,
+                    reason=REJECTED_INVALID_SOURCE_ROW,
+                )
+            )
+            continue
+        candidates.append(candidate)
+        source_by_candidate[id(candidate)] = source_row
+    if last_alerted_at_by_key is None:
+        last_alerted_at_by_key = _fetch_last_alerted_at_by_key(
+            client,
+            strategy_id=pack.strategy_id,
+            league=league,
+        )
+    evaluation = evaluate_candidates(
+        candidates,
+        policy=policy_from_pack(pack),
+        requested_league=league,
+        journal_active_keys=journal_active_keys,
+        last_alerted_at_by_key=last_alerted_at_by_key,
+    )
+    recommendation_rows = [
+        _recommendation_payload(
+            scanner_run_id=scanner_run_id,
+            pack=pack,
+            candidate=candidate,
+            source_row=source_by_candidate[id(candidate)],
+        )
+        for candidate in evaluation.eligible
+    ]
+    decision_rows = [
+        _decision_payload(
+            scanner_run_id=scanner_run_id,
+            decision=decision,
+            source_row=source_by_candidate.get(id(decision.candidate)),
+        )
+        for decision in (*invalid_decisions, *evaluation.decisions)
+    ]
+    return _PackScanResult(
+        strategy_id=pack.strategy_id,
+        decision_rows=decision_rows,
+        recommendation_rows=recommendation_rows,
+        elapsed_seconds=time.perf_counter() - started,
+        last_alerted_at_by_key=last_alerted_at_by_key,
+        journal_active_keys=journal_active_keys,
+    )
+
+
+def _write_scan_results(
+    client: ClickHouseClient,
+    *,
+    results: Sequence[_PackScanResult],
+) -> list[_PackScanResult]:
+    """Write every pack's rows with one insert per table.
+
+    A failed combined insert is retried pack by pack for that table, so a bad
+    pack only loses its own rows. Alerts go out only for packs whose
+    recommendations were written. Returns the packs all of whose rows were
+    written.
+    """
+    decided = _write_pack_rows(
+        results,
+        table="poe_trade.scanner_candidate_decisions",
+        rows_for=lambda result: result.decision_rows,
+        write=lambda rows: _insert_candidate_decision_rows(client, rows=rows),
+    )
+    recommended = _write_pack_rows(
+        results,
+        table="poe_trade.scanner_recommendations",
+        rows_for=lambda result: result.recommendation_rows,
+        write=lambda rows: _insert_json_rows(
+            client,
+            table="poe_trade.scanner_recommendations",
+            rows=rows,
+            columns=_RECOMMENDATION_INSERT_COLUMNS,
+            fallback_columns=_LEGACY_RECOMMENDATION_INSERT_COLUMNS,
+        ),
+    )
+    alerted = _write_pack_rows(
+        recommended,
+        table="poe_trade.scanner_alert_log",
+        rows_for=lambda result: [
+            _alert_payload(row) for row in result.recommendation_rows
+        ],
+        write=lambda rows: _insert_json_rows(
+            client,
+            table="poe_trade.scanner_alert_log",
+            rows=rows,
+            columns=_ALERT_INSERT_COLUMNS,
+            fallback_columns=_LEGACY_ALERT_INSERT_COLUMNS,
+        ),
+    )
+    decided_ids = {id(result) for result in decided}
+    alerted_ids = {id(result) for result in alerted}
+    return [
+        result
+        for result in results
+        if (not result.decision_rows or id(result) in decided_ids)
+        and (not result.recommendation_rows or id(result) in alerted_ids)
+    ]
+
+
+def _write_pack_rows(
+    results: Sequence[_PackScanResult],
+    *,
+    table: str,
+    rows_for: Callable[[_PackScanResult], list[dict[str, object]]],
+    write: Callable[[list[dict[str, object]]], None],
+) -> list[_PackScanResult]:
+    """Returns the packs whose rows were written."""
+    batches = [(result, rows_for(result)) for result in results]
+    batches = [(result, rows) for result, rows in batches if rows]
+    if not batches:
+        return []
+    try:
+        write([row for _result, rows in batches for row in rows])
+        return [result for result, _rows in batches]
+    except Exception:
+        logger.exception(
+            "scanner cycle write failed for packs: %s table=%s",
+            ",".join(result.strategy_id for result, _rows in batches),
+            table,
+        )
+        if len(batches) == 1:
+            return []
+    written: list[_PackScanResult] = []
+    for result, rows in batches:
+        try:
+            write(rows)
+        except Exception:
+            logger.exception(
+                "scanner pack write failed: %s table=%s", result.strategy_id, table
+            )
+            continue
+        written.append(result)
+    return written
+
+
 def run_scan_watch(
     client: ClickHouseClient,
     *,
@@ -309,11 +528,22 @@ def run_scan_watch(
     interval_seconds: float,
     max_runs: int | None = None,
     dry_run: bool = False,
+    max_workers: int = 1,
+    incremental: bool = True,
 ) -> list[str]:
     run_ids: list[str] = []
     completed_runs = 0
+    watch_state = ScanWatchState() if incremental else None
     while max_runs is None or completed_runs < max_runs:
-        run_ids.append(run_scan_once(client, league=league, dry_run=dry_run))
+        run_ids.append(
+            run_scan_once(
+                client,
+                league=league,
+                dry_run=dry_run,
+                max_workers=max_workers,
+                watch_state=watch_state,
+            )
+        )
         completed_runs += 1
         if max_runs is not None and completed_runs >= max_runs:
             break
@@ -321,6 +551,159 @@ def run_scan_watch(
     return run_ids
 
 
+def _plan_watch_cycle(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    packs: Sequence[StrategyPack],
+    state: ScanWatchState,
+) -> dict[str, tuple[object, ...]]:
+    cycle_started_at = datetime.now(timezone.utc)
+    _refresh_watch_cooldowns(client, league=league, state=state)
+    state.alert_watermark = cycle_started_at
+    for pack in packs:
+        if pack.strategy_id in state.source_tables:
+            continue
+        try:
+            candidate_sql = load_candidate_sql(pack)
+        except Exception:
+            # Left to fail, and be reported, by the pack's own scan.
+            candidate_sql = ""
+        state.source_tables[pack.strategy_id] = tuple(
+            sorted(set(_GOLD_SOURCE_TABLE_PATTERN.findall(candidate_sql)))
+        )
+    tables = sorted(
+        {table for pack in packs for table in state.source_tables[pack.strategy_id]}
+    )
+    try:
+        watermarks = _fetch_source_watermarks(client, tables=tables)
+        journal_watermark = (
+            _fetch_journal_watermark(client, league=league)
+            if any(pack.requires_journal for pack in packs)
+            else None
+        )
+    except Exception:
+        logger.warning(
+            "scanner watch watermark lookup failed; evaluating every pack",
+            exc_info=True,
+            extra={"league": league},
+        )
+        state.journal_active_keys.clear()
+        return {}
+    if journal_watermark != state.journal_watermark:
+        state.journal_active_keys.clear()
+        state.journal_watermark = journal_watermark
+    signatures: dict[str, tuple[object, ...]] = {}
+    for pack in packs:
+        pack_tables = state.source_tables[pack.strategy_id]
+        if not pack_tables:
+            continue
+        signature: tuple[object, ...] = tuple(
+            watermarks.get(table) for table in pack_tables
+        )
+        if pack.requires_journal:
+            signature += (journal_watermark,)
+        signatures[pack.strategy_id] = signature
+    return signatures
+
+
+def _watch_pack_is_unchanged(
+    state: ScanWatchState,
+    *,
+    pack: StrategyPack,
+    signature: tuple[object, ...] | None,
+) -> bool:
+    if signature is None or state.pack_signatures.get(pack.strategy_id) != signature:
+        return False
+    evaluated_at = state.evaluated_at.get(pack.strategy_id)
+    if evaluated_at is None:
+        return False
+    return time.monotonic() - evaluated_at < state.full_refresh_seconds
+
+
+def _refresh_watch_cooldowns(
+    client: ClickHouseClient,
+    *,
+    league: str,
+    state: ScanWatchState,
+) -> None:
+    if state.alert_watermark is None or not state.last_alerted_at:
+        return
+    since = format_scan_timestamp(state.alert_watermark - _ALERT_WATERMARK_SLACK)
+    select = (
+        "SELECT strategy_id, item_or_market_key, max(recorded_at) AS last_recorded_at "
+        + "FROM poe_trade.scanner_alert_log "
+        + f"WHERE league = '{_escape_sql(league)}' "
+        + f"AND recorded_at >= toDateTime64('{since}', 3, 'UTC') "
+    )
+    group_by = "GROUP BY strategy_id, item_or_market_key FORMAT JSONEachRow"
+    try:
+        payload = _execute_with_legacy_fallback(
+            client,
+            select
+            + f"AND recommendation_contract_version = {constants.RECOMMENDATION_CONTRACT_VERSION} "
+            + group_by,
+            select + group_by,
+        )
+        rows = _parse_json_rows(payload)
+    except Exception:
+        logger.warning(
+            "scanner watch cooldown refresh failed; reloading cooldown state",
+            exc_info=True,
+            extra={"league": league},
+        )
+        state.last_alerted_at.clear()
+        return
+    for row in rows:
+        cooldowns = state.last_alerted_at.get(str(row.get("strategy_id") or ""))
+        key = str(row.get("item_or_market_key") or "").strip()
+        recorded_at = _parse_datetime(row.get("last_recorded_at"))
+        if cooldowns is None or not key or recorded_at is None:
+            continue
+        previous = cooldowns.get(key)
+        if previous is None or recorded_at > previous:
+            cooldowns[key] = recorded_at
+
+
+def _fetch_source_watermarks(
+    client: ClickHouseClient,
+    *,
+    tables: Sequence[str],
+) -> dict[str, str]:
+    if not tables:
+        return {}
+    payload = client.execute(
+        " UNION ALL ".join(
+            f"SELECT '{table}' AS source_table, "
+            + "toString(max(updated_at)) AS watermark, "
+            + "count() AS row_count "
+            + f"FROM poe_trade.{table}"
+            for table in tables
+        )
+        + " FORMAT JSONEachRow"
+    )
+    return {
+        str(row.get("source_table") or ""): (
+            f"{row.get('watermark') or ''}|{row.get('row_count') or 0}"
+        )
+        for row in _parse_json_rows(payload)
+    }
+
+
+def _fetch_journal_watermark(client: ClickHouseClient, *, league: str) -> str:
+    rows = _parse_json_rows(
+        client.execute(
+            "SELECT toString(max(updated_at)) AS watermark, count() AS row_count "
+            + "FROM poe_trade.journal_positions "
+            + f"WHERE league = '{_escape_sql(league)}' "
+            + "FORMAT JSONEachRow"
+        )
+    )
+    if not rows:
+        return ""
+    return f"{rows[0].get('watermark') or ''}|{rows[0].get('row_count') or 0}"
+
+
 def format_scan_timestamp(value: datetime | None = None) -> str:
     current = value or datetime.now(timezone.utc)
     return current.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
@@ -0,0 +1,12 @@
+CREATE TABLE IF NOT EXISTS poe_trade.account_stash_valuation_cache (
+    league String,
+    model_version String,
+    fx_hour DateTime('UTC'),
+    content_signature String,
+    payload_json String CODEC(ZSTD(6)),
+    cached_at DateTime64(3, 'UTC')
+) ENGINE = ReplacingMergeTree(cached_at)
+PARTITION BY toYYYYMMDD(fx_hour)
+ORDER BY (league, model_version, fx_hour, content_signature)
+TTL fx_hour + INTERVAL 2 DAY DELETE
+SETTINGS index_granularity = 8192;
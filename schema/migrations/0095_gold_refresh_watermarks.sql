@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS poe_trade.gold_refresh_watermarks (
+    mart_table String,
+    source_table String,
+    low_water Nullable(DateTime64(3, 'UTC')),
+    source_watermark DateTime64(3, 'UTC'),
+    partitions_replaced UInt32,
+    read_rows Nullable(UInt64),
+    read_bytes Nullable(UInt64),
+    written_rows Nullable(UInt64),
+    refreshed_at DateTime64(3, 'UTC')
+) ENGINE = MergeTree()
+ORDER BY (mart_table, refreshed_at)
+TTL toDateTime(refreshed_at) + INTERVAL 30 DAY;
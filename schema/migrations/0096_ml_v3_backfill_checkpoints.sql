@@ -0,0 +1,6 @@
+CREATE TABLE IF NOT EXISTS poe_trade.ml_v3_backfill_checkpoints (
+    league String,
+    day Date,
+    completed_at DateTime64(3, 'UTC')
+) ENGINE = ReplacingMergeTree(completed_at)
+ORDER BY (league, day);
@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS poe_trade.search_item_label_daily (
+    day Date,
+    item_name String,
+    item_kind LowCardinality(String),
+    match_count UInt64,
+    source_inserted_at DateTime64(3, 'UTC')
+) ENGINE = MergeTree()
+PARTITION BY toYYYYMM(day)
+ORDER BY (day, item_name, item_kind);
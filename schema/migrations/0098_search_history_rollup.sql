@@ -0,0 +1,53 @@
+CREATE TABLE IF NOT EXISTS poe_trade.search_history_rollup_hourly (
+    league LowCardinality(String),
+    item_name String,
+    hour DateTime('UTC'),
+    price_bucket Float64,
+    listings SimpleAggregateFunction(sum, UInt64),
+    min_price SimpleAggregateFunction(min, Float64),
+    max_price SimpleAggregateFunction(max, Float64),
+    min_as_of_ts SimpleAggregateFunction(min, DateTime64(3, 'UTC')),
+    max_as_of_ts SimpleAggregateFunction(max, DateTime64(3, 'UTC'))
+) ENGINE = AggregatingMergeTree()
+PARTITION BY toYYYYMM(hour)
+ORDER BY (league, item_name, hour, price_bucket);
+
+INSERT INTO poe_trade.search_history_rollup_hourly
+SELECT
+    league,
+    if(
+        lowerUTF8(ifNull(rarity, '')) = 'unique' AND nullIf(item_name, '') IS NOT NULL,
+        nullIf(item_name, ''),
+        base_type
+    ) AS item_name,
+    toStartOfHour(as_of_ts) AS hour,
+    floor(assumeNotNull(target_price_chaos)) AS price_bucket,
+    count() AS listings,
+    min(assumeNotNull(target_price_chaos)) AS min_price,
+    max(assumeNotNull(target_price_chaos)) AS max_price,
+    min(as_of_ts) AS min_as_of_ts,
+    max(as_of_ts) AS max_as_of_ts
+FROM poe_trade.ml_v3_listing_episodes
+WHERE target_price_chaos IS NOT NULL AND target_price_chaos > 0
+GROUP BY league, item_name, hour, price_bucket;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS poe_trade.mv_ml_v3_listing_episodes_to_search_history_rollup
+TO poe_trade.search_history_rollup_hourly
+AS
+SELECT
+    league,
+    if(
+        lowerUTF8(ifNull(rarity, '')) = 'unique' AND nullIf(item_name, '') IS NOT NULL,
+        nullIf(item_name, ''),
+        base_type
+    ) AS item_name,
+    toStartOfHour(as_of_ts) AS hour,
+    floor(assumeNotNull(target_price_chaos)) AS price_bucket,
+    count() AS listings,
+    min(assumeNotNull(target_price_chaos)) AS min_price,
+    max(assumeNotNull(target_price_chaos)) AS max_price,
+    min(as_of_ts) AS min_as_of_ts,
+    max(as_of_ts) AS max_as_of_ts
+FROM poe_trade.ml_v3_listing_episodes
+WHERE target_price_chaos IS NOT NULL AND target_price_chaos > 0
+GROUP BY league, item_name, hour, price_bucket;
@@ -4,7 +4,7 @@ import sys
 
 sys.path.insert(0, '/mnt/data/devrepo')
 
-from poe_trade.ml.workflows import _parse_clipboard_item
+from poe_trade.ml.workflows import _parse_clipboard_item, _parse_item_json
 
 
 RARE_HELM = '''Rarity: Rare
@@ -45,3 +45,49 @@ def test_parse_clipboard_item_extracts_unique_name_and_base_type_separately() ->
     assert parsed['base_type'] == 'Prophet Crown'
     assert parsed['item_class'] == 'Helmets'
     assert parsed['rarity'] == 'Unique'
+
+
+RARE_HELM_JSON = {
+    'frameType': 2,
+    'name': 'Grim Bane',
+    'typeLine': 'Hubris Circlet',
+    'baseType': 'Hubris Circlet',
+    'ilvl': 86,
+    'fractured': True,
+    'explicitMods': [
+        '+2 to Level of Socketed Minion Gems',
+        '+93 to maximum Life',
+    ],
+    'craftedMods': ['+1 to Level of Socketed Gems'],
+}
+
+
+def test_parse_item_json_matches_clipboard_shape_for_rare_item() -> None:
+    from_clipboard = _parse_clipboard_item(RARE_HELM)
+    parsed = _parse_item_json(RARE_HELM_JSON)
+
+    assert set(parsed) == set(from_clipboard)
+    for key in ('rarity', 'item_name', 'base_type', 'category', 'ilvl'):
+        assert parsed[key] == from_clipboard[key]
+    assert parsed['mod_token_count'] == 3
+    assert parsed['fractured'] == 1
+    assert parsed['corrupted'] == 0
+    assert parsed['mod_features_json'] == from_clipboard['mod_features_json']
+
+
+def test_parse_item_json_drops_generated_name_for_magic_items() -> None:
+    parsed = _parse_item_json(
+        {
+            'frameType': 1,
+            'name': '',
+            'typeLine': 'Sapphire Ring of the Whelpling',
+            'baseType': 'Sapphire Ring',
+            'stackSize': 0,
+        }
+    )
+
+    assert parsed['rarity'] == 'Magic'
+    assert parsed['item_name'] == ''
+    assert parsed['base_type'] == 'Sapphire Ring'
+    assert parsed['category'] == 'ring'
+    assert parsed['stack_size'] == 1
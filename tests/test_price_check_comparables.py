@@ -119,6 +119,49 @@ def test_price_check_payload_uses_base_type_lookup_and_returns_recent_comparable
     assert payload["fastSale24hPrice"] == 109.0
 
 
+def test_price_item_json_payload_skips_clipboard_round_trip(monkeypatch) -> None:
+    captured: dict[str, object] = {}
+    monkeypatch.setattr(
+        api_ops,
+        "fetch_predict_one",
+        lambda *_args, **_kwargs: pytest.fail("clipboard path must not be used"),
+    )
+    monkeypatch.setattr(
+        api_ops,
+        "fetch_predict_from_item_json",
+        lambda _client, *, league, item: (
+            captured.update({"league": league, "item": item})
+            or {"predictedValue": 77.0, "currency": "chaos", "confidence": 0.5}
+        ),
+    )
+    monkeypatch.setattr(
+        workflows,
+        "_parse_clipboard_item",
+        lambda _text: pytest.fail("item json must not be re-parsed as text"),
+    )
+    client = _RecordingClickHouse(
+        [
+            '{"item_name":"Hubris Circlet","league":"Mirage","listed_price":118.0,'
+            '"added_on":"2026-03-15 12:00:00"}'
+        ]
+    )
+    item = {
+        "frameType": 2,
+        "name": "Grim Bane",
+        "typeLine": "Hubris Circlet",
+        "baseType": "Hubris Circlet",
+        "explicitMods": ["+93 to maximum Life"],
+    }
+
+    payload = api_ops.price_item_json_payload(client, league="Mirage", item=item)
+
+    assert captured == {"league": "Mirage", "item": item}
+    assert payload["predictedValue"] == 77.0
+    assert [row["price"] for row in payload["comparables"]] == [118.0]
+    assert any("base_type = 'Hubris Circlet'" in query for query in client.queries)
+    assert any("ifNull(rarity, '') = 'Rare'" in query for query in client.queries)
+
+
 def test_predict_one_uses_serving_profile_when_present(monkeypatch) -> None:
     monkeypatch.setattr(
         workflows,
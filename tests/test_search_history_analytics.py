@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+import threading
 from collections.abc import Mapping
 
 sys.path.insert(0, '/mnt/data/devrepo')
@@ -23,6 +24,23 @@ class _SequentialClickHouse(ClickHouseClient):
         return ''
 
 
+class _RoutedClickHouse(ClickHouseClient):
+    def __init__(self, responses: Mapping[str, str]) -> None:
+        super().__init__(endpoint='http://clickhouse')
+        self.responses = dict(responses)
+        self.queries: list[str] = []
+        self._lock = threading.Lock()
+
+    def execute(self, query: str, settings: Mapping[str, str] | None = None) -> str:  # type: ignore[override]
+        del settings
+        with self._lock:
+            self.queries.append(query)
+        for marker, response in self.responses.items():
+            if marker in query:
+                return response
+        return ''
+
+
 def test_search_suggestions_returns_ranked_candidates() -> None:
     client = _SequentialClickHouse(
         [
@@ -48,14 +66,14 @@ def test_search_suggestions_returns_ranked_candidates() -> None:
 
 
 def test_search_history_returns_db_driven_rows_histograms_and_filter_ranges() -> None:
-    client = _SequentialClickHouse(
-        [
-            '{"league":"Mirage"}\n{"league":"Standard"}',
-            '{"min_price":10.0,"max_price":220.0,"min_added_on":"2026-03-01 00:00:00","max_added_on":"2026-03-15 00:00:00"}',
-            '{"bucket_start":0.0,"bucket_end":50.0,"count":2}',
-            '{"bucket_start":"2026-03-01 00:00:00","bucket_end":"2026-03-08 00:00:00","count":4}',
-            '{"item_name":"Hubris Circlet","league":"Mirage","listed_price":118.0,"added_on":"2026-03-15 12:00:00"}',
-        ]
+    client = _RoutedClickHouse(
+        {
+            'SELECT league': '{"league":"Mirage"}\n{"league":"Standard"}',
+            'min(min_price) AS min_price': '{"min_price":10.0,"max_price":220.0,"min_added_on":"2026-03-01 00:00:00","max_added_on":"2026-03-15 00:00:00"}',
+            'AS bucket_width': '{"bucket_start":0.0,"bucket_end":50.0,"count":2}',
+            'AS bucket_seconds': '{"bucket_start":"2026-03-01 00:00:00","bucket_end":"2026-03-08 00:00:00","count":4}',
+            'AS listed_price': '{"item_name":"Hubris Circlet","league":"Mirage","listed_price":118.0,"added_on":"2026-03-15 12:00:00"}',
+        }
     )
 
     payload = analytics_search_history(
@@ -92,3 +110,12 @@ def test_search_history_returns_db_driven_rows_histograms_and_filter_ranges() ->
     ]
     assert any('ORDER BY listed_price ASC' in query for query in client.queries)
     assert any("league = 'Mirage'" in query for query in client.queries)
+    rollup_queries = [q for q in client.queries if 'search_history_rollup_hourly' in q]
+    assert len(rollup_queries) == 4
+    assert all('ml_v3_listing_episodes' not in q for q in rollup_queries)
+    time_query = next(q for q in rollup_queries if 'AS bucket_seconds' in q)
+    assert 'price_bucket >= floor(50.0)' in time_query
+    assert 'price_bucket <= 150.0' in time_query
+    rows_query = next(q for q in client.queries if 'AS listed_price' in q)
+    assert 'FROM poe_trade.ml_v3_listing_episodes' in rows_query
+    assert 'target_price_chaos >= 50.0' in rows_query
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 import json
+import threading
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 from poe_trade.db import ClickHouseClient
+from poe_trade.ingestion import account_stash_harvester
 from poe_trade.ingestion.account_stash_harvester import AccountStashHarvester
 from poe_trade.ingestion.account_stash_harvester import parse_listed_price
 from poe_trade.ingestion.account_stash_harvester import run_persisted_valuation_refresh
 from poe_trade.ingestion.poe_client import PoeClient
 from poe_trade.ingestion.rate_limit import RateLimitPolicy
 from poe_trade.ingestion.status import StatusReporter
+from poe_trade.stash_valuation_cache import StashValuationCache, reset_memory_cache
 
 
 class _FakePoeClient(PoeClient):
@@ -376,6 +380,64 @@ def test_run_persisted_valuation_refresh_revalues_published_rows_without_poe_cal
     assert any("account_stash_published_scans" in query for query in clickhouse.queries)
 
 
+class _ThreeItemPersistedRefreshClickHouse(_PersistedRefreshClickHouse):
+    def execute(self, query: str, settings: Mapping[str, str] | None = None) -> str:
+        payload = super().execute(query, settings)
+        if "FROM poe_trade.account_stash_scan_runs" in query:
+            return _published_scan_run_row(items_total=3)
+        if "account_stash_scan_items_v2" in query and payload:
+            return "".join(
+                payload.replace("item-1", f"item-{index}").replace(
+                    "tab-1:1:2", f"tab-1:{index}:2"
+                )
+                for index in (1, 2, 3)
+            )
+        return payload
+
+
+def test_run_persisted_valuation_refresh_prefetches_candidates_once_per_route(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from poe_trade.api import ops
+    from poe_trade.ml.v3 import serve
+
+    monkeypatch.setattr(serve, "_load_bundle_if_present", lambda **_kwargs: None)
+
+    def _single_query(**_kwargs):  # noqa: ANN003
+        raise AssertionError("per-item retrieval query should not run")
+
+    monkeypatch.setattr(serve.sql, "build_retrieval_candidate_query", _single_query)
+    clickhouse = _ThreeItemPersistedRefreshClickHouse()
+
+    result = run_persisted_valuation_refresh(
+        clickhouse,
+        account_name="qa-exile",
+        league="Mirage",
+        realm="pc",
+        published_scan_id="scan-1",
+        scan_id="scan-2",
+        started_at="2026-03-21T12:10:00Z",
+        price_items=lambda items: ops.price_items_json_payload(
+            clickhouse, league="Mirage", items=items
+        ),
+    )
+
+    assert result["status"] == "published"
+    retrieval_queries = [
+        query for query in clickhouse.queries if "candidate_rank" in query
+    ]
+    assert len(retrieval_queries) == 1
+    history_query = next(
+        query
+        for query in clickhouse.queries
+        if "INSERT INTO poe_trade.account_stash_item_history_v2" in query
+    )
+    assert [
+        json.loads(line)["item_id"]
+        for line in history_query.split("FORMAT JSONEachRow\n", 1)[1].splitlines()
+    ] == ["item-1", "item-2", "item-3"]
+
+
 def test_run_persisted_valuation_refresh_fails_closed_when_source_rows_are_missing() -> None:
     clickhouse = _EmptyPersistedRefreshClickHouse()
 
@@ -716,6 +778,408 @@ def test_run_private_scan_uses_valuation_callback_when_available() -> None:
     assert all(row["source_scan_id"] == "" for row in active_scan_rows)
 
 
+def test_run_private_scan_reuses_cached_valuations_for_unchanged_items() -> None:
+    reset_memory_cache()
+    calls: list[str] = []
+
+    def _price_item(item: dict[str, object]) -> dict[str, object]:
+        calls.append(str(item.get("id")))
+        return {"predictedValue": 42.0, "currency": "chaos", "confidence": 88.0}
+
+    def _scan() -> _FakeClickHouse:
+        clickhouse = _FakeClickHouse()
+        harvester = AccountStashHarvester(
+            _FakePoeClient(),
+            clickhouse,
+            StatusReporter(clickhouse, "account_stash_harvester"),
+            account_name="qa-exile",
+            access_token="access-token",
+            price_item=_price_item,
+            valuation_cache=StashValuationCache(
+                clickhouse,
+                league="Mirage",
+                model_version="v3-1",
+                fx_hour="2026-03-20 10:00:00",
+            ),
+        )
+        assert harvester.run_private_scan(realm="pc", league="Mirage")[
+            "status"
+        ] == "published"
+        return clickhouse
+
+    first = _scan()
+    second = _scan()
+
+    assert calls == ["item-1"]
+    cache_writes = [
+        query
+        for query in first.queries
+        if query.startswith("INSERT INTO poe_trade.account_stash_valuation_cache")
+    ]
+    assert len(cache_writes) == 1
+    cached_row = json.loads(cache_writes[0].split("FORMAT JSONEachRow\n", 1)[1])
+    assert cached_row["model_version"] == "v3-1"
+    assert json.loads(cached_row["payload_json"])["predictedValue"] == 42.0
+    assert not any(
+        query.startswith("INSERT INTO poe_trade.account_stash_valuation_cache")
+        for query in second.queries
+    )
+    history_query = next(
+        query for query in second.queries if "account_stash_item_history_v2" in query
+    )
+    history_row = json.loads(history_query.split("FORMAT JSONEachRow\n", 1)[1])
+    assert history_row["estimated_price_chaos"] == 42.0
+
+
+def test_valuation_cache_keeps_items_differing_in_priced_fields_apart() -> None:
+    reset_memory_cache()
+    calls: list[dict[str, object]] = []
+
+    def _price_item(item: dict[str, object]) -> dict[str, object]:
+        calls.append(item)
+        return {"predictedValue": float(len(calls))}
+
+    cache = StashValuationCache(
+        _FakeClickHouse(),
+        league="Mirage",
+        model_version="v3-1",
+        fx_hour="2026-03-20 10:00:00",
+    )
+    price = cache.wrap(_price_item)
+    base = {"typeLine": "Divine Orb", "frameType": 5, "ilvl": 0, "stackSize": 1}
+
+    single = price(base)
+    stack = price({**base, "stackSize": 5})
+    corrupted = price({**base, "corrupted": True})
+    again = price(dict(base))
+
+    assert [single, stack, corrupted] == [
+        {"predictedValue": 1.0},
+        {"predictedValue": 2.0},
+        {"predictedValue": 3.0},
+    ]
+    assert again == single
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_valuation_cache_batch_wrapper_prices_only_misses_in_one_call() -> None:
+    reset_memory_cache()
+    batches: list[list[object]] = []
+
+    def _price_items(items: list[dict[str, object]]) -> list[dict[str, object]]:
+        batches.append([item.get("stackSize") for item in items])
+        return [{"predictedValue": float(item["stackSize"])} for item in items]
+
+    cache = StashValuationCache(
+        _FakeClickHouse(),
+        league="Mirage",
+        model_version="v3-1",
+        fx_hour="2026-03-20 10:00:00",
+    )
+    price = cache.wrap_batch(_price_items)
+    items = [{"typeLine": "Divine Orb", "stackSize": size} for size in (1, 2)]
+
+    assert price(items) == [{"predictedValue": 1.0}, {"predictedValue": 2.0}]
+    assert price([items[1], {"typeLine": "Divine Orb", "stackSize": 3}]) == [
+        {"predictedValue": 2.0},
+        {"predictedValue": 3.0},
+    ]
+    assert price(items[:1]) == [{"predictedValue": 1.0}]
+    assert batches == [[1, 2], [3]]
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_valuation_cache_counts_lookups_from_concurrent_pricing_threads() -> None:
+    reset_memory_cache()
+    cache = StashValuationCache(
+        _FakeClickHouse(),
+        league="Mirage",
+        model_version="v3-1",
+        fx_hour="2026-03-20 10:00:00",
+    )
+    price = cache.wrap(lambda item: {"predictedValue": 1.0})
+    items = [{"typeLine": "Divine Orb", "stackSize": index % 4} for index in range(400)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(price, items))
+
+    assert cache.hits + cache.misses == len(items)
+
+
+def test_valuation_cache_prefetches_persisted_payloads_from_clickhouse() -> None:
+    reset_memory_cache()
+
+    class _CachedClickHouse(_FakeClickHouse):
+        def execute(
+            self, query: str, settings: Mapping[str, str] | None = None
+        ) -> str:
+            super().execute(query, settings)
+            if "FROM poe_trade.account_stash_valuation_cache" in query:
+                return json.dumps(
+                    {
+                        "content_signature": "sig-1",
+                        "payload_json": json.dumps({"predictedValue": 7.0}),
+                    }
+                )
+            return ""
+
+    clickhouse = _CachedClickHouse()
+    cache = StashValuationCache(
+        clickhouse, league="Mirage", model_version="v3-1", fx_hour="2026-03-20 10:00:00"
+    )
+
+    cache.prefetch(["sig-1", "sig-2", "sig-1"])
+
+    assert len(clickhouse.queries) == 1
+    assert "IN ('sig-1', 'sig-2')" in clickhouse.queries[0]
+    assert "fx_hour = toDateTime('2026-03-20 10:00:00', 'UTC')" in clickhouse.queries[0]
+    assert cache.get("sig-1") == {"predictedValue": 7.0}
+    assert cache.get("sig-2") is None
+
+
+class _ThreeTabPoeClient(_FakePoeClient):
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Mapping[str, str] | None = None,
+        data: object | None = None,
+        headers: Mapping[str, str] | None = None,
+    ):
+        del method, path, data, headers
+        params = dict(params or {})
+        if params.get("tabs") == "1":
+            return {
+                "tabs": [
+                    {"id": f"tab-{index}", "i": index, "n": "Dump", "type": "normal"}
+                    for index in range(3)
+                ]
+            }
+        tab_index = params.get("tabIndex")
+        return {
+            "stash": {
+                "items": [
+                    {
+                        "id": f"item-{tab_index}-{slot}",
+                        "name": f"Item {tab_index}-{slot}",
+                        "typeLine": "Hubris Circlet",
+                        "frameType": 2,
+                        "x": slot,
+                        "y": 0,
+                    }
+                    for slot in range(2)
+                ]
+            }
+        }
+
+
+class _RowCountingRegressor:
+    def __init__(self, value: float) -> None:
+        self.value = value
+        self.calls: list[int] = []
+
+    def predict(self, X):  # noqa: ANN001
+        self.calls.append(len(X))
+        return [self.value] * len(X)
+
+
+class _RowVectorizer:
+    def transform(self, rows):  # noqa: ANN001
+        return [[1.0] for _ in rows]
+
+
+def test_run_private_scan_scores_each_tab_with_one_predict_per_bundle(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from poe_trade.api import ops
+    from poe_trade.ml.v3 import serve
+
+    p50_model = _RowCountingRegressor(120.0)
+    bundle = {
+        "vectorizer": _RowVectorizer(),
+        "models": {
+            "p10": _RowCountingRegressor(95.0),
+            "p50": p50_model,
+            "p90": _RowCountingRegressor(140.0),
+        },
+        "metadata": {"row_count": 1200},
+    }
+    monkeypatch.setattr(serve, "_load_bundle_if_present", lambda **_kwargs: bundle)
+    monkeypatch.setattr(
+        serve, "_load_promoted_rollout_rows", lambda *_args, **_kwargs: []
+    )
+
+    def _single_item_price(*_args, **_kwargs):  # noqa: ANN002, ANN003
+        raise AssertionError("stash scans should not price items one by one")
+
+    monkeypatch.setattr(serve, "predict_from_item_json", _single_item_price)
+    batch_sizes: list[int] = []
+
+    def _price_items(items: list[dict[str, object]]) -> list[dict[str, object]]:
+        batch_sizes.append(len(items))
+        return ops.price_items_json_payload(clickhouse, league="Mirage", items=items)
+
+    clickhouse = _FakeClickHouse()
+    harvester = AccountStashHarvester(
+        _ThreeTabPoeClient(),
+        clickhouse,
+        StatusReporter(clickhouse, "account_stash_harvester"),
+        account_name="qa-exile",
+        access_token="access-token",
+        price_items=_price_items,
+    )
+
+    result = harvester.run_private_scan(realm="pc", league="Mirage")
+
+    assert result["status"] == "published"
+    assert batch_sizes == [2, 2, 2]
+    assert p50_model.calls == [2, 2, 2]
+    history_query = next(
+        query
+        for query in clickhouse.queries
+        if "account_stash_item_history_v2" in query
+    )
+    history_rows = [
+        json.loads(line)
+        for line in history_query.split("FORMAT JSONEachRow\n", 1)[1].splitlines()
+    ]
+    assert [row["estimated_price_chaos"] for row in history_rows] == [120.0] * 6
+
+
+def test_run_private_scan_prices_tabs_concurrently_and_streams_item_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(account_stash_harvester, "_ITEM_WRITE_CHUNK_ROWS", 3)
+    both_items_pricing = threading.Barrier(2, timeout=5.0)
+
+    def _price_item(_item: dict[str, object]) -> dict[str, object]:
+        both_items_pricing.wait()
+        return {"predictedValue": 5.0, "currency": "chaos"}
+
+    clickhouse = _FakeClickHouse()
+    harvester = AccountStashHarvester(
+        _ThreeTabPoeClient(),
+        clickhouse,
+        StatusReporter(clickhouse, "account_stash_harvester"),
+        account_name="qa-exile",
+        access_token="access-token",
+        price_item=_price_item,
+        pricing_workers=2,
+    )
+
+    result = harvester.run_private_scan(realm="pc", league="Mirage")
+
+    assert result["status"] == "published"
+    item_queries = [
+        query for query in clickhouse.queries if "account_stash_scan_items_v2" in query
+    ]
+    assert [
+        [
+            json.loads(line)["item_id"]
+            for line in query.split("FORMAT JSONEachRow\n", 1)[1].splitlines()
+        ]
+        for query in item_queries
+    ] == [
+        ["item-0-0", "item-0-1", "item-1-0", "item-1-1"],
+        ["item-2-0", "item-2-1"],
+    ]
+    running_rows = [
+        query
+        for query in clickhouse.queries
+        if "account_stash_scan_runs" in query and '"status": "running"' in query
+    ]
+    assert len(running_rows) == 2
+    history_queries = [
+        q for q in clickhouse.queries if "account_stash_item_history_v2" in q
+    ]
+    assert len(history_queries) == 1
+    assert len(history_queries[0].split("FORMAT JSONEachRow\n", 1)[1].splitlines()) == 6
+
+
+def test_run_private_scan_prices_whole_tabs_as_concurrent_pool_batches() -> None:
+    second_tab_pricing = threading.Event()
+    batches: list[list[str]] = []
+    batches_lock = threading.Lock()
+
+    def _price_items(items: list[dict[str, object]]) -> list[dict[str, object]]:
+        item_ids = [str(item["id"]) for item in items]
+        with batches_lock:
+            batches.append(item_ids)
+        if item_ids[0].startswith("item-1-"):
+            second_tab_pricing.set()
+        if item_ids[0].startswith("item-0-"):
+            assert second_tab_pricing.wait(5.0)
+        return [{"predictedValue": 5.0, "currency": "chaos"} for _ in items]
+
+    clickhouse = _FakeClickHouse()
+    harvester = AccountStashHarvester(
+        _ThreeTabPoeClient(),
+        clickhouse,
+        StatusReporter(clickhouse, "account_stash_harvester"),
+        account_name="qa-exile",
+        access_token="access-token",
+        price_items=_price_items,
+        pricing_workers=2,
+    )
+
+    result = harvester.run_private_scan(realm="pc", league="Mirage")
+
+    assert result["status"] == "published"
+    assert sorted(batches) == [
+        ["item-0-0", "item-0-1"],
+        ["item-1-0", "item-1-1"],
+        ["item-2-0", "item-2-1"],
+    ]
+    history_query = next(
+        query
+        for query in clickhouse.queries
+        if "account_stash_item_history_v2" in query
+    )
+    history_rows = [
+        json.loads(line)
+        for line in history_query.split("FORMAT JSONEachRow\n", 1)[1].splitlines()
+    ]
+    assert [row["item_id"] for row in history_rows] == [
+        "item-0-0",
+        "item-0-1",
+        "item-1-0",
+        "item-1-1",
+        "item-2-0",
+        "item-2-1",
+    ]
+    assert {row["estimated_price_chaos"] for row in history_rows} == {5.0}
+
+
+def test_run_private_scan_failing_midway_writes_no_item_history(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class _FailingSecondChunkClickHouse(_FakeClickHouse):
+        def execute(self, query: str, settings: Mapping[str, str] | None = None) -> str:
+            if "INSERT INTO poe_trade.account_stash_scan_items_v2" in query and any(
+                "account_stash_scan_items_v2" in seen for seen in self.queries
+            ):
+                raise RuntimeError("insert failed")
+            return super().execute(query, settings=settings)
+
+    monkeypatch.setattr(account_stash_harvester, "_ITEM_WRITE_CHUNK_ROWS", 3)
+    clickhouse = _FailingSecondChunkClickHouse()
+    harvester = AccountStashHarvester(
+        _ThreeTabPoeClient(),
+        clickhouse,
+        StatusReporter(clickhouse, "account_stash_harvester"),
+        account_name="qa-exile",
+        access_token="access-token",
+    )
+
+    result = harvester.run_private_scan(realm="pc", league="Mirage")
+
+    assert result["status"] == "failed"
+    assert any("account_stash_scan_items_v2" in query for query in clickhouse.queries)
+    assert not any(
+        "account_stash_item_history_v2" in query for query in clickhouse.queries
+    )
+
+
 def test_run_private_scan_keeps_published_status_when_valuations_fail() -> None:
     class _FailingValuationsClickHouse(_FakeClickHouse):
         def execute(self, query: str, settings: Mapping[str, str] | None = None) -> str:
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+from poe_trade.analytics import refresh
+from poe_trade.db import ClickHouseClient
+
+
+class _RefreshClient(ClickHouseClient):
+    def __init__(self, *, watermark: str | None, pending_rows: int) -> None:
+        super().__init__(endpoint="http://clickhouse")
+        self.watermark = watermark
+        self.pending_rows = pending_rows
+        self.queries: list[str] = []
+        self.settings_by_query: dict[str, dict[str, str]] = {}
+
+    def execute(self, query: str, settings: Mapping[str, str] | None = None) -> str:  # type: ignore[override]
+        self.queries.append(query)
+        if settings:
+            self.settings_by_query[query] = dict(settings)
+        if f"FROM {refresh.WATERMARK_TABLE}" in query:
+            return json.dumps(
+                {
+                    "watermark": self.watermark or "1970-01-01 00:00:00.000",
+                    "refreshes": 1 if self.watermark else 0,
+                }
+            )
+        if "AS pending_rows" in query:
+            return json.dumps(
+                {
+                    "high_water": "2026-03-02 05:40:00.000",
+                    "pending_rows": self.pending_rows,
+                }
+            )
+        if "FROM system.parts" in query:
+            return "\n".join(
+                json.dumps({"partition_id": partition_id})
+                for partition_id in ("20260301", "20260302")
+            )
+        if "FROM system.query_log" in query:
+            return json.dumps(
+                {"read_rows": 1200, "read_bytes": 96000, "written_rows": 48}
+            )
+        return ""
+
+
+def _gold_sql(name: str) -> Path:
+    return refresh.SQL_ROOT / "gold" / name
+
+
+def test_refresh_gold_mart_recomputes_days_from_watermark_and_swaps_partitions() -> (
+    None
+):
+    client = _RefreshClient(watermark="2026-03-01 17:20:00.000", pending_rows=30)
+
+    result = refresh.refresh_gold_mart(client, _gold_sql("110_listing_ref_hour.sql"))
+
+    assert result.status == "refreshed"
+    assert result.table == "poe_trade.gold_listing_ref_hour"
+    assert result.low_water == "2026-03-01 00:00:00.000"
+    assert result.high_water == "2026-03-02 05:40:00.000"
+    assert result.partitions_replaced == 2
+    assert (result.read_rows, result.read_bytes, result.written_rows) == (
+        1200,
+        96000,
+        48,
+    )
+    pending_query = next(q for q in client.queries if "AS pending_rows" in q)
+    assert "observed_at > toDateTime64('2026-03-01 17:20:00.000'" in pending_query
+    stage_insert = next(
+        q
+        for q in client.queries
+        if q.startswith("INSERT INTO poe_trade.gold_listing_ref_hour__refresh_stage")
+    )
+    assert (
+        "FROM (SELECT * FROM poe_trade.v_ps_items_enriched WHERE "
+        "observed_at >= toDateTime64('2026-03-01 00:00:00.000', 3, 'UTC') AND "
+        "observed_at <= toDateTime64('2026-03-02 05:40:00.000', 3, 'UTC'))"
+    ) in stage_insert
+    assert client.settings_by_query[stage_insert]["query_id"].startswith(
+        "gold-refresh-"
+    )
+    assert not any(
+        q.startswith("INSERT INTO poe_trade.gold_listing_ref_hour\n")
+        for q in client.queries
+    )
+    assert [q for q in client.queries if "REPLACE PARTITION" in q] == [
+        "ALTER TABLE poe_trade.gold_listing_ref_hour REPLACE PARTITION ID "
+        "'20260301' FROM poe_trade.gold_listing_ref_hour__refresh_stage",
+        "ALTER TABLE poe_trade.gold_listing_ref_hour REPLACE PARTITION ID "
+        "'20260302' FROM poe_trade.gold_listing_ref_hour__refresh_stage",
+    ]
+    watermark_insert = client.queries[-1]
+    assert watermark_insert.startswith(f"INSERT INTO {refresh.WATERMARK_TABLE}")
+    recorded = json.loads(watermark_insert.split("\n", 1)[1])
+    assert recorded["source_watermark"] == "2026-03-02 05:40:00.000"
+    assert recorded["read_bytes"] == 96000
+
+
+def test_refresh_gold_mart_skips_when_source_has_no_rows_past_watermark() -> None:
+    client = _RefreshClient(watermark="2026-03-02 05:40:00.000", pending_rows=0)
+
+    result = refresh.refresh_gold_mart(client, _gold_sql("100_currency_ref_hour.sql"))
+
+    assert result.status == "unchanged"
+    assert result.table == "poe_trade.gold_currency_ref_hour"
+    assert "hour_ts > toDateTime64('2026-03-02 05:40:00.000'" in client.queries[-1]
+    assert not any("INSERT" in q for q in client.queries)
+
+
+def test_refresh_gold_mart_first_run_rebuilds_every_partition() -> None:
+    client = _RefreshClient(watermark=None, pending_rows=500)
+
+    result = refresh.refresh_gold_mart(client, _gold_sql("140_set_ref_hour.sql"))
+
+    assert result.status == "refreshed"
+    assert result.low_water is None
+    stage_insert = next(
+        q for q in client.queries if "INSERT INTO poe_trade.gold_set_ref_hour__" in q
+    )
+    assert "observed_at >=" not in stage_insert
+    assert "WHERE category IN ('map', 'logbook', 'other')" in stage_insert
+
+
+class _RecordingClient(ClickHouseClient):
+    def __init__(self, *, fail_on: str | None = None) -> None:
+        super().__init__(endpoint="http://clickhouse")
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+        self.events: list[tuple[str, str]] = []
+        self.settings_by_step: dict[str, dict[str, str] | None] = {}
+        self.running = 0
+        self.peak_running = 0
+
+    def execute(self, query: str, settings: Mapping[str, str] | None = None) -> str:  # type: ignore[override]
+        name = query.rsplit("SELECT '", 1)[1].split("'", 1)[0]
+        with self.lock:
+            self.events.append(("start", name))
+            self.settings_by_step[name] = dict(settings) if settings else None
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+            self.events.append(("end", name))
+        if name == self.fail_on:
+            raise RuntimeError(f"{name} failed")
+        return ""
+
+
+def _write_silver_sql(root: Path, name: str, *header: str) -> None:
+    silver = root / "silver"
+    silver.mkdir(exist_ok=True)
+    (silver / f"{name}.sql").write_text(
+        "\n".join([*header, f"INSERT INTO t SELECT '{name}'"]) + "\n",
+        encoding="utf-8",
+    )
+
+
+def test_execute_refresh_group_runs_independent_steps_concurrently(
+    monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setattr(refresh, "SQL_ROOT", tmp_path)
+    _write_silver_sql(tmp_path, "100_a", "-- settings: max_threads=4")
+    _write_silver_sql(tmp_path, "110_b")
+    _write_silver_sql(tmp_path, "120_c", "-- depends_on: 100_a, 110_b")
+    client = _RecordingClient()
+
+    sql_files = refresh.execute_refresh_group(client, layer="silver", max_parallel=2)
+
+    assert [path.stem for path in sql_files] == ["100_a", "110_b", "120_c"]
+    assert client.peak_running == 2
+    events = client.events
+    assert events.index(("start", "120_c")) > events.index(("end", "100_a"))
+    assert events.index(("start", "120_c")) > events.index(("end", "110_b"))
+    assert client.settings_by_step == {
+        "100_a": {"max_threads": "4"},
+        "110_b": None,
+        "120_c": None,
+    }
+
+
+def test_execute_refresh_group_stops_scheduling_after_failure(
+    monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setattr(refresh, "SQL_ROOT", tmp_path)
+    _write_silver_sql(tmp_path, "100_a")
+    _write_silver_sql(tmp_path, "110_b", "-- depends_on: 100_a")
+    client = _RecordingClient(fail_on="100_a")
+
+    with pytest.raises(RuntimeError, match="100_a failed"):
+        refresh.execute_refresh_group(client, layer="silver", max_parallel=4)
+
+    assert ("start", "110_b") not in client.events
+
+
+def test_load_refresh_steps_orders_dependencies_and_rejects_cycles(tmp_path) -> None:
+    _write_silver_sql(tmp_path, "100_a", "-- depends_on: 110_b")
+    _write_silver_sql(tmp_path, "110_b")
+    files = sorted((tmp_path / "silver").glob("*.sql"))
+
+    steps = refresh.load_refresh_steps(files)
+
+    assert [step.name for step in steps] == ["110_b", "100_a"]
+    assert steps[1].depends_on == ("110_b",)
+
+    _write_silver_sql(tmp_path, "110_b", "-- depends_on: 100_a")
+    with pytest.raises(ValueError, match="cycle"):
+        refresh.load_refresh_steps(files)
+
+    _write_silver_sql(tmp_path, "110_b", "-- depends_on: 999_missing")
+    with pytest.raises(ValueError, match="unknown refresh steps: 999_missing"):
+        refresh.load_refresh_steps(files)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import random
+from collections.abc import Mapping
+
+from poe_trade.analytics import search_index
+from poe_trade.analytics.search_index import Suggestion, SuggestionIndex
+from poe_trade.api.ops import analytics_search_suggestions
+from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import ClickHouseClientError
+
+
+class _IndexClient(ClickHouseClient):
+    def __init__(self, *, index_rows: int = 0, touched_days: list[str]) -> None:
+        super().__init__(endpoint="http://clickhouse")
+        self.index_rows = index_rows
+        self.touched_days = touched_days
+        self.queries: list[str] = []
+
+    def execute(self, query: str, settings: Mapping[str, str] | None = None) -> str:  # type: ignore[override]
+        del settings
+        self.queries.append(query)
+        if "AS watermark" in query:
+            return json.dumps(
+                {"watermark": "2026-03-20 10:00:00.000", "rows": self.index_rows}
+            )
+        if "SELECT DISTINCT toString(toDate(as_of_ts)) AS day" in query:
+            return "".join(json.dumps({"day": day}) + "\n" for day in self.touched_days)
+        return ""
+
+
+def _index() -> SuggestionIndex:
+    return SuggestionIndex(
+        [
+            Suggestion("Hubris Circlet", "base_type", 42),
+            Suggestion("Headhunter", "unique_name", 7),
+            Suggestion("Hubris Circlet", "unique_name", 3),
+            Suggestion("Leather Belt", "base_type", 90),
+            Suggestion("Heavy Belt", "base_type", 42),
+        ]
+    )
+
+
+def test_suggestion_index_matches_substrings_case_insensitively_by_rank() -> None:
+    index = _index()
+
+    assert [item.item_name for item in index.search("BELT", limit=8)] == [
+        "Leather Belt",
+        "Heavy Belt",
+    ]
+    top_h = index.search("h", limit=3)
+    assert [(item.item_name, item.match_count) for item in top_h] == [
+        ("Leather Belt", 90),
+        ("Heavy Belt", 42),
+        ("Hubris Circlet", 42),
+    ]
+    assert index.search("ubris c", limit=8) == [
+        Suggestion("Hubris Circlet", "base_type", 42),
+        Suggestion("Hubris Circlet", "unique_name", 3),
+    ]
+    assert index.search("mirror", limit=8) == []
+    assert index.search("   ", limit=8) == []
+
+
+def test_suggestion_index_agrees_with_a_linear_scan() -> None:
+    rng = random.Random(7)
+    alphabet = "abcde "
+    suggestions = [
+        Suggestion(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))),
+            "base_type",
+            rng.randint(1, 50),
+        )
+        for _ in range(300)
+    ]
+    index = SuggestionIndex(suggestions)
+    ranked = sorted(suggestions, key=lambda item: (-item.match_count, item.item_name))
+
+    for query in ["a", "ab", "cde", "e a", "bad", "ddd", "abcab"]:
+        expected = [item for item in ranked if query in item.item_name][:8]
+        assert index.search(query, limit=8) == expected
+
+
+def test_refresh_recomputes_only_days_touched_since_the_watermark() -> None:
+    client = _IndexClient(index_rows=12, touched_days=["2026-03-19", "2026-03-20"])
+
+    result = search_index.refresh_search_label_index(client)
+
+    assert result.days_refreshed == 2
+    touched_query = next(q for q in client.queries if "SELECT DISTINCT" in q)
+    assert "inserted_at > toDateTime64('2026-03-20 10:00:00.000', 3, 'UTC')" in (
+        touched_query
+    )
+    delete = next(query for query in client.queries if query.startswith("DELETE"))
+    insert = next(query for query in client.queries if query.startswith("INSERT"))
+    assert "toDate('2026-03-19'), toDate('2026-03-20')" in delete
+    assert "WHERE toDate(as_of_ts) IN (toDate('2026-03-19'), toDate('2026-03-20'))" in (
+        insert
+    )
+    assert "GROUP BY day, item_name, item_kind" in insert
+
+
+def test_refresh_without_watermark_rebuilds_all_days_and_skips_when_idle() -> None:
+    client = _IndexClient(touched_days=[])
+
+    result = search_index.refresh_search_label_index(client)
+
+    assert result == search_index.LabelIndexRefreshResult(
+        days_refreshed=0, source_watermark=None
+    )
+    touched_query = next(q for q in client.queries if "SELECT DISTINCT" in q)
+    assert "inserted_at" not in touched_query
+    assert not any(query.startswith(("DELETE", "INSERT")) for query in client.queries)
+
+
+def test_suggestion_index_cache_loads_once_per_period_and_survives_failures() -> None:
+    class _LoadClient(ClickHouseClient):
+        def __init__(self) -> None:
+            super().__init__(endpoint="http://clickhouse")
+            self.loads = 0
+            self.fail = False
+
+        def execute(self, query: str, settings: Mapping[str, str] | None = None) -> str:  # type: ignore[override]
+            del query, settings
+            self.loads += 1
+            if self.fail:
+                raise ClickHouseClientError("table missing")
+            return (
+                '{"item_name":"Hubris Circlet","item_kind":"base_type",'
+                '"match_count":4}\n'
+            )
+
+    client = _LoadClient()
+    cache = search_index.SuggestionIndexCache(refresh_seconds=3600)
+
+    first = cache.get(client)
+    assert first is not None and len(first) == 1
+    assert cache.get(client) is first
+    assert client.loads == 1
+
+    failing = _LoadClient()
+    failing.fail = True
+    empty_cache = search_index.SuggestionIndexCache(refresh_seconds=3600)
+    assert empty_cache.get(failing) is None
+    assert empty_cache.get(failing) is None
+    assert failing.loads == 1
+
+
+def test_search_suggestions_are_served_from_a_loaded_index() -> None:
+    client = _IndexClient(touched_days=[])
+
+    payload = analytics_search_suggestions(client, query="belt", index=_index())
+
+    assert payload == {
+        "query": "belt",
+        "suggestions": [
+            {"itemName": "Leather Belt", "itemKind": "base_type", "matchCount": 90},
+            {"itemName": "Heavy Belt", "itemKind": "base_type", "matchCount": 42},
+        ],
+    }
+    assert client.queries == []
@@ -306,7 +306,7 @@ def test_stash_scan_start_returns_accepted_payload(
     assert body["league"] == "Mirage"
 
 
-def test_private_stash_harvester_builder_wires_price_item_callback(
+def test_private_stash_harvester_builder_wires_batch_price_callback(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     captured: dict[str, object] = {}
@@ -347,26 +347,24 @@ def test_private_stash_harvester_builder_wires_price_item_callback(
     monkeypatch.setattr(api_app_module, "AccountStashHarvester", _DummyHarvester)
     monkeypatch.setattr(
         api_app_module,
-        "serialize_stash_item_to_clipboard",
-        lambda item: f"clipboard:{item.get('name')}",
-    )
-    monkeypatch.setattr(
-        api_app_module,
-        "price_check_payload",
-        lambda client, *, league, item_text: (
+        "price_items_json_payload",
+        lambda client, *, league, items: (
             price_check_capture.update(
-                {"client": client, "league": league, "item_text": item_text}
+                {"client": client, "league": league, "items": items}
             )
-            or {
-                "predictedValue": 42.0,
-                "currency": "chaos",
-                "confidence": 88.0,
-                "interval": {"p10": 35.0, "p90": 55.0},
-                "priceRecommendationEligible": True,
-                "estimateTrust": "normal",
-                "estimateWarning": "",
-                "fallbackReason": "",
-            }
+            or [
+                {
+                    "predictedValue": 42.0,
+                    "currency": "chaos",
+                    "confidence": 88.0,
+                    "interval": {"p10": 35.0, "p90": 55.0},
+                    "priceRecommendationEligible": True,
+                    "estimateTrust": "normal",
+                    "estimateWarning": "",
+                    "fallbackReason": "",
+                }
+                for _item in items
+            ]
         ),
     )
 
@@ -381,17 +379,17 @@ def test_private_stash_harvester_builder_wires_price_item_callback(
     )
 
     assert isinstance(result, _DummyHarvester)
-    price_item = cast(
-        Callable[[dict[str, object]], dict[str, object]],
-        getattr(result, "_price_item"),
+    price_items = cast(
+        Callable[[list[dict[str, object]]], list[dict[str, object]]],
+        getattr(result, "_price_items"),
     )
-    assert callable(price_item)
-    payload = price_item({"name": "Prismatic Eclipse"})
-    assert payload["predictedValue"] == 42.0
+    assert callable(price_items)
+    payloads = price_items([{"name": "Prismatic Eclipse"}])
+    assert [payload["predictedValue"] for payload in payloads] == [42.0]
     assert price_check_capture == {
         "client": captured["clickhouse_client"],
         "league": "Mirage",
-        "item_text": "clipboard:Prismatic Eclipse",
+        "items": [{"name": "Prismatic Eclipse"}],
     }
 
 
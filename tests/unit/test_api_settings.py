@@ -21,11 +21,19 @@ def test_api_settings_defaults() -> None:
     assert cfg.api_trusted_origin_bypass is False
     assert cfg.api_max_body_bytes == 32768
     assert cfg.api_league_allowlist == ("Mirage",)
+    assert cfg.api_search_suggestions_refresh_seconds == 300.0
     assert cfg.enable_account_stash is False
     assert cfg.account_stash_realm == "pc"
     assert cfg.account_stash_league == "Mirage"
     assert cfg.account_stash_request_timeout_seconds == 15.0
     assert cfg.account_stash_scan_stale_timeout_seconds == 120
+    assert cfg.account_stash_pricing_workers == 4
+    assert cfg.scanner_pack_workers == 4
+    assert cfg.refresh_parallelism == 2
+    assert cfg.ml_v3_model_backend == "gbr"
+    assert cfg.ml_v3_full_retrain_hours == 24.0
+    assert cfg.ml_v3_warm_start_max_delta == 0.2
+    assert cfg.ml_v3_backfill_parallelism == 2
     assert cfg.stash_poll_interval == 300.0
     assert cfg.auth_cookie_name == "poe_session"
     assert cfg.poe_account_redirect_uri == ""
@@ -41,16 +49,28 @@ def test_api_settings_parse_values() -> None:
         "POE_API_TRUSTED_ORIGIN_BYPASS": "true",
         "POE_API_MAX_BODY_BYTES": "16384",
         "POE_API_LEAGUE_ALLOWLIST": "Mirage, Keepers ",
+        "POE_API_SEARCH_SUGGESTIONS_REFRESH_SECONDS": "30",
         "POE_ENABLE_ACCOUNT_STASH": "true",
         "POE_ACCOUNT_STASH_REALM": "xbox",
         "POE_ACCOUNT_STASH_LEAGUE": "Settlers",
         "POE_ACCOUNT_STASH_REQUEST_TIMEOUT_SECONDS": "9",
         "POE_ACCOUNT_STASH_SCAN_STALE_TIMEOUT_SECONDS": "45",
+        "POE_ACCOUNT_STASH_PRICING_WORKERS": "2",
+        "POE_SCANNER_PACK_WORKERS": "6",
+        "POE_REFRESH_PARALLELISM": "3",
         "POE_STASH_POLL_INTERVAL": "120",
         "POE_AUTH_COOKIE_NAME": "session_cookie",
         "POE_ACCOUNT_REDIRECT_URI": "https://api.example.com/api/v1/auth/callback",
         "POE_ML_AUTOMATION_LEAGUE": "Mirage",
         "POE_ML_AUTOMATION_INTERVAL_SECONDS": "300",
+        "POE_ML_SERVING_CONTEXT_TTL_SECONDS": "45",
+        "POE_ML_V3_MODEL_BACKEND": "hist",
+        "POE_ML_V3_FULL_RETRAIN_HOURS": "6",
+        "POE_ML_V3_WARM_START_MAX_DELTA": "0.1",
+        "POE_ML_V3_BACKFILL_PARALLELISM": "6",
+        "POE_PSAPI_PIPELINE_ENABLED": "true",
+        "POE_INGEST_BATCH_MAX_ROWS": "250",
+        "POE_INGEST_BATCH_MAX_AGE_SECONDS": "0.5",
     }
     with mock.patch.dict(os.environ, env, clear=True):
         cfg = Settings.from_env()
@@ -64,17 +84,29 @@ def test_api_settings_parse_values() -> None:
     assert cfg.api_trusted_origin_bypass is True
     assert cfg.api_max_body_bytes == 16384
     assert cfg.api_league_allowlist == ("Mirage", "Keepers")
+    assert cfg.api_search_suggestions_refresh_seconds == 30.0
     assert cfg.enable_account_stash is True
     assert cfg.account_stash_realm == "xbox"
     assert cfg.account_stash_league == "Settlers"
     assert cfg.account_stash_request_timeout_seconds == 9.0
     assert cfg.account_stash_scan_stale_timeout_seconds == 45
+    assert cfg.account_stash_pricing_workers == 2
+    assert cfg.scanner_pack_workers == 6
+    assert cfg.refresh_parallelism == 3
     assert cfg.stash_poll_interval == 120.0
     assert cfg.auth_cookie_name == "session_cookie"
     assert (
         cfg.poe_account_redirect_uri == "https://api.example.com/api/v1/auth/callback"
     )
     assert cfg.ml_automation_interval_seconds == 300
+    assert cfg.ml_serving_context_ttl_seconds == 45.0
+    assert cfg.ml_v3_model_backend == "hist"
+    assert cfg.ml_v3_full_retrain_hours == 6.0
+    assert cfg.ml_v3_warm_start_max_delta == 0.1
+    assert cfg.ml_v3_backfill_parallelism == 6
+    assert cfg.psapi_pipeline_enabled is True
+    assert cfg.ingest_batch_max_rows == 250
+    assert cfg.ingest_batch_max_age_seconds == 0.5
 
 
 def test_create_app_starts_account_stash_autoscan_when_enabled(
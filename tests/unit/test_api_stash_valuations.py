@@ -1591,7 +1591,7 @@ def test_start_stash_valuations_refresh_uses_persisted_rows_without_oauth_token(
 
         assert captured["run_refresh"]["scan_id"] == payload["activeScanId"]
         assert captured["run_refresh"]["published_scan_id"] == "scan-1"
-        assert callable(captured["run_refresh"]["price_item"])
+        assert callable(captured["run_refresh"]["price_items"])
         assert captured["latest_payload"] == {
             "account_name": "qa-exile",
             "league": "Mirage",
@@ -1783,7 +1783,7 @@ def test_start_stash_valuations_refresh_republishes_latest_scan_from_persisted_v
 
         assert captured["run_refresh"]["scan_id"] == payload["activeScanId"]
         assert captured["run_refresh"]["published_scan_id"] == "scan-1"
-        assert callable(captured["run_refresh"]["price_item"])
+        assert callable(captured["run_refresh"]["price_items"])
         assert captured["latest_payload"] == {
             "account_name": "qa-exile",
             "league": "Mirage",
@@ -0,0 +1,151 @@
+import json
+import threading
+from datetime import datetime, timezone
+
+from poe_trade.db import BatchedInserter, ClickHouseClient
+from poe_trade.db.clickhouse import ClickHouseClientError
+from poe_trade.ingestion.status import StatusReporter
+
+
+class _RecordingClient(ClickHouseClient):
+    def __init__(self) -> None:
+        super().__init__(endpoint="http://clickhouse")
+        object.__setattr__(self, "queries", [])
+        object.__setattr__(self, "failures", [])
+        object.__setattr__(self, "written", threading.Event())
+
+    def execute(self, query: str, settings=None) -> str:  # noqa: ANN001
+        if self.failures:
+            raise self.failures.pop(0)
+        self.queries.append(query)
+        self.written.set()
+        return ""
+
+
+def _rows(query: str) -> list[dict[str, object]]:
+    return [json.loads(line) for line in query.splitlines()[2:]]
+
+
+def test_batched_inserter_groups_rows_per_table_until_close() -> None:
+    client = _RecordingClient()
+    inserter = BatchedInserter(client, max_rows=100, max_age_seconds=60.0)
+
+    inserter.insert("poe_trade.a", ("x",), [{"x": 1}])
+    inserter.insert("poe_trade.a", ("x",), [{"x": 2}])
+    inserter.insert("poe_trade.b", ("y", "z"), [{"y": 1, "z": "q"}])
+    assert client.queries == []
+
+    inserter.close()
+
+    assert sorted(query.splitlines()[0] for query in client.queries) == [
+        "INSERT INTO poe_trade.a (x)",
+        "INSERT INTO poe_trade.b (y, z)",
+    ]
+    table_a = next(q for q in client.queries if "poe_trade.a" in q)
+    assert table_a.splitlines()[1] == "FORMAT JSONEachRow"
+    assert _rows(table_a) == [{"x": 1}, {"x": 2}]
+
+
+def test_batched_inserter_flushes_when_size_threshold_reached() -> None:
+    client = _RecordingClient()
+    inserter = BatchedInserter(client, max_rows=2, max_age_seconds=60.0)
+    try:
+        inserter.insert("poe_trade.a", ("x",), [{"x": 1}, {"x": 2}])
+        assert client.written.wait(2.0)
+        assert _rows(client.queries[0]) == [{"x": 1}, {"x": 2}]
+    finally:
+        inserter.close()
+
+
+def test_batched_inserter_flushes_an_idle_buffer_once_it_ages_out() -> None:
+    client = _RecordingClient()
+    inserter = BatchedInserter(client, max_rows=500, max_age_seconds=0.2)
+    try:
+        inserter.insert("poe_trade.a", ("x",), [{"x": 1}])
+        assert client.written.wait(2.0)
+        assert _rows(client.queries[0]) == [{"x": 1}]
+    finally:
+        inserter.close()
+
+
+def test_batched_inserter_retries_transient_failures() -> None:
+    client = _RecordingClient()
+    client.failures.append(ClickHouseClientError("busy", retryable=True))
+    inserter = BatchedInserter(client, max_rows=100, max_age_seconds=0.0)
+    try:
+        inserter.insert("poe_trade.a", ("x",), [{"x": 1}])
+        assert inserter.flush(timeout=5.0) is True
+        assert [_rows(query) for query in client.queries] == [[{"x": 1}]]
+    finally:
+        inserter.close()
+
+
+def test_batched_inserter_close_retries_transient_failures() -> None:
+    client = _RecordingClient()
+    client.failures.append(ClickHouseClientError("busy", retryable=True))
+    inserter = BatchedInserter(client, max_rows=100, max_age_seconds=60.0)
+    inserter.insert("poe_trade.a", ("x",), [{"x": 1}])
+
+    inserter.close(timeout=10.0)
+
+    assert [_rows(query) for query in client.queries] == [[{"x": 1}]]
+
+
+def test_batched_inserter_close_drops_rows_on_fatal_error_or_timeout() -> None:
+    client = _RecordingClient()
+    client.failures.append(ClickHouseClientError("bad row", retryable=False))
+    inserter = BatchedInserter(client, max_rows=100, max_age_seconds=60.0)
+    inserter.insert("poe_trade.a", ("x",), [{"x": 1}])
+
+    inserter.close(timeout=10.0)
+
+    assert client.queries == []
+    assert client.failures == []
+
+    client.failures.extend(
+        ClickHouseClientError("busy", retryable=True) for _ in range(10)
+    )
+    inserter = BatchedInserter(client, max_rows=100, max_age_seconds=60.0)
+    inserter.insert("poe_trade.a", ("x",), [{"x": 2}])
+
+    inserter.close(timeout=0.3)
+
+    assert inserter.flush(timeout=1.0) is True
+    assert client.queries == []
+
+
+def test_batched_inserter_writes_synchronously_after_close() -> None:
+    client = _RecordingClient()
+    inserter = BatchedInserter(client)
+    inserter.close()
+
+    inserter.insert("poe_trade.a", ("x",), [{"x": 1}])
+
+    assert [_rows(query) for query in client.queries] == [[{"x": 1}]]
+
+
+def test_status_reporter_buffers_rows_through_inserter() -> None:
+    client = _RecordingClient()
+    inserter = BatchedInserter(client, max_rows=100, max_age_seconds=60.0)
+    reporter = StatusReporter(client, "market_harvester", inserter=inserter)
+
+    for status in ("success", "idle"):
+        reporter.report(
+            queue_key="psapi:pc",
+            feed_kind="psapi",
+            contract_version=1,
+            league=None,
+            realm="pc",
+            cursor="1-2",
+            next_change_id="3-4",
+            last_ingest_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            request_rate=1.0,
+            status=status,
+        )
+    assert client.queries == []
+
+    inserter.close()
+
+    assert len(client.queries) == 1
+    assert client.queries[0].startswith("INSERT INTO poe_trade.poe_ingest_status (")
+    assert [row["status"] for row in _rows(client.queries[0])] == ["success", "idle"]
@@ -19,12 +19,16 @@ def test_refresh_gold_refs_dry_run(monkeypatch, capsys):
     monkeypatch.setattr(
         cli.settings,
         "get_settings",
-        lambda: SimpleNamespace(clickhouse_url="http://clickhouse"),
+        lambda: SimpleNamespace(
+            clickhouse_url="http://clickhouse", refresh_parallelism=2
+        ),
     )
     monkeypatch.setattr(cli, "ClickHouseClient", _DummyClickHouseClient)
 
-    def _fake_execute(client, *, layer, group=None, dry_run=False):
-        calls.append((client.url, layer, group, dry_run))
+    def _fake_execute(
+        client, *, layer, group=None, dry_run=False, incremental=False, max_parallel=1
+    ):
+        calls.append((client.url, layer, group, dry_run, incremental, max_parallel))
         return [
             Path("/tmp/100_currency_ref_hour.sql"),
             Path("/tmp/110_listing_ref_hour.sql"),
@@ -35,7 +39,7 @@ def test_refresh_gold_refs_dry_run(monkeypatch, capsys):
     result = cli.main(["refresh", "gold", "--group", "refs", "--dry-run"])
 
     assert result == 0
-    assert calls == [("http://clickhouse", "gold", "refs", True)]
+    assert calls == [("http://clickhouse", "gold", "refs", True, False, 2)]
     output = capsys.readouterr().out
     assert "/tmp/100_currency_ref_hour.sql" in output
     assert "/tmp/110_listing_ref_hour.sql" in output
@@ -47,12 +51,16 @@ def test_refresh_silver_without_group(monkeypatch, capsys):
     monkeypatch.setattr(
         cli.settings,
         "get_settings",
-        lambda: SimpleNamespace(clickhouse_url="http://clickhouse"),
+        lambda: SimpleNamespace(
+            clickhouse_url="http://clickhouse", refresh_parallelism=2
+        ),
     )
     monkeypatch.setattr(cli, "ClickHouseClient", _DummyClickHouseClient)
 
-    def _fake_execute(client, *, layer, group=None, dry_run=False):
-        calls.append((client.url, layer, group, dry_run))
+    def _fake_execute(
+        client, *, layer, group=None, dry_run=False, incremental=False, max_parallel=1
+    ):
+        calls.append((client.url, layer, group, dry_run, incremental, max_parallel))
         return []
 
     monkeypatch.setattr(cli, "execute_refresh_group", _fake_execute)
@@ -60,5 +68,31 @@ def test_refresh_silver_without_group(monkeypatch, capsys):
     result = cli.main(["refresh", "silver"])
 
     assert result == 0
-    assert calls == [("http://clickhouse", "silver", None, False)]
+    assert calls == [("http://clickhouse", "silver", None, False, False, 2)]
     assert capsys.readouterr().out == ""
+
+
+def test_refresh_gold_incremental_flag(monkeypatch):
+    calls = []
+
+    monkeypatch.setattr(
+        cli.settings,
+        "get_settings",
+        lambda: SimpleNamespace(
+            clickhouse_url="http://clickhouse", refresh_parallelism=2
+        ),
+    )
+    monkeypatch.setattr(cli, "ClickHouseClient", _DummyClickHouseClient)
+
+    def _fake_execute(
+        client, *, layer, group=None, dry_run=False, incremental=False, max_parallel=1
+    ):
+        calls.append((client.url, layer, group, dry_run, incremental, max_parallel))
+        return []
+
+    monkeypatch.setattr(cli, "execute_refresh_group", _fake_execute)
+
+    result = cli.main(["refresh", "gold", "--incremental", "--parallelism", "4"])
+
+    assert result == 0
+    assert calls == [("http://clickhouse", "gold", None, False, True, 4)]
@@ -1,19 +1,87 @@
+import gzip
+import http.client
 import io
-import urllib.error
-from email.message import Message
+import threading
+from datetime import datetime, timezone
 
 import pytest
 
+from poe_trade.db import clickhouse, rowbinary
 from poe_trade.db.clickhouse import ClickHouseClient, ClickHouseClientError
 
 
-def test_execute_wraps_timeout_as_retryable_clickhouse_error(monkeypatch) -> None:
-    client = ClickHouseClient(endpoint="http://clickhouse")
+class _FakeResponse:
+    def __init__(
+        self,
+        status: int,
+        body: bytes,
+        *,
+        will_close: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.status = status
+        self._body = io.BytesIO(body)
+        self.will_close = will_close
+        self._headers = headers or {}
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._body.read(amt)
+
+    def getheader(self, name: str, default=None):  # noqa: ANN001
+        return self._headers.get(name, default)
+
+
+class _FakeSocket:
+    def settimeout(self, _timeout) -> None:  # noqa: ANN001
+        return None
 
-    def _raise_timeout(_request, timeout):
-        raise TimeoutError(f"timed out after {timeout}")
 
-    monkeypatch.setattr("urllib.request.urlopen", _raise_timeout)
+class _FakeConnection:
+    instances: list["_FakeConnection"] = []
+    responses: list[object] = []
+    request_errors: list[BaseException] = []
+
+    def __init__(self, host, port=None, timeout=None) -> None:  # noqa: ANN001
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sock: _FakeSocket | None = _FakeSocket()
+        self.requests: list[dict[str, object]] = []
+        self.closed = False
+        _FakeConnection.instances.append(self)
+
+    def request(self, method, path, body=None, headers=None) -> None:  # noqa: ANN001
+        if _FakeConnection.request_errors:
+            raise _FakeConnection.request_errors.pop(0)
+        self.requests.append(
+            {"method": method, "path": path, "body": body, "headers": headers}
+        )
+
+    def getresponse(self) -> _FakeResponse:
+        outcome = _FakeConnection.responses.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome  # type: ignore[return-value]
+
+    def close(self) -> None:
+        self.closed = True
+        self.sock = None
+
+
+@pytest.fixture(autouse=True)
+def fake_transport(monkeypatch):
+    clickhouse.close_connection_pools()
+    _FakeConnection.instances = []
+    _FakeConnection.responses = []
+    _FakeConnection.request_errors = []
+    monkeypatch.setattr(http.client, "HTTPConnection", _FakeConnection)
+    yield
+    clickhouse.close_connection_pools()
+
+
+def test_execute_wraps_timeout_as_retryable_clickhouse_error() -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [TimeoutError("timed out after 300")]
 
     with pytest.raises(ClickHouseClientError) as exc_info:
         client.execute("SELECT 1")
@@ -22,19 +90,9 @@ def test_execute_wraps_timeout_as_retryable_clickhouse_error(monkeypatch) -> Non
     assert exc_info.value.status_code is None
 
 
-def test_execute_marks_503_as_retryable(monkeypatch) -> None:
+def test_execute_marks_503_as_retryable() -> None:
     client = ClickHouseClient(endpoint="http://clickhouse")
-
-    def _raise_http_error(_request, timeout):
-        raise urllib.error.HTTPError(
-            url="http://clickhouse/",
-            code=503,
-            msg="service unavailable",
-            hdrs=Message(),
-            fp=io.BytesIO(b"temporary outage"),
-        )
-
-    monkeypatch.setattr("urllib.request.urlopen", _raise_http_error)
+    _FakeConnection.responses = [_FakeResponse(503, b"temporary outage")]
 
     with pytest.raises(ClickHouseClientError) as exc_info:
         client.execute("SELECT 1")
@@ -43,38 +101,151 @@ def test_execute_marks_503_as_retryable(monkeypatch) -> None:
     assert exc_info.value.status_code == 503
 
 
-def test_execute_marks_400_as_non_retryable(monkeypatch) -> None:
+def test_execute_marks_400_as_non_retryable() -> None:
     client = ClickHouseClient(endpoint="http://clickhouse")
-
-    def _raise_http_error(_request, timeout):
-        raise urllib.error.HTTPError(
-            url="http://clickhouse/",
-            code=400,
-            msg="bad request",
-            hdrs=Message(),
-            fp=io.BytesIO(b"syntax error"),
-        )
-
-    monkeypatch.setattr("urllib.request.urlopen", _raise_http_error)
+    _FakeConnection.responses = [_FakeResponse(400, b"syntax error")]
 
     with pytest.raises(ClickHouseClientError) as exc_info:
         client.execute("SELECT bad")
 
     assert exc_info.value.retryable is False
     assert exc_info.value.status_code == 400
+    assert str(exc_info.value) == "syntax error"
 
 
-def test_query_df_parses_json_each_row_payload(monkeypatch) -> None:
+def test_execute_reuses_keep_alive_connection_and_sends_credentials_in_headers() -> None:
+    client = ClickHouseClient(
+        endpoint="http://clickhouse:8123",
+        database="poe_trade",
+        user="writer",
+        password="s3cret",
+    )
+    _FakeConnection.responses = [_FakeResponse(200, b"1\n"), _FakeResponse(200, b"2\n")]
+
+    assert client.execute("SELECT 1") == "1\n"
+    assert client.execute("SELECT 2", settings={"max_threads": "2"}) == "2\n"
+
+    assert len(_FakeConnection.instances) == 1
+    connection = _FakeConnection.instances[0]
+    assert (connection.host, connection.port) == ("clickhouse", 8123)
+    first, second = connection.requests
+    assert first["path"] == "/?database=poe_trade"
+    assert second["path"] == "/?database=poe_trade&max_threads=2"
+    assert "s3cret" not in str(first["path"])
+    headers = first["headers"]
+    assert isinstance(headers, dict)
+    assert headers["X-ClickHouse-User"] == "writer"
+    assert headers["X-ClickHouse-Key"] == "s3cret"
+
+
+def test_execute_retries_once_when_idle_connection_was_closed_by_server() -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [
+        _FakeResponse(200, b"warm\n"),
+        http.client.RemoteDisconnected("closed"),
+        _FakeResponse(200, b"fresh\n"),
+    ]
+
+    assert client.execute("SELECT 1") == "warm\n"
+    assert client.execute("SELECT 2") == "fresh\n"
+
+    assert len(_FakeConnection.instances) == 2
+    assert _FakeConnection.instances[0].closed is True
+
+
+def test_execute_does_not_resend_insert_after_the_server_dropped_the_response() -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [
+        _FakeResponse(200, b"warm\n"),
+        http.client.RemoteDisconnected("closed"),
+    ]
+
+    assert client.execute("SELECT 1") == "warm\n"
+    with pytest.raises(ClickHouseClientError) as exc_info:
+        client.execute("INSERT INTO t FORMAT JSONEachRow\n{}")
+
+    assert exc_info.value.retryable is True
+    assert len(_FakeConnection.instances) == 1
+    assert len(_FakeConnection.instances[0].requests) == 2
+
+
+def test_execute_resends_insert_that_failed_while_sending_on_an_idle_socket() -> None:
     client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [_FakeResponse(200, b"warm\n"), _FakeResponse(200, b"")]
 
-    monkeypatch.setattr(
-        ClickHouseClient,
-        "execute",
-        lambda self, query, settings=None: (
-            '{"item_id":"1","price_chaos":12.5}\n{"item_id":"2","price_chaos":8.0}'
-        ),
+    assert client.execute("SELECT 1") == "warm\n"
+    _FakeConnection.request_errors = [BrokenPipeError("closed")]
+    client.execute("INSERT INTO t FORMAT JSONEachRow\n{}")
+
+    assert len(_FakeConnection.instances) == 2
+    assert _FakeConnection.instances[1].requests[0]["body"] == (
+        b"INSERT INTO t FORMAT JSONEachRow\n{}"
     )
 
+
+def test_pool_grows_when_a_later_client_asks_for_more_connections() -> None:
+    small = ClickHouseClient(
+        endpoint="http://clickhouse", max_connections=1, timeout=0.2
+    )
+    large = ClickHouseClient(
+        endpoint="http://clickhouse", max_connections=2, timeout=0.2
+    )
+    _FakeConnection.responses = [_FakeResponse(200, b"1\n"), _FakeResponse(200, b"2\n")]
+    replies: list[str] = []
+
+    with small._stream("SELECT 1") as chunks:
+        worker = threading.Thread(
+            target=lambda: replies.append(large.execute("SELECT 2"))
+        )
+        worker.start()
+        worker.join(2.0)
+        assert b"".join(chunks) == b"1\n"
+
+    assert replies == ["2\n"]
+
+
+def test_execute_drops_connection_when_server_closes_it() -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [
+        _FakeResponse(200, b"1\n", will_close=True),
+        _FakeResponse(200, b"2\n"),
+    ]
+
+    client.execute("SELECT 1")
+    client.execute("SELECT 2")
+
+    assert len(_FakeConnection.instances) == 2
+    assert _FakeConnection.instances[0].closed is True
+
+
+def test_execute_gzips_large_request_bodies_when_enabled() -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse", compress_requests=True)
+    _FakeConnection.responses = [_FakeResponse(200, b""), _FakeResponse(200, b"")]
+    large_query = "INSERT INTO t FORMAT JSONEachRow " + ('{"a":1}\n' * 500)
+
+    client.execute("SELECT 1")
+    client.execute(large_query)
+
+    small_request, large_request = _FakeConnection.instances[0].requests
+    assert small_request["body"] == b"SELECT 1"
+    assert "Content-Encoding" not in small_request["headers"]  # type: ignore[operator]
+    assert large_request["headers"]["Content-Encoding"] == "gzip"  # type: ignore[index]
+    assert gzip.decompress(large_request["body"]).decode("utf-8") == large_query  # type: ignore[arg-type]
+
+
+def test_query_df_parses_json_each_row_payload(monkeypatch) -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    monkeypatch.setattr(clickhouse, "pa", None)
+    _FakeConnection.responses = [
+        _FakeResponse(
+            200,
+            gzip.compress(
+                b'{"item_id":"1","price_chaos":12.5}\n{"item_id":"2","price_chaos":8.0}'
+            ),
+            headers={"Content-Encoding": "gzip"},
+        )
+    ]
+
     frame = client.query_df("SELECT * FROM test_table")
 
     assert list(frame.columns) == ["item_id", "price_chaos"]
@@ -82,3 +253,212 @@ def test_query_df_parses_json_each_row_payload(monkeypatch) -> None:
         {"item_id": 1, "price_chaos": 12.5},
         {"item_id": 2, "price_chaos": 8.0},
     ]
+    request = _FakeConnection.instances[0].requests[0]
+    assert request["body"] == b"SELECT * FROM test_table FORMAT JSONEachRow"
+    assert request["path"] == "/?enable_http_compression=1"
+    assert request["headers"]["Accept-Encoding"] == "gzip"  # type: ignore[index]
+
+
+def test_execute_does_not_request_response_compression() -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [_FakeResponse(200, b"1\n")]
+
+    assert client.execute("SELECT 1") == "1\n"
+
+    request = _FakeConnection.instances[0].requests[0]
+    assert request["path"] == "/"
+    assert "Accept-Encoding" not in request["headers"]  # type: ignore[operator]
+
+
+def test_query_arrow_requires_pyarrow(monkeypatch) -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    monkeypatch.setattr(clickhouse, "pa", None)
+
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        client.query_arrow("SELECT 1")
+
+
+def test_query_df_reads_arrow_stream_when_pyarrow_available() -> None:
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"item_id": ["1", "2"], "price_chaos": [12.5, 8.0]})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [
+        _FakeResponse(
+            200,
+            gzip.compress(sink.getvalue().to_pybytes()),
+            headers={"Content-Encoding": "gzip"},
+        )
+    ]
+
+    frame = client.query_df("SELECT item_id, price_chaos FROM test_table;")
+
+    assert frame.to_dict(orient="records") == [
+        {"item_id": "1", "price_chaos": 12.5},
+        {"item_id": "2", "price_chaos": 8.0},
+    ]
+    request = _FakeConnection.instances[0].requests[0]
+    assert request["body"] == (
+        b"SELECT item_id, price_chaos FROM test_table FORMAT ArrowStream"
+    )
+    assert "output_format_arrow_string_as_string=1" in request["path"]  # type: ignore[operator]
+
+
+def test_query_records_renders_arrow_timestamps_like_json_each_row() -> None:
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table(
+        {
+            "item_id": ["1", "2"],
+            "as_of_ts": pa.array(
+                [datetime(2026, 3, 1, 12, 30, 0, 250000, tzinfo=timezone.utc), None],
+                type=pa.timestamp("ms", tz="UTC"),
+            ),
+            "ilvl": pa.array([84, 86], type=pa.uint16()),
+        }
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [
+        _FakeResponse(
+            200,
+            gzip.compress(sink.getvalue().to_pybytes()),
+            headers={"Content-Encoding": "gzip"},
+        )
+    ]
+
+    rows = clickhouse.query_records(client, "SELECT item_id, as_of_ts, ilvl FROM t")
+
+    assert rows == [
+        {"item_id": "1", "as_of_ts": "2026-03-01 12:30:00.250", "ilvl": 84},
+        {"item_id": "2", "as_of_ts": None, "ilvl": 86},
+    ]
+    request = _FakeConnection.instances[0].requests[0]
+    assert request["body"] == b"SELECT item_id, as_of_ts, ilvl FROM t FORMAT ArrowStream"
+
+
+def test_query_records_reads_json_each_row_through_execute_override() -> None:
+    class _Wrapped(ClickHouseClient):
+        def __init__(self) -> None:
+            super().__init__(endpoint="http://clickhouse")
+            self.queries: list[str] = []
+
+        def execute(self, query, settings=None):  # type: ignore[override]
+            del settings
+            self.queries.append(query)
+            return '{"item_id":"1","as_of_ts":"2026-03-01 12:30:00.250"}\n'
+
+    client = _Wrapped()
+
+    rows = clickhouse.query_records(client, "SELECT item_id, as_of_ts FROM t")
+
+    assert rows == [{"item_id": "1", "as_of_ts": "2026-03-01 12:30:00.250"}]
+    assert client.queries == ["SELECT item_id, as_of_ts FROM t FORMAT JSONEachRow"]
+
+
+def test_iter_rows_streams_gzip_body_in_batches(monkeypatch) -> None:
+    monkeypatch.setattr(clickhouse, "_STREAM_CHUNK_BYTES", 7)
+    body = b"".join(b'{"item_id":"%d"}\n' % index for index in range(5))
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [
+        _FakeResponse(200, gzip.compress(body), headers={"Content-Encoding": "gzip"}),
+        _FakeResponse(200, b"1\n"),
+    ]
+
+    batches = list(client.iter_rows("SELECT item_id FROM t", batch_size=2))
+
+    assert [[row["item_id"] for row in batch] for batch in batches] == [
+        ["0", "1"],
+        ["2", "3"],
+        ["4"],
+    ]
+    request = _FakeConnection.instances[0].requests[0]
+    assert request["body"] == b"SELECT item_id FROM t FORMAT JSONEachRow"
+    assert client.execute("SELECT 1") == "1\n"
+    assert len(_FakeConnection.instances) == 1
+
+
+def test_iter_rows_drops_connection_when_abandoned_mid_stream() -> None:
+    body = b"".join(b'{"item_id":"%d"}\n' % index for index in range(4))
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [_FakeResponse(200, body)]
+
+    rows = client.iter_rows("SELECT item_id FROM t", batch_size=1)
+    assert next(rows) == [{"item_id": "0"}]
+    rows.close()
+
+    assert _FakeConnection.instances[0].closed is True
+
+
+def test_iter_rows_raises_on_inline_exception() -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse")
+    _FakeConnection.responses = [
+        _FakeResponse(
+            200, b'{"item_id":"1"}\nCode: 241. DB::Exception: Memory limit exceeded\n'
+        )
+    ]
+
+    with pytest.raises(ClickHouseClientError, match="Memory limit"):
+        list(client.iter_rows("SELECT item_id FROM t"))
+
+
+def test_iter_rows_lets_the_consuming_thread_query_at_the_connection_limit() -> None:
+    body = b'{"item_id":"0"}\n{"item_id":"1"}\n'
+    client = ClickHouseClient(
+        endpoint="http://clickhouse", max_connections=1, timeout=0.2
+    )
+    _FakeConnection.responses = [
+        _FakeResponse(200, body),
+        _FakeResponse(200, b"ok-0\n"),
+        _FakeResponse(200, b"ok-1\n"),
+        _FakeResponse(200, b"after\n"),
+    ]
+
+    replies = [
+        client.execute(f"INSERT {row['item_id']}")
+        for batch in client.iter_rows("SELECT item_id FROM t", batch_size=1)
+        for row in batch
+    ]
+
+    assert replies == ["ok-0\n", "ok-1\n"]
+    assert client.execute("SELECT 1") == "after\n"
+
+
+def test_query_rows_uses_execute_override() -> None:
+    class _RecordingClient(ClickHouseClient):
+        def execute(self, query, settings=None):  # noqa: ANN001
+            return '{"a":1}\n\n{"a":2}\n'
+
+    client = _RecordingClient(endpoint="http://clickhouse")
+
+    assert clickhouse.query_rows(client, "SELECT a FROM t") == [{"a": 1}, {"a": 2}]
+    assert _FakeConnection.instances == []
+
+
+def test_insert_binary_sends_statement_in_url_and_rows_in_body() -> None:
+    client = ClickHouseClient(endpoint="http://clickhouse", database="poe_trade")
+    _FakeConnection.responses = [_FakeResponse(200, b"")]
+    data = rowbinary.string("pc") + rowbinary.nullable_string(None)
+
+    client.insert_binary("poe_trade.t", ("realm", "league"), data)
+
+    request = _FakeConnection.instances[0].requests[0]
+    assert request["body"] == b"\x02pc\x01"
+    assert request["path"] == (
+        "/?database=poe_trade&query=INSERT+INTO+poe_trade.t+%28realm%2C+league%29"
+        "+FORMAT+RowBinary"
+    )
+    assert request["headers"]["Content-Type"] == "application/octet-stream"  # type: ignore[index]
+
+
+def test_rowbinary_encoders() -> None:
+    assert rowbinary.varint(0) == b"\x00"
+    assert rowbinary.varint(300) == b"\xac\x02"
+    assert rowbinary.string("é") == b"\x02\xc3\xa9"
+    assert rowbinary.nullable_string("a") == b"\x00\x01a"
+    assert rowbinary.datetime64(
+        datetime(1970, 1, 1, 0, 0, 1, 500000, tzinfo=timezone.utc)
+    ) == (1500).to_bytes(8, "little", signed=True)
@@ -2,13 +2,19 @@ import hashlib
 import json
 import logging
 import re
+import threading
 import urllib.error
 from datetime import datetime, timedelta, timezone
 from typing import Any, Mapping
 
 import pytest
 
-from poe_trade.db import ClickHouseClient, ClickHouseClientError
+from poe_trade.db import (
+    BatchedInserter,
+    ClickHouseClient,
+    ClickHouseClientError,
+    rowbinary,
+)
 from poe_trade.ingestion.market_harvester import (
     MarketHarvester,
     OAuthClient,
@@ -16,6 +22,7 @@ from poe_trade.ingestion.market_harvester import (
 )
 from poe_trade.ingestion.poe_client import PoeClient, PoeResponse
 from poe_trade.ingestion.rate_limit import RateLimitPolicy
+from poe_trade.ingestion.stash_page import parse_stash_page
 from poe_trade.ingestion.status import StatusReporter
 from poe_trade.ingestion.sync_state import QueueState, SyncStateStore
 
@@ -800,3 +807,188 @@ def test_harvest_ignores_invalid_cursor_file_value(tmp_path):
         {"id": "3047361752-2988787889-2913372319-3248177543-3139899951"},
     )
     assert cursor_file.read_text(encoding="utf-8").strip() == payload["next_change_id"]
+
+
+def test_batched_checkpoints_advance_cursor_before_flush():
+    payload = {
+        "next_change_id": "next-1",
+        "stashes": [{"id": "stash-a", "league": "Synthesis", "realm": "pc"}],
+    }
+    client = _DummyPoeClient(payload=payload)
+    clickhouse = _DummyClickHouseClient()
+    inserter = BatchedInserter(clickhouse, max_rows=100, max_age_seconds=60.0)
+    harvester = MarketHarvester(
+        client,
+        clickhouse,
+        _DummySyncStateStore(initial={"psapi:pc": "cursor-1"}),
+        _DummyStatusReporter(client=clickhouse),
+        auth_client=_build_harvester()[0]._auth_client,
+        inserter=inserter,
+    )
+
+    harvester._harvest("pc", "Synthesis", dry_run=False)
+    harvester._harvest("pc", "Synthesis", dry_run=False)
+
+    assert [call[2] for call in client.calls] == [
+        {"id": "cursor-1"},
+        {"id": "next-1"},
+    ]
+    assert all(
+        "raw_public_stash_pages" in query for query in clickhouse.queries
+    )
+
+    inserter.close()
+
+    checkpoint_queries = [
+        query for query in clickhouse.queries if "bronze_ingest_checkpoints" in query
+    ]
+    assert len(checkpoint_queries) == 1
+    assert len(checkpoint_queries[0].splitlines()) == 4
+
+
+class _SequencePoeClient(_DummyPoeClient):
+    def __init__(self, pages, stop_event):
+        super().__init__()
+        self.pages = pages
+        self.stop_event = stop_event
+
+    def request_with_metadata(
+        self, method, path, params=None, data=None, headers=None
+    ) -> PoeResponse:
+        cursor = (params or {}).get("id")
+        self.calls.append((method, path, params))
+        payload = self.pages[cursor]
+        if payload["next_change_id"] == cursor:
+            self.stop_event.set()
+        return _DummyResponse(payload, duration_ms=5.0)
+
+
+def _pipeline_pages():
+    return {
+        "cursor-1": {
+            "next_change_id": "cursor-2",
+            "stashes": [{"id": "stash-a", "league": "Synthesis"}],
+        },
+        "cursor-2": {
+            "next_change_id": "cursor-3",
+            "stashes": [{"id": "stash-b", "league": "Synthesis"}],
+        },
+        "cursor-3": {"next_change_id": "cursor-3", "stashes": []},
+    }
+
+
+def test_harvest_pipelined_commits_pages_before_checkpoints():
+    stop_event = threading.Event()
+    client = _SequencePoeClient(_pipeline_pages(), stop_event)
+    harvester, clickhouse, _sync_state, status = _build_harvester(
+        checkpoint={"psapi:pc": "cursor-1"}, client=client
+    )
+
+    harvester.harvest_pipelined(
+        "pc", dry_run=False, stop_event=stop_event, idle_wait=0.0
+    )
+
+    assert [call[2] for call in client.calls] == [
+        {"id": "cursor-1"},
+        {"id": "cursor-2"},
+        {"id": "cursor-3"},
+    ]
+    tables = [
+        "raw" if "raw_public_stash_pages" in query else "checkpoint"
+        for query in clickhouse.queries
+        if "raw_public_stash_pages" in query or "bronze_ingest_checkpoints" in query
+    ]
+    assert tables == ["raw", "checkpoint", "raw", "checkpoint", "checkpoint"]
+    assert [report["status"] for report in status.reports] == [
+        "success",
+        "success",
+        "idle",
+    ]
+
+
+def test_harvest_pipelined_stops_without_checkpoint_when_write_fails():
+    class _FailSecondWrite(_DummyClickHouseClient):
+        def execute(self, query, settings=None):
+            if "raw_public_stash_pages" in query and "stash-b" in query:
+                raise ClickHouseClientError("insert failed")
+            return super().execute(query, settings)
+
+    stop_event = threading.Event()
+    client = _SequencePoeClient(_pipeline_pages(), stop_event)
+    clickhouse = _FailSecondWrite()
+    harvester = MarketHarvester(
+        client,
+        clickhouse,
+        _DummySyncStateStore(initial={"psapi:pc": "cursor-1"}),
+        _DummyStatusReporter(client=clickhouse),
+        auth_client=_build_harvester()[0]._auth_client,
+    )
+
+    harvester.harvest_pipelined(
+        "pc", dry_run=False, stop_event=stop_event, idle_wait=0.0
+    )
+
+    checkpoints = [
+        json.loads(query.splitlines()[-1])
+        for query in clickhouse.queries
+        if "bronze_ingest_checkpoints" in query
+    ]
+    assert [row["next_cursor_id"] for row in checkpoints] == ["cursor-2"]
+
+
+def test_write_uses_rowbinary_for_native_clients():
+    class _BinaryClickHouseClient(ClickHouseClient):
+        def __init__(self):
+            super().__init__(endpoint="http://localhost:8123")
+            object.__setattr__(self, "inserts", [])
+
+        def insert_binary(self, table, columns, data, **_kwargs):
+            self.inserts.append((table, tuple(columns), data))
+
+    clickhouse = _BinaryClickHouseClient()
+    harvester = MarketHarvester(
+        _DummyPoeClient(),
+        clickhouse,
+        _DummySyncStateStore(),
+        _DummyStatusReporter(client=clickhouse),
+    )
+    raw_entry = '{"id":"stash-a", "league":null}'
+
+    harvester._write(
+        [
+            {
+                "captured_at": "2026-01-01 00:00:00.250",
+                "realm": "pc",
+                "league": None,
+                "tab_id": "stash-a",
+                "next_change_id": "next-1",
+                "payload_json": raw_entry,
+            }
+        ],
+        checkpoint="cursor-1",
+    )
+
+    [(table, columns, data)] = clickhouse.inserts
+    assert table == "poe_trade.raw_public_stash_pages"
+    assert columns[-1] == "payload_json"
+    assert data == (
+        rowbinary.datetime64(datetime(2026, 1, 1, 0, 0, 0, 250000, tzinfo=timezone.utc))
+        + rowbinary.string("pc")
+        + rowbinary.nullable_string(None)
+        + rowbinary.string("stash-a")
+        + rowbinary.string("cursor-1")
+        + rowbinary.string("next-1")
+        + rowbinary.string(raw_entry)
+    )
+
+
+def test_rows_reuse_raw_stash_text_from_scanned_page():
+    body = '{"next_change_id":"n","stashes":[{"id": "a",  "league":"Mirage"}]}'
+    harvester, *_ = _build_harvester()
+
+    rows = harvester._rows(
+        parse_stash_page(body), datetime.now(timezone.utc), realm="pc"
+    )
+
+    assert [row["payload_json"] for row in rows] == ['{"id": "a",  "league":"Mirage"}']
+    assert harvester._client._payload_parsers["public-stash-tabs"] is parse_stash_page
@@ -20,9 +20,23 @@ class _DummyClickHouseClient:
 
 
 class _DummyStatusReporter:
-    def __init__(self, client, service_name: str):
+    def __init__(self, client, service_name: str, inserter=None):
         self.client = client
         self.service_name = service_name
+        self.inserter = inserter
+
+
+class _DummyBatchedInserter:
+    instances: list["_DummyBatchedInserter"] = []
+
+    def __init__(self, client, **kwargs):
+        self.client = client
+        self.kwargs = kwargs
+        self.closed = False
+        _DummyBatchedInserter.instances.append(self)
+
+    def close(self):
+        self.closed = True
 
 
 class _DummySyncStateStore:
@@ -46,6 +60,7 @@ def test_main_returns_error_when_oauth_precheck_fails(monkeypatch, caplog):
     monkeypatch.setattr(market_harvester, "PoeClient", _DummyPoeClient)
     monkeypatch.setattr(market_harvester, "ClickHouseClient", _DummyClickHouseClient)
     monkeypatch.setattr(market_harvester, "StatusReporter", _DummyStatusReporter)
+    monkeypatch.setattr(market_harvester, "BatchedInserter", _DummyBatchedInserter)
     monkeypatch.setattr(market_harvester, "SyncStateStore", _DummySyncStateStore)
     monkeypatch.setattr(market_harvester, "RateLimitPolicy", _DummyRateLimitPolicy)
     monkeypatch.setattr(market_harvester, "CxapiSync", _DummyCxapiSync)
@@ -79,6 +94,7 @@ def test_main_returns_error_when_oauth_precheck_fails(monkeypatch, caplog):
             enable_cxapi=False,
             cxapi_hour_offset_seconds=15,
             refresh_refs_minutes=5,
+            refresh_parallelism=2,
             stash_bootstrap_until_league="",
             stash_bootstrap_from_beginning=False,
             rate_limit_max_retries=1,
@@ -90,6 +106,9 @@ def test_main_returns_error_when_oauth_precheck_fails(monkeypatch, caplog):
             poe_request_timeout=1.0,
             clickhouse_url="http://clickhouse",
             checkpoint_dir="/tmp",
+            psapi_pipeline_enabled=False,
+            ingest_batch_max_rows=500,
+            ingest_batch_max_age_seconds=2.0,
         ),
     )
 
@@ -113,16 +132,20 @@ def test_main_runs_harvester_when_oauth_precheck_succeeds(monkeypatch):
     monkeypatch.setattr(market_harvester, "PoeClient", _DummyPoeClient)
     monkeypatch.setattr(market_harvester, "ClickHouseClient", _DummyClickHouseClient)
     monkeypatch.setattr(market_harvester, "StatusReporter", _DummyStatusReporter)
+    monkeypatch.setattr(market_harvester, "BatchedInserter", _DummyBatchedInserter)
     monkeypatch.setattr(market_harvester, "SyncStateStore", _DummySyncStateStore)
     monkeypatch.setattr(market_harvester, "RateLimitPolicy", _DummyRateLimitPolicy)
     monkeypatch.setattr(market_harvester, "CxapiSync", _DummyCxapiSync)
 
     instances = []
+    inserters = []
     scheduler_calls = []
+    _DummyBatchedInserter.instances = []
 
     class _DummyMarketHarvester:
-        def __init__(self, *_args, auth_client=None, **_kwargs):
+        def __init__(self, *_args, auth_client=None, inserter=None, **_kwargs):
             instances.append(auth_client)
+            inserters.append(inserter)
 
     monkeypatch.setattr(market_harvester, "MarketHarvester", _DummyMarketHarvester)
 
@@ -147,6 +170,7 @@ def test_main_runs_harvester_when_oauth_precheck_succeeds(monkeypatch):
             enable_cxapi=False,
             cxapi_hour_offset_seconds=15,
             refresh_refs_minutes=5,
+            refresh_parallelism=2,
             stash_bootstrap_until_league="",
             stash_bootstrap_from_beginning=False,
             rate_limit_max_retries=1,
@@ -158,6 +182,9 @@ def test_main_runs_harvester_when_oauth_precheck_succeeds(monkeypatch):
             poe_request_timeout=1.0,
             clickhouse_url="http://clickhouse",
             checkpoint_dir="/tmp",
+            psapi_pipeline_enabled=False,
+            ingest_batch_max_rows=500,
+            ingest_batch_max_age_seconds=2.0,
         ),
     )
 
@@ -179,6 +206,13 @@ def test_main_runs_harvester_when_oauth_precheck_succeeds(monkeypatch):
     assert scheduler_calls[0]["cx_sync"] is None
     assert scheduler_calls[0]["refresh_client"] is not None
     assert scheduler_calls[0]["refresh_refs_minutes"] == 5
+    assert scheduler_calls[0]["refresh_parallelism"] == 2
+    assert scheduler_calls[0]["psapi_pipelined"] is False
+    assert len(_DummyBatchedInserter.instances) == 1
+    inserter = _DummyBatchedInserter.instances[0]
+    assert inserter.kwargs == {"max_rows": 500, "max_age_seconds": 2.0}
+    assert inserters == [inserter]
+    assert inserter.closed is True
 
 
 def test_main_exits_cleanly_when_both_feeds_disabled(monkeypatch):
@@ -194,6 +228,7 @@ def test_main_exits_cleanly_when_both_feeds_disabled(monkeypatch):
             enable_cxapi=False,
             cxapi_hour_offset_seconds=15,
             refresh_refs_minutes=5,
+            refresh_parallelism=2,
             stash_bootstrap_until_league="",
             stash_bootstrap_from_beginning=False,
             rate_limit_max_retries=1,
@@ -205,6 +240,9 @@ def test_main_exits_cleanly_when_both_feeds_disabled(monkeypatch):
             poe_request_timeout=1.0,
             clickhouse_url="http://clickhouse",
             checkpoint_dir="/tmp",
+            psapi_pipeline_enabled=False,
+            ingest_batch_max_rows=500,
+            ingest_batch_max_age_seconds=2.0,
         ),
     )
 
@@ -225,6 +263,7 @@ def test_main_runs_cx_only_when_psapi_disabled(monkeypatch):
     monkeypatch.setattr(market_harvester, "PoeClient", _DummyPoeClient)
     monkeypatch.setattr(market_harvester, "ClickHouseClient", _DummyClickHouseClient)
     monkeypatch.setattr(market_harvester, "StatusReporter", _DummyStatusReporter)
+    monkeypatch.setattr(market_harvester, "BatchedInserter", _DummyBatchedInserter)
     monkeypatch.setattr(market_harvester, "SyncStateStore", _DummySyncStateStore)
     monkeypatch.setattr(market_harvester, "RateLimitPolicy", _DummyRateLimitPolicy)
 
@@ -265,6 +304,7 @@ def test_main_runs_cx_only_when_psapi_disabled(monkeypatch):
             enable_cxapi=True,
             cxapi_hour_offset_seconds=15,
             refresh_refs_minutes=5,
+            refresh_parallelism=2,
             stash_bootstrap_until_league="",
             stash_bootstrap_from_beginning=False,
             rate_limit_max_retries=1,
@@ -276,6 +316,9 @@ def test_main_runs_cx_only_when_psapi_disabled(monkeypatch):
             poe_request_timeout=1.0,
             clickhouse_url="http://clickhouse",
             checkpoint_dir="/tmp",
+            psapi_pipeline_enabled=False,
+            ingest_batch_max_rows=500,
+            ingest_batch_max_age_seconds=2.0,
         ),
     )
     monkeypatch.setattr(
@@ -292,3 +335,4 @@ def test_main_runs_cx_only_when_psapi_disabled(monkeypatch):
     assert scheduler_calls[0]["cx_sync"] is not None
     assert scheduler_calls[0]["refresh_client"] is not None
     assert scheduler_calls[0]["refresh_refs_minutes"] == 5
+    assert scheduler_calls[0]["refresh_parallelism"] == 2
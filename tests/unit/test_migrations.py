@@ -922,3 +922,49 @@ def test_mirage_iron_ring_context_migration_adds_ring_context_columns() -> None:
     assert "suffix_count" in sql
     assert "open_prefixes" in sql
     assert "open_suffixes" in sql
+
+
+def test_v3_backfill_checkpoint_migration_keys_checkpoints_by_league_day() -> None:
+    migration = (
+        Path(__file__).resolve().parents[2]
+        / "schema"
+        / "migrations"
+        / "0096_ml_v3_backfill_checkpoints.sql"
+    )
+
+    sql = migration.read_text(encoding="utf-8")
+
+    assert "CREATE TABLE IF NOT EXISTS poe_trade.ml_v3_backfill_checkpoints" in sql
+    assert "ORDER BY (league, day)" in sql
+
+
+def test_search_item_label_index_migration_keys_counts_by_day_and_label() -> None:
+    migration = (
+        Path(__file__).resolve().parents[2]
+        / "schema"
+        / "migrations"
+        / "0097_search_item_label_index.sql"
+    )
+
+    sql = migration.read_text(encoding="utf-8")
+
+    assert "CREATE TABLE IF NOT EXISTS poe_trade.search_item_label_daily" in sql
+    assert "match_count UInt64" in sql
+    assert "ORDER BY (day, item_name, item_kind)" in sql
+
+
+def test_search_history_rollup_migration_feeds_hourly_rollup_from_episodes() -> None:
+    migration = (
+        Path(__file__).resolve().parents[2]
+        / "schema"
+        / "migrations"
+        / "0098_search_history_rollup.sql"
+    )
+
+    sql = migration.read_text(encoding="utf-8")
+
+    assert "CREATE TABLE IF NOT EXISTS poe_trade.search_history_rollup_hourly" in sql
+    assert "ORDER BY (league, item_name, hour, price_bucket)" in sql
+    assert "TO poe_trade.search_history_rollup_hourly" in sql
+    assert "FROM poe_trade.ml_v3_listing_episodes" in sql
+    assert "INSERT INTO poe_trade.search_history_rollup_hourly" in sql
@@ -895,18 +895,22 @@ def test_v3_backfill_command_dispatches(monkeypatch, capsys) -> None:
     monkeypatch.setattr(
         cli.settings,
         "get_settings",
-        lambda: SimpleNamespace(clickhouse_url="http://clickhouse"),
+        lambda: SimpleNamespace(
+            clickhouse_url="http://clickhouse", ml_v3_backfill_parallelism=3
+        ),
     )
     monkeypatch.setattr(cli.ClickHouseClient, "from_env", lambda _url: object())
     monkeypatch.setattr(
         cli, "detect_runtime_profile", lambda: cast(object, SimpleNamespace())
     )
     monkeypatch.setattr(cli, "persist_runtime_profile", lambda _profile: None)
-    monkeypatch.setattr(
-        cli.v3_backfill,
-        "backfill_range",
-        lambda *_args, **_kwargs: {"days_processed": 2, "league": "Mirage"},
-    )
+    calls: list[dict[str, object]] = []
+
+    def _backfill_range(*_args, **kwargs):  # noqa: ANN002, ANN003
+        calls.append(kwargs)
+        return {"days_processed": 2, "league": "Mirage"}
+
+    monkeypatch.setattr(cli.v3_backfill, "backfill_range", _backfill_range)
 
     result = cli.main(
         [
@@ -917,11 +921,13 @@ def test_v3_backfill_command_dispatches(monkeypatch, capsys) -> None:
             "2026-03-20",
             "--end-day",
             "2026-03-21",
+            "--resume",
         ]
     )
 
     assert result == 0
     assert "days_processed" in capsys.readouterr().out
+    assert (calls[0]["parallelism"], calls[0]["resume"]) == (3, True)
 
 
 def test_v3_predict_one_requires_one_input_source(monkeypatch, capsys) -> None:
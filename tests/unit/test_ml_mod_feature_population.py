@@ -8,6 +8,15 @@ from typing import cast
 from poe_trade.ml import workflows
 
 
+def _row_batches(query_rows):
+    def _iter_row_batches(client, query: str, *, batch_size: int):
+        del batch_size
+        rows = query_rows(client, query)
+        return iter([rows] if rows else [])
+
+    return _iter_row_batches
+
+
 def test_mod_features_from_tokens_emits_expected_key_shape():
     payload = workflows._mod_features_from_tokens(
         [
@@ -91,7 +100,9 @@ def test_populate_item_mod_features_scopes_refresh_to_requested_league(monkeypat
         inserted_batches.append(rows)
 
     monkeypatch.setattr(workflows, "_ensure_mod_feature_table", lambda _client: None)
-    monkeypatch.setattr(workflows, "_query_rows", _fake_query_rows)
+    monkeypatch.setattr(
+        workflows, "_iter_row_batches", _row_batches(_fake_query_rows)
+    )
     monkeypatch.setattr(workflows, "_insert_json_rows", _fake_insert)
 
     result = workflows._populate_item_mod_features_from_tokens(
@@ -156,7 +167,9 @@ def test_populate_item_mod_features_preserves_token_order_and_duplicates(monkeyp
         return {"sentinel_tier": 1, "sentinel_roll": 1.0}
 
     monkeypatch.setattr(workflows, "_ensure_mod_feature_table", lambda _client: None)
-    monkeypatch.setattr(workflows, "_query_rows", _fake_query_rows)
+    monkeypatch.setattr(
+        workflows, "_iter_row_batches", _row_batches(_fake_query_rows)
+    )
     monkeypatch.setattr(workflows, "_insert_json_rows", _fake_insert)
     monkeypatch.setattr(workflows, "_mod_features_from_tokens", _fake_mod_features)
 
@@ -208,7 +221,9 @@ def test_populate_item_mod_features_advances_cursor_monotonically(monkeypatch):
         return None
 
     monkeypatch.setattr(workflows, "_ensure_mod_feature_table", lambda _client: None)
-    monkeypatch.setattr(workflows, "_query_rows", _fake_query_rows)
+    monkeypatch.setattr(
+        workflows, "_iter_row_batches", _row_batches(_fake_query_rows)
+    )
     monkeypatch.setattr(workflows, "_insert_json_rows", _fake_insert)
 
     _ = workflows._populate_item_mod_features_from_tokens(
@@ -259,7 +274,9 @@ def test_populate_item_mod_features_retries_legacy_page_on_memory_limit(monkeypa
     monkeypatch.setenv("POE_ML_MOD_FEATURE_FALLBACK_PAGE_SIZE_CAP", "1000")
     monkeypatch.setenv("POE_ML_MOD_FEATURE_FALLBACK_MAX_MEMORY_USAGE", "1500000000")
     monkeypatch.setattr(workflows, "_ensure_mod_feature_table", lambda _client: None)
-    monkeypatch.setattr(workflows, "_query_rows", _fake_query_rows)
+    monkeypatch.setattr(
+        workflows, "_iter_row_batches", _row_batches(_fake_query_rows)
+    )
     monkeypatch.setattr(workflows, "_insert_json_rows", _fake_insert)
 
     result = workflows._populate_item_mod_features_from_tokens(
@@ -274,6 +291,51 @@ def test_populate_item_mod_features_retries_legacy_page_on_memory_limit(monkeypa
     assert result["rows_written"] == 1
 
 
+def test_populate_item_mod_features_resumes_streamed_page_after_memory_limit(
+    monkeypatch,
+):
+    observed_queries: list[str] = []
+    inserted_rows: list[dict[str, Any]] = []
+
+    class _DummyClient:
+        def execute(self, _query: str) -> str:
+            return ""
+
+    def _fake_iter_row_batches(_client, query: str, *, batch_size: int):
+        del batch_size
+        observed_queries.append(query)
+        if len(observed_queries) == 1:
+            yield [{"item_id": "item-001", "mod_tokens": ["+10 to strength"]}]
+            raise workflows.ClickHouseClientError(
+                "Code: 241. DB::Exception: MEMORY_LIMIT_EXCEEDED"
+            )
+        if len(observed_queries) == 2:
+            yield [{"item_id": "item-002", "mod_tokens": ["+20 to strength"]}]
+
+    def _fake_insert(_client, _table: str, rows: list[dict[str, Any]]):
+        inserted_rows.extend(rows)
+
+    monkeypatch.setenv("POE_ML_MOD_ROLLUP_FORCE_LEGACY", "true")
+    monkeypatch.setenv("POE_ML_MOD_FEATURE_FALLBACK_PAGE_SIZE_CAP", "1000")
+    monkeypatch.setattr(workflows, "_ensure_mod_feature_table", lambda _client: None)
+    monkeypatch.setattr(workflows, "_iter_row_batches", _fake_iter_row_batches)
+    monkeypatch.setattr(workflows, "_insert_json_rows", _fake_insert)
+
+    result = workflows._populate_item_mod_features_from_tokens(
+        cast(workflows.ClickHouseClient, cast(object, _DummyClient())),
+        league="Mirage",
+        page_size=5000,
+    )
+
+    assert [row["item_id"] for row in inserted_rows] == ["item-001", "item-002"]
+    assert result["rows_written"] == 2
+    assert "item_id > ''" in observed_queries[0]
+    assert "LIMIT 1000" in observed_queries[0]
+    assert "item_id > 'item-001'" in observed_queries[1]
+    assert "LIMIT 500" in observed_queries[1]
+    assert "item_id > 'item-002'" in observed_queries[2]
+
+
 def test_populate_item_mod_features_uses_max_as_of_ts_fallback(monkeypatch):
     token_pages = [
         [
@@ -302,7 +364,9 @@ def test_populate_item_mod_features_uses_max_as_of_ts_fallback(monkeypatch):
         inserted_rows.extend(rows)
 
     monkeypatch.setattr(workflows, "_ensure_mod_feature_table", lambda _client: None)
-    monkeypatch.setattr(workflows, "_query_rows", _fake_query_rows)
+    monkeypatch.setattr(
+        workflows, "_iter_row_batches", _row_batches(_fake_query_rows)
+    )
     monkeypatch.setattr(workflows, "_insert_json_rows", _fake_insert)
 
     _ = workflows._populate_item_mod_features_from_tokens(
@@ -521,7 +585,9 @@ def test_populate_item_mod_features_force_legacy_fallback_applies_limits(monkeyp
     monkeypatch.setenv("POE_ML_MOD_FEATURE_FALLBACK_MAX_THREADS", "4")
     monkeypatch.setenv("POE_ML_MOD_FEATURE_FALLBACK_MAX_EXECUTION_TIME", "180")
     monkeypatch.setattr(workflows, "_ensure_mod_feature_table", lambda _client: None)
-    monkeypatch.setattr(workflows, "_query_rows", _fake_query_rows)
+    monkeypatch.setattr(
+        workflows, "_iter_row_batches", _row_batches(_fake_query_rows)
+    )
     monkeypatch.setattr(workflows, "_insert_json_rows", _fake_insert)
 
     result = workflows._populate_item_mod_features_from_tokens(
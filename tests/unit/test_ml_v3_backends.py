@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, cast
+
+import joblib
+import numpy as np
+import pytest
+
+from poe_trade.ml.v3 import backends, serve, train
+
+
+class _Client:
+    def __init__(self, payload: str) -> None:
+        self.payload = payload
+        self.queries: list[str] = []
+
+    def execute(self, query: str, settings=None) -> str:  # noqa: ANN001
+        self.queries.append(query)
+        if "count() AS rows" in query:
+            return json.dumps({"rows": 850}) + "\n"
+        return self.payload
+
+
+def test_categorical_dict_vectorizer_codes_strings_and_masks_unseen_values() -> None:
+    vectorizer = backends.CategoricalDictVectorizer(max_categories=2)
+
+    X = vectorizer.fit_transform(
+        [
+            {"base_type": "Hubris Circlet", "ilvl": 86},
+            {"base_type": "Hubris Circlet", "ilvl": 84},
+            {"base_type": "Vaal Regalia", "corrupted": 1},
+            {"base_type": "Zodiac Leather", "ilvl": 70},
+        ]
+    )
+
+    assert vectorizer.feature_names_ == ["base_type", "corrupted", "ilvl"]
+    assert vectorizer.categorical_mask_.tolist() == [True, False, False]
+    assert X[:, 0].tolist()[:3] == [0.0, 0.0, 1.0]
+    assert math.isnan(X[3, 0])
+    assert X[2].tolist()[1:] == [1.0, 0.0]
+
+    unseen = vectorizer.transform([{"base_type": "Astral Plate", "unknown": 3}])
+    assert math.isnan(unseen[0, 0])
+    assert unseen[0, 1:].tolist() == [0.0, 0.0]
+
+
+def test_new_target_model_hist_uses_native_quantile_and_categorical_splits() -> None:
+    mask = np.array([True, False])
+
+    model = backends.new_target_model("hist", "p10", categorical_mask=mask)
+
+    assert model.loss == "quantile"
+    assert model.quantile == 0.1
+    assert model.categorical_features is mask
+    assert backends.new_target_model("gbr", "p90").alpha == 0.9
+    with pytest.raises(ValueError, match="unknown v3 model backend"):
+        backends.validate_model_backend("xgb")
+
+
+def test_train_route_v3_hist_backend_trains_full_window_and_serves(tmp_path) -> None:
+    rows = [
+        {
+            "category": "helmet",
+            "base_type": "Hubris Circlet" if index % 2 else "Lion Pelt",
+            "rarity": "Rare",
+            "ilvl": 60 + index,
+            "feature_vector_json": json.dumps({"ilvl": 60 + index}),
+            "mod_features_json": json.dumps({"MaximumLife_tier": index % 6}),
+            "target_price_chaos": 10.0 + index * 4.0,
+            "target_fast_sale_24h_price": 9.0 + index * 3.0,
+            "target_sale_probability_24h": (index % 10) / 10.0,
+        }
+        for index in range(40)
+    ]
+    client = _Client("\n".join(json.dumps(row) for row in rows) + "\n")
+
+    result = train.train_route_v3(
+        cast(Any, client),
+        league="Mirage",
+        route="sparse_retrieval",
+        model_dir=str(tmp_path),
+        model_backend="hist",
+    )
+
+    assert result["status"] == "trained"
+    assert "LIMIT 680" in client.queries[1]
+    bundle = joblib.load(result["model_bundle_path"])
+    assert bundle["metadata"]["model_backend"] == "hist"
+    assert isinstance(bundle["vectorizer"], backends.CategoricalDictVectorizer)
+    assert serve._is_valid_bundle_schema(bundle)
+    outputs = serve._predict_bundle_outputs(
+        bundle, [train._feature_dict(rows[5]), train._feature_dict(rows[30])]
+    )
+    assert all(math.isfinite(output["p50"]) for output in outputs)
+    assert outputs[0]["p10"] <= outputs[0]["p90"]
+
+
+def test_warm_start_keeps_predictions_for_categories_missing_from_the_delta() -> None:
+    rows = [
+        {"base_type": f"base-{code}", "ilvl": 60 + index % 5}
+        for code in range(6)
+        for index in range(30)
+    ]
+    y = np.array([10.0 * int(str(row["base_type"])[-1]) for row in rows])
+    vectorizer = backends.new_vectorizer("gbr")
+    X = vectorizer.fit_transform(rows)
+    model = backends.new_target_model("gbr", "p50")
+    model.fit(X, y)
+    probe = vectorizer.transform(
+        [{"base_type": f"base-{code}", "ilvl": 62} for code in range(1, 6)]
+    )
+    before = model.predict(probe)
+
+    delta = [row for row in rows if row["base_type"] == "base-0"][:20]
+    train._warm_start_target_model(
+        "gbr",
+        "p50",
+        model,
+        vectorizer.transform(delta),
+        np.zeros(len(delta)),
+        np.ones(len(delta)),
+        20,
+    )
+
+    np.testing.assert_allclose(model.predict(probe), before, atol=1.0)
+    with pytest.raises(ValueError, match="does not support warm start"):
+        backends.grow_target_model(
+            "hist", backends.new_target_model("hist", "p50"), 20
+        )
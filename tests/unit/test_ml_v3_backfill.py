@@ -31,6 +31,9 @@ def _load_ml_trainer_module():
         class _GradientBoostingRegressor:  # noqa: D401
             """test stub"""
 
+        class _HistGradientBoostingRegressor:  # noqa: D401
+            """test stub"""
+
         class _DictVectorizer:  # noqa: D401
             """test stub"""
 
@@ -38,6 +41,7 @@ def _load_ml_trainer_module():
             """test stub"""
 
         ensemble_module.GradientBoostingRegressor = _GradientBoostingRegressor
+        ensemble_module.HistGradientBoostingRegressor = _HistGradientBoostingRegressor
         feature_extraction_module.DictVectorizer = _DictVectorizer
         linear_model_module.LogisticRegression = _LogisticRegression
         sys.modules["sklearn"] = sklearn_module
@@ -230,6 +234,10 @@ def test_replay_day_clears_target_day_slice_before_inserts() -> None:
     assert "DELETE FROM poe_trade.silver_v3_item_events" in joined
     assert "DELETE FROM poe_trade.ml_v3_sale_proxy_labels" in joined
     assert "DELETE FROM poe_trade.ml_v3_training_examples" in joined
+    assert (
+        "DELETE FROM poe_trade.search_history_rollup_hourly WHERE league = 'Mirage' "
+        "AND toDate(hour) = toDate('2026-03-20')"
+    ) in joined
 
 
 def test_partial_replay_retry_keeps_single_effective_day_output() -> None:
@@ -277,6 +285,101 @@ def test_partial_replay_retry_keeps_single_effective_day_output() -> None:
     assert client.day_insert_effect["2026-03-21"] == 2
 
 
+def test_backfill_range_replays_days_in_parallel_and_checkpoints_each_day() -> None:
+    client = _RecordingClient(bytes_on_disk=10)
+
+    payload = backfill.backfill_range(
+        client,
+        league="Mirage",
+        start_day="2026-03-20",
+        end_day="2026-03-23",
+        max_bytes=1_000,
+        parallelism=3,
+    )
+
+    assert [row["day"] for row in payload["results"]] == [
+        "2026-03-20",
+        "2026-03-21",
+        "2026-03-22",
+        "2026-03-23",
+    ]
+    checkpoints = [
+        json.loads(query.split("\n", 1)[1])["day"]
+        for query in client.queries
+        if query.startswith("INSERT INTO poe_trade.ml_v3_backfill_checkpoints")
+    ]
+    assert sorted(checkpoints) == [row["day"] for row in payload["results"]]
+    day_stages = [
+        query.split(" (", 1)[0].split()[2]
+        for query in client.queries
+        if query.startswith("INSERT INTO") and "2026-03-22" in query
+    ]
+    assert day_stages == [
+        "poe_trade.ml_v3_listing_episodes",
+        "poe_trade.silver_v3_item_events",
+        "poe_trade.silver_v3_item_events",
+        "poe_trade.ml_v3_sale_proxy_labels",
+        "poe_trade.ml_v3_training_examples",
+        "poe_trade.ml_v3_backfill_checkpoints",
+    ]
+
+
+def test_backfill_range_resume_skips_checkpointed_days() -> None:
+    class _CheckpointClient(_RecordingClient):
+        def execute(self, query: str, settings=None) -> str:  # noqa: ANN001
+            if "FROM poe_trade.ml_v3_backfill_checkpoints" in query:
+                self.queries.append(query)
+                return json.dumps({"day": "2026-03-20"}) + "\n"
+            return super().execute(query, settings=settings)
+
+    client = _CheckpointClient(bytes_on_disk=10)
+
+    payload = backfill.backfill_range(
+        client,
+        league="Mirage",
+        start_day="2026-03-20",
+        end_day="2026-03-21",
+        max_bytes=1_000,
+        resume=True,
+    )
+
+    assert payload["days_resumed"] == ["2026-03-20"]
+    assert [row["day"] for row in payload["results"]] == ["2026-03-21"]
+    assert not any(
+        "2026-03-20" in query and query.startswith("INSERT INTO poe_trade.ml_v3_")
+        for query in client.queries
+    )
+
+
+def test_parallel_backfill_stops_starting_days_once_disk_budget_is_exceeded() -> None:
+    class _GrowingDiskClient(_RecordingClient):
+        def execute(self, query: str, settings=None) -> str:  # noqa: ANN001
+            if "INSERT INTO poe_trade.ml_v3_training_examples" in query:
+                self.bytes_on_disk = 5_000
+            return super().execute(query, settings=settings)
+
+    client = _GrowingDiskClient(bytes_on_disk=10)
+
+    with pytest.raises(ValueError, match="disk budget exceeded"):
+        backfill.backfill_range(
+            client,
+            league="Mirage",
+            start_day="2026-03-01",
+            end_day="2026-03-10",
+            max_bytes=1_000,
+            parallelism=2,
+        )
+
+    replayed_days = {
+        day
+        for query in client.queries
+        if query.startswith("INSERT INTO poe_trade.ml_v3_listing_episodes")
+        for day in [f"2026-03-{index:02d}" for index in range(1, 11)]
+        if day in query
+    }
+    assert len(replayed_days) <= 2
+
+
 def test_ml_trainer_once_fails_when_refresh_stage_reports_failure(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
@@ -286,6 +389,10 @@ def test_ml_trainer_once_fails_when_refresh_stage_reports_failure(
     cfg = SimpleNamespace(
         clickhouse_url="http://ch",
         ml_automation_enabled=True,
+        ml_v3_model_backend="gbr",
+        ml_v3_full_retrain_hours=24.0,
+        ml_v3_warm_start_max_delta=0.2,
+        ml_v3_backfill_parallelism=1,
         ml_automation_league="Mirage",
         ml_automation_interval_seconds=30,
         ml_automation_max_iterations=1,
@@ -335,6 +442,10 @@ def test_ml_trainer_once_allows_legacy_training_status_missing_with_success_indi
     cfg = SimpleNamespace(
         clickhouse_url="http://ch",
         ml_automation_enabled=True,
+        ml_v3_model_backend="gbr",
+        ml_v3_full_retrain_hours=24.0,
+        ml_v3_warm_start_max_delta=0.2,
+        ml_v3_backfill_parallelism=1,
         ml_automation_league="Mirage",
         ml_automation_interval_seconds=30,
         ml_automation_max_iterations=1,
@@ -394,6 +505,10 @@ def test_ml_trainer_once_fails_when_training_status_missing_and_no_success_indic
     cfg = SimpleNamespace(
         clickhouse_url="http://ch",
         ml_automation_enabled=True,
+        ml_v3_model_backend="gbr",
+        ml_v3_full_retrain_hours=24.0,
+        ml_v3_warm_start_max_delta=0.2,
+        ml_v3_backfill_parallelism=1,
         ml_automation_league="Mirage",
         ml_automation_interval_seconds=30,
         ml_automation_max_iterations=1,
@@ -451,6 +566,10 @@ def test_ml_trainer_once_fails_when_training_stage_reports_failure(
     cfg = SimpleNamespace(
         clickhouse_url="http://ch",
         ml_automation_enabled=True,
+        ml_v3_model_backend="gbr",
+        ml_v3_full_retrain_hours=24.0,
+        ml_v3_warm_start_max_delta=0.2,
+        ml_v3_backfill_parallelism=1,
         ml_automation_league="Mirage",
         ml_automation_interval_seconds=30,
         ml_automation_max_iterations=1,
@@ -509,6 +628,10 @@ def test_ml_trainer_once_fails_when_eval_stage_reports_failure(
     cfg = SimpleNamespace(
         clickhouse_url="http://ch",
         ml_automation_enabled=True,
+        ml_v3_model_backend="gbr",
+        ml_v3_full_retrain_hours=24.0,
+        ml_v3_warm_start_max_delta=0.2,
+        ml_v3_backfill_parallelism=1,
         ml_automation_league="Mirage",
         ml_automation_interval_seconds=30,
         ml_automation_max_iterations=1,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib
 import json
 from pathlib import Path
 
@@ -249,6 +250,50 @@ def test_save_benchmark_artifacts_writes_text_report_for_txt_output(tmp_path) ->
     assert artifacts["artifacts"]["markdown"] == str(output_path)
 
 
+def test_run_pricing_benchmark_pool_matches_sequential_and_reports_resources(
+    monkeypatch,
+) -> None:
+    # Workers unpickle candidate factories by name, so use the live module even
+    # if another test reloaded it.
+    live_benchmark = importlib.import_module("poe_trade.ml.v3.benchmark")
+    rows = [_row(index) for index in range(12)]
+    local_spec = live_benchmark.CandidateSpec(
+        name="local_mean_log",
+        description="Unpicklable spec that must fit in-process",
+        model_factory=lambda: live_benchmark.DummyRegressor(strategy="mean"),
+    )
+    specs = (*live_benchmark.BENCHMARK_CANDIDATE_SPECS[:2], local_spec)
+    vectorized: list[int] = []
+    original = live_benchmark._dense_feature_matrix
+
+    def _counting_dense_feature_matrix(*args, **kwargs):
+        vectorized.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(
+        live_benchmark, "_dense_feature_matrix", _counting_dense_feature_matrix
+    )
+
+    serial = live_benchmark.run_pricing_benchmark(rows, candidate_specs=specs)
+    pooled = live_benchmark.run_pricing_benchmark(
+        rows, candidate_specs=specs, workers=2
+    )
+
+    assert vectorized == [1, 1]
+    assert pooled["ranking"] == serial["ranking"]
+    assert pooled["training"]["workers"] == 2
+    for result in pooled["candidate_results"]:
+        assert set(result["resources"]) == {
+            "fit_seconds",
+            "predict_seconds",
+            "peak_rss_mb",
+        }
+        assert result["resources"]["peak_rss_mb"] > 0
+    text = live_benchmark.format_benchmark_report(pooled)
+    assert "- elasticnet_log: fit=" in text
+    assert "Training: workers=2" in text
+
+
 def test_normalize_mirage_iron_ring_branch_row_builds_sparse_mod_features() -> None:
     affix_catalog = benchmark.build_mirage_affix_catalog(
         [
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import pytest
 import importlib
+import json
+import random
 import sys
+from datetime import UTC, datetime
 
 from poe_trade.ml.v3.hybrid_search import (
     SearchResult,
@@ -211,6 +214,101 @@ def test_run_search_applies_similarity_weights_and_penalties() -> None:
     assert result.candidates[0]["score"] == pytest.approx(0.82, rel=1e-3)
 
 
+def _random_search_case(
+    rng: random.Random, row_count: int
+) -> tuple[dict[str, str], list[dict[str, object]], list[dict[str, object]]]:
+    affixes = ["a", "b", "c", "d", "e"]
+    state = "rare|corrupted=0|fractured=0|synthesised=0"
+    target_item = {
+        "base_type": "Hubris Circlet",
+        "rarity": "Rare",
+        "item_state_key": state,
+        "mod_features_json": json.dumps(
+            {
+                affix: rng.choice([0, 1, 2, 2.5, 3])
+                for affix in affixes
+                if rng.random() < 0.7
+            }
+        ),
+    }
+    rows = [
+        {
+            "identity_key": f"id-{rng.randrange(row_count)}",
+            "base_type": rng.choice(
+                ["Hubris Circlet", "Hubris Circlet", "Eternal Burgonet"]
+            ),
+            "rarity": "Rare",
+            "item_state_key": state,
+            "mod_features_json": json.dumps(
+                {
+                    affix: rng.choice([0, 1, 2, 2.5, 3, 4])
+                    for affix in affixes
+                    if rng.random() < 0.8
+                }
+            ),
+            "target_price_chaos": rng.random() * 100.0,
+            "support_count_recent": rng.randrange(30),
+            "as_of_ts": rng.choice(
+                [
+                    None,
+                    "bad",
+                    f"2026-03-0{rng.randrange(1, 10)}T10:00:00",
+                    "2026-03-20T00:00:00Z",
+                ]
+            ),
+        }
+        for _ in range(row_count)
+    ]
+    ranked_affixes = [
+        {"affix": affix, "importance": rng.choice([1.0, 5.0, 7.0, 9.0]), "support": 3}
+        for affix in rng.sample(affixes, rng.randrange(0, len(affixes) + 1))
+    ]
+    return target_item, rows, ranked_affixes
+
+
+def test_run_search_vectorized_matches_scalar_scoring() -> None:
+    now_utc = datetime(2026, 3, 15, tzinfo=UTC)
+    for seed in range(200):
+        rng = random.Random(seed)
+        target_item, rows, ranked_affixes = _random_search_case(
+            rng, rng.randrange(0, 60)
+        )
+        targets = {stage: rng.randrange(1, 20) for stage in (1, 2, 3, 4)}
+        results = [
+            run_search(
+                parsed_item=target_item,
+                candidate_rows=rows,
+                ranked_affixes=ranked_affixes,
+                stage_support_targets=targets,
+                latency_budget_ms=60_000,
+                now_utc=now_utc,
+                vectorized=vectorized,
+            )
+            for vectorized in (True, False)
+        ]
+
+        assert results[0] == results[1], seed
+
+
+def test_run_search_scores_two_thousand_candidates_within_latency_budget() -> None:
+    target_item, rows, _ = _random_search_case(random.Random(7), 2000)
+    ranked_affixes = [
+        {"affix": affix, "importance": 5.0, "support": 3} for affix in "abcde"
+    ]
+
+    result = run_search(
+        parsed_item=target_item,
+        candidate_rows=rows,
+        ranked_affixes=ranked_affixes,
+        stage_support_targets={1: 5000, 2: 5000, 3: 5000, 4: 5000},
+        now_utc=datetime(2026, 3, 15, tzinfo=UTC),
+    )
+
+    assert result.degradation_reason == "stage_4_support_shortfall"
+    assert result.candidate_count > 1000
+    assert len(result.candidates) == 64
+
+
 def test_run_search_uses_prior_only_stage_zero_when_no_candidates_exist() -> None:
     target_item = {
         "base_type": "Any",
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+
+from poe_trade.ml.v3 import incremental
+from poe_trade.ml.v3.incremental import (
+    IncrementalPolicy,
+    RouteFingerprint,
+    RouteTrainingState,
+    SliceFingerprint,
+)
+
+_NOW = datetime(2026, 3, 2, 12, 0, tzinfo=UTC)
+_PREVIOUS = RouteFingerprint(
+    row_count=1000, max_as_of_ts="2026-03-01 00:00:00.000", digest="42"
+)
+
+
+def _state(
+    *,
+    warm_starts: int = 0,
+    trained_at: str = "2026-03-02T06:00:00+00:00",
+    backend: str = "gbr",
+):
+    return RouteTrainingState(
+        fingerprint=_PREVIOUS,
+        model_backend=backend,
+        full_trained_at=trained_at,
+        warm_starts=warm_starts,
+    )
+
+
+def _appended(rows: int, *, prefix_digest: str = "42") -> SliceFingerprint:
+    return SliceFingerprint(
+        current=RouteFingerprint(
+            row_count=rows, max_as_of_ts="2026-03-02 00:00:00.000", digest="77"
+        ),
+        prefix_row_count=1000,
+        prefix_digest=prefix_digest,
+    )
+
+
+@pytest.mark.parametrize(
+    ("state", "fingerprint", "backend", "expected"),
+    [
+        (None, _appended(1100), "gbr", ("full", "no_previous_state")),
+        (_state(), _appended(1100), "hist", ("full", "backend_changed")),
+        (
+            _state(),
+            SliceFingerprint(_PREVIOUS, prefix_row_count=1000, prefix_digest="42"),
+            "gbr",
+            ("skip", "unchanged"),
+        ),
+        (_state(), _appended(1005), "gbr", ("skip", "below_change_threshold")),
+        (_state(), _appended(1100), "gbr", ("warm_start", "appended_rows")),
+        (_state(), _appended(1500), "gbr", ("full", "large_delta")),
+        (
+            _state(),
+            _appended(1100, prefix_digest="13"),
+            "gbr",
+            ("full", "history_changed"),
+        ),
+        (_state(warm_starts=8), _appended(1100), "gbr", ("full", "warm_start_limit")),
+        (
+            _state(backend="hist"),
+            _appended(1100),
+            "hist",
+            ("full", "warm_start_unsupported"),
+        ),
+        (
+            _state(backend="hist"),
+            SliceFingerprint(_PREVIOUS, prefix_row_count=1000, prefix_digest="42"),
+            "hist",
+            ("skip", "unchanged"),
+        ),
+        (
+            _state(warm_starts=1, trained_at="2026-03-01T06:00:00+00:00"),
+            _appended(1100),
+            "gbr",
+            ("full", "scheduled"),
+        ),
+    ],
+)
+def test_plan_route_update_picks_cheapest_safe_action(
+    state, fingerprint, backend, expected
+) -> None:  # noqa: ANN001
+    plan = incremental.plan_route_update(
+        state,
+        fingerprint,
+        policy=IncrementalPolicy(),
+        model_backend=backend,
+        now=_NOW,
+    )
+
+    assert (plan.action, plan.reason) == expected
+
+
+def test_training_state_round_trips_and_tolerates_corruption(tmp_path) -> None:
+    state = _state(warm_starts=2)
+
+    incremental.write_training_state(tmp_path, state)
+    assert incremental.read_training_state(tmp_path) == state
+
+    (tmp_path / incremental.STATE_FILENAME).write_text("{", encoding="utf-8")
+    assert incremental.read_training_state(tmp_path) is None
+    incremental.clear_training_state(tmp_path)
+    assert incremental.read_training_state(tmp_path) is None
+
+
+def test_load_slice_fingerprint_digests_the_limited_training_slice() -> None:
+    class _Client:
+        def __init__(self) -> None:
+            self.queries: list[str] = []
+
+        def execute(self, query: str, settings=None) -> str:  # noqa: ANN001
+            self.queries.append(query)
+            return (
+                '{"rows":3,"max_as_of_ts":"2026-03-02 00:00:00.000","digest":"9",'
+                '"prefix_rows":2,"prefix_digest":"5"}\n'
+            )
+
+    client = _Client()
+
+    fingerprint = incremental.load_slice_fingerprint(
+        client,  # type: ignore[arg-type]
+        league="Mirage",
+        route="sparse_retrieval",
+        train_limit=680,
+        since="2026-03-01 00:00:00.000",
+    )
+
+    assert fingerprint == SliceFingerprint(
+        current=RouteFingerprint(
+            row_count=3, max_as_of_ts="2026-03-02 00:00:00.000", digest="9"
+        ),
+        prefix_row_count=2,
+        prefix_digest="5",
+    )
+    query = client.queries[0]
+    assert "ORDER BY as_of_ts ASC, identity_key ASC LIMIT 680" in query
+    assert "as_of_ts <= toDateTime64('2026-03-01 00:00:00.000', 3, 'UTC')" in query
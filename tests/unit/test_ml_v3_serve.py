@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import UTC, datetime
 from typing import Any
 
 import pytest
 
 from poe_trade.db import ClickHouseClient
+from poe_trade.db.clickhouse import ClickHouseClientError
 from poe_trade.ml.v3 import serve
 from poe_trade.ml.v3 import hybrid_search
 from poe_trade.ml.v3.hybrid_search import SearchResult, run_search
 
 
+@pytest.fixture(autouse=True)
+def reset_serving_context() -> None:
+    serve.invalidate_serving_context()
+
+
 class _Client(ClickHouseClient):
     def __init__(self) -> None:
         super().__init__(endpoint="http://localhost")
@@ -329,6 +336,43 @@ def test_predict_one_v3_uses_route_bundle_when_rollout_state_is_empty(
     assert payload["confidence"] == 0.1
 
 
+def test_predict_from_item_json_parses_item_dict_without_clipboard(
+    monkeypatch,
+) -> None:
+    seen: dict[str, object] = {}
+    monkeypatch.setattr(
+        serve.workflows,
+        "_parse_clipboard_item",
+        lambda _text: pytest.fail("clipboard parser must not run"),
+    )
+    monkeypatch.setattr(
+        serve.workflows,
+        "_parse_item_json",
+        lambda item: seen.setdefault("item", item) and _parsed_payload(),
+    )
+    monkeypatch.setattr(
+        serve,
+        "_attach_search",
+        lambda _client, *, league, prepared: {**prepared, "league": league},
+    )
+    monkeypatch.setattr(
+        serve,
+        "_predict_prepared_v3",
+        lambda _client, *, league, prepared_items, model_dir: [
+            {"league": league, "route": prepared_items[0]["route"]}
+        ],
+    )
+    item = {"frameType": 2, "typeLine": "Hubris Circlet"}
+
+    payload = serve.predict_from_item_json(
+        _Client(), league="Mirage", item=item, model_dir="/unused"
+    )
+
+    assert seen["item"] is item
+    assert payload["league"] == "Mirage"
+    assert payload["route"] == serve.routes.select_route(_parsed_payload())
+
+
 def test_predict_one_v3_decodes_log1p_price_bundle_outputs(monkeypatch) -> None:
     monkeypatch.setattr(
         serve.workflows,
@@ -1503,3 +1547,313 @@ def test_run_search_uses_supplied_now_utc_for_deterministic_recency() -> None:
         "newer",
         "older",
     ]
+
+
+def test_load_bundle_if_present_reuses_cached_bundle_until_file_changes(
+    monkeypatch, tmp_path
+) -> None:
+    serve.reset_bundle_cache()
+    path = tmp_path / "v3" / "Mirage" / "sparse_retrieval" / "bundle.joblib"
+    path.parent.mkdir(parents=True)
+    serve.joblib.dump({"version": 1}, path)
+    load_calls: list[str] = []
+    real_load = serve.joblib.load
+
+    def _counting_load(target):  # noqa: ANN001
+        load_calls.append(str(target))
+        return real_load(target)
+
+    monkeypatch.setattr(serve.joblib, "load", _counting_load)
+
+    first = serve._load_bundle_if_present(
+        model_dir=str(tmp_path), league="Mirage", route="sparse_retrieval"
+    )
+    second = serve._load_bundle_if_present(
+        model_dir=str(tmp_path), league="Mirage", route="sparse_retrieval"
+    )
+
+    assert first == {"version": 1}
+    assert second is first
+    assert len(load_calls) == 1
+
+    serve.joblib.dump({"version": 2}, path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    third = serve._load_bundle_if_present(
+        model_dir=str(tmp_path), league="Mirage", route="sparse_retrieval"
+    )
+
+    assert third == {"version": 2}
+    assert len(load_calls) == 2
+    serve.reset_bundle_cache()
+
+
+def test_warmup_bundle_cache_loads_every_route_bundle(tmp_path) -> None:
+    serve.reset_bundle_cache()
+    valid_path = tmp_path / "v3" / "Mirage" / "sparse_retrieval" / "bundle.joblib"
+    invalid_path = tmp_path / "v3" / "Mirage" / "fungible_reference" / "bundle.joblib"
+    valid_path.parent.mkdir(parents=True)
+    invalid_path.parent.mkdir(parents=True)
+    serve.joblib.dump(
+        {
+            "vectorizer": _DummyVectorizer(),
+            "models": {
+                "p10": _DummyRegressor(1.0),
+                "p50": _DummyRegressor(2.0),
+                "p90": _DummyRegressor(3.0),
+            },
+        },
+        valid_path,
+    )
+    serve.joblib.dump({"models": {}}, invalid_path)
+
+    states = serve.warmup_bundle_cache(league="Mirage", model_dir=str(tmp_path))
+
+    assert states == {
+        "fungible_reference": "bundle_invalid",
+        "sparse_retrieval": "warm",
+    }
+    assert (str(tmp_path), "Mirage", "sparse_retrieval") in serve._BUNDLE_CACHE
+    assert serve.warmup_bundle_cache(league="Standard", model_dir=str(tmp_path)) == {}
+    serve.reset_bundle_cache()
+
+
+class _RowCountingRegressor:
+    def __init__(self, value: float) -> None:
+        self.value = value
+        self.calls: list[int] = []
+
+    def predict(self, X):  # noqa: ANN001
+        self.calls.append(len(X))
+        return [self.value + index for index in range(len(X))]
+
+
+class _RowVectorizer:
+    def transform(self, rows):  # noqa: ANN001
+        return [[1.0] for _ in rows]
+
+
+def test_predict_many_v3_scores_each_bundle_group_with_one_predict_call(
+    monkeypatch,
+) -> None:
+    parsed_by_text = {
+        "rare-a": _parsed_payload(),
+        "rare-b": {**_parsed_payload(), "ilvl": 84},
+        "unknown": {**_parsed_payload(), "category": "", "rarity": "Magic"},
+    }
+    monkeypatch.setattr(
+        serve.workflows,
+        "_parse_clipboard_item",
+        lambda text: dict(parsed_by_text[text]),
+    )
+    monkeypatch.setattr(
+        serve.sql,
+        "build_retrieval_candidate_query",
+        lambda **_kwargs: "RETRIEVE",
+    )
+    rollout_calls: list[str] = []
+    monkeypatch.setattr(
+        serve,
+        "_load_promoted_rollout_rows",
+        lambda *_args, **kwargs: rollout_calls.append(kwargs["league"]) or [],
+    )
+    p50_model = _RowCountingRegressor(120.0)
+    bundle_loads: list[str] = []
+    bundle = {
+        "vectorizer": _RowVectorizer(),
+        "models": {
+            "p10": _RowCountingRegressor(95.0),
+            "p50": p50_model,
+            "p90": _RowCountingRegressor(140.0),
+        },
+        "metadata": {"row_count": 1200},
+    }
+
+    def _fake_load_bundle(**kwargs):  # noqa: ANN003
+        bundle_loads.append(kwargs["route"])
+        return bundle if kwargs["route"] == "sparse_retrieval" else None
+
+    monkeypatch.setattr(serve, "_load_bundle_if_present", _fake_load_bundle)
+
+    payloads = serve.predict_many_v3(
+        _Client(),
+        league="Mirage",
+        items=["rare-a", "rare-b", "unknown"],
+        model_dir="/unused",
+    )
+
+    assert [payload["route"] for payload in payloads] == [
+        "sparse_retrieval",
+        "sparse_retrieval",
+        "fallback_abstain",
+    ]
+    assert p50_model.calls == [2]
+    assert payloads[0]["fair_value_p50"] == 120.0
+    assert payloads[1]["fair_value_p50"] == 121.0
+    assert payloads[0]["prediction_source"] == "v3_model"
+    assert payloads[2]["prediction_source"] == "v3_median_fallback"
+    assert sorted(bundle_loads) == ["fallback_abstain", "sparse_retrieval"]
+    assert rollout_calls == ["Mirage"]
+
+
+def test_predict_many_v3_matches_predict_one_v3_for_single_item(monkeypatch) -> None:
+    monkeypatch.setattr(
+        serve.workflows,
+        "_parse_clipboard_item",
+        lambda _text: _parsed_payload(),
+    )
+    monkeypatch.setattr(
+        serve,
+        "_load_bundle_if_present",
+        lambda **_kwargs: {
+            "vectorizer": _DummyVectorizer(),
+            "models": {
+                "p10": _DummyRegressor(95.0),
+                "p50": _DummyRegressor(120.0),
+                "p90": _DummyRegressor(140.0),
+                "fast_sale_24h": _DummyRegressor(109.0),
+                "sale_probability": _DummyClassifier(),
+            },
+            "fallback_fast_sale_multiplier": 0.9,
+            "metadata": {"row_count": 1200},
+        },
+    )
+
+    single = serve.predict_one_v3(
+        _Client(), league="Mirage", clipboard_text="dummy", model_dir="/unused"
+    )
+    batch = serve.predict_many_v3(
+        _Client(), league="Mirage", items=["dummy"], model_dir="/unused"
+    )
+
+    volatile = {"prediction_id", "prediction_as_of_ts"}
+    assert len(batch) == 1
+    assert {k: v for k, v in batch[0].items() if k not in volatile} == {
+        k: v for k, v in single.items() if k not in volatile
+    }
+
+
+def test_predict_many_v3_prefetches_retrieval_candidates_once_per_route(
+    monkeypatch,
+) -> None:
+    parsed_by_text = {
+        "clean": _parsed_payload(),
+        "corrupted": {**_parsed_payload(), "corrupted": 1},
+        "clean-again": {**_parsed_payload(), "ilvl": 83},
+    }
+    monkeypatch.setattr(
+        serve.workflows,
+        "_parse_clipboard_item",
+        lambda text: dict(parsed_by_text[text]),
+    )
+    monkeypatch.setattr(serve, "_load_bundle_if_present", lambda **_kwargs: None)
+
+    def _single_query(**_kwargs):  # noqa: ANN003
+        raise AssertionError("per-item retrieval query should not run")
+
+    monkeypatch.setattr(serve.sql, "build_retrieval_candidate_query", _single_query)
+    retrieval_queries: list[str] = []
+    searched_rows: list[list[dict[str, Any]]] = []
+    real_run_search = serve.hybrid_search.run_search
+
+    def _recording_run_search(**kwargs):  # noqa: ANN003
+        searched_rows.append(list(kwargs["candidate_rows"]))
+        return real_run_search(**kwargs)
+
+    monkeypatch.setattr(serve.hybrid_search, "run_search", _recording_run_search)
+
+    def _fake_query_rows(_client, query: str):  # noqa: ANN001
+        if "candidate_rank" in query:
+            retrieval_queries.append(query)
+            return [
+                {
+                    "identity_key": "clean-1",
+                    "item_state_key": "rare|corrupted=0|fractured=0|synthesised=0",
+                },
+                {
+                    "identity_key": "corrupted-1",
+                    "item_state_key": "rare|corrupted=1|fractured=0|synthesised=0",
+                },
+            ]
+        return []
+
+    monkeypatch.setattr(serve, "_query_rows", _fake_query_rows)
+
+    payloads = serve.predict_many_v3(
+        _Client(),
+        league="Mirage",
+        items=["clean", "corrupted", "clean-again"],
+        model_dir="/unused",
+    )
+
+    assert len(payloads) == 3
+    assert len(retrieval_queries) == 1
+    assert "item_state_key IN (" in retrieval_queries[0]
+    assert [[row["identity_key"] for row in rows] for rows in searched_rows] == [
+        ["clean-1"],
+        ["corrupted-1"],
+        ["clean-1"],
+    ]
+
+
+class _FxClient(ClickHouseClient):
+    def __init__(self, rates: list[object]) -> None:
+        super().__init__(endpoint="http://localhost")
+        object.__setattr__(self, "rates", rates)
+        object.__setattr__(self, "queries", [])
+
+    def execute(self, query: str, settings=None) -> str:  # noqa: ANN001
+        self.queries.append(query)
+        rate = self.rates.pop(0)
+        if isinstance(rate, Exception):
+            raise rate
+        return json.dumps({"rate": rate}) + "\n"
+
+
+def test_serving_context_caches_fx_rate_until_ttl_expires(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(serve.time, "monotonic", lambda: clock["now"])
+    context = serve.ServingContext(ttl_seconds=60.0)
+    client = _FxClient([200.0, 210.0])
+
+    assert context.fx_rate(client, league="Mirage") == 200.0
+    clock["now"] += 59.0
+    assert context.fx_rate(client, league="Mirage") == 200.0
+    assert len(client.queries) == 1
+
+    clock["now"] += 2.0
+    assert context.fx_rate(client, league="Mirage") == 210.0
+    assert len(client.queries) == 2
+
+
+def test_serving_context_does_not_cache_failed_fx_lookup() -> None:
+    context = serve.ServingContext(ttl_seconds=60.0)
+    client = _FxClient([ClickHouseClientError("down"), 190.0])
+
+    assert context.fx_rate(client, league="Mirage") == 1.0
+    assert context.fx_rate(client, league="Mirage") == 190.0
+    assert len(client.queries) == 2
+
+
+def test_serving_context_invalidates_rollout_rows_on_workflow_rollout_change(
+    monkeypatch,
+) -> None:
+    calls: list[str] = []
+
+    def _fake_query_rows(_client, query: str):  # noqa: ANN001
+        calls.append(query)
+        return [{"strategy_family": "sparse_retrieval", "cohort_key": "c", "promoted": 1}]
+
+    monkeypatch.setattr(serve, "_query_rows", _fake_query_rows)
+
+    first = serve._load_promoted_rollout_rows(_Client(), league="Mirage")
+    second = serve._load_promoted_rollout_rows(_Client(), league="Mirage")
+
+    assert first == second
+    assert len(calls) == 1
+
+    serve.workflows._invalidate_active_model_cache(league="Mirage")
+    serve._load_promoted_rollout_rows(_Client(), league="Mirage")
+
+    assert len(calls) == 2
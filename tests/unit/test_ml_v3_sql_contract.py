@@ -212,6 +212,33 @@ def test_retrieval_candidate_sql_includes_identity_and_mod_payload() -> None:
     assert "mod_features_json" in query
 
 
+def test_retrieval_candidate_pool_sql_fetches_many_states_per_route() -> None:
+    query = sql.build_retrieval_candidate_pool_query(
+        league="Mirage",
+        route="sparse_retrieval",
+        item_state_keys=[
+            "rare|corrupted=1|fractured=0|synthesised=0",
+            "rare|corrupted=0|fractured=0|synthesised=0",
+            "rare|corrupted=1|fractured=0|synthesised=0",
+        ],
+    )
+
+    assert "PARTITION BY league, route, item_state_key" in query
+    assert "route = 'sparse_retrieval'" in query
+    assert (
+        "item_state_key IN ('rare|corrupted=0|fractured=0|synthesised=0', "
+        "'rare|corrupted=1|fractured=0|synthesised=0')"
+    ) in query
+    assert "candidate_rank <= 2000" in query
+
+
+def test_retrieval_candidate_pool_sql_rejects_empty_state_keys() -> None:
+    with pytest.raises(ValueError, match="item_state_keys"):
+        sql.build_retrieval_candidate_pool_query(
+            league="Mirage", route="sparse_retrieval", item_state_keys=[]
+        )
+
+
 def test_route_sql_fragment_delegates_to_routes_module() -> None:
     query = sql.build_training_examples_insert_query(
         league="Mirage", day=date(2026, 3, 20)
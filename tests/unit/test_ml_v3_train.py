@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import importlib
 import json
 from typing import Any, cast
 
 import joblib
 
 from poe_trade.db import ClickHouseClient
-from poe_trade.ml.v3 import train
+from poe_trade.ml.v3 import backends, train
+from poe_trade.ml.v3.incremental import STATE_FILENAME, IncrementalPolicy
 
 
 class _Client:
@@ -438,11 +440,13 @@ def test_load_training_rows_keeps_eval_tail_out_of_train_slice() -> None:
     assert "snapshot_count" in training_query
 
     client_eval = _CaptureClient()
-    _ = train._load_eval_rows(
-        cast(Any, client_eval),
-        league="Mirage",
-        route="sparse_retrieval",
-        max_rows=2_000,
+    _ = list(
+        train._iter_eval_row_batches(
+            cast(Any, client_eval),
+            league="Mirage",
+            route="sparse_retrieval",
+            max_rows=2_000,
+        )
     )
     eval_query = next(
         query for query in client_eval.queries if "ORDER BY as_of_ts" in query
@@ -475,7 +479,14 @@ def test_train_all_routes_v3_runs_ring_parser_audit_first(monkeypatch) -> None:
         return [{"route": "sparse_retrieval", "rows": 1}]
 
     def _train_route_v3(
-        client, *, league: str, route: str, model_dir: str, max_rows: int
+        client,
+        *,
+        league: str,
+        route: str,
+        model_dir: str,
+        max_rows: int | None,
+        pool=None,
+        **_kwargs,
     ):  # noqa: ANN001
         calls.append(f"train:{route}")
         return {
@@ -609,9 +620,9 @@ def test_record_eval_predictions_for_run_writes_engine_version(
         ]
     )
     models = {
-        "p10": train.GradientBoostingRegressor(random_state=42),
-        "p50": train.GradientBoostingRegressor(random_state=42),
-        "p90": train.GradientBoostingRegressor(random_state=42),
+        "p10": backends.GradientBoostingRegressor(random_state=42),
+        "p50": backends.GradientBoostingRegressor(random_state=42),
+        "p90": backends.GradientBoostingRegressor(random_state=42),
     }
     feature_row = {
         "category": "helmet",
@@ -647,24 +658,26 @@ def test_record_eval_predictions_for_run_writes_engine_version(
     monkeypatch.setattr(train, "_load_bundle_for_route", lambda **_kwargs: bundle)
     monkeypatch.setattr(
         train,
-        "_load_eval_rows",
+        "_iter_eval_row_batches",
         lambda *_args, **_kwargs: [
-            {
-                "as_of_ts": "2026-03-20T00:00:00",
-                "item_id": "item-1",
-                "identity_key": "item-1",
-                "category": "helmet",
-                "base_type": "Hubris Circlet",
-                "rarity": "Rare",
-                "ilvl": 86,
-                "stack_size": 1,
-                "corrupted": 0,
-                "fractured": 0,
-                "synthesised": 0,
-                "support_count_recent": 4,
-                "feature_vector_json": '{"ilvl":86,"stack_size":1,"corrupted":0}',
-                "mod_features_json": '{"explicit.max_life":1}',
-            }
+            [
+                {
+                    "as_of_ts": "2026-03-20T00:00:00",
+                    "item_id": "item-1",
+                    "identity_key": "item-1",
+                    "category": "helmet",
+                    "base_type": "Hubris Circlet",
+                    "rarity": "Rare",
+                    "ilvl": 86,
+                    "stack_size": 1,
+                    "corrupted": 0,
+                    "fractured": 0,
+                    "synthesised": 0,
+                    "support_count_recent": 4,
+                    "feature_vector_json": '{"ilvl":86,"stack_size":1,"corrupted":0}',
+                    "mod_features_json": '{"explicit.max_life":1}',
+                }
+            ]
         ],
     )
 
@@ -719,10 +732,10 @@ def test_record_eval_predictions_for_run_uses_cohort_bundle_when_available(
 
     def _fit_bundle(value: float) -> dict[str, object]:
         models = {
-            "p10": train.GradientBoostingRegressor(random_state=42),
-            "p50": train.GradientBoostingRegressor(random_state=42),
-            "p90": train.GradientBoostingRegressor(random_state=42),
-            "fast_sale_24h": train.GradientBoostingRegressor(random_state=42),
+            "p10": backends.GradientBoostingRegressor(random_state=42),
+            "p50": backends.GradientBoostingRegressor(random_state=42),
+            "p90": backends.GradientBoostingRegressor(random_state=42),
+            "fast_sale_24h": backends.GradientBoostingRegressor(random_state=42),
             "sale_probability": _Classifier(),
         }
         X = vectorizer.transform([feature_row, feature_row])
@@ -760,27 +773,29 @@ def test_record_eval_predictions_for_run_uses_cohort_bundle_when_available(
     monkeypatch.setattr(train, "_load_bundle_for_route", lambda **_kwargs: route_bundle)
     monkeypatch.setattr(
         train,
-        "_load_eval_rows",
+        "_iter_eval_row_batches",
         lambda *_args, **_kwargs: [
-            {
-                "as_of_ts": "2026-03-20T00:00:00",
-                "item_id": "item-1",
-                "identity_key": "item-1",
-                "route": "sparse_retrieval",
-                "category": "helmet",
-                "base_type": "Hubris Circlet",
-                "item_type_line": "Hubris Circlet",
-                "rarity": "Rare",
-                "ilvl": 86,
-                "stack_size": 1,
-                "corrupted": 0,
-                "fractured": 0,
-                "synthesised": 0,
-                "support_count_recent": 4,
-                "fx_chaos_per_divine": 100.0,
-                "feature_vector_json": '{"ilvl":86,"stack_size":1,"corrupted":0}',
-                "mod_features_json": '{"explicit.max_life":1}',
-            }
+            [
+                {
+                    "as_of_ts": "2026-03-20T00:00:00",
+                    "item_id": "item-1",
+                    "identity_key": "item-1",
+                    "route": "sparse_retrieval",
+                    "category": "helmet",
+                    "base_type": "Hubris Circlet",
+                    "item_type_line": "Hubris Circlet",
+                    "rarity": "Rare",
+                    "ilvl": 86,
+                    "stack_size": 1,
+                    "corrupted": 0,
+                    "fractured": 0,
+                    "synthesised": 0,
+                    "support_count_recent": 4,
+                    "fx_chaos_per_divine": 100.0,
+                    "feature_vector_json": '{"ilvl":86,"stack_size":1,"corrupted":0}',
+                    "mod_features_json": '{"explicit.max_life":1}',
+                }
+            ]
         ],
     )
 
@@ -795,3 +810,220 @@ def test_record_eval_predictions_for_run_uses_cohort_bundle_when_available(
     assert count == 1
     body = "\n".join(inserted)
     assert '"fair_value_p50":500.0' in body
+
+
+def _two_cohort_rows() -> list[dict[str, Any]]:
+    rows = []
+    for index in range(8):
+        family = "sparse_retrieval" if index % 2 else "fungible_reference"
+        rows.append(
+            {
+                "feature_vector_json": json.dumps(
+                    {"ilvl": 60 + index * 3, "stack_size": 1, "corrupted": index % 3}
+                ),
+                "mod_features_json": json.dumps({"MaximumLife_tier": index % 5}),
+                "target_price_chaos": 20.0 + index * 11.0,
+                "target_fast_sale_24h_price": 18.0 + index * 9.0,
+                "target_sale_probability_24h": 0.1 * (index % 7),
+                "label_weight": 0.5,
+                "strategy_family": family,
+                "cohort_key": f"{family}|helmet|v1",
+            }
+        )
+    return rows
+
+
+def test_train_route_v3_pool_matches_sequential_fit(tmp_path) -> None:
+    from poe_trade.ml.v3.parallel import TrainingPool
+
+    # Workers unpickle the fit function by name, so use the live module even
+    # if another test reloaded it.
+    live_train = importlib.import_module("poe_trade.ml.v3.train")
+    payload = "\n".join(json.dumps(row) for row in _two_cohort_rows()) + "\n"
+    serial = live_train.train_route_v3(
+        cast(Any, _Client(payload=payload)),
+        league="Mirage",
+        route="sparse_retrieval",
+        model_dir=str(tmp_path / "serial"),
+    )
+    with TrainingPool(workers=2, scratch_root=str(tmp_path)) as pool:
+        pooled = live_train.train_route_v3(
+            cast(Any, _Client(payload=payload)),
+            league="Mirage",
+            route="sparse_retrieval",
+            model_dir=str(tmp_path / "pooled"),
+            pool=pool,
+        )
+
+    serial_bundle = joblib.load(serial["model_bundle_path"])
+    pooled_bundle = joblib.load(pooled["model_bundle_path"])
+    assert list(pooled_bundle["cohort_bundles"]) == list(
+        serial_bundle["cohort_bundles"]
+    )
+    assert pooled_bundle["metadata"] == serial_bundle["metadata"]
+    for key, serial_cohort in serial_bundle["cohort_bundles"].items():
+        pooled_cohort = pooled_bundle["cohort_bundles"][key]
+        assert pooled_cohort["metadata"] == serial_cohort["metadata"]
+        X = serial_cohort["vectorizer"].transform(
+            [live_train._feature_dict(row) for row in _two_cohort_rows()]
+        )
+        for target, model in serial_cohort["models"].items():
+            assert (
+                pooled_cohort["models"][target].predict(X) == model.predict(X)
+            ).all()
+    assert list((tmp_path).glob("poe-v3-train-*")) == []
+
+
+def test_train_all_routes_v3_fans_routes_out_to_shared_pool(monkeypatch) -> None:
+    pools: list[object] = []
+
+    def _train_route_v3(
+        client,
+        *,
+        league: str,
+        route: str,
+        model_dir: str,
+        max_rows: int | None,
+        pool=None,
+        **_kwargs,
+    ):  # noqa: ANN001
+        pools.append(pool)
+        return {
+            "league": league,
+            "route": route,
+            "row_count": 1,
+            "model_bundle_path": "",
+            "status": "trained",
+        }
+
+    monkeypatch.setattr(
+        train.workflows, "audit_ring_parser_invariants", lambda *_a, **_k: None
+    )
+    monkeypatch.setattr(
+        train,
+        "_query_rows",
+        lambda *_a: [{"route": "sparse_retrieval"}, {"route": "fungible_reference"}],
+    )
+    monkeypatch.setattr(train, "train_route_v3", _train_route_v3)
+    monkeypatch.setattr(
+        train, "record_eval_predictions_for_run", lambda *_a, **_k: 0
+    )
+
+    result = train.train_all_routes_v3(
+        cast(Any, _Client(payload="")), league="Mirage", model_dir="/tmp/m", workers=3
+    )
+
+    assert [row["route"] for row in result["results"]] == [
+        "sparse_retrieval",
+        "fungible_reference",
+    ]
+    assert len(pools) == 2 and pools[0] is not None and pools[0] is pools[1]
+
+    pools.clear()
+    train.train_all_routes_v3(
+        cast(Any, _Client(payload="")), league="Mirage", model_dir="/tmp/m", workers=1
+    )
+    assert pools == [None, None]
+
+
+class _IncrementalClient:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.fingerprint: dict[str, Any] = {}
+        self.delta_rows: list[dict[str, Any]] = []
+        self.queries: list[str] = []
+
+    def execute(self, query: str, settings=None) -> str:  # noqa: ANN001
+        self.queries.append(query)
+        if query.startswith("INSERT"):
+            return ""
+        if "groupBitXor" in query:
+            payload = [self.fingerprint]
+        elif "count() AS rows" in query:
+            payload = [{"rows": len(self.rows) * 2}]
+        elif "as_of_ts > toDateTime64" in query:
+            payload = self.delta_rows
+        else:
+            payload = self.rows
+        return "".join(json.dumps(row) + "\n" for row in payload)
+
+
+def test_train_route_v3_incremental_skips_warm_starts_and_retrains(tmp_path) -> None:
+    rows = _two_cohort_rows()
+    client = _IncrementalClient(rows)
+    client.fingerprint = {
+        "rows": 8,
+        "max_as_of_ts": "2026-01-01 00:00:00.000",
+        "digest": "111",
+        "prefix_rows": 0,
+        "prefix_digest": "0",
+    }
+    policy = IncrementalPolicy(min_change_fraction=0.0, warm_start_max_delta=0.5)
+    state_path = tmp_path / "v3" / "Mirage" / "sparse_retrieval" / STATE_FILENAME
+
+    def _train() -> dict[str, Any]:
+        return train.train_route_v3(
+            cast(Any, client),
+            league="Mirage",
+            route="sparse_retrieval",
+            model_dir=str(tmp_path),
+            incremental=policy,
+        )
+
+    first = _train()
+    assert (first["status"], first["reason"]) == ("trained", "no_previous_state")
+
+    client.fingerprint.update(prefix_rows=8, prefix_digest="111")
+    client.queries.clear()
+    unchanged = _train()
+    assert (unchanged["status"], unchanged["reason"]) == ("unchanged", "unchanged")
+    assert not any("listing_episode_id" in query for query in client.queries)
+
+    client.fingerprint.update(
+        rows=10, max_as_of_ts="2026-01-02 00:00:00.000", digest="222"
+    )
+    client.delta_rows = rows[:2]
+    warm = _train()
+    assert (warm["status"], warm["row_count"]) == ("warm_started", 10)
+    bundle = joblib.load(warm["model_bundle_path"])
+    assert bundle["models"]["p50"].n_estimators_ == 140
+    assert bundle["metadata"]["row_count"] == 10
+    cohort_bundle = bundle["cohort_bundles"][
+        "fungible_reference::fungible_reference|helmet|v1"
+    ]
+    assert cohort_bundle["metadata"]["row_count"] == 5
+    state = json.loads(state_path.read_text(encoding="utf-8"))
+    assert state["warm_starts"] == 1
+    assert state["fingerprint"]["digest"] == "222"
+
+    client.fingerprint.update(
+        rows=12, max_as_of_ts="2026-01-03 00:00:00.000", prefix_digest="999"
+    )
+    retrained = _train()
+    assert (retrained["status"], retrained["reason"]) == ("trained", "history_changed")
+    bundle = joblib.load(retrained["model_bundle_path"])
+    assert bundle["models"]["p50"].n_estimators_ == 120
+
+    train.train_route_v3(
+        cast(Any, client),
+        league="Mirage",
+        route="sparse_retrieval",
+        model_dir=str(tmp_path),
+    )
+    assert not state_path.exists()
+
+
+def test_training_capacity_limits_route_slots_by_route_row_count(monkeypatch) -> None:
+    from types import SimpleNamespace
+
+    from poe_trade.ml.v3 import parallel
+
+    monkeypatch.setattr(
+        parallel,
+        "detect_runtime_profile",
+        lambda: SimpleNamespace(default_workers=6, memory_budget_gb=12.0),
+    )
+
+    assert parallel.resolve_training_capacity().route_slots == 6
+    assert parallel.resolve_training_capacity(route_rows=250_000).route_slots == 2
+    assert parallel.resolve_training_capacity(route_rows=2_000_000).route_slots == 1
@@ -21,6 +21,7 @@ def _settings() -> SimpleNamespace:
     return SimpleNamespace(
         api_league_allowlist=("Mirage",),
         scan_minutes=0.01,
+        scanner_pack_workers=4,
         clickhouse_url="http://clickhouse",
     )
 
@@ -34,7 +35,7 @@ def test_main_returns_retryable_failure_in_once_mode(monkeypatch) -> None:
         lambda *_args, **_kwargs: SimpleNamespace(report=lambda **_kw: None),
     )
 
-    def _raise_transient(_client, *, league, dry_run=False):
+    def _raise_transient(_client, *, league, dry_run=False, **_kwargs):
         raise ClickHouseClientError("timeout", retryable=True)
 
     monkeypatch.setattr(scanner_worker.scanner, "run_scan_once", _raise_transient)
@@ -53,7 +54,7 @@ def test_main_raises_non_retryable_clickhouse_error(monkeypatch) -> None:
         lambda *_args, **_kwargs: SimpleNamespace(report=lambda **_kw: None),
     )
 
-    def _raise_non_retryable(_client, *, league, dry_run=False):
+    def _raise_non_retryable(_client, *, league, dry_run=False, **_kwargs):
         raise ClickHouseClientError("bad query", retryable=False, status_code=400)
 
     monkeypatch.setattr(scanner_worker.scanner, "run_scan_once", _raise_non_retryable)
@@ -78,7 +79,7 @@ def test_main_uses_status_reporter_for_heartbeat(monkeypatch) -> None:
     monkeypatch.setattr(
         scanner_worker.scanner,
         "run_scan_once",
-        lambda _client, *, league, dry_run=False: "scan-123",
+        lambda _client, *, league, dry_run=False, **_kwargs: "scan-123",
     )
 
     result = scanner_worker.main(["--once", "--league", "Mirage", "--dry-run"])
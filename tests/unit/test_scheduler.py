@@ -78,9 +78,15 @@ def test_run_market_sync_runs_refs_refresh_on_schedule(monkeypatch) -> None:
     refresh_calls = []
 
     def _record_refresh(
-        client, *, layer: str, group: str | None = None, dry_run: bool = False
+        client,
+        *,
+        layer: str,
+        group: str | None = None,
+        dry_run: bool = False,
+        incremental: bool = False,
+        max_parallel: int = 1,
     ):
-        refresh_calls.append((client, layer, group, dry_run))
+        refresh_calls.append((client, layer, group, dry_run, incremental, max_parallel))
         return []
 
     monkeypatch.setattr(scheduler, "execute_refresh_group", _record_refresh)
@@ -97,6 +103,25 @@ def test_run_market_sync_runs_refs_refresh_on_schedule(monkeypatch) -> None:
         cxapi_hour_offset_seconds=15,
         refresh_client=refresh_client,
         refresh_refs_minutes=5,
+        refresh_parallelism=3,
     )
 
-    assert refresh_calls == [(refresh_client, "gold", "refs", False)]
+    assert refresh_calls == [(refresh_client, "gold", "refs", False, True, 3)]
+
+
+def test_run_market_sync_once_ignores_pipeline_mode() -> None:
+    harvester = _DummyHarvester()
+
+    scheduler.run_market_sync(
+        harvester=harvester,
+        cx_sync=None,
+        realms=("pc",),
+        leagues=("Mirage",),
+        poll_interval=0.0,
+        dry_run=False,
+        once=True,
+        cxapi_hour_offset_seconds=15,
+        psapi_pipelined=True,
+    )
+
+    assert harvester.calls == [("pc", "Mirage", False)]
@@ -15,6 +15,10 @@ def test_ml_trainer_persists_runtime_stage_in_status(monkeypatch, tmp_path) -> N
     cfg = SimpleNamespace(
         clickhouse_url="http://ch",
         ml_automation_enabled=True,
+        ml_v3_model_backend="gbr",
+        ml_v3_full_retrain_hours=24.0,
+        ml_v3_warm_start_max_delta=0.2,
+        ml_v3_backfill_parallelism=1,
         ml_automation_league="Mirage",
         ml_automation_interval_seconds=30,
         ml_automation_max_iterations=1,
@@ -61,6 +65,13 @@ def test_ml_trainer_persists_runtime_stage_in_status(monkeypatch, tmp_path) -> N
             "routes": ["sparse_retrieval"],
         },
     )
+    monkeypatch.setattr(
+        ml_trainer.search_index,
+        "refresh_search_label_index",
+        lambda _client: ml_trainer.search_index.LabelIndexRefreshResult(
+            days_refreshed=2, source_watermark="2026-03-20 00:00:00.000"
+        ),
+    )
     result = ml_trainer.main(["--once", "--league", "Mirage"])
 
     assert result == 0
@@ -70,12 +81,21 @@ def test_ml_trainer_persists_runtime_stage_in_status(monkeypatch, tmp_path) -> N
     assert payload["stage"] == "train_cycle"
     assert payload["status"] == "completed"
     assert payload["result"]["v3"]["run_id"] == "run-1"
+    assert payload["result"]["search_index"] == {
+        "status": "completed",
+        "days_refreshed": 2,
+        "source_watermark": "2026-03-20 00:00:00.000",
+    }
 
 
 def test_ml_trainer_rejects_dataset_table_argument(monkeypatch) -> None:
     cfg = SimpleNamespace(
         clickhouse_url="http://ch",
         ml_automation_enabled=True,
+        ml_v3_model_backend="gbr",
+        ml_v3_full_retrain_hours=24.0,
+        ml_v3_warm_start_max_delta=0.2,
+        ml_v3_backfill_parallelism=1,
         ml_automation_league="Mirage",
         ml_automation_interval_seconds=30,
         ml_automation_max_iterations=1,
@@ -105,6 +125,10 @@ def test_ml_trainer_uses_v3_training(monkeypatch) -> None:
     cfg = SimpleNamespace(
         clickhouse_url="http://ch",
         ml_automation_enabled=True,
+        ml_v3_model_backend="gbr",
+        ml_v3_full_retrain_hours=24.0,
+        ml_v3_warm_start_max_delta=0.2,
+        ml_v3_backfill_parallelism=1,
         ml_automation_league="Mirage",
         ml_automation_interval_seconds=30,
         ml_automation_max_iterations=1,
@@ -134,10 +158,14 @@ def test_ml_trainer_uses_v3_training(monkeypatch) -> None:
             "replayed_days": [],
         },
     )
+    train_kwargs: list[dict[str, Any]] = []
+
+    def _train_all_routes_v3(*_args, **kwargs):  # noqa: ANN002, ANN003
+        train_kwargs.append(kwargs)
+        return {"trained_count": 2, "routes": ["a", "b"]}
+
     monkeypatch.setattr(
-        ml_trainer.v3_train,
-        "train_all_routes_v3",
-        lambda *_args, **_kwargs: {"trained_count": 2, "routes": ["a", "b"]},
+        ml_trainer.v3_train, "train_all_routes_v3", _train_all_routes_v3
     )
     monkeypatch.setattr(
         ml_trainer.workflows,
@@ -157,6 +185,12 @@ def test_ml_trainer_uses_v3_training(monkeypatch) -> None:
     result = ml_trainer.main(["--once", "--league", "Mirage"])
 
     assert result == 0
+    policy = train_kwargs[0]["incremental"]
+    assert (policy.full_retrain_hours, policy.warm_start_max_delta) == (24.0, 0.2)
+
+    cfg.ml_v3_full_retrain_hours = 0
+    assert ml_trainer.main(["--once", "--league", "Mirage"]) == 0
+    assert train_kwargs[1]["incremental"] is None
 
 
 def test_refresh_v3_training_examples_replays_missing_days() -> None:
@@ -0,0 +1,34 @@
+import json
+
+from poe_trade.ingestion.stash_page import StashPagePayload, parse_stash_page
+
+
+def test_parse_stash_page_matches_json_loads_and_keeps_raw_entries() -> None:
+    body = (
+        '{ "next_change_id" : "1-2",\n "stashes": [ {"id":"a", "league":"Mirage",'
+        ' "items":[{"name":"\\u00e9p\\u00e9e"}]} ,{"id":"b","league":null} ] }'
+    )
+
+    page = parse_stash_page(body)
+
+    assert isinstance(page, StashPagePayload)
+    assert page == json.loads(body)
+    assert page.raw_stashes == [
+        '{"id":"a", "league":"Mirage", "items":[{"name":"\\u00e9p\\u00e9e"}]}',
+        '{"id":"b","league":null}',
+    ]
+    assert [json.loads(raw) for raw in page.raw_stashes] == page["stashes"]
+
+
+def test_parse_stash_page_handles_empty_stashes() -> None:
+    page = parse_stash_page('{"next_change_id":"1","stashes":[]}')
+
+    assert page == {"next_change_id": "1", "stashes": []}
+    assert page.raw_stashes == []
+
+
+def test_parse_stash_page_falls_back_for_non_object_bodies() -> None:
+    assert parse_stash_page("[1, 2]") == [1, 2]
+    page = parse_stash_page('{"stashes": {"not": "a list"}}')
+    assert page == {"stashes": {"not": "a list"}}
+    assert page.raw_stashes is None
@@ -1,4 +1,5 @@
 import json
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 from typing import cast
@@ -267,6 +268,94 @@ def test_run_scan_once_isolates_unexpected_pack_runtime_errors_and_continues(
     assert "unexpected pack bug" in caplog.text
 
 
+def test_run_scan_once_runs_packs_concurrently_and_batches_inserts(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    packs = [
+        _pack(tmp_path, strategy_id="first_strategy"),
+        _pack(tmp_path, strategy_id="second_strategy"),
+        _pack(tmp_path, strategy_id="broken_strategy"),
+    ]
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _rows_for_pack(*_args: object, **kwargs: object) -> list[dict[str, object]]:
+        sql = str(kwargs.get("sql") or "")
+        if "broken_strategy" in sql:
+            raise ClickHouseClientError("broken pack source fetch failed")
+        # Both healthy packs must be in flight at once to get past the barrier.
+        _ = barrier.wait()
+        return [_candidate_row(semantic_key=f"sem:{sql}", item_or_market_key=sql)]
+
+    monkeypatch.setattr(scanner, "list_strategy_packs", lambda: packs)
+    monkeypatch.setattr(scanner, "load_candidate_sql", lambda pack: pack.strategy_id)
+    monkeypatch.setattr(scanner, "_fetch_candidate_source_rows", _rows_for_pack)
+    client = _RecordingClient()
+
+    with caplog.at_level("INFO"):
+        _ = scanner.run_scan_once(
+            _clickhouse_client(client), league="Mirage", max_workers=3
+        )
+
+    inserts = [query for query in client.queries if query.startswith("INSERT")]
+    assert [query.split(" (", 1)[0] for query in inserts] == [
+        "INSERT INTO poe_trade.scanner_candidate_decisions",
+        "INSERT INTO poe_trade.scanner_recommendations",
+        "INSERT INTO poe_trade.scanner_alert_log",
+    ]
+    recommendation_rows = _extract_insert_rows(inserts[1])
+    assert [row["strategy_id"] for row in recommendation_rows] == [
+        "first_strategy",
+        "second_strategy",
+    ]
+    assert "scanner strategy pack failed: broken_strategy" in caplog.text
+    assert "scanner pack completed strategy_id=first_strategy" in caplog.text
+    assert "packs=3 skipped=0 failed=1 workers=3" in caplog.text
+
+
+def test_run_scan_once_retries_failed_combined_write_pack_by_pack(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    class _RejectingPackClient(_RecordingClient):
+        def execute(self, query: str) -> str:
+            self.queries.append(query)
+            if (
+                "INSERT INTO poe_trade.scanner_recommendations" in query
+                and "bad_strategy" in query
+            ):
+                raise ClickHouseClientError("insert failed")
+            return ""
+
+    packs = [
+        _pack(tmp_path, strategy_id="bad_strategy"),
+        _pack(tmp_path, strategy_id="good_strategy"),
+    ]
+
+    def _rows_for_pack(*_args: object, **kwargs: object) -> list[dict[str, object]]:
+        sql = str(kwargs.get("sql") or "")
+        return [_candidate_row(semantic_key=f"sem:{sql}", item_or_market_key=sql)]
+
+    monkeypatch.setattr(scanner, "list_strategy_packs", lambda: packs)
+    monkeypatch.setattr(scanner, "load_candidate_sql", lambda pack: pack.strategy_id)
+    monkeypatch.setattr(scanner, "_fetch_candidate_source_rows", _rows_for_pack)
+    client = _RejectingPackClient()
+
+    with caplog.at_level("ERROR"):
+        _ = scanner.run_scan_once(_clickhouse_client(client), league="Mirage")
+
+    inserts = [query for query in client.queries if query.startswith("INSERT")]
+    assert [query.split(" (", 1)[0] for query in inserts] == [
+        "INSERT INTO poe_trade.scanner_candidate_decisions",
+        "INSERT INTO poe_trade.scanner_recommendations",
+        "INSERT INTO poe_trade.scanner_recommendations",
+        "INSERT INTO poe_trade.scanner_recommendations",
+        "INSERT INTO poe_trade.scanner_alert_log",
+    ]
+    alert_rows = _extract_insert_rows(inserts[-1])
+    assert [row["strategy_id"] for row in alert_rows] == ["good_strategy"]
+    assert "scanner pack write failed: bad_strategy" in caplog.text
+    assert "scanner pack write failed: good_strategy" not in caplog.text
+
+
 def test_run_scan_once_dry_run_skips_clickhouse(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -286,8 +375,15 @@ def test_run_scan_once_dry_run_skips_clickhouse(
 def test_run_scan_watch_runs_multiple_cycles(monkeypatch: pytest.MonkeyPatch) -> None:
     calls: list[tuple[str, bool]] = []
 
-    def _fake_once(client: object, *, league: str, dry_run: bool = False) -> str:
-        _ = client
+    def _fake_once(
+        client: object,
+        *,
+        league: str,
+        dry_run: bool = False,
+        max_workers: int = 1,
+        watch_state: object = None,
+    ) -> str:
+        _ = client, max_workers, watch_state
         calls.append((league, dry_run))
         return f"scan-{len(calls)}"
 
@@ -309,6 +405,137 @@ def test_run_scan_watch_runs_multiple_cycles(monkeypatch: pytest.MonkeyPatch) ->
     assert calls == [("Mirage", True), ("Mirage", True), ("Mirage", True)]
 
 
+def test_run_scan_watch_skips_packs_whose_gold_sources_did_not_change(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    pack = _pack(tmp_path, cooldown_minutes=30)
+    source_fetches: list[str] = []
+    cooldown_fetches: list[str] = []
+    client = _RecordingClient(
+        responses={
+            "AS source_table": (
+                '{"source_table":"gold_listing_ref_hour",'
+                '"watermark":"2026-03-01 00:00:00.000","row_count":"10"}'
+            )
+        }
+    )
+
+    def _rows(*_args: object, **_kwargs: object) -> list[dict[str, object]]:
+        source_fetches.append(pack.strategy_id)
+        return [_candidate_row()]
+
+    def _cooldowns(*_args: object, **_kwargs: object) -> dict[str, object]:
+        cooldown_fetches.append(pack.strategy_id)
+        return {}
+
+    sleeps: list[float] = []
+
+    def _advance_gold_mart(seconds: float) -> None:
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            client.responses["AS source_table"] = client.responses[
+                "AS source_table"
+            ].replace('"row_count":"10"', '"row_count":"11"')
+
+    monkeypatch.setattr(scanner, "list_strategy_packs", lambda: [pack])
+    monkeypatch.setattr(
+        scanner,
+        "load_candidate_sql",
+        lambda _pack: "SELECT * FROM poe_trade.gold_listing_ref_hour",
+    )
+    monkeypatch.setattr(scanner, "_fetch_candidate_source_rows", _rows)
+    monkeypatch.setattr(scanner, "_fetch_last_alerted_at_by_key", _cooldowns)
+    monkeypatch.setattr("poe_trade.strategy.scanner.time.sleep", _advance_gold_mart)
+
+    run_ids = scanner.run_scan_watch(
+        _clickhouse_client(client),
+        league="Mirage",
+        interval_seconds=0.1,
+        max_runs=4,
+    )
+
+    assert len(run_ids) == 4
+    assert source_fetches == ["demo_strategy", "demo_strategy"]
+    assert cooldown_fetches == ["demo_strategy"]
+    watermark_queries = [
+        query for query in client.queries if "AS source_table" in query
+    ]
+    assert len(watermark_queries) == 4
+    assert "FROM poe_trade.gold_listing_ref_hour" in watermark_queries[0]
+    incremental_cooldown_queries = [
+        query
+        for query in client.queries
+        if "FROM poe_trade.scanner_alert_log" in query and "recorded_at >=" in query
+    ]
+    assert len(incremental_cooldown_queries) == 3
+    assert all("league = 'Mirage'" in query for query in incremental_cooldown_queries)
+    recommendation_inserts = [
+        query
+        for query in client.queries
+        if query.startswith("INSERT INTO poe_trade.scanner_recommendations")
+    ]
+    assert len(recommendation_inserts) == 2
+
+
+def test_run_scan_watch_reevaluates_pack_whose_write_failed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    class _FlakyInsertClient(_RecordingClient):
+        fail_recommendations = True
+
+        def execute(self, query: str) -> str:
+            if (
+                self.fail_recommendations
+                and "INSERT INTO poe_trade.scanner_recommendations" in query
+            ):
+                self.queries.append(query)
+                self.fail_recommendations = False
+                raise ClickHouseClientError("insert failed")
+            return super().execute(query)
+
+    pack = _pack(tmp_path)
+    source_fetches: list[str] = []
+    client = _FlakyInsertClient(
+        responses={
+            "AS source_table": (
+                '{"source_table":"gold_listing_ref_hour",'
+                '"watermark":"2026-03-01 00:00:00.000","row_count":"10"}'
+            )
+        }
+    )
+
+    def _rows(*_args: object, **_kwargs: object) -> list[dict[str, object]]:
+        source_fetches.append(pack.strategy_id)
+        return [_candidate_row()]
+
+    monkeypatch.setattr(scanner, "list_strategy_packs", lambda: [pack])
+    monkeypatch.setattr(
+        scanner,
+        "load_candidate_sql",
+        lambda _pack: "SELECT * FROM poe_trade.gold_listing_ref_hour",
+    )
+    monkeypatch.setattr(scanner, "_fetch_candidate_source_rows", _rows)
+    monkeypatch.setattr(
+        scanner, "_fetch_last_alerted_at_by_key", lambda *_args, **_kwargs: {}
+    )
+    monkeypatch.setattr("poe_trade.strategy.scanner.time.sleep", lambda _s: None)
+
+    _ = scanner.run_scan_watch(
+        _clickhouse_client(client),
+        league="Mirage",
+        interval_seconds=0.1,
+        max_runs=3,
+    )
+
+    assert source_fetches == ["demo_strategy", "demo_strategy"]
+    recommendation_inserts = [
+        query
+        for query in client.queries
+        if query.startswith("INSERT INTO poe_trade.scanner_recommendations")
+    ]
+    assert len(recommendation_inserts) == 2
+
+
 def test_run_scan_once_preserves_source_recommendation_fields_with_fallbacks(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
@@ -1077,7 +1304,7 @@ def test_run_scan_once_logs_on_failed_clickhouse_write(
         )
 
     assert len(scan_id) == 32
-    assert "scanner strategy pack failed: demo_strategy" in caplog.text
+    assert "scanner cycle write failed for packs: demo_strategy" in caplog.text
     assert "insert failed" in caplog.text
 
 